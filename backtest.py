@@ -1,21 +1,479 @@
 """
-Basit backtest stub'u: Testler, run_backtest fonksiyonunun bir float döndürmesini ve
-"Final portfolio value:" yazmasını bekliyor. Ağ/harici bağımlılık yoktur.
+Olay güdümlü backtest: yerel dosyalardaki 1m / 15m kline ve order book anlık görüntüleri,
+ana döngünün karar yolundan bar bar geçirilir. Ağ / Binance client kullanılmaz.
+
+Karar yolu (main.py ile aynı fonksiyonlar):
+    playbook.regime_on (15m) -> bb_squeeze_breakout_signal / pullback_signal (1m)
+    -> orderbook_imbalance_ok -> micro_entry_signal (trend kapalıyken scalp)
+    -> compute_stop_and_size -> order_filters.ensure_min_qty / adjust_qty_for_filters
+    -> order_filters.validate_order_plan (tick/step/minNotional, simülasyon saatinde cooldown)
+Karar i. barın kapanışında verilir, emir (i+1). barın açılışında dolar. Çıkışlar: stop
+(bar low'u stop'a değerse; gap'te açılış fiyatından), ilk kâr hedefi, en uzun tutma süresi.
+Ücret taker oranıyla, slippage o ana kadarki son order book görüntüsünden
+(estimate_slippage_from_book) ya da görüntü yoksa sabit baz puanla modellenir.
+15m rejimi yalnızca kapanmış 15m barlarından okunur (ileriye bakma yok); 15m dosyası yoksa
+1m barlarından sunucu kuralıyla toplanır (core.bar_aggregator.aggregate).
+
+Veri dizini (BACKTEST_DATA_DIR):
+    {SYMBOL}_1m.csv | .json      Binance kline satırları (data.binance.vision dökümü ya da REST yanıtı)
+    {SYMBOL}_15m.csv | .json     opsiyonel
+    {SYMBOL}_book.jsonl          opsiyonel; satır başına {"ts": ms, "bids": [...], "asks": [...]}
+Dosya yoksa run_backtest yerel kline deposundan (core.kline_store, KLINE_STORE_DIR) yalnız
+istenen aralık + ısınmayı okur; depoda da yoksa deterministik sentetik veriyle çalışır.
+
+Çalıştır:
+    python backtest.py SOLUSDT "3 days ago UTC" 1000
 """
+from __future__ import annotations
+import bisect
+import csv
+import json
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.bar_aggregator import aggregate
+from core.bars import Bars
+from core.cooldown import CooldownRegistry
+from core.kline_cache import INTERVAL_MS
+from core.kline_store import KlineStore, default_store
+from core.types import OrderPlan
+from modules import order_filters, playbook
+from modules.signals import micro_entry_signal
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+BACKTEST_DATA_DIR = os.getenv("BACKTEST_DATA_DIR", "data/backtest")
+BACKTEST_FEE_RATE = _float_env("BACKTEST_FEE_RATE", order_filters.DEFAULT_TAKER_FEE)
+BACKTEST_SLIPPAGE_BPS = _float_env("BACKTEST_SLIPPAGE_BPS", 2.0)
+BACKTEST_MODE = os.getenv("BACKTEST_MODE", "event")
+
+_MIN = INTERVAL_MS["1m"]
+_M15 = INTERVAL_MS["15m"]
+# Sinyal kodları (dışarıdan verilen sinyal dizisi için): 0 yok, 1 LONG, 2 SCALP
+SETUPS = (None, "LONG", "SCALP")
+
+
+@dataclass
+class BacktestConfig:
+    """Varsayılanlar main.py ile aynı env değişkenlerinden."""
+    fee_rate: float = BACKTEST_FEE_RATE
+    slippage_bps: float = BACKTEST_SLIPPAGE_BPS          # order book görüntüsü yoksa
+    risk_pct: float = _float_env("RISK_PCT", 0.0105)
+    min_notional_usdt: float = _float_env("MIN_NOTIONAL_USDT", 6.0)
+    hard_stop_pct: float = _float_env("HARD_STOP_LOSS_PCT", 0.006)
+    take_profit_pct: float = _float_env("FIRST_EXIT_MIN_PROFIT_PCT", 0.0035)
+    max_hold_sec: int = _int_env("FIRST_EXIT_MAX_HOLD_SEC", 1800)
+    entry_cooldown_sec: int = _int_env("ENTRY_COOLDOWN_SEC", 20)
+    orderbook_min_ratio: float = _float_env("ORDERBOOK_MIN_RATIO", 0.52)
+    adx_min: float = _float_env("TREND_ADX_MIN", 18.0)
+    scalp_mode: bool = _bool_env("SCALP_MODE_ENABLED", True)
+    micro_entry: bool = _bool_env("MICRO_ENTRY_ENABLED", True)
+    window_1m: int = 200      # ana döngüdeki pencereler
+    window_15m: int = 100
+
+
+@dataclass
+class Trade:
+    symbol: str
+    setup: str                # "LONG" | "SCALP"
+    entry_ts: int             # ms
+    entry_price: float
+    qty: float
+    stop_price: Optional[float]
+    exit_ts: int = 0
+    exit_price: float = 0.0
+    exit_reason: str = ""     # "stop" | "take_profit" | "max_hold" | "end"
+    fees: float = 0.0
+    pnl: float = 0.0
+
+
+@dataclass
+class BacktestResult:
+    symbol: str
+    initial_balance: float
+    final_value: float
+    trades: List[Trade] = field(default_factory=list)
+    equity_curve: List[Tuple[int, float]] = field(default_factory=list)   # (bar close ms, equity)
+    bars: int = 0
+    seconds: float = 0.0
+
+    @property
+    def bars_per_sec(self) -> float:
+        return self.bars / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def max_drawdown(self) -> float:
+        peak, mdd = 0.0, 0.0
+        for _, eq in self.equity_curve:
+            peak = max(peak, eq)
+            if peak > 0:
+                mdd = max(mdd, (peak - eq) / peak)
+        return mdd
+
+
+# ----------------------
+# Veri yükleme
+# ----------------------
+def load_klines(path: str) -> List[list]:
+    """CSV (başlıksız Binance dökümü ya da başlıklı) veya JSON kline satırları; open_time artan."""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [list(r) for r in json.load(f)]
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = [r for r in csv.reader(f) if r and r[0].strip().lstrip("-").isdigit()]
+    for r in rows:
+        # Yeni spot dökümleri mikrosaniye: ms'ye indir
+        t0, t1 = int(r[0]), int(r[6])
+        if t0 > 10 ** 14:
+            t0, t1 = t0 // 1000, t1 // 1000
+        r[0], r[6] = t0, t1
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+def load_book_snapshots(path: str) -> List[Dict[str, Any]]:
+    """JSONL order book görüntüleri; ts (ms) artan."""
+    snaps = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                snaps.append(json.loads(line))
+    snaps.sort(key=lambda s: int(s["ts"]))
+    return snaps
+
+
+def resample_closed(rows_1m: Sequence[Sequence[Any]], interval: str = "15m") -> List[list]:
+    """1m satırlarından yalnızca tam (eksiksiz) üst barlar."""
+    step = INTERVAL_MS[interval]
+    per_bucket = step // _MIN
+    if isinstance(rows_1m, Bars):
+        return _resample_bars(rows_1m, step, per_bucket)
+    buckets: Dict[int, List[Sequence[Any]]] = {}
+    for r in rows_1m:
+        t = int(r[0])
+        buckets.setdefault(t - t % step, []).append(r)
+    return [aggregate(buckets[s], s, step) for s in sorted(buckets) if len(buckets[s]) == per_bucket]
+
+
+def _resample_bars(bars: Bars, step: int, per_bucket: int) -> List[list]:
+    # Bars (ör. KlineStore aralığı) için diziyle: open_time artan, kovalar bitişik
+    a = bars.values
+    if not a.shape[0]:
+        return []
+    t = a[:, 0].astype(np.int64)
+    bucket = t - t % step
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    counts = np.diff(np.append(starts, t.shape[0]))
+    high = np.maximum.reduceat(a[:, 2], starts)
+    low = np.minimum.reduceat(a[:, 3], starts)
+    volume = np.add.reduceat(a[:, 5], starts)
+    full = np.flatnonzero(counts == per_bucket)
+    return [[int(bucket[starts[k]]), float(a[starts[k], 1]), float(high[k]), float(low[k]),
+             float(a[starts[k] + counts[k] - 1, 4]), float(volume[k]), int(bucket[starts[k]]) + step - 1]
+            for k in full.tolist()]
+
+
+def synthetic_klines(n: int, seed: int = 42, start_ms: int = 1_700_000_000_000 // _M15 * _M15) -> List[list]:
+    """Deterministik 1m rastgele yürüyüş (Binance satır biçimi); veri dosyası yoksa."""
+    rnd = random.Random(seed)
+    p, rows = 100.0, []
+    drift = 0.0
+    for i in range(n):
+        if i % 240 == 0:
+            drift = rnd.uniform(-0.0002, 0.0002)    # rejim değişimi
+        o = p
+        p *= 1 + drift + rnd.gauss(0, 0.0015)
+        t = start_ms + i * _MIN
+        rows.append([t, f"{o:.6f}", f"{max(o, p) * (1 + abs(rnd.gauss(0, 0.0005))):.6f}",
+                     f"{min(o, p) * (1 - abs(rnd.gauss(0, 0.0005))):.6f}", f"{p:.6f}",
+                     f"{rnd.uniform(10, 500):.4f}", t + _MIN - 1, "0", 0, "0", "0", "0"])
+    return rows
+
+
+def _lookback_minutes(start_str: str) -> Optional[int]:
+    """'3 days ago UTC' -> dakika; anlaşılmazsa None (tüm veri)."""
+    m = re.match(r"\s*(\d+)\s*(minute|hour|day|week)s?\s+ago", str(start_str or ""), re.I)
+    if not m:
+        return None
+    return int(m.group(1)) * {"minute": 1, "hour": 60, "day": 1440, "week": 10080}[m.group(2).lower()]
+
+
+def _find(data_dir: str, symbol: str, suffix: str) -> Optional[str]:
+    for ext in (".csv", ".json"):
+        path = os.path.join(data_dir, f"{symbol}_{suffix}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# ----------------------
+# Motor
+# ----------------------
+class Backtester:
+    def __init__(self, symbol: str, klines_1m: Sequence[Sequence[Any]],
+                 klines_15m: Optional[Sequence[Sequence[Any]]] = None,
+                 books: Optional[List[Dict[str, Any]]] = None,
+                 config: Optional[BacktestConfig] = None,
+                 signals: Optional[Sequence[int]] = None):
+        """signals: bar başına SETUPS kodu; verilirse karar yolu yerine kullanılır (bkz. vector_backtest)."""
+        self.symbol = symbol
+        self.cfg = config or BacktestConfig()
+        self.bars_1m = Bars.from_klines(klines_1m)
+        self.bars_15m = Bars.from_klines(klines_15m if klines_15m is not None else resample_closed(klines_1m))
+        # 15m kapanışı: bu ana kadar kapanmış barlar searchsorted ile
+        self._close_15m = (self.bars_15m.open_time + _M15).tolist()
+        self.books = books or []
+        self._book_ts = [int(b["ts"]) for b in self.books]
+        self.cooldown = CooldownRegistry()
+        self._regime: Tuple[int, bool] = (-1, False)    # (kapanmış 15m bar sayısı, regime_on)
+        self.signals = signals
+
+    # --- yardımcılar ---
+    def _book_at(self, ts_ms: int) -> Optional[Dict[str, Any]]:
+        i = bisect.bisect_right(self._book_ts, ts_ms) - 1
+        return self.books[i] if i >= 0 else None
+
+    def _slippage(self, side: str, notional: float, ts_ms: int) -> float:
+        book = self._book_at(ts_ms)
+        if book is not None:
+            est = order_filters.estimate_slippage_from_book(side, notional, book)
+            if est.get("ok") and est.get("slippage_pct") is not None:
+                return float(est["slippage_pct"])
+        return self.cfg.slippage_bps / 10_000.0
+
+    def _entry_signal(self, i: int) -> Optional[str]:
+        """i. bar kapanışında main.py giriş kararı; 'LONG' | 'SCALP' | None."""
+        if self.signals is not None:
+            return SETUPS[int(self.signals[i])]
+        cfg = self.cfg
+        w1 = self.bars_1m[max(0, i + 1 - cfg.window_1m):i + 1]
+        t_close = int(w1.open_time[-1]) + _MIN
+        j = bisect.bisect_right(self._close_15m, t_close)
+        if self._regime[0] != j:
+            # Rejim yalnızca yeni 15m barı kapanınca değişir; EMA50 geçmişi yoksa zaten False
+            w15 = self.bars_15m[max(0, j - cfg.window_15m):j]
+            self._regime = (j, playbook.regime_on(w15, adx_min=cfg.adx_min) if len(w15) >= 50 else False)
+        trend_on = self._regime[1]
+        signal_breakout = playbook.bb_squeeze_breakout_signal(w1)
+        signal_pullback = playbook.pullback_signal(w1)
+        book = self._book_at(t_close)
+        orderbook_ok = playbook.orderbook_imbalance_ok(book, min_ratio=cfg.orderbook_min_ratio) if book else True
+        if trend_on and orderbook_ok and (signal_breakout or signal_pullback):
+            return "LONG"
+        if cfg.scalp_mode and not trend_on and cfg.micro_entry:
+            vwap_values = ((w1.open[-3:] + w1.close[-3:]) / 2.0).tolist()
+            c = w1.close
+            volatility = abs((c[-1] - c[-2]) / c[-2]) if len(c) >= 2 and c[-2] != 0 else 0.0
+            if micro_entry_signal(ohlcv_1m=w1, vwap=vwap_values, volatility=volatility):
+                return "SCALP"
+        return None
+
+    def _size(self, i: int, cash: float) -> Tuple[Optional[float], float]:
+        """compute_stop_and_size + filtreler + validate_order_plan; (stop, qty) ya da (None, 0)."""
+        cfg = self.cfg
+        w1 = self.bars_1m[max(0, i + 1 - cfg.window_1m):i + 1]
+        price = float(w1.close[-1])
+        stop_price, qty = playbook.compute_stop_and_size(entry_price=price, ohlcv_1m=w1, equity=cash,
+                                                         risk_pct=cfg.risk_pct)
+        qty = order_filters.ensure_min_qty(self.symbol, price, float(qty or 0.0), cfg.min_notional_usdt)
+        t_close = int(w1.open_time[-1]) + _MIN
+        # Nakit sınırı: ücret + bu büyüklükteki beklenen slippage dahil
+        slip = self._slippage("BUY", qty * price, t_close)
+        qty = min(qty, cash / (price * (1 + cfg.fee_rate + slip) * 1.001))
+        qty = order_filters.adjust_qty_for_filters(self.symbol, qty)
+        if qty <= 0:
+            return None, 0.0
+        now = t_close / 1000.0
+        plan = OrderPlan(symbol=self.symbol, side="BUY", qty_base=qty, entry_price=price, sl_price=stop_price)
+        rc = order_filters.validate_order_plan(plan, market_state={"last_price": price},
+                                               account_state={"quote_free": cash}, now=now, cooldown=self.cooldown)
+        if not rc.ok:
+            return None, 0.0
+        return stop_price, float(rc.adjusted_qty)
+
+    def _fill(self, i: int, setup: str, stop_price: Optional[float], qty: float,
+              cash: float) -> Tuple[Optional[Trade], float]:
+        """Bekleyen girişi i. barın açılışında doldur; nakit yetmezse (None, cash)."""
+        t_open = int(self.bars_1m.values[i][0])
+        price = float(self.bars_1m.values[i][1])
+        fill = price * (1 + self._slippage("BUY", qty * price, t_open))
+        cost = qty * fill
+        fee = cost * self.cfg.fee_rate
+        if cost + fee > cash + 1e-9:
+            return None, cash
+        self.cooldown.mark_trade(self.symbol, t_open / 1000.0)
+        pos = Trade(symbol=self.symbol, setup=setup, entry_ts=t_open, entry_price=fill, qty=qty,
+                    stop_price=stop_price, fees=fee)
+        return pos, cash - (cost + fee)
+
+    def _levels(self, pos: Trade) -> Tuple[float, float]:
+        """(stop, kâr hedefi); 0 ise devre dışı."""
+        cfg = self.cfg
+        stop = pos.entry_price * (1 - cfg.hard_stop_pct) if cfg.hard_stop_pct else 0.0
+        if pos.stop_price:
+            stop = max(stop, pos.stop_price)
+        target = pos.entry_price * (1 + cfg.take_profit_pct) if cfg.take_profit_pct else 0.0
+        return stop, target
+
+    def _exit(self, i: int, pos: Trade) -> Optional[Tuple[float, str]]:
+        """i. bar içinde çıkış (fiyat, neden); muhafazakâr: önce stop."""
+        cfg = self.cfg
+        b = self.bars_1m.values[i]
+        o, h, lo, c = float(b[1]), float(b[2]), float(b[3]), float(b[4])
+        stop, target = self._levels(pos)
+        if stop and lo <= stop:
+            return min(o, stop), "stop"
+        if target and h >= target:
+            return max(o, target), "take_profit"
+        if (int(b[0]) + _MIN - pos.entry_ts) / 1000.0 >= cfg.max_hold_sec:
+            return c, "max_hold"
+        return None
+
+    def _close(self, pos: Trade, i: int, price: float, reason: str) -> float:
+        notional = pos.qty * price
+        fill = price * (1 - self._slippage("SELL", notional, int(self.bars_1m.values[i][0])))
+        proceeds = pos.qty * fill
+        fee = proceeds * self.cfg.fee_rate
+        pos.exit_ts = int(self.bars_1m.values[i][0]) + _MIN
+        pos.exit_price = fill
+        pos.exit_reason = reason
+        pos.fees += fee
+        pos.pnl = proceeds - pos.qty * pos.entry_price - pos.fees
+        return proceeds - fee
+
+    # --- ana döngü ---
+    def run(self, initial_balance: float = 1000.0, start_index: Optional[int] = None) -> BacktestResult:
+        cfg = self.cfg
+        result = BacktestResult(symbol=self.symbol, initial_balance=float(initial_balance),
+                                final_value=float(initial_balance))
+        n = len(self.bars_1m)
+        first = max(cfg.window_1m - 1, int(start_index or 0))
+        cash = float(initial_balance)
+        pos: Optional[Trade] = None
+        pending: Optional[Tuple[str, Optional[float], float]] = None
+        last_entry_ms = -10 ** 15
+        closes = self.bars_1m.close.tolist()
+        times = self.bars_1m.open_time.tolist()
+
+        t0 = time.perf_counter()
+        for i in range(first, n):
+            t_open = int(times[i])
+            # 1) Bekleyen giriş bu barın açılışında dolar
+            if pending is not None:
+                pos, cash = self._fill(i, *pending, cash)
+                pending = None
+                if pos is not None:
+                    last_entry_ms = t_open
+            # 2) Açık pozisyonda bar içi çıkış
+            if pos is not None:
+                hit = self._exit(i, pos)
+                if hit is not None:
+                    cash += self._close(pos, i, hit[0], hit[1])
+                    result.trades.append(pos)
+                    pos = None
+            t_close = t_open + _MIN
+            result.equity_curve.append((t_close, cash + (pos.qty * closes[i] if pos is not None else 0.0)))
+            # 3) Kapanışta giriş kararı (sonraki barda dolar)
+            if pos is None and i + 1 < n and (t_close - last_entry_ms) / 1000.0 >= cfg.entry_cooldown_sec:
+                setup = self._entry_signal(i)
+                if setup is not None:
+                    stop_price, qty = self._size(i, cash)
+                    if qty > 0:
+                        pending = (setup, stop_price, qty)
+        if pos is not None:
+            cash += self._close(pos, n - 1, closes[-1], "end")
+            result.trades.append(pos)
+            result.equity_curve[-1] = (result.equity_curve[-1][0], cash)
+        result.seconds = time.perf_counter() - t0
+        result.bars = max(0, n - first)
+        result.final_value = cash
+        return result
+
 
-from typing import Any
+def run_backtest(symbol: str = "BTCUSDT", interval: str = "1h", start_str: str = "1 day ago UTC",
+                 initial_balance: float = 10.0, data_dir: Optional[str] = None,
+                 config: Optional[BacktestConfig] = None, mode: Optional[str] = None,
+                 store: Optional[KlineStore] = None) -> float:
+    """
+    Yerel veriyle backtest; son portföy değerini döndürür. mode: "event" (bar bar) | "vector"
+    (vector_backtest; BACKTEST_MODE). Karar yolu ana döngüdeki gibi 1m + 15m
+    olduğundan `interval` yalnızca imza uyumu içindir; `start_str` ('N days ago UTC') değerlendirilen
+    bar aralığını sınırlar (ısınma penceresi bunun öncesinden okunur). Veri sırası: data_dir
+    dosyaları, `store` (varsayılan KLINE_STORE_DIR deposu), sentetik seri. Depodan okurken
+    `start_str` anlaşılır bir aralık olmalıdır (tüm geçmiş belleğe kopyalanmaz; yoksa ValueError).
+    """
+    cfg = config or BacktestConfig()
+    data_dir = data_dir or BACKTEST_DATA_DIR
+    minutes = _lookback_minutes(start_str)
+    path_1m = _find(data_dir, symbol, "1m")
+    store = store or default_store()
+    if path_1m:
+        rows_1m = load_klines(path_1m)
+        path_15m = _find(data_dir, symbol, "15m")
+        rows_15m = load_klines(path_15m) if path_15m else None
+        book_path = os.path.join(data_dir, f"{symbol}_book.jsonl")
+        books = load_book_snapshots(book_path) if os.path.exists(book_path) else None
+        source = path_1m
+    elif store.length(symbol):
+        # Depodan yalnız değerlendirilecek aralık + 15m ısınması (bir kova payıyla) okunur
+        if not minutes:
+            raise ValueError(f"run_backtest: kline deposu için sınırlı aralık gerekli "
+                             f"(start_str='N days ago UTC'), verilen: {start_str!r}")
+        warmup = (cfg.window_15m + 1) * 15
+        rows_1m = store.bars(symbol, last=minutes + warmup)
+        rows_15m, books, source = None, None, f"kline store {store.root}"
+    else:
+        warmup = cfg.window_15m * 15
+        rows_1m = synthetic_klines((minutes or 1440) + warmup)
+        rows_15m, books, source = None, None, "synthetic"
 
+    start_index = max(0, len(rows_1m) - minutes) if minutes else 0
+    mode = (mode or BACKTEST_MODE).lower()
+    if mode == "vector":
+        from vector_backtest import VectorBacktester
+        engine: Backtester = VectorBacktester(symbol, rows_1m, rows_15m, books, cfg)
+    else:
+        engine = Backtester(symbol, rows_1m, rows_15m, books, cfg)
+    res = engine.run(initial_balance, start_index=start_index)
 
-def run_backtest(symbol: str = "BTCUSDT", interval: str = "1h", start_str: str = "1 day ago UTC", initial_balance: float = 10.0) -> float:
-    # Parametreler yalnızca imza uyumu için; gerçek ağ çağrısı yapılmaz.
-    portfolio_value = float(initial_balance)
-    # Basit deterministik artış simülasyonu
-    steps = 5
-    for _ in range(steps):
-        portfolio_value *= 1.001  # +0.1%
-    print(f"Final portfolio value: {portfolio_value:.2f} USDT")
-    return float(portfolio_value)
+    wins = sum(1 for t in res.trades if t.pnl > 0)
+    print(f"Backtest {symbol} ({source}, {mode}): {res.bars} bars, {len(res.trades)} trades, {wins} wins, "
+          f"max DD {res.max_drawdown * 100:.2f}%, {res.bars_per_sec:,.0f} bars/sec")
+    print(f"Final portfolio value: {res.final_value:.2f} USDT")
+    return float(res.final_value)
 
 
 if __name__ == "__main__":
-    run_backtest()
+    args = sys.argv[1:]
+    run_backtest(symbol=args[0] if args else "BTCUSDT",
+                 start_str=args[1] if len(args) > 1 else "1 day ago UTC",
+                 initial_balance=float(args[2]) if len(args) > 2 else 10.0)
@@ -0,0 +1,190 @@
+"""Üst zaman dilimi barlarını 1m verisinden yerelde üreten client sarmalayıcı.
+
+Her (symbol, interval) için kapanmış üst barlar bir kez REST'ten tohumlanır (ör. 15m x 100);
+sonrasında yeni barlar alttaki client'ın 1m penceresinden (KlineCache / MarketStream,
+turda zaten çekilen veri) toplanır, 3m / 15m için ek istek yapılmaz.
+
+Toplama Binance sunucu tarafı kuralıdır: kova başı open_time % interval == 0 (UTC epoch),
+open = ilk barın open'ı, close = son barın close'u, high / low = en yüksek / en düşük,
+hacim / quote hacim / taker hacimleri ve işlem sayısı toplanır, close_time = kova sonu - 1.
+Sayılar str ise (REST biçimi) toplamlar Decimal ile yapılır ve aynı ondalık basamakla yazılır.
+Son (açık) kova o ana kadarki 1m barlardan kısmi olarak döner. 1m penceresi son kapanmış
+üst bardan sonrasını kapsamıyorsa ya da kovada eksik dakika varsa REST'ten yeniden tohumlanır.
+
+Kullanım:
+    data_client = BarAggregator(KlineCache(client), targets={"3m": 3, "15m": 100})
+    data_client.get_klines(symbol="SOLUSDT", interval="15m", limit=100)
+"""
+from __future__ import annotations
+import os
+import threading
+from collections import deque
+from decimal import Decimal
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from core.bars import Bars, fetch_bars
+from core.kline_cache import INTERVAL_MS
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+BAR_AGGREGATION_ENABLED = _bool_env("BAR_AGGREGATION_ENABLED", True)
+BAR_AGGREGATION_BASE_LIMIT = _int_env("BAR_AGGREGATION_BASE_LIMIT", 200)
+
+# Epoch hizalı olmayan aralıklar (3d / 1w) yerelde üretilmez
+_UNALIGNED = ("3d", "1w")
+
+
+def _add(values: List[Any]) -> Any:
+    if all(isinstance(v, str) for v in values):
+        total = Decimal(0)
+        for v in values:
+            total += Decimal(v)
+        return format(total, "f")    # "0.00000000" (str() "0E-8" yazardı)
+    return sum(float(v) for v in values)
+
+
+def _extreme(values: List[Any], pick) -> Any:
+    return pick(values, key=float)
+
+
+def aggregate(rows: List[list], start_ms: int, interval_ms: int) -> list:
+    """Aynı kovadaki alt barlardan tek üst bar (REST satır biçimi)."""
+    first, last = rows[0], rows[-1]
+    out = [start_ms, first[1], _extreme([r[2] for r in rows], max), _extreme([r[3] for r in rows], min),
+           last[4], _add([r[5] for r in rows]), start_ms + interval_ms - 1]
+    if all(len(r) >= 12 for r in rows):
+        out += [_add([r[7] for r in rows]), sum(int(r[8]) for r in rows),
+                _add([r[9] for r in rows]), _add([r[10] for r in rows]), "0"]
+    return out
+
+
+class _Series:
+    __slots__ = ("closed", "next_open")
+
+    def __init__(self, closed: Deque[list], next_open: int):
+        self.closed = closed
+        self.next_open = next_open    # ilk kapanmamış kovanın başı
+
+
+class BarAggregator:
+    """
+    Client sarmalayıcı: `targets` aralıklarındaki get_klines yerel toplamadan,
+    diğer tüm çağrılar alttaki client'a aynen geçer.
+    """
+
+    def __init__(self, client: Any, targets: Optional[Dict[str, int]] = None, base: str = "1m",
+                 base_limit: int = BAR_AGGREGATION_BASE_LIMIT):
+        self.client = client
+        self.base = base
+        self.base_ms = INTERVAL_MS[base]
+        self.base_limit = int(base_limit)
+        self.targets: Dict[str, int] = {
+            iv: int(n) for iv, n in (targets or {}).items()
+            if iv in INTERVAL_MS and iv not in _UNALIGNED and INTERVAL_MS[iv] % self.base_ms == 0
+            and INTERVAL_MS[iv] > self.base_ms
+        }
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"local": 0, "rest_seeds": 0}
+
+    def __getattr__(self, name: str) -> Any:
+        # new_cycle, get_order_book vb. doğrudan alttaki client'a
+        client = self.__dict__.get("client")
+        if client is None:
+            raise AttributeError(name)
+        return getattr(client, name)
+
+    # ----------------------
+    # Okuma
+    # ----------------------
+    def get_klines(self, symbol: str, interval: str, limit: int = 500, **kwargs: Any) -> List[list]:
+        if kwargs or interval not in self.targets:
+            return self.client.get_klines(symbol=symbol, interval=interval, limit=limit, **kwargs)
+        limit = int(limit)
+        key = (symbol, interval)
+        with self._lock:
+            window = max(limit, self.targets[interval])
+            series = self._series.get(key)
+            if series is None or len(series.closed) + 1 < min(limit, self.targets[interval]):
+                series, _ = self._seed(symbol, interval, window)
+            rows = self._advance(symbol, interval, series)
+            if rows is None:
+                series, rest_rows = self._seed(symbol, interval, window)
+                rows = self._advance(symbol, interval, series)
+                if rows is None:
+                    # 1m verisi hâlâ yetersiz: bu tur REST yanıtı aynen
+                    return rest_rows[-limit:]
+            self.stats["local"] += 1
+            return rows[-limit:]
+
+    def get_bars(self, symbol: str, interval: str, limit: int = 500) -> Bars:
+        if interval in self.targets:
+            return Bars.from_klines(self.get_klines(symbol=symbol, interval=interval, limit=limit))
+        return fetch_bars(self.client, symbol, interval, limit)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            for key in [k for k in self._series if symbol is None or k[0] == symbol]:
+                self._series.pop(key, None)
+        inner = getattr(type(self.client), "invalidate", None)
+        if inner is not None:
+            self.client.invalidate(symbol)
+
+    # ----------------------
+    # Tohumlama / ilerletme
+    # ----------------------
+    def _seed(self, symbol: str, interval: str, window: int) -> Tuple[_Series, List[list]]:
+        rows = list(self.client.get_klines(symbol=symbol, interval=interval, limit=window + 1) or [])
+        self.stats["rest_seeds"] += 1
+        # Son satır açık bar: kapanmış kabul edilmez, 1m'den yeniden kurulur
+        closed = deque((list(r) for r in rows[:-1]), maxlen=max(window, 1))
+        next_open = int(rows[-1][0]) if rows else 0
+        series = _Series(closed, next_open)
+        self._series[(symbol, interval)] = series
+        return series, rows
+
+    def _advance(self, symbol: str, interval: str, series: _Series) -> Optional[List[list]]:
+        """Kapanan kovaları seriye ekle; kapanmış barlar + kısmi açık bar. Kapsam yoksa None."""
+        step = INTERVAL_MS[interval]
+        per_bucket = step // self.base_ms
+        base = self.client.get_klines(symbol=symbol, interval=self.base, limit=self.base_limit) or []
+        if not base or series.next_open == 0:
+            return None
+        if int(base[0][0]) > series.next_open:
+            return None    # 1m penceresi son kapanmış üst bardan sonrasını kapsamıyor
+        pending = [r for r in base if int(r[0]) >= series.next_open]
+        if not pending:
+            return None
+        buckets: Dict[int, List[list]] = {}
+        for r in pending:
+            open_ms = int(r[0])
+            buckets.setdefault(open_ms - open_ms % step, []).append(r)
+        starts = sorted(buckets)
+        for start in starts[:-1]:
+            # Sonraki kovada bar varsa bu kova kapanmıştır; kova / dakika eksikse sunucu toplamıyla eşleşmez
+            if start != series.next_open or len(buckets[start]) != per_bucket:
+                return None
+            series.closed.append(aggregate(buckets[start], start, step))
+            series.next_open = start + step
+        last = starts[-1]
+        rows = buckets[last]
+        if last != series.next_open or int(rows[-1][0]) - last != (len(rows) - 1) * self.base_ms:
+            return None
+        partial = aggregate(rows, last, step)
+        return list(series.closed) + [partial]
+
+
+__all__ = ["BarAggregator", "aggregate", "BAR_AGGREGATION_ENABLED"]
@@ -0,0 +1,201 @@
+"""Sütunsal kline kabı: ham yanıt bir kez ayrıştırılır, tüketiciler görünüm alır.
+
+`Bars` tek bir (N, 6) float64 matris tutar: open_time, open, high, low, close, volume.
+Aynı veri üç biçimde, kopyasız okunur:
+    bars.close / bars.volume ...   -> NumPy sütun görünümü (indikatörler, VWAP)
+    bars[i][4], for row in bars    -> satır görünümü (OHLCV tuple tüketicileri: playbook, ATR)
+    bars.candles[i]['close']       -> mum görünümü (dict tüketicileri: detect_*_signal)
+Dilimleme (bars[-10:], bars.candles[-3:]) yine görünüm döner; np.asarray(bars) matrisin
+kendisidir. Satır / mum nesneleri yalnızca erişildiğinde oluşturulan iki alanlı
+`__slots__` sarmalayıcılardır.
+
+Kullanım:
+    bars = Bars.from_klines(client.get_klines(symbol="SOLUSDT", interval="1m", limit=200))
+    bars = fetch_bars(data_client, "SOLUSDT", "1m", 200)   # KlineCache'te tur başına bir ayrıştırma
+"""
+from __future__ import annotations
+from typing import Any, Iterator, List, Sequence, Union
+
+import numpy as np
+
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+_FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+
+class Row:
+    """Tek barın tuple benzeri görünümü: row[4], len(row) == 6, tuple(row)."""
+
+    __slots__ = ("_a", "_i")
+
+    def __init__(self, a: np.ndarray, i: int):
+        self._a = a
+        self._i = i
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return tuple(self._a[self._i, j].tolist())
+        return self._a.item(self._i, j)
+
+    def __len__(self) -> int:
+        return 6
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._a[self._i].tolist())
+
+    def __eq__(self, other: Any) -> bool:
+        try:
+            return tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Row{tuple(self)}"
+
+
+class Candle:
+    """Tek barın dict benzeri görünümü: candle['open'], candle['close'], candle.get('high')."""
+
+    __slots__ = ("_a", "_i")
+
+    def __init__(self, a: np.ndarray, i: int):
+        self._a = a
+        self._i = i
+
+    def __getitem__(self, key: str) -> float:
+        return self._a.item(self._i, _FIELD_INDEX[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        j = _FIELD_INDEX.get(key)
+        return default if j is None else self._a.item(self._i, j)
+
+    def keys(self):
+        return FIELDS
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_INDEX
+
+    def __repr__(self) -> str:
+        return repr({k: self[k] for k in FIELDS})
+
+
+class _View:
+    """Bars üzerinde dizi protokolü; `item` satır ya da mum sarmalayıcısı."""
+
+    __slots__ = ("_a", "_item")
+
+    def __init__(self, a: np.ndarray, item):
+        self._a = a
+        self._item = item
+
+    def __len__(self) -> int:
+        return self._a.shape[0]
+
+    def __bool__(self) -> bool:
+        return self._a.shape[0] > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return type(self)(self._a[i])
+        n = self._a.shape[0]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("bar index out of range")
+        return self._item(self._a, i)
+
+    def __iter__(self):
+        item, a = self._item, self._a
+        return (item(a, i) for i in range(a.shape[0]))
+
+    def column(self, name: str) -> np.ndarray:
+        """Alan adına göre sütun görünümü ('open', 'close', ...)."""
+        return self._a[:, _FIELD_INDEX[name]]
+
+
+class CandleView(_View):
+    __slots__ = ()
+
+    def __init__(self, a: np.ndarray):
+        super().__init__(a, Candle)
+
+
+class Bars(_View):
+    """(N, 6) float64 kline matrisi; satır dizisi gibi davranır, sütunlar özellik olarak."""
+
+    __slots__ = ()
+
+    def __init__(self, a: np.ndarray):
+        super().__init__(a, Row)
+
+    @classmethod
+    def from_klines(cls, klines: Sequence[Sequence[Any]]) -> "Bars":
+        """Ham kline yanıtı (12 alanlı, sayılar str olabilir) veya OHLCV tuple listesi."""
+        if isinstance(klines, Bars):
+            return klines
+        if klines is None or len(klines) == 0:
+            return cls.empty()
+        # object -> float64 dönüşümü C içinde float() çağırır; str alanlarda np.array(dtype=float)'tan hızlı
+        return cls(np.array([k[:6] for k in klines], dtype=object).astype(np.float64))
+
+    @classmethod
+    def empty(cls) -> "Bars":
+        return cls(np.empty((0, 6), dtype=np.float64))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self._a if dtype is None else self._a.astype(dtype, copy=False)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._a
+
+    @property
+    def open_time(self) -> np.ndarray:
+        return self._a[:, OPEN_TIME]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._a[:, OPEN]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._a[:, HIGH]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._a[:, LOW]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._a[:, CLOSE]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._a[:, VOLUME]
+
+    @property
+    def candles(self) -> CandleView:
+        return CandleView(self._a)
+
+    def tolist(self) -> List[tuple]:
+        """Eski (open_time, o, h, l, c, v) tuple listesi (gerektiğinde; kopya)."""
+        return [tuple(r) for r in self._a.tolist()]
+
+
+def column(rows: Union[Bars, Sequence[Sequence[Any]]], j: int) -> Union[np.ndarray, List[float]]:
+    """Bars için sütun görünümü, satır listesi için float listesi."""
+    if isinstance(rows, Bars):
+        return rows.values[:, j]
+    return [float(r[j]) for r in rows]
+
+
+def fetch_bars(client: Any, symbol: str, interval: str, limit: int) -> Bars:
+    """KlineCache ise tur başına bir ayrıştırılmış pencereden dilim; değilse yanıtı ayrıştırır."""
+    get_bars = getattr(type(client), "get_bars", None)
+    if get_bars is not None:
+        return client.get_bars(symbol=symbol, interval=interval, limit=limit)
+    return Bars.from_klines(client.get_klines(symbol=symbol, interval=interval, limit=limit))
+
+
+__all__ = ["Bars", "Row", "Candle", "CandleView", "FIELDS", "column", "fetch_bars",
+           "OPEN_TIME", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]
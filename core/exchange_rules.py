@@ -1,9 +1,11 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import os
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Callable, Iterable
 import json
 import time
+import urllib.parse
 import urllib.request
 
 
@@ -23,7 +25,19 @@ def _bool_env(name: str, default: bool) -> bool:
     return str(v).strip().lower() in ("1", "true", "yes", "on")
 
 
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
 USE_EXCHANGE_INFO = _bool_env("USE_EXCHANGE_INFO", False)
+EXCHANGE_RULES_TTL_SEC = _float_env("EXCHANGE_RULES_TTL_SEC", 6 * 3600)
+EXCHANGE_RULES_RETRY_SEC = _float_env("EXCHANGE_RULES_RETRY_SEC", 60.0)
+# Kayıtta olmayan sembol için tek seferlik exchangeInfo isteğinin zaman aşımı
+EXCHANGE_RULES_SYMBOL_TIMEOUT_SEC = _float_env("EXCHANGE_RULES_SYMBOL_TIMEOUT_SEC", 5.0)
+EXCHANGE_RULES_SNAPSHOT = os.getenv("EXCHANGE_RULES_SNAPSHOT", "logs/exchange_rules_snapshot.json")
 
 
 def _load_from_modules(symbol: str) -> Optional[SymbolRules]:
@@ -47,38 +61,246 @@ def _load_from_modules(symbol: str) -> Optional[SymbolRules]:
         return None
 
 
-def load_rules_for_symbol(symbol: str) -> SymbolRules:
+def _exchangeinfo_base() -> str:
+    return os.getenv("BINANCE_EXCHANGEINFO_BASE", "https://testnet.binance.vision")
+
+
+def _client_source(client: Any) -> str:
+    """Kuralların geldiği ortam: python-binance client'ın REST tabanı (API_URL) + testnet bayrağı."""
+    url = getattr(client, "API_URL", None) or type(client).__name__
+    return f"{url}|testnet={bool(getattr(client, 'testnet', False))}"
+
+
+def _fetch_exchange_info(symbols: Optional[Iterable[str]] = None, timeout: float = 10.0) -> Dict[str, Any]:
+    """Tek istekte toplu exchangeInfo (symbols verilirse yalnızca onlar)."""
+    url = f"{_exchangeinfo_base()}/api/v3/exchangeInfo"
+    if symbols:
+        url += "?symbols=" + urllib.parse.quote(json.dumps(list(symbols), separators=(",", ":")))
+    with urllib.request.urlopen(url, timeout=timeout) as resp:  # nosec - controlled URL
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def _rules_from_filters(symbol: str, filters: Dict[str, Dict[str, Any]], quote: str = "USDT") -> SymbolRules:
+    tick = float(filters.get("PRICE_FILTER", {}).get("tickSize", 0.0001))
+    step = float(filters.get("LOT_SIZE", {}).get("stepSize", 0.0001))
+    min_notional = float(
+        filters.get("NOTIONAL", {}).get("minNotional")
+        or filters.get("MIN_NOTIONAL", {}).get("minNotional")
+        or 5.0
+    )
+    return SymbolRules(symbol=symbol, tick_size=tick, step_size=step, min_notional_usdt=min_notional, quote=quote)
+
+
+class RulesRegistry:
     """
-    Önce opsiyonel exchange_info modülünü dener, yoksa ENV fallback ile döner.
-    ENV fallback:
-      DEFAULT_TICK_SIZE, DEFAULT_STEP_SIZE, DEFAULT_MIN_NOTIONAL_USDT
+    Sembol kuralları için bellek içi kayıt:
+    - `preload()`: tek toplu exchangeInfo isteğiyle tüm semboller (bloklar; başlangıçta çağrılır)
+    - `get()`: hiçbir zaman ağa çıkmaz; süre dolmuşsa arka planda yenileme tetikler ve
+      eldeki (bayat) kuralı döndürür
+    - `load_symbol()`: kayıtta olmayan sembol için tek, zaman aşımlı istek (sembol başına
+      `retry_sec` içinde en çok bir deneme)
+    - disk snapshot: sıcak yeniden başlatma için `snapshot_path`; `source` (base URL / ortam)
+      ile etiketlenir, başka ortamın (örn. testnet -> live) snapshot'ı yüklenmez
     """
-    if USE_EXCHANGE_INFO:
-        # 1) Modül sağlayıcısı
-        r = _load_from_modules(symbol)
-        if r:
-            return r
-        # 2) REST fallback (Binance spot exchangeInfo) - testnet/prod autodetect
-        #    Çok sık çağrılmaması önerilir; basit cache eklemek isterseniz genişletilebilir.
-        base = os.getenv("BINANCE_EXCHANGEINFO_BASE", "https://testnet.binance.vision")
-        url = f"{base}/api/v3/exchangeInfo?symbol={symbol}"
+
+    def __init__(self, ttl_sec: float = EXCHANGE_RULES_TTL_SEC,
+                 snapshot_path: Optional[str] = EXCHANGE_RULES_SNAPSHOT,
+                 fetcher: Callable[..., Dict[str, Any]] = _fetch_exchange_info,
+                 clock: Callable[[], float] = time.time,
+                 source: Optional[str] = None):
+        self.ttl_sec = float(ttl_sec)
+        self.source = source or _exchangeinfo_base()
+        self.snapshot_path = snapshot_path
+        self._fetcher = fetcher
+        if fetcher is _fetch_exchange_info:
+            self._symbol_fetcher: Callable[[str], Dict[str, Any]] = \
+                lambda symbol: _fetch_exchange_info([symbol], timeout=EXCHANGE_RULES_SYMBOL_TIMEOUT_SEC)
+        else:
+            self._symbol_fetcher = lambda symbol: fetcher([symbol])
+        self._symbol_attempts: Dict[str, float] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rules: Dict[str, SymbolRules] = {}
+        self._filters: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.loaded_at: float = 0.0
+        self._symbols: Optional[list] = None
+        self._refreshing: Optional[threading.Thread] = None
+        self._last_attempt: float = float("-inf")
+        self.retry_sec = EXCHANGE_RULES_RETRY_SEC
+
+    # ----------------------
+    # Yükleme
+    # ----------------------
+    def _ingest(self, data: Dict[str, Any], loaded_at: float) -> int:
+        rules: Dict[str, SymbolRules] = {}
+        filters_by_symbol: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for sdef in data.get("symbols") or []:
+            sym = sdef.get("symbol")
+            if not sym:
+                continue
+            filters = {f["filterType"]: f for f in sdef.get("filters", [])}
+            filters_by_symbol[sym] = filters
+            rules[sym] = _rules_from_filters(sym, filters, quote=str(sdef.get("quoteAsset", "USDT")))
+        with self._lock:
+            self._rules.update(rules)
+            self._filters.update(filters_by_symbol)
+            self.loaded_at = loaded_at
+        return len(rules)
+
+    def use_client(self, client: Any) -> None:
+        """Toplu yüklemeyi python-binance client üzerinden yap (emir ortamıyla aynı kaynak)."""
+        self._fetcher = lambda symbols=None: client.get_exchange_info()
+        self._symbol_fetcher = lambda symbol: {"symbols": [client.get_symbol_info(symbol) or {}]}
+        source = _client_source(client)
+        with self._lock:
+            if source != self.source:
+                # Ortam değişti: önceki kaynağın kuralları geçersiz
+                self._rules.clear()
+                self._filters.clear()
+                self.loaded_at = 0.0
+            self.source = source
+
+    def add_symbol_info(self, sdef: Optional[Dict[str, Any]]) -> Optional[SymbolRules]:
+        """Tek bir exchangeInfo sembol tanımını (get_symbol_info çıktısı) kayda ekle."""
+        if not sdef or not sdef.get("symbol"):
+            return None
+        with self._lock:
+            loaded_at = self.loaded_at
+        self._ingest({"symbols": [sdef]}, loaded_at or self._clock())
+        return self.get(sdef["symbol"])
+
+    def load_symbol(self, symbol: str) -> Optional[SymbolRules]:
+        """Kayıtta yoksa sembolün kuralını tek istekle yükle (soğuk kayıt); başarısızsa None."""
+        with self._lock:
+            if symbol in self._rules:
+                return self._rules[symbol]
+            now = self._clock()
+            if now - self._symbol_attempts.get(symbol, float("-inf")) < self.retry_sec:
+                return None
+            self._symbol_attempts[symbol] = now
+        try:
+            data = self._symbol_fetcher(symbol)
+        except Exception:
+            return None
+        sdef = next((d for d in data.get("symbols") or [] if d.get("symbol") == symbol), None)
+        return self.add_symbol_info(sdef)
+
+    def preload(self, symbols: Optional[Iterable[str]] = None) -> bool:
+        """Toplu exchangeInfo çek, belleğe al ve snapshot yaz. Hata halinde False."""
+        if symbols is not None:
+            self._symbols = list(symbols)
+        try:
+            data = self._fetcher(self._symbols) if self._symbols else self._fetcher()
+        except Exception:
+            return False
+        if not self._ingest(data, self._clock()):
+            return False
+        self.save_snapshot()
+        return True
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            if snap.get("source") != self.source:
+                return False
+            symbols = [{"symbol": sym, "quoteAsset": snap["rules"].get(sym, {}).get("quote", "USDT"),
+                        "filters": list(filters.values())}
+                       for sym, filters in snap.get("filters", {}).items()]
+            return self._ingest({"symbols": symbols}, float(snap.get("loaded_at", 0.0))) > 0
+        except Exception:
+            return False
+
+    def save_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            snap = {
+                "source": self.source,
+                "loaded_at": self.loaded_at,
+                "rules": {sym: asdict(r) for sym, r in self._rules.items()},
+                "filters": dict(self._filters),
+            }
         try:
-            with urllib.request.urlopen(url, timeout=5) as resp:  # nosec - controlled URL
-                data = json.loads(resp.read().decode("utf-8"))
-            symbols = data.get("symbols") or []
-            if symbols:
-                sdef = symbols[0]
-                filters = {f["filterType"]: f for f in sdef.get("filters", [])}
-                tick = float(filters.get("PRICE_FILTER", {}).get("tickSize", 0.0001))
-                step = float(filters.get("LOT_SIZE", {}).get("stepSize", 0.0001))
-                min_notional = float(
-                    filters.get("NOTIONAL", {}).get("minNotional")
-                    or filters.get("MIN_NOTIONAL", {}).get("minNotional")
-                    or 5.0
-                )
-                return SymbolRules(symbol=symbol, tick_size=tick, step_size=step, min_notional_usdt=min_notional, quote="USDT")
+            d = os.path.dirname(self.snapshot_path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = f"{self.snapshot_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snap, f)
+            os.replace(tmp, self.snapshot_path)
         except Exception:
             pass
+
+    def warm_start(self, symbols: Optional[Iterable[str]] = None, block: bool = True) -> bool:
+        """Snapshot'tan yükle; yoksa/bayatsa toplu yükle (block=False ise arka planda)."""
+        if symbols is not None:
+            self._symbols = list(symbols)
+        have = self.load_snapshot()
+        if have and not self.is_expired():
+            return True
+        if block and not have:
+            return self.preload()
+        self.refresh_async()
+        return have
+
+    # ----------------------
+    # Tazelik
+    # ----------------------
+    def is_expired(self) -> bool:
+        return (self._clock() - self.loaded_at) >= self.ttl_sec
+
+    def refresh_async(self) -> None:
+        """Tek bir arka plan yenilemesi başlat (zaten çalışıyorsa / yeni denendiyse açmaz)."""
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            now = self._clock()
+            if now - self._last_attempt < self.retry_sec:
+                return
+            self._last_attempt = now
+            self._refreshing = threading.Thread(target=self.preload, name="rules-refresh", daemon=True)
+            self._refreshing.start()
+
+    # ----------------------
+    # Okuma (ağsız)
+    # ----------------------
+    def get(self, symbol: str) -> Optional[SymbolRules]:
+        if self.loaded_at and self.is_expired():
+            self.refresh_async()
+        with self._lock:
+            return self._rules.get(symbol)
+
+    def get_filters(self, symbol: str) -> Dict[str, Dict[str, Any]]:
+        if self.loaded_at and self.is_expired():
+            self.refresh_async()
+        with self._lock:
+            return dict(self._filters.get(symbol, {}))
+
+    def __contains__(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol in self._rules
+
+
+# Süreç genelinde tek kayıt
+RULES = RulesRegistry()
+
+
+def symbol_filters(symbol: str, client: Any = None) -> Dict[str, Dict[str, Any]]:
+    """
+    LOT_SIZE / PRICE_FILTER / (MIN_)NOTIONAL filtreleri, sembole göre indeksli.
+    Kayıtta yoksa ve client verildiyse tek seferlik get_symbol_info ile doldurulur.
+    """
+    filters = RULES.get_filters(symbol)
+    if filters or client is None:
+        return filters
+    RULES.add_symbol_info(client.get_symbol_info(symbol))
+    return RULES.get_filters(symbol)
+
+
+def _env_fallback_rules(symbol: str) -> SymbolRules:
     return SymbolRules(
         symbol=symbol,
         tick_size=float(os.getenv("DEFAULT_TICK_SIZE", 0.0001)),
@@ -86,3 +308,24 @@ def load_rules_for_symbol(symbol: str) -> SymbolRules:
         min_notional_usdt=float(os.getenv("DEFAULT_MIN_NOTIONAL_USDT", 5.0)),
         quote="USDT"
     )
+
+
+def load_rules_for_symbol(symbol: str) -> SymbolRules:
+    """
+    Önce opsiyonel exchange_info modülünü dener, sonra RULES kaydını (ağsız). Kayıtta sembol yoksa
+    tek, zaman aşımlı exchangeInfo isteğiyle yüklenir (sembol başına retry_sec içinde bir kez);
+    o da başarısızsa arka planda toplu yükleme tetiklenir ve ENV fallback döner.
+    ENV fallback:
+      DEFAULT_TICK_SIZE, DEFAULT_STEP_SIZE, DEFAULT_MIN_NOTIONAL_USDT
+    """
+    if USE_EXCHANGE_INFO:
+        # 1) Modül sağlayıcısı
+        r = _load_from_modules(symbol)
+        if r:
+            return r
+        # 2) Önbellekli kayıt (toplu exchangeInfo); soğuk kayıtta sembol başına tek istek
+        r = RULES.get(symbol) or RULES.load_symbol(symbol)
+        if r:
+            return r
+        RULES.refresh_async()
+    return _env_fallback_rules(symbol)
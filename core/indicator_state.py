@@ -0,0 +1,548 @@
+"""Artımlı (bar başına O(1)) indikatörler ve (symbol, interval) başına indikatör durumu.
+
+Her sınıf iki işlem sunar:
+    update(x) -> kapanmış barı işler (kalıcı), güncel değeri döner
+    peek(x)   -> x eklenseydi değer ne olurdu (durumu değiştirmez; açık bar için)
+
+Değerler `technical_analysis` / `utils.signal_utils` toplu fonksiyonlarının aynı seri
+üzerindeki son değeriyle eşleşir (bkz. tests/test_indicator_state.py). Fark yalnızca
+tohumlama noktasıdır: toplu fonksiyon verilen pencerenin başından, durum ise ilk
+beslendiği bardan başlar.
+
+Kullanım:
+    snap = INDICATORS.feed("SOLUSDT", "15m", klines_15m)
+    snap["ema20"], snap["adx14"], snap["bb_width"]
+"""
+from __future__ import annotations
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from core.kline_cache import INTERVAL_MS
+
+
+def _rsi_from(avg_gain: float, avg_loss: float) -> float:
+    rs = avg_gain / avg_loss if avg_loss != 0 else 0
+    return 100 - (100 / (1 + rs))
+
+
+class Ema:
+    """İlk değer ilk `period` değerin ortalaması, sonra x*k + ema*(1-k)."""
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.k = 2 / (self.period + 1)
+        self.count = 0
+        self._sum = 0.0
+        self.value: Optional[float] = None
+
+    def _next(self, x: float) -> Tuple[float, Optional[float]]:
+        if self.value is not None:
+            return self._sum, x * self.k + self.value * (1 - self.k)
+        s = self._sum + x
+        return s, (s / self.period if self.count + 1 == self.period else None)
+
+    def update(self, x: float) -> Optional[float]:
+        self._sum, self.value = self._next(float(x))
+        self.count += 1
+        return self.value
+
+    def peek(self, x: float) -> Optional[float]:
+        return self._next(float(x))[1]
+
+
+class WilderSmoother:
+    """İlk değer ilk p değerin toplamı, sonra y - y/p + v (technical_analysis.calculate_adx)."""
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.count = 0
+        self._seed = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, v: float) -> Optional[float]:
+        self.count += 1
+        if self.value is None:
+            self._seed += v
+            if self.count == self.period:
+                self.value = self._seed
+            return self.value
+        self.value = self.value - (self.value / self.period) + v
+        return self.value
+
+    def peek(self, v: float) -> Optional[float]:
+        if self.value is None:
+            return self._seed + v if self.count + 1 == self.period else None
+        return self.value - (self.value / self.period) + v
+
+
+class WilderRsi:
+    """Wilder RSI: ilk `period` değişimin ortalamasıyla tohumlanır, sonra (avg*(p-1)+x)/p."""
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._prev: Optional[float] = None
+        self._n = 0
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value: Optional[float] = None
+
+    def _next(self, x: float) -> Tuple[float, float, Optional[float]]:
+        d = x - self._prev
+        g, lo = (d if d > 0 else 0.0), (-d if d < 0 else 0.0)
+        p = self.period
+        if self._n < p:
+            gain, loss = self._gain + g, self._loss + lo
+            if self._n + 1 == p:
+                gain, loss = gain / p, loss / p
+                return gain, loss, _rsi_from(gain, loss)
+            return gain, loss, None
+        gain = (self._gain * (p - 1) + g) / p
+        loss = (self._loss * (p - 1) + lo) / p
+        return gain, loss, _rsi_from(gain, loss)
+
+    def update(self, x: float) -> Optional[float]:
+        x = float(x)
+        if self._prev is not None:
+            self._gain, self._loss, self.value = self._next(x)
+            self._n += 1
+        self._prev = x
+        return self.value
+
+    def peek(self, x: float) -> Optional[float]:
+        if self._prev is None:
+            return None
+        return self._next(float(x))[2]
+
+
+class _Window:
+    """Sabit uzunlukta pencere + kayan toplam; kayma hatası için `period` adımda bir yeniden toplanır."""
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.items: Deque[float] = deque(maxlen=self.period)
+        self.total = 0.0
+        self._since = 0
+
+    def push(self, v: float) -> None:
+        if len(self.items) == self.period:
+            self.total -= self.items[0]
+        self.items.append(v)
+        self.total += v
+        self._since += 1
+        if self._since >= self.period:
+            self.total = sum(self.items)
+            self._since = 0
+
+    def total_with(self, v: float) -> float:
+        """v eklenseydi pencere toplamı."""
+        drop = self.items[0] if len(self.items) == self.period else 0.0
+        return self.total - drop + v
+
+    def full_with_one_more(self) -> bool:
+        return len(self.items) >= self.period - 1
+
+
+class AtrWindow:
+    """Son `period` true range'in basit ortalaması (technical_analysis.calculate_atr)."""
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._prev_close: Optional[float] = None
+        self._trs = _Window(self.period)
+        self.value: Optional[float] = None
+
+    def _tr(self, high: float, low: float) -> float:
+        c0 = self._prev_close
+        return max(high - low, abs(high - c0), abs(low - c0))
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._prev_close is not None:
+            self._trs.push(self._tr(float(high), float(low)))
+            if len(self._trs.items) == self.period:
+                self.value = self._trs.total / self.period
+        self._prev_close = float(close)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._prev_close is None or not self._trs.full_with_one_more():
+            return None
+        return self._trs.total_with(self._tr(float(high), float(low))) / self.period
+
+
+class Adx:
+    """Wilder ADX (technical_analysis.calculate_adx ile aynı ölçek: smoothed DX / period)."""
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._prev: Optional[Tuple[float, float, float]] = None
+        self._tr = WilderSmoother(period)
+        self._pdm = WilderSmoother(period)
+        self._mdm = WilderSmoother(period)
+        self._dx = WilderSmoother(period)
+        self.value: Optional[float] = None
+
+    def _parts(self, high: float, low: float) -> Tuple[float, float, float]:
+        ph, pl, pc = self._prev
+        tr = max(high - low, abs(high - pc), abs(low - pc))
+        up, down = high - ph, pl - low
+        pdm = up if (up > down and up > 0) else 0.0
+        mdm = down if (down > up and down > 0) else 0.0
+        return tr, pdm, mdm
+
+    @staticmethod
+    def _dx_of(trn: float, pdm: float, mdm: float) -> float:
+        di_p = 100 * (pdm / trn) if trn else 0.0
+        di_m = 100 * (mdm / trn) if trn else 0.0
+        return 100 * (abs(di_p - di_m) / (di_p + di_m)) if (di_p + di_m) else 0.0
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        high, low, close = float(high), float(low), float(close)
+        if self._prev is not None:
+            tr, pdm, mdm = self._parts(high, low)
+            trn = self._tr.update(tr)
+            pn = self._pdm.update(pdm)
+            mn = self._mdm.update(mdm)
+            if trn is not None:
+                adx = self._dx.update(self._dx_of(trn, pn, mn))
+                if adx is not None:
+                    self.value = adx / self.period
+        self._prev = (high, low, close)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._prev is None:
+            return None
+        tr, pdm, mdm = self._parts(float(high), float(low))
+        trn = self._tr.peek(tr)
+        if trn is None:
+            return None
+        adx = self._dx.peek(self._dx_of(trn, self._pdm.peek(pdm), self._mdm.peek(mdm)))
+        return adx / self.period if adx is not None else None
+
+
+class RollingMeanVar:
+    """
+    Kayan pencere ortalama / popülasyon varyansı (Bollinger için).
+    Kareler bir kaydırma değerine göre tutulur (büyük fiyatlarda sayısal iptali önler);
+    kaydırma ve toplamlar `period` adımda bir pencereden yeniden hesaplanır.
+    """
+
+    def __init__(self, period: int = 20):
+        self.period = int(period)
+        self.items: Deque[float] = deque(maxlen=self.period)
+        self._shift = 0.0
+        self._s = 0.0
+        self._ss = 0.0
+        self._since = 0
+
+    def _rebase(self) -> None:
+        n = len(self.items)
+        self._shift = sum(self.items) / n if n else 0.0
+        self._s = sum(x - self._shift for x in self.items)
+        self._ss = sum((x - self._shift) ** 2 for x in self.items)
+        self._since = 0
+
+    def update(self, x: float) -> Optional[Tuple[float, float]]:
+        x = float(x)
+        if not self.items:
+            self._shift = x
+        if len(self.items) == self.period:
+            old = self.items[0] - self._shift
+            self._s -= old
+            self._ss -= old * old
+        self.items.append(x)
+        d = x - self._shift
+        self._s += d
+        self._ss += d * d
+        self._since += 1
+        if self._since >= self.period:
+            self._rebase()
+        return self.mean_var()
+
+    def _stats(self, s: float, ss: float) -> Tuple[float, float]:
+        n = self.period
+        m = s / n
+        return self._shift + m, max(ss / n - m * m, 0.0)
+
+    def mean_var(self) -> Optional[Tuple[float, float]]:
+        if len(self.items) < self.period:
+            return None
+        return self._stats(self._s, self._ss)
+
+    def peek(self, x: float) -> Optional[Tuple[float, float]]:
+        if len(self.items) < self.period - 1:
+            return None
+        d = float(x) - self._shift
+        s, ss = self._s + d, self._ss + d * d
+        if len(self.items) == self.period:
+            old = self.items[0] - self._shift
+            s -= old
+            ss -= old * old
+        return self._stats(s, ss)
+
+
+def bands(mv: Optional[Tuple[float, float]], mult: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    if mv is None:
+        return None, None, None
+    mid, var = mv
+    std = var ** 0.5
+    return mid, mid + mult * std, mid - mult * std
+
+
+class RollingQuantile:
+    """
+    Kayan pencerede q-yüzdelik (sıralı pencere + bisect). Konum ve okuma O(log n);
+    ekleme/çıkarma liste kaydırması (küçük pencerelerde ihmal edilebilir).
+
+    Sıra kuralı playbook ile aynı: sorted(w)[max(0, int(len(w) * q) - 1)].
+    Diğer yüzdelik filtreleri için de kullanılabilir.
+    """
+
+    def __init__(self, window: int, q: float):
+        self.window = int(window)
+        self.q = float(q)
+        self._fifo: Deque[float] = deque()
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def rank(self, n: int) -> int:
+        return max(0, int(n * self.q) - 1)
+
+    def update(self, x: float) -> Optional[float]:
+        x = float(x)
+        if len(self._fifo) == self.window:
+            old = self._fifo.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+        self._fifo.append(x)
+        insort(self._sorted, x)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self._sorted:
+            return None
+        return self._sorted[self.rank(len(self._sorted))]
+
+    def peek(self, x: float) -> Optional[float]:
+        """x eklenseydi (pencere doluysa en eski düşerek) yüzdelik; liste değişmez."""
+        x = float(x)
+        s = self._sorted
+        drop = len(self._fifo) == self.window
+        io = bisect_left(s, self._fifo[0]) if drop else len(s)
+        n = len(s) - (1 if drop else 0) + 1
+        k = self.rank(n)
+        # s' = s'den io çıkarılmış dizi; x, s' içinde ix konumuna girer
+        ix = bisect_left(s, x)
+        if drop and io < ix:
+            ix -= 1
+        if k == ix:
+            return x
+        j = k if k < ix else k - 1          # s' içindeki sıra
+        return s[j] if (not drop or j < io) else s[j + 1]
+
+
+def _width(bb: Tuple[Optional[float], Optional[float], Optional[float]]) -> Optional[float]:
+    mid, up, low = bb
+    return (up - low) / mid if mid else None
+
+
+class RollingVwap:
+    """Son `lookback` barın sum(close*volume)/sum(volume) değeri (technical_analysis.calculate_vwap)."""
+
+    def __init__(self, lookback: int = 50):
+        self.lookback = int(lookback)
+        self._pv = _Window(self.lookback)
+        self._v = _Window(self.lookback)
+
+    @staticmethod
+    def _ratio(pv: float, v: float) -> Optional[float]:
+        return pv / v if v > 0 else None
+
+    def update(self, close: float, volume: float) -> Optional[float]:
+        c, v = float(close), float(volume)
+        self._pv.push(c * v)
+        self._v.push(v)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self._v.items:
+            return None
+        return self._ratio(self._pv.total, self._v.total)
+
+    def peek(self, close: float, volume: float) -> Optional[float]:
+        c, v = float(close), float(volume)
+        return self._ratio(self._pv.total_with(c * v), self._v.total_with(v))
+
+
+# ----------------------
+# (symbol, interval) durumu
+# ----------------------
+DEFAULT_SPEC: Dict[str, Any] = {
+    "ema": (9, 20, 21, 50),
+    "rsi": (9, 14),
+    "atr": 14,
+    "adx": 14,
+    "bb": (20, 2.0),
+    "vwap": 50,
+    # Bollinger genişliğinin kayan yüzdeliği: (pencere (genişlik sayısı), q) -> bb_squeeze_thr
+    # 181 = 200 barlık pencerede BB(20) genişlik sayısı (playbook.bb_squeeze_breakout_signal)
+    "squeeze": (181, 0.2),
+}
+# Seri olarak tutulan son değer sayısı (örn. rsi9_series)
+HISTORY = 5
+
+
+class IndicatorState:
+    """
+    Bir (symbol, interval) için artımlı indikatörler.
+
+    `feed(rows)` kline satırlarını ([open_time, o, h, l, c, v, ...]) alır: son satır açık bar
+    sayılır ve yalnızca peek edilir, öncekilerden henüz işlenmemiş olanlar kalıcı olarak
+    işlenir. Seri kopuksa (eksik bar) durum sıfırlanıp verilen satırlardan yeniden kurulur.
+    """
+
+    def __init__(self, interval: Optional[str] = None, spec: Optional[Dict[str, Any]] = None):
+        self.interval = interval
+        self.spec = dict(DEFAULT_SPEC if spec is None else spec)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        sp = self.spec
+        self.emas = {p: Ema(p) for p in sp.get("ema", ())}
+        self.rsis = {p: WilderRsi(p) for p in sp.get("rsi", ())}
+        self.atr = AtrWindow(sp["atr"]) if sp.get("atr") else None
+        self.adx = Adx(sp["adx"]) if sp.get("adx") else None
+        bb = sp.get("bb")
+        self.bb = RollingMeanVar(bb[0]) if bb else None
+        self.bb_mult = float(bb[1]) if bb else 2.0
+        self.vwap = RollingVwap(sp["vwap"]) if sp.get("vwap") else None
+        sq = sp.get("squeeze") if bb else None
+        self.squeeze = RollingQuantile(sq[0], sq[1]) if sq else None
+        self.history: Dict[str, Deque[Optional[float]]] = {f"rsi{p}": deque(maxlen=HISTORY) for p in self.rsis}
+        self.last_closed_ms: Optional[int] = None
+        self.bars = 0
+        self._open: Optional[Sequence[Any]] = None
+
+    # ----------------------
+    # Besleme
+    # ----------------------
+    def _step_ms(self, rows: Sequence[Sequence[Any]]) -> Optional[int]:
+        step = INTERVAL_MS.get(self.interval or "")
+        if step:
+            return step
+        if len(rows) >= 2:
+            return int(rows[1][0]) - int(rows[0][0])
+        return None
+
+    def _commit(self, row: Sequence[Any]) -> None:
+        h, lo, c, v = float(row[2]), float(row[3]), float(row[4]), float(row[5])
+        for e in self.emas.values():
+            e.update(c)
+        for p, r in self.rsis.items():
+            self.history[f"rsi{p}"].append(r.update(c))
+        if self.atr:
+            self.atr.update(h, lo, c)
+        if self.adx:
+            self.adx.update(h, lo, c)
+        if self.bb:
+            width = _width(bands(self.bb.update(c), self.bb_mult))
+            if self.squeeze is not None and width is not None:
+                self.squeeze.update(width)
+        if self.vwap:
+            self.vwap.update(c, v)
+        self.last_closed_ms = int(row[0])
+        self.bars += 1
+
+    def feed(self, rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+        with self._lock:
+            if not rows:
+                return self._snapshot()
+            last = self.last_closed_ms
+            if last is not None:
+                step = self._step_ms(rows)
+                first = int(rows[0][0])
+                # Verilen satırlar işlenmiş seriye bağlanmıyorsa (boşluk / geriye gidiş) baştan kur
+                connected = first <= last + (step or 0) and int(rows[-1][0]) >= last
+                if not connected:
+                    self.reset()
+                    last = None
+            for row in rows[:-1]:
+                if last is None or int(row[0]) > last:
+                    self._commit(row)
+                    last = self.last_closed_ms
+            tail = rows[-1]
+            self._open = tail if (last is None or int(tail[0]) > last) else None
+            return self._snapshot()
+
+    # ----------------------
+    # Okuma
+    # ----------------------
+    def _snapshot(self) -> Dict[str, Any]:
+        row = self._open
+        out: Dict[str, Any] = {"bars": self.bars + (1 if row is not None else 0)}
+        if row is not None:
+            h, lo, c, v = float(row[2]), float(row[3]), float(row[4]), float(row[5])
+            out["close"] = c
+        for p, e in self.emas.items():
+            out[f"ema{p}"] = e.peek(c) if row is not None else e.value
+        for p, r in self.rsis.items():
+            key = f"rsi{p}"
+            series: List[Optional[float]] = list(self.history[key])
+            if row is not None:
+                series.append(r.peek(c))
+            out[key] = series[-1] if series else None
+            out[f"{key}_series"] = series
+        if self.atr:
+            out[f"atr{self.atr.period}"] = self.atr.peek(h, lo, c) if row is not None else self.atr.value
+        if self.adx:
+            out[f"adx{self.adx.period}"] = self.adx.peek(h, lo, c) if row is not None else self.adx.value
+        if self.bb:
+            bb = bands(self.bb.peek(c) if row is not None else self.bb.mean_var(), self.bb_mult)
+            width = _width(bb)
+            out.update(bb_mid=bb[0], bb_upper=bb[1], bb_lower=bb[2], bb_width=width)
+            if self.squeeze is not None:
+                if row is not None and width is not None:
+                    out["bb_squeeze_thr"] = self.squeeze.peek(width)
+                else:
+                    out["bb_squeeze_thr"] = self.squeeze.value
+        if self.vwap:
+            out[f"vwap{self.vwap.lookback}"] = self.vwap.peek(c, v) if row is not None else self.vwap.value
+        return out
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot()
+
+
+class IndicatorRegistry:
+    """(symbol, interval) -> IndicatorState."""
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        self.spec = spec
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, interval: str) -> IndicatorState:
+        key = (symbol, interval)
+        with self._lock:
+            st = self._states.get(key)
+            if st is None:
+                st = self._states[key] = IndicatorState(interval, self.spec)
+            return st
+
+    def feed(self, symbol: str, interval: str, rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+        return self.get(symbol, interval).feed(rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+# Süreç genelinde paylaşılan kayıt
+INDICATORS = IndicatorRegistry()
@@ -0,0 +1,158 @@
+"""Tur bazlı kline önbelleği.
+
+Ana döngünün bir turunda aynı (symbol, interval) için birden çok `get_klines`
+çağrısı yapılıyor (limit=5/10/200 ...). Bu modül her anahtar için en geniş
+pencereyi bir kez çeker, küçük pencereleri bellekten döndürür ve yeni turda /
+bar kapanınca yalnızca eksik barları `startTime` ile artımlı olarak tamamlar.
+
+Kullanım:
+    data_client = KlineCache(client, windows={"1m": 200, "15m": 100})
+    data_client.new_cycle()                     # her tur başında
+    data_client.get_klines(symbol="SOLUSDT", interval="1m", limit=5)
+    data_client.get_bars(symbol="SOLUSDT", interval="1m", limit=10)  # sütunsal görünüm (core/bars.py)
+    data_client.get_order_book(symbol="SOLUSDT")  # diğer çağrılar client'a aynen geçer
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.bars import Bars
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+_MIN = 60_000
+INTERVAL_MS: Dict[str, int] = {
+    "1m": _MIN, "3m": 3 * _MIN, "5m": 5 * _MIN, "15m": 15 * _MIN, "30m": 30 * _MIN,
+    "1h": 60 * _MIN, "2h": 120 * _MIN, "4h": 240 * _MIN, "6h": 360 * _MIN,
+    "8h": 480 * _MIN, "12h": 720 * _MIN, "1d": 1440 * _MIN, "3d": 3 * 1440 * _MIN,
+    "1w": 7 * 1440 * _MIN,
+}
+
+# Binance tek istekte en fazla 1000 kline döndürür
+MAX_KLINES_PER_REQUEST = 1000
+KLINE_CACHE_MAX_ROWS = _int_env("KLINE_CACHE_MAX_ROWS", MAX_KLINES_PER_REQUEST)
+
+
+@dataclass
+class _Entry:
+    rows: List[list] = field(default_factory=list)
+    cycle: int = -1
+    complete: bool = False   # borsa istenenden az döndürdüyse geçmişin tamamı elimizde
+    bars: Optional[Bars] = None  # rows'un ayrıştırılmış hali; ilk get_bars'ta
+
+
+class KlineCache:
+    """
+    Client sarmalayıcı: `get_klines` önbellekli, diğer tüm metotlar client'a iletilir.
+    Veri geçerliliği: aynı tur içinde ve son barın kapanış zamanı geçmemişse bellekten.
+    """
+
+    def __init__(self, client: Any, windows: Optional[Dict[str, int]] = None,
+                 max_rows: int = KLINE_CACHE_MAX_ROWS, clock: Callable[[], float] = time.time):
+        self.client = client
+        self.windows: Dict[str, int] = dict(windows or {})
+        self.max_rows = int(max_rows)
+        self._clock = clock
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._widest: Dict[Tuple[str, str], int] = {}
+        self._cycle = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "rest_full": 0, "rest_incremental": 0}
+
+    def __getattr__(self, name: str) -> Any:
+        # get_ticker, get_order_book vb. doğrudan client'a
+        return getattr(self.client, name)
+
+    # ----------------------
+    # Tur yönetimi
+    # ----------------------
+    def new_cycle(self) -> None:
+        """Yeni döngü turu: bir sonraki erişimde açık bar artımlı olarak tazelenir."""
+        with self._lock:
+            self._cycle += 1
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == symbol]:
+                    self._entries.pop(key, None)
+
+    # ----------------------
+    # Okuma
+    # ----------------------
+    def get_klines(self, symbol: str, interval: str, limit: int = 500, **kwargs: Any) -> List[list]:
+        if kwargs or interval not in INTERVAL_MS:
+            # startTime/endTime gibi özel sorgular önbelleğe alınmaz
+            return self.client.get_klines(symbol=symbol, interval=interval, limit=limit, **kwargs)
+
+        key = (symbol, interval)
+        limit = int(limit)
+        with self._lock:
+            window = self._window_for(key, limit)
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry, interval) and self._covers(entry, limit):
+                self.stats["hits"] += 1
+                return entry.rows[-limit:]
+            entry = self._refresh(symbol, interval, entry, window)
+            self._entries[key] = entry
+            return entry.rows[-limit:]
+
+    def get_bars(self, symbol: str, interval: str, limit: int = 500) -> Bars:
+        """get_klines ile aynı pencere; girdi başına bir kez ayrıştırılır, dilimler görünümdür."""
+        rows = self.get_klines(symbol=symbol, interval=interval, limit=limit)
+        with self._lock:
+            entry = self._entries.get((symbol, interval))
+            if entry is None or not rows or not entry.rows or entry.rows[-1] is not rows[-1]:
+                return Bars.from_klines(rows)
+            if entry.bars is None:
+                entry.bars = Bars.from_klines(entry.rows)
+            return entry.bars[-len(rows):]
+
+    def _window_for(self, key: Tuple[str, str], limit: int) -> int:
+        widest = max(limit, self._widest.get(key, 0), int(self.windows.get(key[1], 0)))
+        widest = min(widest, self.max_rows)
+        self._widest[key] = widest
+        return widest
+
+    def _is_fresh(self, entry: _Entry, interval: str) -> bool:
+        if entry.cycle != self._cycle or not entry.rows:
+            return False
+        last_open = int(entry.rows[-1][0])
+        return self._clock() * 1000 < last_open + INTERVAL_MS[interval]
+
+    @staticmethod
+    def _covers(entry: _Entry, limit: int) -> bool:
+        return entry.complete or len(entry.rows) >= limit
+
+    def _refresh(self, symbol: str, interval: str, entry: Optional[_Entry], window: int) -> _Entry:
+        if entry is not None and entry.rows and self._covers(entry, window):
+            last_open = int(entry.rows[-1][0])
+            missing = int((self._clock() * 1000 - last_open) // INTERVAL_MS[interval]) + 1
+            if 0 < missing < min(window, MAX_KLINES_PER_REQUEST):
+                # Açık (son) bar yeniden, sonrasında kapanan barlar eklenir
+                new_rows = self.client.get_klines(symbol=symbol, interval=interval,
+                                                  startTime=last_open, limit=missing + 1)
+                self.stats["rest_incremental"] += 1
+                rows = entry.rows
+                if new_rows:
+                    first_new = int(new_rows[0][0])
+                    rows = [r for r in rows if int(r[0]) < first_new] + list(new_rows)
+                return _Entry(rows=rows[-window:], cycle=self._cycle, complete=entry.complete)
+
+        rows = list(self.client.get_klines(symbol=symbol, interval=interval, limit=window) or [])
+        self.stats["rest_full"] += 1
+        return _Entry(rows=rows, cycle=self._cycle, complete=len(rows) < window)
+
+
+__all__ = ["KlineCache", "INTERVAL_MS", "MAX_KLINES_PER_REQUEST"]
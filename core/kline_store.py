@@ -0,0 +1,255 @@
+"""Yerel geçmiş kline deposu: sembol başına bellek eşlemli (memmap) sütun dosyaları.
+
+Her (interval, symbol) için alan başına bir ham ikili dosya tutulur:
+    {root}/{interval}/{SYMBOL}/open_time.i8      int64, ms, kesin artan
+    {root}/{interval}/{SYMBOL}/{open,high,low,close,volume}.f8   float64
+Dosyalar yalnızca sona eklenir (append-only); satır sayısı dosya boyutundan okunur, başlık /
+metadata yoktur. Ekleme sırasında yarıda kalan yazma (farklı uzunlukta sütunlar) bir sonraki
+eklemede en kısa sütuna kırpılarak onarılır; okuyucular zaten en kısa sütunu görür.
+
+Okuma kopyasızdır: `columns()` memmap dilimleri döner, zaman aralığı open_time üzerinde ikili
+aramayla (np.searchsorted) bulunur; yalnızca dokunulan sayfalar diskten okunur, yıllarca 1m
+veri RAM'e yüklenmez. `bars()` istenen aralığı motorların beklediği (N, 6) `Bars` matrisine
+bir kez kopyalar (yalnız o aralık). `price_data()` minimal_strategy'nin {symbol: [fiyat...]}
+girdisini adım (varsayılan gün) sonu kapanışlarından üretir.
+
+Kullanım:
+    store = KlineStore()
+    store.update(client, "SOLUSDT")                  # eksik kapanmış barlar get_klines(startTime) ile
+    cols = store.columns("SOLUSDT", start_ms, end_ms)   # {'open_time': memmap, 'close': memmap, ...}
+    bars = store.bars("SOLUSDT", start_ms, end_ms)      # Backtester / VectorBacktester girdisi
+
+Çalıştır:
+    python -m core.kline_store import SOLUSDT data/backtest/SOLUSDT_1m.csv
+    python -m core.kline_store update SOLUSDT
+"""
+from __future__ import annotations
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.bars import FIELDS, Bars
+from core.kline_cache import INTERVAL_MS, MAX_KLINES_PER_REQUEST
+from core.rate_limit import KLINES_WEIGHT, WeightBudget, default_budget
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+KLINE_STORE_DIR = os.getenv("KLINE_STORE_DIR", "data/klines")
+# Depo boşken update() kaç günlük geçmişten başlar
+KLINE_STORE_BACKFILL_DAYS = _int_env("KLINE_STORE_BACKFILL_DAYS", 365)
+
+_DTYPES = {name: np.dtype(np.int64) if name == "open_time" else np.dtype(np.float64) for name in FIELDS}
+_SUFFIX = {name: "i8" if name == "open_time" else "f8" for name in FIELDS}
+_DAY_MS = 86_400_000
+
+
+class KlineStore:
+    def __init__(self, root: str = KLINE_STORE_DIR, interval: str = "1m"):
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"KlineStore: bilinmeyen interval {interval}")
+        self.root = root
+        self.interval = interval
+        self.step_ms = INTERVAL_MS[interval]
+        self._maps: Dict[str, Tuple[int, Dict[str, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+
+    # ----------------------
+    # Dosya düzeni
+    # ----------------------
+    def _dir(self, symbol: str) -> str:
+        return os.path.join(self.root, self.interval, symbol.upper())
+
+    def _path(self, symbol: str, name: str) -> str:
+        return os.path.join(self._dir(symbol), f"{name}.{_SUFFIX[name]}")
+
+    def symbols(self) -> List[str]:
+        base = os.path.join(self.root, self.interval)
+        if not os.path.isdir(base):
+            return []
+        return sorted(s for s in os.listdir(base) if self.length(s) > 0)
+
+    def length(self, symbol: str) -> int:
+        """Tüm sütunlarda eksiksiz yazılmış satır sayısı."""
+        n = None
+        for name in FIELDS:
+            try:
+                rows = os.path.getsize(self._path(symbol, name)) // _DTYPES[name].itemsize
+            except OSError:
+                return 0
+            n = rows if n is None else min(n, rows)
+        return int(n or 0)
+
+    # ----------------------
+    # Okuma
+    # ----------------------
+    def _columns(self, symbol: str) -> Dict[str, np.ndarray]:
+        n = self.length(symbol)
+        with self._lock:
+            cached = self._maps.get(symbol.upper())
+            if cached is not None and cached[0] == n:
+                return cached[1]
+            if n == 0:
+                cols = {name: np.empty(0, dtype=_DTYPES[name]) for name in FIELDS}
+            else:
+                cols = {name: np.memmap(self._path(symbol, name), dtype=_DTYPES[name], mode="r", shape=(n,))
+                        for name in FIELDS}
+            self._maps[symbol.upper()] = (n, cols)
+            return cols
+
+    def last_open_time(self, symbol: str) -> Optional[int]:
+        t = self._columns(symbol)["open_time"]
+        return int(t[-1]) if t.shape[0] else None
+
+    def index_range(self, symbol: str, start_ms: Optional[int] = None,
+                    end_ms: Optional[int] = None) -> Tuple[int, int]:
+        """start_ms <= open_time < end_ms satırlarının [lo, hi) indeksleri (ikili arama)."""
+        t = self._columns(symbol)["open_time"]
+        lo = int(np.searchsorted(t, start_ms, side="left")) if start_ms is not None else 0
+        hi = int(np.searchsorted(t, end_ms, side="left")) if end_ms is not None else t.shape[0]
+        return lo, max(lo, hi)
+
+    def columns(self, symbol: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                fields: Sequence[str] = FIELDS) -> Dict[str, np.ndarray]:
+        """Alan -> salt okunur memmap dilimi (kopyasız)."""
+        cols = self._columns(symbol)
+        lo, hi = self.index_range(symbol, start_ms, end_ms)
+        return {name: cols[name][lo:hi] for name in fields}
+
+    def bars(self, symbol: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+             last: Optional[int] = None) -> Bars:
+        """Aralığın (N, 6) Bars matrisi; `last` verilirse aralığın son `last` barı. Yalnız bu aralık kopyalanır."""
+        lo, hi = self.index_range(symbol, start_ms, end_ms)
+        if last is not None:
+            lo = max(lo, hi - int(last))
+        cols = self._columns(symbol)
+        out = np.empty((hi - lo, len(FIELDS)), dtype=np.float64)
+        for j, name in enumerate(FIELDS):
+            out[:, j] = cols[name][lo:hi]
+        return Bars(out)
+
+    def price_data(self, symbols: Sequence[str], start_ms: Optional[int] = None,
+                   end_ms: Optional[int] = None, step_ms: int = _DAY_MS) -> Dict[str, np.ndarray]:
+        """{symbol: adım sonu kapanışları}; minimal_strategy simülasyon / optimize_parameters girdisi.
+
+        Adımlar step_ms'e hizalıdır (UTC gün başı); adımdaki son barın kapanışı alınır, barı
+        olmayan adımlar atlanır. Yalnız adım sınırları ikili aramayla okunur.
+        """
+        out: Dict[str, np.ndarray] = {}
+        for symbol in symbols:
+            cols = self.columns(symbol, start_ms, end_ms, fields=("open_time", "close"))
+            t, c = cols["open_time"], cols["close"]
+            if not t.shape[0]:
+                out[symbol] = np.empty(0)
+                continue
+            first = int(t[0]) - int(t[0]) % step_ms
+            edges = np.arange(first + step_ms, int(t[-1]) + step_ms + 1, step_ms, dtype=np.int64)
+            ends = np.searchsorted(t, edges, side="left")
+            starts = np.concatenate(([0], ends[:-1]))
+            out[symbol] = np.asarray(c[ends[ends > starts] - 1], dtype=np.float64)
+        return out
+
+    # ----------------------
+    # Yazma
+    # ----------------------
+    def _repair(self, symbol: str, n: int) -> None:
+        # Yarıda kalan ekleme: uzun sütunları ortak uzunluğa kırp
+        for name in FIELDS:
+            path = self._path(symbol, name)
+            size = n * _DTYPES[name].itemsize
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def append(self, symbol: str, klines: Any) -> int:
+        """Kapanmış barları ekle (REST satırları, OHLCV tuple'ları ya da Bars); eklenen satır sayısı.
+
+        Son kayıtlı open_time'dan eski / eşit barlar ve girdideki tekrarlar atlanır (geçmiş
+        değişmez). open_time en son yazılır: yarıda kalan ekleme okuyuculara görünmez.
+        """
+        a = Bars.from_klines(klines).values
+        if not a.shape[0]:
+            return 0
+        t = a[:, 0].astype(np.int64)
+        t, first = np.unique(t, return_index=True)     # sıralı, tekrarsız
+        a = a[first]
+        n = self.length(symbol)
+        last = self.last_open_time(symbol)
+        if last is not None:
+            keep = t > last
+            t, a = t[keep], a[keep]
+        if not t.shape[0]:
+            return 0
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        self._repair(symbol, n)
+        for j, name in reversed(list(enumerate(FIELDS))):
+            col = t if name == "open_time" else np.ascontiguousarray(a[:, j])
+            with open(self._path(symbol, name), "ab") as f:
+                f.write(col.astype(_DTYPES[name], copy=False).tobytes())
+        return int(t.shape[0])
+
+    def update(self, client: Any, symbol: str, start_ms: Optional[int] = None,
+               now_ms: Optional[int] = None, budget: Optional[WeightBudget] = None) -> int:
+        """Son kayıttan bu yana kapanmış barları get_klines(startTime=...) ile tamamla (artımlı).
+
+        Depo boşsa start_ms'ten (yoksa KLINE_STORE_BACKFILL_DAYS gün önceden) başlar; açık bar eklenmez.
+        """
+        now = int(time.time() * 1000) if now_ms is None else int(now_ms)
+        budget = budget or default_budget()
+        last = self.last_open_time(symbol)
+        if last is not None:
+            nxt = last + self.step_ms
+        elif start_ms is not None:
+            nxt = int(start_ms)
+        else:
+            nxt = now - KLINE_STORE_BACKFILL_DAYS * _DAY_MS
+        added = 0
+        while nxt + self.step_ms <= now:
+            budget.acquire(KLINES_WEIGHT)
+            rows = list(client.get_klines(symbol=symbol, interval=self.interval, startTime=nxt,
+                                          limit=MAX_KLINES_PER_REQUEST) or [])
+            closed = [r for r in rows if int(r[0]) + self.step_ms <= now]
+            if not closed:
+                break
+            added += self.append(symbol, closed)
+            nxt = int(closed[-1][0]) + self.step_ms
+            if len(rows) < MAX_KLINES_PER_REQUEST:
+                break
+        return added
+
+
+_DEFAULT: Optional[KlineStore] = None
+
+
+def default_store() -> KlineStore:
+    """KLINE_STORE_DIR altındaki 1m deposu (süreç genelinde tek örnek)."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = KlineStore()
+    return _DEFAULT
+
+
+__all__ = ["KlineStore", "default_store", "KLINE_STORE_DIR", "KLINE_STORE_BACKFILL_DAYS"]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == "import":
+        from backtest import load_klines
+        store = KlineStore()
+        print(f"{args[1]}: {store.append(args[1], load_klines(args[2]))} bars added, {store.length(args[1])} total")
+    elif len(args) >= 2 and args[0] == "update":
+        from binance.client import Client
+        store = KlineStore()
+        print(f"{args[1]}: {store.update(Client(), args[1])} bars added, {store.length(args[1])} total")
+    else:
+        print(__doc__)
@@ -0,0 +1,359 @@
+"""WebSocket market-data servisi.
+
+Binance combined stream (`/stream?streams=...`) üzerinden her sembol için
+kline, bookTicker, partial depth ve miniTicker akışlarına abone olur; veriyi
+bellekteki sembol bazlı ring buffer'larda tutar. Sınıf bir client sarmalayıcıdır:
+`get_klines`, `get_ticker`, `get_order_book`, `get_symbol_ticker`,
+`get_orderbook_ticker` akış tazeyse buffer'dan, değilse fallback (REST) client'tan
+döner. Diğer tüm çağrılar fallback client'a aynen geçer.
+
+Kullanım:
+    stream = MarketStream(TRADE_SYMBOL_LIST, fallback=KlineCache(client))
+    stream.start()
+    stream.get_klines(symbol="SOLUSDT", interval="1m", limit=200)
+    stream.stop()
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core.kline_cache import INTERVAL_MS
+from core.logger import logger
+
+try:  # websockets opsiyonel: yoksa her şey REST fallback ile çalışır
+    from websockets.sync.client import connect as _ws_connect
+except Exception:  # pragma: no cover
+    _ws_connect = None
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+MARKET_STREAM_ENABLED = _bool_env("MARKET_STREAM_ENABLED", True)
+MARKET_STREAM_URL = os.getenv("BINANCE_STREAM_URL", "wss://stream.binance.com:9443")
+MARKET_STREAM_BUFFER = _int_env("MARKET_STREAM_BUFFER", 1000)
+MARKET_STREAM_STALE_SEC = _float_env("MARKET_STREAM_STALE_SEC", 10.0)
+DEPTH_LEVELS = 20  # Binance partial depth: 5 / 10 / 20
+
+
+class MarketStream:
+    """
+    Akış verisi + REST fallback. Bir veri "taze" sayılır: son mesaj
+    `stale_sec` içinde geldiyse (kline için ayrıca son bar hâlâ açıksa).
+    """
+
+    def __init__(self, symbols: Iterable[str], fallback: Any = None,
+                 intervals: Iterable[str] = ("1m", "3m", "15m"),
+                 url: str = MARKET_STREAM_URL, buffer_size: int = MARKET_STREAM_BUFFER,
+                 stale_sec: float = MARKET_STREAM_STALE_SEC,
+                 clock: Callable[[], float] = time.time):
+        self.symbols = [s.upper() for s in symbols]
+        self.fallback = fallback
+        self.intervals = [i for i in intervals if i in INTERVAL_MS]
+        self.url = url.rstrip("/")
+        self.buffer_size = int(buffer_size)
+        self.stale_sec = float(stale_sec)
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._klines: Dict[Tuple[str, str], Deque[list]] = {}
+        self._kline_seen: Dict[Tuple[str, str], float] = {}
+        self._book: Dict[str, Tuple[float, dict]] = {}
+        self._depth: Dict[str, Tuple[float, dict]] = {}
+        self._ticker: Dict[str, Tuple[float, dict]] = {}
+        self._price: Dict[str, Tuple[float, str]] = {}
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self.connected = threading.Event()
+        self.stats: Dict[str, int] = {"messages": 0, "stream_hits": 0, "rest_fallbacks": 0, "connects": 0}
+
+    def __getattr__(self, name: str) -> Any:
+        # new_cycle, get_account, create_order vb. doğrudan fallback client'a
+        fallback = self.__dict__.get("fallback")
+        if fallback is None:
+            raise AttributeError(name)
+        return getattr(fallback, name)
+
+    # ----------------------
+    # Bağlantı
+    # ----------------------
+    def stream_names(self) -> List[str]:
+        names: List[str] = []
+        for sym in self.symbols:
+            s = sym.lower()
+            names += [f"{s}@kline_{i}" for i in self.intervals]
+            names += [f"{s}@bookTicker", f"{s}@depth{DEPTH_LEVELS}@100ms", f"{s}@miniTicker"]
+        return names
+
+    def stream_url(self) -> str:
+        return f"{self.url}/stream?streams={'/'.join(self.stream_names())}"
+
+    def start(self) -> bool:
+        if _ws_connect is None:
+            logger.warning("MarketStream: websockets paketi yok, REST fallback kullanılacak")
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="market-stream", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.connected.clear()
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with _ws_connect(self.stream_url(), open_timeout=10, max_size=2 ** 22) as ws:
+                    self._ws = ws
+                    self._on_connect()
+                    backoff = 1.0
+                    while not self._stop.is_set():
+                        try:
+                            raw = ws.recv(timeout=1.0)
+                        except TimeoutError:
+                            continue
+                        self.handle_message(raw)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"MarketStream bağlantı hatası: {e} (tekrar {backoff:.0f}s sonra)")
+            finally:
+                self._ws = None
+                self.connected.clear()
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _on_connect(self) -> None:
+        with self._lock:
+            self.stats["connects"] += 1
+            # Kopukluk sırasında kaçan barlar olabilir: kline buffer'ları REST'ten yeniden tohumlanır
+            self._klines.clear()
+            self._kline_seen.clear()
+        self.connected.set()
+
+    # ----------------------
+    # Mesaj işleme
+    # ----------------------
+    def handle_message(self, raw: Any) -> None:
+        try:
+            msg = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+            stream = str(msg.get("stream", ""))
+            data = msg.get("data") or {}
+        except Exception:
+            return
+        now = self._clock()
+        sym = stream.split("@", 1)[0].upper()
+        with self._lock:
+            self.stats["messages"] += 1
+            if "@kline_" in stream:
+                self._apply_kline(data.get("k") or {}, now)
+            elif stream.endswith("@bookTicker"):
+                self._book[sym] = (now, {
+                    "symbol": sym, "bidPrice": data.get("b"), "bidQty": data.get("B"),
+                    "askPrice": data.get("a"), "askQty": data.get("A"),
+                })
+            elif "@depth" in stream:
+                self._depth[sym] = (now, {
+                    "lastUpdateId": data.get("lastUpdateId"),
+                    "bids": data.get("bids") or [], "asks": data.get("asks") or [],
+                })
+            elif stream.endswith("@miniTicker"):
+                self._ticker[sym] = (now, {
+                    "symbol": sym, "lastPrice": data.get("c"), "openPrice": data.get("o"),
+                    "highPrice": data.get("h"), "lowPrice": data.get("l"),
+                    "volume": data.get("v"), "quoteVolume": data.get("q"),
+                })
+                self._price[sym] = (now, data.get("c"))
+
+    def _apply_kline(self, k: dict, now: float) -> None:
+        sym = str(k.get("s", "")).upper()
+        interval = k.get("i")
+        if not sym or interval not in INTERVAL_MS:
+            return
+        # REST get_klines satır biçimi
+        row = [int(k["t"]), k["o"], k["h"], k["l"], k["c"], k["v"], int(k["T"]),
+               k.get("q", "0"), int(k.get("n", 0)), k.get("V", "0"), k.get("Q", "0"), "0"]
+        key = (sym, interval)
+        buf = self._klines.get(key)
+        if buf is None:
+            buf = self._klines[key] = deque(maxlen=self.buffer_size)
+        if buf:
+            last_open = int(buf[-1][0])
+            if row[0] == last_open:
+                buf[-1] = row
+            elif row[0] == last_open + INTERVAL_MS[interval]:
+                buf.append(row)
+            elif row[0] > last_open:
+                # Boşluk: buffer sürekliliğini kaybetti, yeniden tohumlanacak
+                buf.clear()
+                buf.append(row)
+            else:
+                return
+        else:
+            buf.append(row)
+        self._kline_seen[key] = now
+        self._price[sym] = (now, k["c"])
+
+    # ----------------------
+    # Tazelik
+    # ----------------------
+    def _fresh(self, ts: Optional[float]) -> bool:
+        return ts is not None and (self._clock() - ts) <= self.stale_sec
+
+    def _kline_rows(self, symbol: str, interval: str, limit: int) -> Optional[List[list]]:
+        key = (symbol, interval)
+        buf = self._klines.get(key)
+        if not buf or len(buf) < limit or not self._fresh(self._kline_seen.get(key)):
+            return None
+        if self._clock() * 1000 >= int(buf[-1][0]) + INTERVAL_MS[interval]:
+            return None  # bar kapandı ama yeni bar mesajı gelmedi
+        return list(buf)[-limit:]
+
+    def _seed_klines(self, symbol: str, interval: str, rows: List[list]) -> List[list]:
+        """REST satırlarıyla buffer'ı tohumla; akıştan gelen daha yeni barlar korunur."""
+        key = (symbol, interval)
+        if not rows:
+            return rows
+        buf = self._klines.get(key)
+        merged = [list(r) for r in rows]
+        if buf:
+            last_rest = int(merged[-1][0])
+            newer = [r for r in buf if int(r[0]) >= last_rest]
+            if newer and int(newer[0][0]) == last_rest:
+                merged = merged[:-1] + newer
+            elif newer and int(newer[0][0]) == last_rest + INTERVAL_MS[interval]:
+                merged += newer
+        self._klines[key] = deque(merged, maxlen=self.buffer_size)
+        return merged
+
+    def _fallback_call(self, name: str, **kwargs: Any) -> Any:
+        if self.fallback is None:
+            raise RuntimeError(f"MarketStream: akış verisi yok ve fallback client tanımlı değil ({name})")
+        self.stats["rest_fallbacks"] += 1
+        return getattr(self.fallback, name)(**kwargs)
+
+    # ----------------------
+    # Client arayüzü
+    # ----------------------
+    def get_klines(self, symbol: str, interval: str, limit: int = 500, **kwargs: Any) -> List[list]:
+        sym = symbol.upper()
+        if kwargs or interval not in self.intervals or sym not in self.symbols:
+            return self._fallback_call("get_klines", symbol=symbol, interval=interval, limit=limit, **kwargs)
+        limit = int(limit)
+        with self._lock:
+            rows = self._kline_rows(sym, interval, limit)
+            if rows is not None:
+                self.stats["stream_hits"] += 1
+                return rows
+        rows = list(self._fallback_call("get_klines", symbol=symbol, interval=interval, limit=limit) or [])
+        if self.connected.is_set():
+            with self._lock:
+                rows = self._seed_klines(sym, interval, rows)[-limit:]
+        return rows
+
+    def _batch_from(self, store: Dict[str, Tuple[float, dict]], symbols_param: Optional[str]) -> Optional[List[dict]]:
+        """`symbols=[...]` toplu sorgusu: istenen sembollerin hepsi tazeyse buffer'dan."""
+        if not symbols_param:
+            return None
+        try:
+            wanted = [str(s).upper() for s in json.loads(symbols_param)]
+        except Exception:
+            return None
+        out: List[dict] = []
+        for sym in wanted:
+            ts, data = store.get(sym, (None, None))
+            if not self._fresh(ts):
+                return None
+            out.append(dict(data))
+        return out
+
+    def get_ticker(self, symbol: Optional[str] = None, **kwargs: Any) -> Any:
+        with self._lock:
+            if symbol is None:
+                rows = self._batch_from(self._ticker, kwargs.get("symbols")) if set(kwargs) == {"symbols"} else None
+                if rows is not None:
+                    self.stats["stream_hits"] += 1
+                    return rows
+            else:
+                ts, data = self._ticker.get(symbol.upper(), (None, None))
+                if not kwargs and self._fresh(ts):
+                    self.stats["stream_hits"] += 1
+                    return dict(data)
+        if symbol is not None:
+            kwargs["symbol"] = symbol
+        return self._fallback_call("get_ticker", **kwargs)
+
+    def get_orderbook_tickers(self, **kwargs: Any) -> Any:
+        with self._lock:
+            rows = self._batch_from(self._book, kwargs.get("symbols")) if set(kwargs) == {"symbols"} else None
+            if rows is not None:
+                self.stats["stream_hits"] += 1
+                return rows
+        return self._fallback_call("get_orderbook_tickers", **kwargs)
+
+    def get_symbol_ticker(self, symbol: str, **kwargs: Any) -> dict:
+        with self._lock:
+            ts, price = self._price.get(symbol.upper(), (None, None))
+            if not kwargs and self._fresh(ts):
+                self.stats["stream_hits"] += 1
+                return {"symbol": symbol.upper(), "price": price}
+        return self._fallback_call("get_symbol_ticker", symbol=symbol, **kwargs)
+
+    def get_orderbook_ticker(self, symbol: str, **kwargs: Any) -> dict:
+        with self._lock:
+            ts, data = self._book.get(symbol.upper(), (None, None))
+            if not kwargs and self._fresh(ts):
+                self.stats["stream_hits"] += 1
+                return dict(data)
+        return self._fallback_call("get_orderbook_ticker", symbol=symbol, **kwargs)
+
+    def get_order_book(self, symbol: str, limit: int = 100, **kwargs: Any) -> dict:
+        with self._lock:
+            ts, data = self._depth.get(symbol.upper(), (None, None))
+            if not kwargs and int(limit) <= DEPTH_LEVELS and self._fresh(ts):
+                self.stats["stream_hits"] += 1
+                return {
+                    "lastUpdateId": data["lastUpdateId"],
+                    "bids": list(data["bids"][:int(limit)]),
+                    "asks": list(data["asks"][:int(limit)]),
+                }
+        return self._fallback_call("get_order_book", symbol=symbol, limit=limit, **kwargs)
+
+
+__all__ = ["MarketStream", "MARKET_STREAM_ENABLED", "DEPTH_LEVELS"]
@@ -40,6 +40,10 @@ EXEC_LATENCY = Histogram(
     "order_execution_seconds", "Execution latency (seconds)",
     buckets=(0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10), registry=_REG
 )
+PRECHECK_FETCH = Histogram(
+    "precheck_fetch_seconds", "Pre-trade fetch latency by fetch (seconds)",
+    labelnames=("fetch",), buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1, 2, 5), registry=_REG
+)
 
 
 def start_metrics_server_if_enabled() -> None:
@@ -80,19 +84,27 @@ def observe_exec(seconds: float) -> None:
         pass
 
 
+def observe_precheck_fetch(fetch: str, seconds: float) -> None:
+    try:
+        PRECHECK_FETCH.labels(fetch=fetch).observe(seconds)
+    except Exception:
+        pass
+
+
 # Test yardımcıları
 def _generate_latest_text() -> str:
     return generate_latest(_REG).decode("utf-8")
 
 
 def _reset_for_tests() -> None:
-    global _REG, STARTED, ORDERS_TOTAL, REJECTIONS_TOTAL, EXCEPTIONS_TOTAL, EXEC_LATENCY
+    global _REG, STARTED, ORDERS_TOTAL, REJECTIONS_TOTAL, EXCEPTIONS_TOTAL, EXEC_LATENCY, PRECHECK_FETCH
     _REG = CollectorRegistry()
     STARTED = False
     ORDERS_TOTAL = Counter("orders_total", "", ("symbol", "side", "status"), registry=_REG)
     REJECTIONS_TOTAL = Counter("order_rejections_total", "", ("reason",), registry=_REG)
     EXCEPTIONS_TOTAL = Counter("exceptions_total", "", ("type",), registry=_REG)
     EXEC_LATENCY = Histogram("order_execution_seconds", "", registry=_REG)
+    PRECHECK_FETCH = Histogram("precheck_fetch_seconds", "", ("fetch",), registry=_REG)
 # core/metrics.py
 
 import time
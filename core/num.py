@@ -1,10 +1,246 @@
+"""Borsa adımlarına (tickSize / stepSize) yuvarlama yardımcıları.
+
+Referans anlam Decimal(str(x)) aritmetiğidir. Sık çağrılan yol için adım değeri bir
+kez tamsayı ölçeğe çevrilir (`_Grid`): yuvarlama önce float bölümle denenir, bölüm
+bir tamsayı / yarım sınırına çok yakınsa str(x)'in ondalık açılımıyla tam tamsayı
+aritmetiği yapılır. Sonuçlar Decimal sürümüyle bit düzeyinde aynıdır.
+"""
 from __future__ import annotations
-from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
-from typing import Optional
+import math
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP, ROUND_UP
+from functools import lru_cache
+from typing import Optional, Tuple
 
 _D = Decimal
 
+# Decimal bağlamı 28 basamak; tam tamsayı yolu bu sınırın güvenli altında kalmalı
+_MAX_EXACT_BITS = 90
+# Float bölüm hatası bölümün ~4e-16 katı; bu pay içinde sınıra yakın sayılır
+_REL_TOL = 1e-13
+
+
+# ----------------------
+# Decimal referans sürümleri
+# ----------------------
+def _quantize_to_step_dec(value: float, step: float) -> float:
+    dval = _D(str(value))
+    dstep = _D(str(step))
+    units = (dval / dstep).to_integral_value(rounding=ROUND_DOWN)
+    return float(units * dstep)
+
+
+def _round_to_tick_dec(price: float, tick: float) -> float:
+    dprice = _D(str(price))
+    dtick = _D(str(tick))
+    units = (dprice / dtick).to_integral_value(rounding=ROUND_HALF_UP)
+    return float(units * dtick)
+
+
+def _ceil_to_step_dec(value: float, step: float) -> float:
+    dval = _D(str(value))
+    dstep = _D(str(step))
+    units = (dval / dstep).to_integral_value(rounding=ROUND_UP)
+    return float(units * dstep)
+
+
+def _safe_mul_dec(a: float, b: float) -> float:
+    return float(_D(str(a)) * _D(str(b)))
+
+
+# ----------------------
+# Tamsayı ölçekli yol
+# ----------------------
+_POW10 = tuple(10 ** i for i in range(400))
+_FLOAT_EXACT = 2 ** 53
+
+
+def _dec_parts(x: float) -> Tuple[int, int]:
+    """str(x)'in ondalık açılımı: x == m / 10**e (e >= 0)."""
+    s = repr(x)
+    if "e" not in s:
+        i = s.index(".")
+        return int(s[:i] + s[i + 1:]), len(s) - i - 1
+    mant, _, exp = s.partition("e")
+    ip, _, fp = mant.partition(".")
+    m = int(ip + fp)
+    e = len(fp) - int(exp)
+    if e < 0:
+        return m * 10 ** (-e), 0
+    return m, e
+
+
+def _pow10(e: int) -> int:
+    return _POW10[e] if e < 400 else 10 ** e
+
+
+_FLOOR, _CEIL, _HALF_UP = 0, 1, 2
+
+
+class _Grid:
+    """Tek bir artım (tick veya step) için önceden derlenmiş yuvarlayıcı."""
+
+    __slots__ = ("inc", "_s", "_k", "_scale", "_fscale", "_ref")
+
+    def __init__(self, inc: float):
+        self.inc = float(inc)
+        s, k = _dec_parts(self.inc)      # inc == s / 10**k
+        self._s = s
+        self._k = k
+        self._scale = _pow10(k)
+        # 10**k float olarak tam ise bölme float ile yapılabilir (ikisi de tam, IEEE doğru yuvarlar)
+        self._fscale = float(self._scale) if k <= 22 else None
+        self._ref = (_quantize_to_step_dec, _ceil_to_step_dec, _round_to_tick_dec)
+
+    def _finish(self, x: float, units: int, mode: int) -> float:
+        n = units * self._s
+        if n < _FLOAT_EXACT and self._fscale is not None:
+            r = n / self._fscale
+        elif n.bit_length() > _MAX_EXACT_BITS:
+            return self._ref[mode](x, self.inc)
+        else:
+            r = n / self._scale          # int / int: doğru yuvarlanmış
+        return -r if x < 0 else r
 
+    def _on_grid(self, ax: float, units: int, halves: bool = False) -> bool:
+        """ax tam olarak units * inc (halves=True: (units + 1/2) * inc) ondalığına mı eşit?
+
+        Pay 10**15'ten küçükse ondalık en fazla 15 anlamlı basamaklıdır; böyle bir ondalık
+        float'a çevrilip repr edildiğinde aynen geri gelir, yani str(ax) ile aynı sayıdır.
+        """
+        if self._fscale is None or self._k > 21:
+            return False
+        if halves:
+            n = (2 * units + 1) * self._s * 5
+            return n < 10 ** 15 and n / (self._fscale * 10.0) == ax
+        n = units * self._s
+        return n < 10 ** 15 and n / self._fscale == ax
+
+    def decimal_parts(self, x: float) -> Tuple[int, int]:
+        """x ızgara üzerindeyse str(x) açılımını repr'siz üret; değilse _dec_parts."""
+        ax = -x if x < 0 else x
+        if ax < 4503599627370496.0 * self.inc:
+            units = round(ax / self.inc)
+            if self._on_grid(ax, units):
+                n = units * self._s
+                return (-n if x < 0 else n), self._k
+        return _dec_parts(x)
+
+    def _slow(self, x: float, mode: int) -> float:
+        if x != x or x in (math.inf, -math.inf):
+            return self._ref[mode](x, self.inc)
+        ax = -x if x < 0 else x
+        q = ax / self.inc
+        if q < 4503599627370496.0:
+            # Sık durum: değer zaten ızgarada (veya tam yarım noktada)
+            r = round(q)
+            if mode == _HALF_UP:
+                fl = int(q)
+                if self._on_grid(ax, fl, halves=True):
+                    return self._finish(x, fl + 1, mode)
+            elif self._on_grid(ax, r):
+                return self._finish(x, r, mode)
+        units = self._exact_units(ax, mode)
+        if units is None:
+            return self._ref[mode](x, self.inc)
+        return self._finish(x, units, mode)
+
+    def _exact_units(self, ax: float, mode: int) -> Optional[int]:
+        m, e = _dec_parts(ax)
+        num = m * self._scale
+        den = self._s * _pow10(e)
+        u, rem = divmod(num, den)
+        if den.bit_length() + u.bit_length() > _MAX_EXACT_BITS:
+            return None
+        if mode == _CEIL:
+            return u + (1 if rem else 0)
+        if mode == _HALF_UP:
+            return u + (1 if 2 * rem >= den else 0)
+        return u
+
+    def floor(self, x: float) -> float:
+        x = float(x)
+        q = (-x if x < 0 else x) / self.inc
+        if q < 4503599627370496.0:       # 2**52: float bölüm güvenilir aralıkta
+            fl = int(q)
+            frac = q - fl
+            tol = q * _REL_TOL + _REL_TOL
+            if tol < frac < 1.0 - tol:
+                return self._finish(x, fl, _FLOOR)
+        return self._slow(x, _FLOOR)
+
+    def ceil(self, x: float) -> float:
+        x = float(x)
+        q = (-x if x < 0 else x) / self.inc
+        if q < 4503599627370496.0:
+            fl = int(q)
+            frac = q - fl
+            tol = q * _REL_TOL + _REL_TOL
+            if tol < frac < 1.0 - tol:
+                return self._finish(x, fl + 1, _CEIL)
+        return self._slow(x, _CEIL)
+
+    def round_half_up(self, x: float) -> float:
+        x = float(x)
+        q = (-x if x < 0 else x) / self.inc
+        if q < 4503599627370496.0:
+            fl = int(q)
+            frac = q - fl
+            if abs(frac - 0.5) > q * _REL_TOL + _REL_TOL:
+                return self._finish(x, fl + 1 if frac > 0.5 else fl, _HALF_UP)
+        return self._slow(x, _HALF_UP)
+
+
+@lru_cache(maxsize=4096)
+def _grid(inc: float) -> _Grid:
+    return _Grid(inc)
+
+
+class Quantizer:
+    """
+    Sembol başına önceden derlenmiş yuvarlayıcı (tick + step).
+    Sonuçlar round_to_tick / quantize_to_step / ceil_to_step / safe_mul ile aynıdır.
+    """
+
+    __slots__ = ("tick", "step", "_tick", "_step")
+
+    def __init__(self, tick: float, step: float):
+        self.tick = float(tick)
+        self.step = float(step)
+        self._tick = _grid(self.tick) if self.tick > 0 else None
+        self._step = _grid(self.step) if self.step > 0 else None
+
+    def round_price(self, price: float) -> float:
+        return self._tick.round_half_up(price) if self._tick else float(price)
+
+    def floor_qty(self, qty: float) -> float:
+        return self._step.floor(qty) if self._step else float(qty)
+
+    def ceil_qty(self, qty: float) -> float:
+        return self._step.ceil(qty) if self._step else float(qty)
+
+    def notional(self, qty: Optional[float], price: Optional[float]) -> Optional[float]:
+        """safe_mul(qty, price); ızgaradaki değerler için repr/Decimal olmadan."""
+        if qty is None or price is None:
+            return None
+        if self._step is None or self._tick is None:
+            return safe_mul(qty, price)
+        try:
+            mq, eq = self._step.decimal_parts(float(qty))
+            mp, ep = self._tick.decimal_parts(float(price))
+        except (ValueError, OverflowError):
+            return _safe_mul_dec(qty, price)
+        return _mul_parts(mq, eq, mp, ep, qty, price)
+
+
+@lru_cache(maxsize=4096)
+def quantizer_for(tick: float, step: float) -> Quantizer:
+    """(tick, step) çiftine göre paylaşılan Quantizer."""
+    return Quantizer(tick, step)
+
+
+# ----------------------
+# Genel API
+# ----------------------
 def quantize_to_step(value: float, step: float) -> float:
     """
     stepSize kuralına göre tabana yuvarla (floor).
@@ -12,10 +248,7 @@ def quantize_to_step(value: float, step: float) -> float:
     """
     if step <= 0:
         return float(value)
-    dval = _D(str(value))
-    dstep = _D(str(step))
-    units = (dval / dstep).to_integral_value(rounding=ROUND_DOWN)
-    return float(units * dstep)
+    return _grid(float(step)).floor(value)
 
 
 def round_to_tick(price: float, tick: float) -> float:
@@ -24,18 +257,23 @@ def round_to_tick(price: float, tick: float) -> float:
     """
     if tick <= 0:
         return float(price)
-    dprice = _D(str(price))
-    dtick = _D(str(tick))
-    units = (dprice / dtick).to_integral_value(rounding=ROUND_HALF_UP)
-    return float(units * dtick)
+    return _grid(float(tick)).round_half_up(price)
 
 
 def safe_mul(a: Optional[float], b: Optional[float]) -> Optional[float]:
     if a is None or b is None:
         return None
-    return float(_D(str(a)) * _D(str(b)))
+    return _safe_mul_dec(a, b)
+
 
-from decimal import Decimal as _Dec, ROUND_UP
+def _mul_parts(ma: int, ea: int, mb: int, eb: int, a: float, b: float) -> float:
+    n = ma * mb
+    e = ea + eb
+    if -_FLOAT_EXACT < n < _FLOAT_EXACT and e <= 22:
+        return n / float(_POW10[e])
+    if n.bit_length() > _MAX_EXACT_BITS:
+        return _safe_mul_dec(a, b)
+    return n / _pow10(e)
 
 
 def ceil_to_step(value: float, step: float) -> float:
@@ -44,7 +282,4 @@ def ceil_to_step(value: float, step: float) -> float:
     """
     if step <= 0:
         return float(value)
-    dval = _Dec(str(value))
-    dstep = _Dec(str(step))
-    units = (dval / dstep).to_integral_value(rounding=ROUND_UP)
-    return float(units * dstep)
+    return _grid(float(step)).ceil(value)
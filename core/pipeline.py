@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Tuple
 from core.types import Decision, SignalBundle, OrderPlan, RiskCheckResult, OrderResult
 from core.logger import logger, log_exceptions
 from core.execution_prefs import load_prefs
@@ -59,6 +60,94 @@ def _safe_import_market_state():
     return get_state
 
 
+# ----------------------
+# Bir kez çözülen bağımlılıklar + uzun ömürlü executor
+# ----------------------
+_LOCK = threading.Lock()
+_RESOLVED: Optional[Dict[str, Any]] = None
+_RESOLVED_KEY: Optional[Tuple[Any, ...]] = None
+_BINDING: Dict[str, Any] = {"client": None, "risk_manager": None}
+_EXECUTOR: Any = None
+_EXECUTOR_KEY: Optional[Tuple[Any, ...]] = None
+_INJECTED: Any = None
+
+
+def _resolver_key() -> Tuple[Any, ...]:
+    # Çözücüler testte monkeypatch ile değiştirilebilir; değişince yeniden çözülür
+    return (_safe_import_executor, _safe_import_filters, _safe_import_mark_executed, _safe_import_market_state)
+
+
+def _resolved() -> Dict[str, Any]:
+    global _RESOLVED, _RESOLVED_KEY
+    key = _resolver_key()
+    res = _RESOLVED
+    if res is not None and _RESOLVED_KEY == key:
+        return res
+    with _LOCK:
+        if _RESOLVED is None or _RESOLVED_KEY != key:
+            kind, cls = _safe_import_executor()
+            _RESOLVED = {
+                "executor": (kind, cls),
+                "validate": _safe_import_filters(),
+                "mark_executed": _safe_import_mark_executed(),
+                "market_state": _safe_import_market_state(),
+            }
+            _RESOLVED_KEY = key
+        return _RESOLVED
+
+
+def init_pipeline(client: Any = None, risk_manager: Any = None) -> None:
+    """Başlangıçta import çözümlemesini yap ve (verilirse) executor'ı client/risk'e bağla."""
+    _resolved()
+    if client is not None or risk_manager is not None:
+        bind_executor(client, risk_manager)
+
+
+def bind_executor(client: Any = None, risk_manager: Any = None) -> None:
+    """Executor'ın kurulacağı client/risk yöneticisini ayarla; mevcut örnek yeniden kurulur."""
+    global _EXECUTOR, _EXECUTOR_KEY
+    with _LOCK:
+        _BINDING["client"] = client
+        _BINDING["risk_manager"] = risk_manager
+        _EXECUTOR = None
+        _EXECUTOR_KEY = None
+
+
+def set_executor(executor: Any) -> None:
+    """Hazır bir executor örneği enjekte et (main'in OrderExecutor'ı veya test stub'ı); None temizler."""
+    global _INJECTED
+    _INJECTED = executor
+
+
+def _construct(cls: Any) -> Any:
+    client, rm = _BINDING["client"], _BINDING["risk_manager"]
+    if client is None:
+        return cls()
+    try:
+        return cls(client, risk_manager=rm)
+    except TypeError:
+        return cls()
+
+
+def get_executor() -> Tuple[Optional[str], Any]:
+    """(kind, örnek): enjekte edilen, yoksa çözülen sınıftan bir kez kurulan uzun ömürlü executor."""
+    global _EXECUTOR, _EXECUTOR_KEY
+    if _INJECTED is not None:
+        return ("injected", _INJECTED)
+    kind, cls = _resolved()["executor"]
+    if cls is None:
+        return (None, None)
+    key = (cls, id(_BINDING["client"]), id(_BINDING["risk_manager"]))
+    inst = _EXECUTOR
+    if inst is not None and _EXECUTOR_KEY == key:
+        return (kind, inst)
+    with _LOCK:
+        if _EXECUTOR is None or _EXECUTOR_KEY != key:
+            _EXECUTOR = _construct(cls)
+            _EXECUTOR_KEY = key
+        return (kind, _EXECUTOR)
+
+
 @log_exceptions("build_order_plan_from_signals")
 def build_order_plan_from_signals(sig: SignalBundle) -> Optional[OrderPlan]:
     if not sig.regime_on:
@@ -94,14 +183,14 @@ def build_order_plan_from_signals(sig: SignalBundle) -> Optional[OrderPlan]:
 def validate_order_plan(plan: OrderPlan,
                         market_state: Optional[Dict[str, Any]] = None,
                         account_state: Optional[Dict[str, Any]] = None) -> RiskCheckResult:
-    vop = _safe_import_filters()
+    vop = _resolved()["validate"]
     # Eğer plan tamamen belirsizse (price ve qty yok), basit fallback doğrulamasını kullan
     use_fallback = (plan.entry_price is None and plan.qty_base is None and plan.qty_quote is None)
     if vop and not use_fallback:
         try:
             # Piyasa durumu yoksa ve fiyat da yoksa, opsiyonel sağlayıcıdan dene
             if market_state is None and plan.entry_price is None:
-                get_ms = _safe_import_market_state()
+                get_ms = _resolved()["market_state"]
                 if get_ms:
                     try:
                         market_state = get_ms(plan.symbol)  # type: ignore
@@ -185,7 +274,7 @@ def execute_with_filters(plan: OrderPlan,
     except Exception:
         pass
     if res.success:
-        me = _safe_import_mark_executed()
+        me = _resolved()["mark_executed"]
         try:
             if me:
                 me(plan.symbol)  # type: ignore
@@ -194,32 +283,64 @@ def execute_with_filters(plan: OrderPlan,
     return res
 
 
+def _plan_quantity(plan: OrderPlan) -> Optional[float]:
+    if plan.qty_base is not None:
+        return plan.qty_base
+    if plan.qty_quote is not None and plan.entry_price:
+        return float(plan.qty_quote) / float(plan.entry_price)
+    return None
+
+
+def _run_executor(kind: Optional[str], exec_inst: Any, plan: OrderPlan) -> OrderResult:
+    if hasattr(exec_inst, "place_order"):
+        res = exec_inst.place_order(plan)  # type: ignore
+    elif hasattr(exec_inst, "execute"):
+        res = exec_inst.execute(plan)  # type: ignore
+    elif hasattr(exec_inst, "execute_order"):
+        # modules.order_executor.OrderExecutor arayüzü
+        order_type = str((plan.meta or {}).get("order_type", "MARKET")).upper()
+        res = exec_inst.execute_order(
+            symbol=plan.symbol,
+            side=plan.side,
+            quantity=_plan_quantity(plan),
+            order_type=order_type,
+            price=plan.entry_price if order_type == "LIMIT" else None,
+            time_in_force=plan.time_in_force,
+        )
+        if isinstance(res, dict) and not res.get("ok", False):
+            return OrderResult(success=False, status="rejected", error=str(res.get("reason", "rejected")),
+                               raw={"kind": kind, "res": str(res)})
+        if isinstance(res, dict):
+            return OrderResult(success=True, status="ok", order_id=str(res.get("orderId")),
+                               filled_qty=res.get("filled_qty"), avg_price=res.get("avg_fill_price"),
+                               raw={"kind": kind, "res": str(res)})
+    else:
+        return OrderResult(success=False, status="unsupported-executor", error="No place_order/execute")
+    return OrderResult(success=True, status="ok", raw={"kind": kind, "res": str(res)})
+
+
 @log_exceptions("execute_order_plan")
 def execute_order_plan(plan: OrderPlan) -> OrderResult:
-    kind, ExecCls = _safe_import_executor()
-    if ExecCls:
+    try:
+        kind, exec_inst = get_executor()
+        if exec_inst is not None:
+            res = _run_executor(kind, exec_inst, plan)
+            if res.success:
+                # Başarılı yürütme -> cooldown işaretlemesi
+                me = _resolved()["mark_executed"]
+                try:
+                    if me:
+                        me(plan.symbol)  # type: ignore
+                except Exception:
+                    logger.exception("mark_executed failed")
+            return res
+    except Exception as e:
+        ce = classify_exception(e)
         try:
-            exec_inst = ExecCls()  # type: ignore
-            if hasattr(exec_inst, "place_order"):
-                res = exec_inst.place_order(plan)  # type: ignore
-            elif hasattr(exec_inst, "execute"):
-                res = exec_inst.execute(plan)  # type: ignore
-            else:
-                return OrderResult(success=False, status="unsupported-executor", error="No place_order/execute")
-            # Başarılı yürütme -> cooldown işaretlemesi
-            try:
-                from modules.order_filters import mark_executed
-                mark_executed(plan.symbol)
-            except Exception:
-                logger.exception("mark_executed failed")
-            return OrderResult(success=True, status="ok", raw={"kind": kind, "res": str(res)})
-        except Exception as e:
-            ce = classify_exception(e)
-            try:
-                inc_exc(e.__class__.__name__)
-            except Exception:
-                pass
-            return OrderResult(success=False, status=ce.status, error=ce.message)
+            inc_exc(e.__class__.__name__)
+        except Exception:
+            pass
+        return OrderResult(success=False, status=ce.status, error=ce.message)
 
     logger.info(f"[MOCK] Executing {plan.side} {plan.symbol} | qty_base={plan.qty_base} qty_quote={plan.qty_quote}")
     return OrderResult(success=True, status="mock-ok", order_id="MOCK", filled_qty=plan.qty_base, avg_price=plan.entry_price)
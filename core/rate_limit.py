@@ -0,0 +1,115 @@
+"""Binance istek ağırlığı (request weight) bütçesi.
+
+Sabit `time.sleep` yerine paylaşılan bir token bucket: her REST çağrısı ağırlığı
+kadar token harcar, bucket dakikalık limite göre sürekli dolar. Birden çok thread
+aynı bütçeyi paylaşır; limit aşılacaksa `acquire` yeterli token birikene kadar bekler.
+
+Kullanım:
+    budget = default_budget()
+    budget.acquire(KLINES_WEIGHT)
+    client.get_klines(...)
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+# Spot REST: dakikalık ağırlık limiti ve güvenlik payı
+WEIGHT_LIMIT_1M = _int_env("BINANCE_WEIGHT_LIMIT_1M", 6000)
+WEIGHT_BUDGET_FRACTION = _float_env("WEIGHT_BUDGET_FRACTION", 0.8)
+
+# Sık kullanılan uç ağırlıkları
+KLINES_WEIGHT = 2
+TICKER_24H_WEIGHT = 2
+ORDER_BOOK_WEIGHT = 5      # limit <= 100
+
+
+class WeightBudget:
+    """Thread-safe token bucket (kapasite = dakikalık ağırlık, dolum = kapasite / 60 sn)."""
+
+    def __init__(self, per_minute: float = WEIGHT_LIMIT_1M * WEIGHT_BUDGET_FRACTION,
+                 burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = float(per_minute) / 60.0
+        self.capacity = float(burst if burst is not None else per_minute)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+        self.waited_sec = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, weight: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= weight:
+                self._tokens -= weight
+                return True
+            return False
+
+    def acquire(self, weight: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Token yoksa bekle; timeout dolarsa False."""
+        weight = min(float(weight), self.capacity)
+        start = self._clock()
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return True
+                wait = (weight - self._tokens) / self.rate if self.rate > 0 else 1.0
+            if timeout is not None and (self._clock() - start) + wait > timeout:
+                return False
+            self._sleep(wait)
+            self.waited_sec += wait
+
+    def sync_used_weight(self, used_weight_1m: float) -> None:
+        """Sunucunun bildirdiği kullanılan ağırlıkla (X-MBX-USED-WEIGHT-1M) bütçeyi daralt."""
+        with self._lock:
+            self._refill()
+            remaining = max(0.0, self.capacity - float(used_weight_1m))
+            self._tokens = min(self._tokens, remaining)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+_DEFAULT: Optional[WeightBudget] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_budget() -> WeightBudget:
+    """Süreç genelinde paylaşılan bütçe."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = WeightBudget()
+        return _DEFAULT
+
+
+__all__ = ["WeightBudget", "default_budget", "KLINES_WEIGHT", "TICKER_24H_WEIGHT", "ORDER_BOOK_WEIGHT"]
@@ -0,0 +1,260 @@
+"""İçerik adresli sonuç önbelleği (diskte JSON, boyut sınırlı LRU).
+
+Anahtar, girdilerin kararlı özetidir (`stable_hash`): parametre sözlüğü, strateji kod sürümü
+(`code_fingerprint`: kaynak dosyaların içeriği), veri dosyaları (`file_fingerprint`) ya da
+bellekteki veri penceresi (`array_fingerprint`). Değerler JSON'a çevrilebilir olmalıdır; her
+kayıt `{root}/{anahtar[:2]}/{anahtar}.json` dosyasıdır, yazma atomiktir (tmp + replace).
+Okunan kaydın mtime'ı tazelenir; toplam boyut `max_bytes`'ı aşınca en eski mtime'lı kayıtlar
+silinir (oturumlar arası LRU). İsabet / ıska / tahliye sayaçları `stats()` ve `report()` ile.
+
+Kullanım:
+    cache = ResultCache()
+    key = stable_hash("bt", params, code_fingerprint(my_strategy), file_fingerprint(path))
+    hit = cache.get(key)
+    if hit is None:
+        hit = cache.put(key, run(...))
+    cache.report("sweep")
+"""
+from __future__ import annotations
+import datetime
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+log = logging.getLogger("silent_core")
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "data/cache")
+RESULT_CACHE_MAX_MB = _float_env("RESULT_CACHE_MAX_MB", 512.0)
+# Optimizasyon taramalarında (minimal_strategy, PerformanceOptimization, strategy_optimizer) varsayılan
+RESULT_CACHE_ENABLED = _bool_env("RESULT_CACHE_ENABLED", False)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return array_fingerprint(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    raise TypeError(f"stable_hash: desteklenmeyen tip {type(obj).__name__}")
+
+
+def stable_hash(*parts: Any) -> str:
+    """Parçaların sıralı-anahtarlı JSON'unun sha256'sı (dict sırası ve süreçten bağımsız)."""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=_default)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def array_fingerprint(arr: np.ndarray) -> str:
+    """Dizi içeriği + şekil + dtype özeti (kopyasız; bitişik değilse bir kez kopyalanır)."""
+    a = np.ascontiguousarray(arr)
+    h = hashlib.sha256(f"{a.dtype.str}{a.shape}".encode())
+    h.update(memoryview(a).cast("B"))
+    return h.hexdigest()
+
+
+# (yol, boyut, mtime_ns) -> içerik özeti; aynı süreçte büyük dosyalar bir kez okunur
+_FILE_HASHES: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_fingerprint(*paths: str) -> str:
+    """Dosya içeriklerinin özeti (yol adından bağımsız); olmayan dosya 'missing' sayılır."""
+    h = hashlib.sha256()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            h.update(b"missing")
+            continue
+        memo = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        digest = _FILE_HASHES.get(memo)
+        if digest is None:
+            fh = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    fh.update(block)
+            digest = _FILE_HASHES[memo] = fh.hexdigest()
+        h.update(digest.encode())
+    return h.hexdigest()
+
+
+def code_fingerprint(*objs: Any) -> str:
+    """Modül / fonksiyon / sınıf / örneklerin kaynak dosyalarının içerik özeti (kod sürümü)."""
+    paths = []
+    for obj in objs:
+        if inspect.ismodule(obj) or inspect.isclass(obj) or inspect.isroutine(obj):
+            target = obj
+        else:
+            target = type(obj)
+        target = inspect.unwrap(target) if inspect.isroutine(target) else target
+        module = target if inspect.ismodule(target) else sys.modules.get(getattr(target, "__module__", ""), None)
+        path = getattr(module, "__file__", None)
+        paths.append(path or f"<{getattr(target, '__qualname__', repr(target))}>")
+    return file_fingerprint(*sorted(set(paths)))
+
+
+# cache_token() / veri dosyası olmadan önbelleğe alınan skor fonksiyonları (uyarı bir kez)
+_UNKEYED_WARNED: set = set()
+
+
+def func_namespace(func: Any, data_files: Tuple[str, ...] = (), extra: Any = None) -> str:
+    """Skor fonksiyonu için önbellek ad alanı: kod sürümü + adı + veri dosyaları (+ cache_token()).
+
+    Sınır: kod sürümü yalnızca func'ın kendi modülünün kaynağıdır. func'ın çağırdığı diğer modüller
+    (örn. bir betikteki eval_func'ın kullandığı minimal_strategy) ve kapanışla yakaladığı bellekteki
+    veri anahtara girmez; bunlar değişince eski skorlar dönmeye devam eder. Böyle fonksiyonlar
+    `cache_token()` sunmalı (bağımlı modüllerin code_fingerprint'i + verinin array_fingerprint'i;
+    bkz. vector_backtest.BacktestObjective) ya da veriyi data_files ile vermelidir. İkisi de yoksa
+    uyarı loglanır.
+    """
+    token = func.cache_token() if hasattr(func, "cache_token") else None
+    name = getattr(func, "__qualname__", type(func).__qualname__)
+    if token is None and not data_files and name not in _UNKEYED_WARNED:
+        _UNKEYED_WARNED.add(name)
+        log.warning("Result cache: %s için cache_token() / cache_data_files yok; çağrılan modüller ve "
+                    "bellekteki veri anahtara girmez (değişince eski skorlar döner)", name)
+    return stable_hash("func", code_fingerprint(func), name, file_fingerprint(*data_files), token, extra)
+
+
+class ResultCache:
+    def __init__(self, root: str = RESULT_CACHE_DIR, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = int(max_bytes if max_bytes is not None else RESULT_CACHE_MAX_MB * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None     # ilk yazmada dizin taranır
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+            os.utime(path)      # LRU: son kullanım
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> Any:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self._size is None:
+            self._size = self._scan_size()
+        try:
+            old = os.path.getsize(path)
+        except OSError:
+            old = 0
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f, default=_default)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._size += size - old
+        if self._size > self.max_bytes:
+            self._evict()
+        return value
+
+    def _entries(self):
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime_ns, st.st_size, path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """En eski mtime'lı kayıtları toplam boyut sınırın altına inene dek sil."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    @property
+    def size_bytes(self) -> int:
+        if self._size is None:
+            self._size = self._scan_size()
+        return self._size
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "evictions": self.evictions, "size_bytes": self.size_bytes}
+
+    def report(self, label: str, since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """İsabet oranını logla; `since` (önceki stats()) verilirse yalnız aradaki fark."""
+        s = self.stats()
+        if since:
+            for k in ("hits", "misses", "evictions"):
+                s[k] -= since.get(k, 0)
+            total = s["hits"] + s["misses"]
+            s["hit_rate"] = s["hits"] / total if total else 0.0
+        log.info(f"{label}: result cache {s['hits']} hits / {s['misses']} misses "
+                 f"({s['hit_rate']:.0%}), {s['evictions']} evicted, {s['size_bytes'] / 1e6:.1f} MB")
+        return s
+
+
+def default_cache(cache: Any = None) -> Optional[ResultCache]:
+    """Tarama girişleri için: ResultCache ver -> o; True -> varsayılan dizin; None -> RESULT_CACHE_ENABLED."""
+    if isinstance(cache, ResultCache):
+        return cache
+    if cache is None:
+        cache = RESULT_CACHE_ENABLED
+    return ResultCache() if cache else None
+
+
+__all__ = ["ResultCache", "stable_hash", "array_fingerprint", "file_fingerprint", "code_fingerprint",
+           "func_namespace", "default_cache", "RESULT_CACHE_DIR", "RESULT_CACHE_ENABLED"]
@@ -11,6 +11,7 @@ from modules.technical_analysis import (
     calculate_macd,
     calculate_atr
 )
+from modules.indicator_engine import series_key
 
 logger = BotLogger()
 
@@ -49,7 +50,8 @@ class Strategy:
         latest_price = ohlcv[-1][4]
 
         # 2. Compute technical indicators
-        rsi = calculate_rsi([c[4] for c in ohlcv])[-1]
+        key = series_key(symbol, getattr(settings, 'CANDLE_INTERVAL', '1m'), ohlcv)
+        rsi = calculate_rsi([c[4] for c in ohlcv], key=key)[-1]
         macd, macd_signal, _ = calculate_macd([c[4] for c in ohlcv])
         atr = calculate_atr(ohlcv)
 
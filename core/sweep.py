@@ -0,0 +1,262 @@
+"""Süreç havuzunda parametre taraması (sweep).
+
+Her deneme (`trial(params, data, context) -> float`) bağımsızdır: paylaşılan fiyat verisi
+bir kez geçici bir .npy dosyasına yazılır ve işçilerde salt okunur memmap olarak açılır
+(kopya yok); `context` (ör. şablon strateji) işçi başına bir kez gönderilir. Sonuçlar
+bittikçe `SweepResults` tablosuna akar (opsiyonel CSV, satır satır).
+
+Kullanım:
+    res = run_sweep(trial, [{"a": 1}, {"a": 2}], shared={"BTCUSDT": prices}, context=strategy)
+    res.best(5)
+"""
+from __future__ import annotations
+import csv
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.result_cache import ResultCache
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+SWEEP_MAX_WORKERS = _int_env("SWEEP_MAX_WORKERS", os.cpu_count() or 1)
+
+Trial = Callable[[Dict[str, Any], Mapping[str, np.ndarray], Any], float]
+
+
+def grid(param_grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """{'a': [1, 2], 'b': [3]} -> [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}] (itertools.product sırası)."""
+    keys = list(param_grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*[param_grid[k] for k in keys])]
+
+
+@dataclass
+class TrialResult:
+    index: int
+    params: Dict[str, Any]
+    score: Optional[float]
+    seconds: float
+    error: Optional[str] = None
+    cached: bool = False
+
+
+@dataclass
+class SweepResults:
+    """Bittikçe doldurulan sonuç tablosu; `path` verilirse her satır anında CSV'ye eklenir."""
+
+    path: Optional[str] = None
+    rows: List[TrialResult] = field(default_factory=list)
+    seconds: float = 0.0
+    stopped_early: bool = False
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._writer = None
+        self._fh = None
+
+    def add(self, row: TrialResult) -> None:
+        with self._lock:
+            self.rows.append(row)
+            if self.path:
+                self._write(row)
+
+    def _write(self, row: TrialResult) -> None:
+        if self._writer is None:
+            dirpath = os.path.dirname(self.path)
+            if dirpath:
+                os.makedirs(dirpath, exist_ok=True)
+            self._fh = open(self.path, "w", newline="")
+            self._writer = csv.writer(self._fh)
+            self._writer.writerow(["index", *row.params.keys(), "score", "seconds", "error"])
+        self._writer.writerow([row.index, *row.params.values(), row.score, f"{row.seconds:.6f}", row.error or ""])
+        self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh, self._writer = None, None
+
+    def best(self, n: int = 1) -> List[TrialResult]:
+        """Skora göre azalan ilk n (hatalı denemeler hariç); eşitlikte önce gelen deneme."""
+        ok = [r for r in self.rows if r.score is not None]
+        return sorted(ok, key=lambda r: (-r.score, r.index))[:n]
+
+    @property
+    def trials_per_sec(self) -> float:
+        return len(self.rows) / self.seconds if self.seconds > 0 else 0.0
+
+
+class EarlyStop:
+    """`stop` kuralı: skor `target`'a ulaşınca ya da `patience` deneme boyunca en iyi skor
+    `min_delta`'dan fazla iyileşmezse True (hatalı denemeler sayaca dahil)."""
+
+    def __init__(self, patience: Optional[int] = None, min_delta: float = 0.0,
+                 target: Optional[float] = None):
+        self.patience = patience
+        self.min_delta = float(min_delta)
+        self.target = target
+        self.best: Optional[float] = None
+        self.since_best = 0
+
+    def __call__(self, row: TrialResult) -> bool:
+        if row.score is not None and (self.best is None or row.score > self.best + self.min_delta):
+            self.best, self.since_best = row.score, 0
+        else:
+            self.since_best += 1
+        if self.target is not None and self.best is not None and self.best >= self.target:
+            return True
+        return self.patience is not None and self.since_best >= self.patience
+
+
+class SharedSeries:
+    """İsimli 1B float64 dizileri tek dosyada tutar; işçiler `np.load(mmap_mode='r')` ile açar."""
+
+    def __init__(self, series: Mapping[str, Sequence[float]]):
+        self.names = list(series.keys())
+        arrays = [np.asarray(series[k], dtype=np.float64).ravel() for k in self.names]
+        self.offsets = np.cumsum([0] + [a.shape[0] for a in arrays]).tolist()
+        self._dir = tempfile.mkdtemp(prefix="sweep-")
+        self.path = os.path.join(self._dir, "series.npy")
+        np.save(self.path, np.concatenate(arrays) if arrays else np.empty(0))
+
+    def handle(self) -> Tuple[str, List[str], List[int]]:
+        return self.path, self.names, self.offsets
+
+    @staticmethod
+    def attach(handle: Tuple[str, List[str], List[int]]) -> Dict[str, np.ndarray]:
+        path, names, offsets = handle
+        flat = np.load(path, mmap_mode="r")
+        return {k: flat[offsets[i]:offsets[i + 1]] for i, k in enumerate(names)}
+
+    def close(self) -> None:
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self) -> "SharedSeries":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# İşçi süreç durumu (initializer ile bir kez kurulur)
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(trial: Trial, handle, context: Any) -> None:
+    _WORKER["trial"] = trial
+    _WORKER["data"] = SharedSeries.attach(handle) if handle is not None else {}
+    _WORKER["context"] = context
+
+
+def _readonly(values: Sequence[float]) -> np.ndarray:
+    view = np.asarray(values, dtype=np.float64).view()
+    view.flags.writeable = False
+    return view
+
+
+def _evaluate(trial: Trial, index: int, params: Dict[str, Any], data, context) -> TrialResult:
+    t0 = time.perf_counter()
+    try:
+        score = trial(params, data, context)
+        return TrialResult(index, params, None if score is None else float(score), time.perf_counter() - t0)
+    except Exception as e:
+        return TrialResult(index, params, None, time.perf_counter() - t0, error=f"{type(e).__name__}: {e}")
+
+
+def _run_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[TrialResult]:
+    trial, data, context = _WORKER["trial"], _WORKER["data"], _WORKER["context"]
+    return [_evaluate(trial, i, p, data, context) for i, p in chunk]
+
+
+def run_sweep(trial: Trial, param_sets: Iterable[Dict[str, Any]],
+              shared: Optional[Mapping[str, Sequence[float]]] = None, context: Any = None,
+              max_workers: Optional[int] = None, chunk_size: Optional[int] = None,
+              results: Optional[SweepResults] = None,
+              on_result: Optional[Callable[[TrialResult], None]] = None,
+              stop: Optional[Callable[[TrialResult], bool]] = None,
+              cache: Optional[ResultCache] = None,
+              cache_key: Optional[Callable[[Dict[str, Any]], str]] = None) -> SweepResults:
+    """Denemeleri süreç havuzunda koştur; max_workers <= 1 ise aynı süreçte sırayla.
+
+    `trial` modül seviyesinde (picklable) olmalı. Sonuçlar bitiş sırasıyla `results`'a
+    eklenir ve `on_result` çağrılır; satırların `index` alanı girdi sırasıdır. `stop`
+    bir sonuçtan sonra True dönerse bekleyen denemeler iptal edilir (erken durdurma).
+    `cache` + `cache_key(params)` verilirse önbellekteki skorlar havuza gönderilmeden
+    (cached=True, önce) yayınlanır, yeni skorlar ana süreçte yazılır.
+    """
+    tasks = list(enumerate(param_sets))
+    results = results if results is not None else SweepResults()
+    workers = max(1, min(int(max_workers or SWEEP_MAX_WORKERS), len(tasks) or 1))
+    t0 = time.perf_counter()
+
+    keys: Dict[int, str] = {}
+
+    def _emit(row: TrialResult) -> bool:
+        if row.index in keys and row.error is None and row.score is not None:
+            cache.put(keys[row.index], row.score)
+        results.add(row)
+        if on_result is not None:
+            on_result(row)
+        if stop is not None and stop(row):
+            results.stopped_early = True
+        return results.stopped_early
+
+    try:
+        if cache is not None and cache_key is not None:
+            todo = []
+            for i, p in tasks:
+                key = cache_key(p)
+                hit = cache.get(key)
+                if hit is None:
+                    keys[i] = key
+                    todo.append((i, p))
+                    results.cache_misses += 1
+                    continue
+                results.cache_hits += 1
+                if _emit(TrialResult(i, p, float(hit), 0.0, cached=True)):
+                    return results
+            tasks = todo
+            workers = max(1, min(workers, len(tasks) or 1))
+        if workers <= 1:
+            data = {k: _readonly(v) for k, v in (shared or {}).items()}
+            for i, p in tasks:
+                if _emit(_evaluate(trial, i, p, data, context)):
+                    break
+            return results
+        size = max(1, int(chunk_size or -(-len(tasks) // (workers * 8))))
+        chunks = [tasks[k:k + size] for k in range(0, len(tasks), size)]
+        with SharedSeries(shared or {}) as series, ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(trial, series.handle(), context)) as pool:
+            pending = {pool.submit(_run_chunk, c) for c in chunks}
+            while pending and not results.stopped_early:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for row in itertools.chain.from_iterable(fut.result() for fut in done):
+                    if _emit(row):
+                        break
+            for fut in pending:
+                fut.cancel()
+        return results
+    finally:
+        results.seconds = time.perf_counter() - t0
+        results.close()
+
+
+__all__ = ["run_sweep", "grid", "EarlyStop", "SweepResults", "TrialResult", "SharedSeries", "SWEEP_MAX_WORKERS"]
@@ -41,15 +41,14 @@ from notifier import send_notification
 from config import settings
 from config import BAŞLANGIÇ_SERMEYESİ, IŞLEM_MIKTARI, TRADE_INTERVAL, MIN_BAKIYE, STOP_LOSS_RATIO, TAKE_PROFIT_RATIO
 from core.logger import BotLogger
-from core.logger import log_exceptions, logger
-from core.pipeline import PIPELINE_ENABLED, build_order_plan_from_signals, validate_order_plan, execute_order_plan, execute_with_filters
+from core.logger import logger
+from core.pipeline import init_pipeline, set_executor
 from core.envcheck import load_runtime_config, assert_live_prereqs
 from core.metrics import start_metrics_server_if_enabled
-from core.types import SignalBundle
-import os as _pipeline_os
-
-PIPELINE_LOG_ON = _pipeline_os.getenv("ORDER_PIPELINE_LOG", "1") in ("1", "true", "yes", "on")
-IGNORE_REGIME = _pipeline_os.getenv("ORDER_PIPELINE_IGNORE_REGIME", "0").lower() in ("1", "true", "yes", "on")
+from core.kline_cache import KlineCache
+from core.market_stream import MarketStream, MARKET_STREAM_ENABLED
+from core.bar_aggregator import BarAggregator, BAR_AGGREGATION_ENABLED
+from core.exchange_rules import RULES, symbol_filters
 
 # --- Runtime bootstrap ---
 cfg = load_runtime_config()
@@ -57,40 +56,20 @@ if cfg.mode.name == "LIVE":
 	assert_live_prereqs()
 start_metrics_server_if_enabled()
 
-@log_exceptions("main-loop")
-def maybe_pipeline_entry(signal_data: dict):
-	if not PIPELINE_ENABLED:
-		return
-	sb = SignalBundle(
-		symbol=signal_data.get("symbol", "BTCUSDT"),
-		buy_score=float(signal_data.get("buy_score", 0.0)),
-		sell_score=float(signal_data.get("sell_score", 0.0)),
-		regime_on=bool(signal_data.get("regime_on", True)),
-		volatility=float(signal_data.get("volatility", 0.0)),
-		extras=signal_data
-	)
-	if IGNORE_REGIME:
-		sb.regime_on = True
-	plan = build_order_plan_from_signals(sb)
-	if plan is None:
-		if PIPELINE_LOG_ON:
-			logger.info("PIPELINE: WAIT (no plan)")
-		return
-	r = validate_order_plan(plan, market_state=None, account_state=None)
-	if not r.ok:
-		logger.info(f"PIPELINE: REJECTED -> {r.reasons}")
-		return
-	res = execute_with_filters(plan, market_state=None, account_state=None)
-	if PIPELINE_LOG_ON:
-		logger.info(f"PIPELINE: EXEC status={res.status} success={res.success}")
 from modules.strategy_optimizer import optimize_strategy_parameters
 from onchain_alternative import get_trade_signal
 from modules.order_executor import OrderExecutor
 from modules.risk_manager import RiskManager
 from modules.daily_reporter import DailyReporter
-from modules.signals import detect_buy_signal, detect_sell_signal, detect_trend_reversal_sell, safe_exit_signal, micro_entry_signal
 from utils.signal_utils import calculate_rsi, calculate_ema
+from modules.signals import detect_buy_signal, detect_sell_signal, detect_trend_reversal_sell, safe_exit_signal, micro_entry_signal
+from core.indicator_state import INDICATORS
 from modules import playbook
+from core.bars import Bars, fetch_bars
+try:
+	from modules import indicators_batch
+except Exception:  # numpy yoksa sembol bazlı skor
+	indicators_batch = None
 from modules import order_filters
 from modules import humanizer
 
@@ -151,9 +130,18 @@ ORDERBOOK_MIN_RATIO = float(_os.getenv("ORDERBOOK_MIN_RATIO", "0.52"))
 ENTRY_STRICT = (_os.getenv("ENTRY_STRICT", "False").lower() == "true")
 MICRO_ENTRY_ENABLED = (_os.getenv("MICRO_ENTRY_ENABLED", "True").lower() == "true")
 MICRO_ENTRY_MIN_VOLATILITY = float(_os.getenv("MICRO_ENTRY_MIN_VOLATILITY", "0.0009"))
+# Strateji değişikliği: true ise strong_reversal (BUY bloğu / SELL) ve safe_exit_signal 200 barlık
+# ısınmış RSI(9)/EMA(9/21) ile çalışır. false (varsayılan): eski girdiler (son 10 kapanış) -> RSI(9)
+# tek değer, EMA21 yok; bu sinyaller tetiklenmez.
+WARM_REVERSAL_SIGNALS = (_os.getenv("WARM_REVERSAL_SIGNALS", "False").lower() == "true")
 RISK_PCT = float(_os.getenv("RISK_PCT", "0.0105"))
 MIN_NOTIONAL_USDT = float(_os.getenv("MIN_NOTIONAL_USDT", "6.0"))
 
+# --- Fırsat taraması ---
+SCAN_MODE = _os.getenv("SCAN_MODE", "batched").lower()  # "batched" | "per_symbol"
+SCAN_TOP_N = int(_os.getenv("SCAN_TOP_N", "12"))
+SCAN_MIN_QUOTE_VOLUME = float(_os.getenv("SCAN_MIN_QUOTE_VOLUME", "0"))
+
 
 @dataclass
 class PositionCtx:
@@ -223,11 +211,9 @@ def get_current_price(client: Any, symbol: str) -> float | None:
 
 
 def get_symbol_filters(client: Any, symbol: str) -> Dict[str, Any]:
-	"""LOT_SIZE / PRICE_FILTER / MIN_NOTIONAL değerlerini döndür."""
+	"""LOT_SIZE / PRICE_FILTER / MIN_NOTIONAL değerlerini döndür (RULES kaydından, bellekte)."""
 	try:
-		info = client.get_symbol_info(symbol)
-		filters = {f['filterType']: f for f in info.get('filters', [])}
-		return filters
+		return symbol_filters(symbol, client)
 	except Exception as e:
 		logger.warning(f"Sembol filtresi alınamadı ({symbol}): {e}")
 		return {}
@@ -252,7 +238,7 @@ def quantize_qty_price(client: Any, symbol: str, qty: float, price: float) -> Tu
 	p = floor_to_step(price, tick_size)
 
 	# MIN_NOTIONAL kontrolü (varsa)
-	mn = filters.get('MIN_NOTIONAL', {})
+	mn = filters.get('MIN_NOTIONAL') or filters.get('NOTIONAL') or {}
 	try:
 		min_notional = float(mn.get('minNotional')) if mn else None
 		if min_notional and q * p < min_notional:
@@ -265,6 +251,17 @@ def quantize_qty_price(client: Any, symbol: str, qty: float, price: float) -> Tu
 
 
 # === Fırsat taraması ===
+def _opportunity_score(close_prices: list, volume: float, bid: float, ask: float) -> Tuple[float, Dict[str, float]]:
+	"""Volatilite * hacim / spread skoru (tek sembol ve toplu tarama ortak)."""
+	if len(close_prices) < 2:
+		return 0.0, {}
+	volatility = (max(close_prices) - min(close_prices)) / close_prices[0]
+	spread = (ask - bid) / bid if bid > 0 else 0
+	score = volatility * volume / (spread + 0.0001)
+	details = {"volatility": volatility, "volume": volume, "spread": spread, "score": score}
+	return score, details
+
+
 def analyze_coin_opportunity(client: Any, symbol: str) -> Tuple[float, Dict[str, float]]:
 	"""Volatilite * hacim / spread skorunu hesapla."""
 	try:
@@ -272,21 +269,103 @@ def analyze_coin_opportunity(client: Any, symbol: str) -> Tuple[float, Dict[str,
 		close_prices = [float(k[4]) for k in klines]
 		if len(close_prices) < 2:
 			return 0.0, {}
-		volatility = (max(close_prices) - min(close_prices)) / close_prices[0]
 		ticker = client.get_ticker(symbol=symbol)
 		volume = float(ticker.get('quoteVolume', 0.0))  # quote hacim
 		order_book = client.get_order_book(symbol=symbol, limit=5)
 		bid = float(order_book['bids'][0][0])
 		ask = float(order_book['asks'][0][0])
-		spread = (ask - bid) / bid if bid > 0 else 0
-		score = volatility * volume / (spread + 0.0001)
-		details = {"volatility": volatility, "volume": volume, "spread": spread, "score": score}
-		return score, details
+		return _opportunity_score(close_prices, volume, bid, ask)
 	except Exception as e:
 		logger.warning(f"{symbol} için fırsat analizi yapılamadı: {e}")
 		return 0.0, {}
 
 
+def _by_symbol(rows: Any) -> Dict[str, Dict[str, Any]]:
+	if isinstance(rows, dict):
+		rows = [rows]
+	return {r.get("symbol"): r for r in (rows or []) if isinstance(r, dict)}
+
+
+def scan_opportunities(client: Any, symbols: list) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
+	"""
+	Toplu tarama: 24h ticker ve bookTicker tüm semboller için birer istekte çekilir,
+	kline yalnızca ön elemeyi geçen ilk SCAN_TOP_N sembol için alınır. Skor formülü
+	analyze_coin_opportunity ile aynıdır; elenen semboller 0 skor alır.
+	"""
+	scores: Dict[str, float] = {s: 0.0 for s in symbols}
+	details: Dict[str, Dict[str, float]] = {s: {} for s in symbols}
+	if SCAN_MODE != "batched":
+		for symbol in symbols:
+			scores[symbol], details[symbol] = analyze_coin_opportunity(client, symbol)
+		return scores, details
+
+	symbols_param = json.dumps(list(symbols), separators=(",", ":"))
+	try:
+		tickers = _by_symbol(client.get_ticker(symbols=symbols_param))
+		books = _by_symbol(client.get_orderbook_tickers(symbols=symbols_param))
+	except Exception as e:
+		logger.warning(f"Toplu tarama başarısız, sembol bazlı taramaya dönülüyor: {e}")
+		for symbol in symbols:
+			scores[symbol], details[symbol] = analyze_coin_opportunity(client, symbol)
+		return scores, details
+
+	# Ön eleme: kline gerektirmeyen hacim / spread kısmı
+	prefilter: Dict[str, Tuple[float, float, float]] = {}
+	for symbol in symbols:
+		try:
+			volume = float(tickers[symbol].get('quoteVolume', 0.0))
+			bid = float(books[symbol]['bidPrice'])
+			ask = float(books[symbol]['askPrice'])
+		except Exception:
+			continue
+		if bid <= 0 or ask <= 0 or volume < SCAN_MIN_QUOTE_VOLUME:
+			continue
+		prefilter[symbol] = (volume, bid, ask)
+	survivors = sorted(
+		prefilter,
+		key=lambda s: prefilter[s][0] / ((prefilter[s][2] - prefilter[s][1]) / prefilter[s][1] + 0.0001),
+		reverse=True,
+	)[:SCAN_TOP_N]
+
+	closes: Dict[str, list] = {}
+	for symbol in survivors:
+		try:
+			klines = client.get_klines(symbol=symbol, interval='1m', limit=5)
+			closes[symbol] = [float(k[4]) for k in klines]
+		except Exception as e:
+			logger.warning(f"{symbol} için fırsat analizi yapılamadı: {e}")
+	for symbol, (score, detail) in _opportunity_scores(closes, prefilter).items():
+		scores[symbol], details[symbol] = score, detail
+	return scores, details
+
+
+def _opportunity_scores(closes: Dict[str, list], quotes: Dict[str, Tuple[float, float, float]]) -> Dict[str, Tuple[float, Dict[str, float]]]:
+	"""
+	_opportunity_score'un toplu sürümü: aynı uzunluktaki kapanışlar tek (semboller × barlar)
+	matrisinde skorlanır; NumPy yoksa veya uzunluk farklıysa sembol bazlı.
+	"""
+	out: Dict[str, Tuple[float, Dict[str, float]]] = {}
+	groups: Dict[int, list] = {}
+	for symbol, close_prices in closes.items():
+		if indicators_batch is None or len(close_prices) < 2 or not close_prices[0]:
+			volume, bid, ask = quotes[symbol]
+			try:
+				out[symbol] = _opportunity_score(close_prices, volume, bid, ask)
+			except Exception as e:
+				logger.warning(f"{symbol} için fırsat analizi yapılamadı: {e}")
+		else:
+			groups.setdefault(len(close_prices), []).append(symbol)
+	for group in groups.values():
+		vol, spread, score = indicators_batch.opportunity_scores(
+			[closes[s] for s in group], [quotes[s] for s in group])
+		for i, symbol in enumerate(group):
+			out[symbol] = float(score[i]), {
+				"volatility": float(vol[i]), "volume": quotes[symbol][0],
+				"spread": float(spread[i]), "score": float(score[i]),
+			}
+	return out
+
+
 def get_volatility_and_volume(client: Any, symbol: str) -> Tuple[float, float, float, float]:
 	"""Son 1dk ve 5dk volatilite ve hacim."""
 	try:
@@ -374,6 +453,24 @@ def main() -> None:
 
 	exec_client = initialize_client()
 
+	# Borsa kuralları/filtreleri: snapshot'tan sıcak başlangıç, yoksa tek toplu exchangeInfo.
+	# quantize_qty_price ve validate_order_plan aynı kayıttan bellekte okur.
+	RULES.use_client(exec_client)
+	if not RULES.warm_start():
+		logger.warning("Exchange rules yüklenemedi; eksik semboller ilk kullanımda sembol başına tek istekle yüklenecek (başarısızsa DEFAULT_* ENV)")
+
+	# Tur bazlı kline önbelleği: aynı (symbol, interval) için tek REST penceresi
+	data_client = KlineCache(market_client or exec_client, windows={"1m": 200, "3m": 3, "15m": 100})
+	# WebSocket akışı: kline/bookTicker/depth/miniTicker buffer'dan, REST yalnızca fallback
+	if MARKET_STREAM_ENABLED:
+		stream_intervals = ("1m",) if BAR_AGGREGATION_ENABLED else ("1m", "3m", "15m")
+		market_stream = MarketStream(TRADE_SYMBOL_LIST, fallback=data_client, intervals=stream_intervals)
+		if market_stream.start():
+			data_client = market_stream
+	# 3m / 15m barları 1m penceresinden yerelde: başlangıçta tek REST tohumu, sonra ek istek yok
+	if BAR_AGGREGATION_ENABLED:
+		data_client = BarAggregator(data_client, targets={"3m": 3, "15m": 100})
+
 	# Strateji optimizasyonu (opsiyonel)
 	try:
 		optimize_strategy_parameters()
@@ -386,6 +483,9 @@ def main() -> None:
 	# Risk yöneticisi + yürütücü
 	risk_manager = RiskManager(day_start_equity_usdt=simule_bakiye)
 	order_executor = OrderExecutor(exec_client, risk_manager=risk_manager)
+	# Pipeline aynı executor'ı kullanır: fee cache / exposure emirler arasında korunur
+	init_pipeline(exec_client, risk_manager)
+	set_executor(order_executor)
 
 	# Günlük raporlayıcı
 	reporter = DailyReporter(report_dir="reports", basename="daily_report", start_equity=simule_bakiye, logger=logger)
@@ -417,6 +517,8 @@ def main() -> None:
 
 	while True:
 		try:
+			data_client.new_cycle()
+
 			# --- Equity'yi güncelle (rapor için) ---
 			reporter.set_equity(simule_bakiye)
 
@@ -452,18 +554,18 @@ def main() -> None:
 				last_refresh = datetime.now()
 
 			# === Dinamik coin skorlama ===
-			coin_scores: Dict[str, float] = {}
-			coin_details: Dict[str, Dict[str, float]] = {}
-			for symbol in candidates:
-				score, details = analyze_coin_opportunity(market_client or exec_client, symbol)
-				coin_scores[symbol] = score
-				coin_details[symbol] = details
+			coin_scores, coin_details = scan_opportunities(data_client, candidates)
 			best_coin = max(coin_scores, key=coin_scores.get)
 			best_score = coin_scores.get(best_coin, 0.0)
 			best_details = coin_details.get(best_coin, {})
+			# Emir ön kontrolü için fee/bakiye önbelleğini karar anından önce tazele
+			try:
+				order_executor.warm_caches()
+			except Exception:
+				pass
 
 			# === Volatilite/hacim filtresi (scanner ile senkron) ===
-			volat_1m, volat_5m, vol_1m, vol_5m = get_volatility_and_volume(market_client or exec_client, best_coin)
+			volat_1m, volat_5m, vol_1m, vol_5m = get_volatility_and_volume(data_client, best_coin)
 			MIN_VOL_1M = float(_os.getenv("MIN_VOL_1M", "0.00005"))
 			MIN_VOL_5M = float(_os.getenv("MIN_VOL_5M", "0.0008"))
 			MIN_VOL_USDT_5M = float(_os.getenv("MIN_VOL_USDT_5M", "30000"))
@@ -498,15 +600,26 @@ def main() -> None:
 				continue
 
 			# === Teknik veri hazırlığı ===
-			klines_1m = (market_client or exec_client).get_klines(symbol=best_coin, interval='1m', limit=10)
-			closes_1m = [float(k[4]) for k in klines_1m]
-			volumes_1m = [float(k[5]) for k in klines_1m]
-			candles_1m = [{'open': float(k[1]), 'close': float(k[4])} for k in klines_1m]
-			klines_3m = (market_client or exec_client).get_klines(symbol=best_coin, interval='3m', limit=3)
-			candles_3m = [{'open': float(k[1]), 'close': float(k[4])} for k in klines_3m]
-			rsi_values = calculate_rsi(closes_1m, period=9)
-			ema_9 = calculate_ema(closes_1m, period=9)
-			ema_21 = calculate_ema(closes_1m, period=21)
+			# Kline yanıtları bir kez sütunsal Bars'a ayrıştırılır; mum / tuple tüketicileri görünüm alır
+			# 1m penceresi tek sefer (200 bar) alınır; 10 barlık görünüm aynı Bars diliminden türetilir
+			ohlcv_1m = fetch_bars(data_client, best_coin, '1m', 200)
+			bars_1m = ohlcv_1m[-10:]
+			volumes_1m = bars_1m.volume
+			candles_1m = bars_1m.candles
+			candles_3m = fetch_bars(data_client, best_coin, '3m', 3).candles
+			# Artımlı indikatörler tam pencereden tohumlanır (sembol değişimi / boşluk sonrası da);
+			# yalnızca yeni kapanan barlar işlenir, açık bar peek edilir. Squeeze aynı snapshot'ı okur.
+			ind_1m = INDICATORS.feed(best_coin, '1m', ohlcv_1m)
+			if WARM_REVERSAL_SIGNALS:
+				rsi_values = ind_1m["rsi9_series"]
+				ema_9 = ind_1m["ema9"]
+				ema_21 = ind_1m["ema21"]
+			else:
+				# Eski karar girdileri: ters dönüş / çıkış sinyalleri 10 kapanıştan (bkz. WARM_REVERSAL_SIGNALS)
+				closes_1m = bars_1m.close.tolist()
+				rsi_values = calculate_rsi(closes_1m, period=9)
+				ema_9 = calculate_ema(closes_1m, period=9)
+				ema_21 = calculate_ema(closes_1m, period=21)
 			tech = {
 				"buy": bool(detect_buy_signal(candles_1m, candles_3m, volumes_1m)),
 				"sell": bool(detect_sell_signal(candles_1m, candles_3m, volumes_1m)),
@@ -546,42 +659,6 @@ def main() -> None:
 					fallback_triggered = True
 					_last_fallback_buy_ts[symbol] = now_ts
 					print(f"[decision] Fallback BUY: log10(score)={norm_score:.2f} (>= {FORCE_SCORE_LOG10}) | cooldown_ok={fallback_cooldown_ok}")
-					# Pipeline bridge (demo/test) - fallback BUY anında pipeline'a sinyal + plan besle
-					if os.getenv("PIPELINE_FALLBACK_DEMO"):
-						try:
-							from core.types import SignalBundle, OrderPlan
-							from core.pipeline import execute_with_filters
-							current_price = last_price  # mevcut son fiyat değişkeni
-							vol = 0.0
-							if 'volatility' in locals():
-								vol = float(volatility or 0.0)
-							# 1) SignalBundle (buy_score >= 0.6)
-							sb = SignalBundle(
-								symbol=best_coin,
-								buy_score=0.8,
-								sell_score=0.0,
-								regime_on=True,
-								volatility=vol,
-								extras={"source": "fallback_buy_bridge"}
-							)
-							# 2) Minimal plan (quote based)
-							plan = OrderPlan(
-								symbol=best_coin,
-								side="BUY",
-								qty_quote=10.0,
-								entry_price=current_price,
-								reason="fallback_bridge",
-								confidence=0.8,
-								tags=["fallback", "demo"],
-							)
-							res = execute_with_filters(
-								plan,
-								market_state={"last_price": current_price},
-								account_state={"quote_free": float(available_usdt) if 'available_usdt' in locals() else 252.0}
-							)
-							logger.info(f"PIPELINE: fallback bridge EXEC status={res.status} success={res.success}")
-						except Exception as _fb:
-							logger.warning(f"PIPELINE: fallback bridge hata: {_fb}")
 			# Açık pozisyonda ekstra BUY engeli
 			if in_pos:
 				should_buy = False
@@ -595,30 +672,24 @@ def main() -> None:
 
 			işlem_sonucu = "WAIT ⏸️"
 			executed = False
-			current_price = get_current_price(market_client or exec_client, best_coin)
+			current_price = get_current_price(data_client, best_coin)
 
 			# === Rejim filtresi (15m) ===
 			try:
-				klines_15m = (market_client or exec_client).get_klines(symbol=best_coin, interval='15m', limit=100)
-				ohlcv_15m = [(float(x[0]), float(x[1]), float(x[2]), float(x[3]), float(x[4]), float(x[5])) for x in klines_15m]
+				bars_15m = fetch_bars(data_client, best_coin, '15m', 100)
 			except Exception:
-				ohlcv_15m = []
-			trend_on = playbook.regime_on(ohlcv_15m) if ohlcv_15m else False
+				bars_15m = Bars.empty()
+			trend_on = playbook.regime_on_snapshot(INDICATORS.feed(best_coin, '15m', bars_15m)) if bars_15m else False
 			if not trend_on:
 				logger.info("REGIME OFF | symbol=%s | msg=%s", best_coin, "Trend kapalı, scalp mod")
 
 			# === Giriş sinyalleri (1m) ===
-			try:
-				klines_1m_full = (market_client or exec_client).get_klines(symbol=best_coin, interval='1m', limit=200)
-				ohlcv_1m = [(float(x[0]), float(x[1]), float(x[2]), float(x[3]), float(x[4]), float(x[5])) for x in klines_1m_full]
-			except Exception:
-				ohlcv_1m = []
-			signal_breakout = playbook.bb_squeeze_breakout_signal(ohlcv_1m) if ohlcv_1m else False
-			signal_pullback = playbook.pullback_signal(ohlcv_1m) if ohlcv_1m else False
+			signal_breakout = playbook.bb_squeeze_breakout_snapshot(ind_1m) if ohlcv_1m else False
+			signal_pullback = playbook.pullback_signal(ohlcv_1m, symbol=best_coin) if ohlcv_1m else False
 
 			# Orderbook dengesizliği
 			try:
-				orderbook = (market_client or exec_client).get_order_book(symbol=best_coin, limit=20)
+				orderbook = data_client.get_order_book(symbol=best_coin, limit=20)
 			except Exception:
 				orderbook = {"bids": [], "asks": []}
 			orderbook_ok = playbook.orderbook_imbalance_ok(orderbook, min_ratio=ORDERBOOK_MIN_RATIO)
@@ -633,11 +704,12 @@ def main() -> None:
 			# === ENTRY (ALIM) KARARI (WAIT'i kır; trend OFF'ta micro-entry ile al; fallback BUY ile override) ===
 			if trading_enabled and not pos.in_pos:
 				try:
-					vwap_values = [ (float(x[1]) + float(x[4])) / 2.0 for x in (ohlcv_1m or [])][-3:]
+					vwap_values = ((ohlcv_1m.open[-3:] + ohlcv_1m.close[-3:]) / 2.0).tolist()
 				except Exception:
 					vwap_values = []
 				try:
-					volatility_1m = abs((ohlcv_1m[-1][4] - ohlcv_1m[-2][4]) / ohlcv_1m[-2][4]) if (ohlcv_1m and len(ohlcv_1m) >= 2 and ohlcv_1m[-2][4] != 0) else 0.0
+					closes_1m = ohlcv_1m.close
+					volatility_1m = abs((closes_1m[-1] - closes_1m[-2]) / closes_1m[-2]) if (len(closes_1m) >= 2 and closes_1m[-2] != 0) else 0.0
 				except Exception:
 					volatility_1m = 0.0
 
@@ -684,16 +756,6 @@ def main() -> None:
 								f"BUY {best_coin} qty={qty_base} @ {current_price:.6f} stop={pos.stop_price} | setup={'LONG' if long_setup else 'SCALP'}"
 							)
 
-							# (HOTFIX-B Demo) Fallback BUY sonrasında pipeline'a küçük bir manuel plan gönder
-							try:
-								from core.types import OrderPlan
-								from core.pipeline import execute_with_filters
-								manual_plan = OrderPlan(symbol=best_coin, side="BUY", qty_quote=10.0, entry_price=current_price, reason="fallback-demo")
-								mres = execute_with_filters(manual_plan, market_state={"last_price": current_price}, account_state={"quote_free": 250.0})
-								logger.info(f"PIPELINE: manual fallback buy => {mres.status} success={mres.success}")
-							except Exception as _pe:
-								logger.warning(f"Pipeline fallback demo başarısız: {_pe}")
-
 						except Exception as e:
 							logger.error(f"Emir gönderilemedi (BUY {best_coin}): {e}")
 
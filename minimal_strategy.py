@@ -1,3 +1,4 @@
+import copy
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -104,6 +105,8 @@ class Strategy:
         self.max_trades_per_day = 10     # Günlük maksimum işlem sayısı
         self.daily_loss = 0
         self.daily_trades = 0
+        # İşlem başına loglar (sweep modunda kapatılır)
+        self.trade_logging = True
 
         self.periods = [
             {
@@ -260,17 +263,17 @@ class Strategy:
                 if position > 0:
                     entry_price = self.last_buy_price[symbol]
                     if price <= entry_price * (1 - self.stop_loss_pct):
-                        self.logger.info(f"STOP-LOSS tetiklendi: {symbol} {price} (entry: {entry_price})")
+                        self._trade_log(logging.INFO, f"STOP-LOSS tetiklendi: {symbol} {price} (entry: {entry_price})")
                         self.last_action[symbol] = 'SELL'
                         self.cooldown[symbol] = bar_index
                         return 'SELL'
                     elif price >= entry_price * (1 + self.take_profit_pct):
-                        self.logger.info(f"TAKE-PROFIT tetiklendi: {symbol} {price} (entry: {entry_price})")
+                        self._trade_log(logging.INFO, f"TAKE-PROFIT tetiklendi: {symbol} {price} (entry: {entry_price})")
                         self.last_action[symbol] = 'SELL'
                         self.cooldown[symbol] = bar_index
                         return 'SELL'
                     else:
-                        self.logger.info(f"Pozisyon korunuyor: {symbol} {price} (entry: {entry_price})")
+                        self._trade_log(logging.INFO, f"Pozisyon korunuyor: {symbol} {price} (entry: {entry_price})")
                         return 'HOLD'
                 else:
                     return 'HOLD'
@@ -306,6 +309,11 @@ class Strategy:
         sorted_coins = sorted(volatility_scores.items(), key=lambda x: x[1], reverse=True)
         return [symbol for symbol, _ in sorted_coins[:top_n]]
 
+    def _trade_log(self, level, msg):
+        # İşlem / bar başına loglar; trade_logging=False iken (sweep) yazılmaz
+        if self.trade_logging:
+            self.logger.log(level, msg)
+
     def simulate_portfolio(self, initial_balance, price_data, days, symbols=None, order_split=3):
         try:
             if symbols is None:
@@ -331,7 +339,7 @@ class Strategy:
                         # Maksimum coin exposure kontrolü
                         coin_value = positions[symbol] * daily_prices[symbol]
                         if coin_value > self.max_coin_exposure_pct * portfolio_value:
-                            self.logger.warning(f"{symbol} pozisyonu portföyün {self.max_coin_exposure_pct*100}%'ünden fazla! İşlem engellendi.")
+                            self._trade_log(logging.WARNING, f"{symbol} pozisyonu portföyün {self.max_coin_exposure_pct*100}%'ünden fazla! İşlem engellendi.")
                             continue
 
                         context = {
@@ -356,9 +364,9 @@ class Strategy:
                                     balance -= cost
                                     positions[symbol] += buy_amount
                                     self.daily_trades += 1
-                                    self.logger.info(f"BUY (split {split+1}/{order_split}): {buy_amount:.4f} {symbol} at {daily_prices[symbol]}, new balance: {balance:.2f}")
+                                    self._trade_log(logging.INFO, f"BUY (split {split+1}/{order_split}): {buy_amount:.4f} {symbol} at {daily_prices[symbol]}, new balance: {balance:.2f}")
                                 else:
-                                    self.logger.warning(f"Yetersiz bakiye ile split alım deneniyor! Bakiye: {balance:.2f}, Gerekli: {cost:.2f}")
+                                    self._trade_log(logging.WARNING, f"Yetersiz bakiye ile split alım deneniyor! Bakiye: {balance:.2f}, Gerekli: {cost:.2f}")
 
                         elif action == 'SELL' and self.daily_trades < self.max_trades_per_day:
                             for split in range(order_split):
@@ -368,17 +376,17 @@ class Strategy:
                                     balance += realized_profit
                                     positions[symbol] -= split_amount
                                     self.daily_trades += 1
-                                    self.logger.info(f"SELL (split {split+1}/{order_split}): {split_amount:.4f} {symbol} at {daily_prices[symbol]}, new balance: {balance:.2f}")
+                                    self._trade_log(logging.INFO, f"SELL (split {split+1}/{order_split}): {split_amount:.4f} {symbol} at {daily_prices[symbol]}, new balance: {balance:.2f}")
 
                         # Günlük zarar kontrolü
                         self.daily_loss = max(0, start_balance - balance)
                         if self.daily_loss > self.max_daily_loss_pct * start_balance:
-                            self.logger.warning(f"Günlük zarar limiti aşıldı! ({self.daily_loss:.2f} USDT)")
+                            self._trade_log(logging.WARNING, f"Günlük zarar limiti aşıldı! ({self.daily_loss:.2f} USDT)")
                             break
 
                         # Günlük işlem limiti kontrolü
                         if self.daily_trades >= self.max_trades_per_day:
-                            self.logger.warning("Günlük maksimum işlem sayısına ulaşıldı!")
+                            self._trade_log(logging.WARNING, "Günlük maksimum işlem sayısına ulaşıldı!")
                             break
 
                         # Günlük hedef/carry_over güncelle
@@ -403,38 +411,73 @@ class Strategy:
             self.logger.error(f"simulate_portfolio hata: {e}")
             return []
 
-    def optimize_parameters(self, price_data, days, symbols, param_grid):
+    def optimize_parameters(self, price_data, days, symbols, param_grid, max_workers=None,
+                            results_path=None, seed=None, cache=None):
         """
-        Basit grid search ile parametre optimizasyonu.
+        Grid search ile parametre optimizasyonu (core.sweep süreç havuzu).
         param_grid: {'cooldown_period': [10,12,15], 'max_position_pct': [0.2,0.25], ...}
+        Her deneme bu stratejinin bir kopyasıyla koşar (self değişmez); fiyat verisi işçilerle
+        memmap üzerinden paylaşılır, işlem logları kapalıdır. Sonuçlar bittikçe loglanır ve
+        results_path verilirse CSV'ye yazılır. seed verilirse split oranları parametre seti
+        başına deterministiktir. max_workers: None -> SWEEP_MAX_WORKERS, 1 -> sıralı.
+        cache: ResultCache | True | None (RESULT_CACHE_ENABLED); yalnız seed verilince kullanılır
+        (anahtar: kod sürümü, strateji durumu, fiyat verisi, gün/sembol, seed, parametreler).
         """
-        import itertools
+        import sys
+        from core.result_cache import code_fingerprint, default_cache, stable_hash
+        from core.sweep import SweepResults, grid, run_sweep
 
         keys = list(param_grid.keys())
-        best_result = None
-        best_params = None
-
-        for values in itertools.product(*[param_grid[k] for k in keys]):
-            # Parametreleri ayarla
-            for k, v in zip(keys, values):
-                setattr(self, k, v)
-            # Simülasyonu çalıştır
-            sim_result = self.simulate_portfolio(
-                initial_balance=1000,
-                price_data=price_data,
-                days=days,
-                symbols=symbols,
-                order_split=3
-            )
-            final_value = sim_result[-1]['portfolio_value'] if sim_result else 0
-            if (best_result is None) or (final_value > best_result):
-                best_result = final_value
-                best_params = dict(zip(keys, values))
-            self.logger.info(f"Test edilen parametreler: {dict(zip(keys, values))}, Son portföy: {final_value}")
-
-        self.logger.info(f"En iyi parametreler: {best_params}, En yüksek portföy: {best_result}")
+        context = {"strategy": self, "days": days, "symbols": symbols, "seed": seed}
+        cache = default_cache(cache)
+        if cache is not None and seed is None:
+            self.logger.warning("optimize_parameters: seed yok (rastgele split), sonuç önbelleği kullanılmıyor")
+            cache = None
+        cache_key = None
+        if cache is not None:
+            state = {k: v for k, v in vars(self).items() if k not in ("logger", "dynamic_position")}
+            namespace = stable_hash("minimal_strategy.optimize_parameters",
+                                    code_fingerprint(sys.modules[__name__], DynamicPosition),
+                                    state, price_data, days, symbols, seed)
+            cache_key = lambda params: stable_hash(namespace, params)  # noqa: E731
+            before = cache.stats()
+
+        def _log(row):
+            if row.error:
+                self.logger.error(f"Test edilen parametreler: {row.params}, hata: {row.error}")
+            else:
+                self.logger.info(f"Test edilen parametreler: {row.params}, Son portföy: {row.score}")
+
+        results = run_sweep(_sweep_trial, grid(param_grid), shared=price_data, context=context,
+                            max_workers=max_workers, results=SweepResults(path=results_path),
+                            on_result=_log, cache=cache, cache_key=cache_key)
+        if cache is not None:
+            cache.report("optimize_parameters", since=before)
+        top = results.best(1)
+        best_params = {k: top[0].params[k] for k in keys} if top else None
+        best_result = top[0].score if top else None
+        self.logger.info(f"En iyi parametreler: {best_params}, En yüksek portföy: {best_result} "
+                         f"({len(results.rows)} deneme, {results.trials_per_sec:.1f}/sn)")
         return best_params, best_result
 
+
+def _sweep_trial(params, price_data, context):
+    """optimize_parameters denemesi (işçi süreçte): şablon stratejinin kopyası + parametreler."""
+    strategy = copy.deepcopy(context["strategy"])
+    strategy.trade_logging = False
+    for k, v in params.items():
+        setattr(strategy, k, v)
+    if context.get("seed") is not None:
+        random.seed(f"{context['seed']}:{sorted(params.items())}")
+    sim_result = strategy.simulate_portfolio(
+        initial_balance=1000,
+        price_data=price_data,
+        days=context["days"],
+        symbols=context["symbols"],
+        order_split=3
+    )
+    return sim_result[-1]['portfolio_value'] if sim_result else 0
+
 if __name__ == "__main__":
     # Test/demolar sadece direkt çalıştırıldığında aktifleştirilsin.
     strategy = Strategy()
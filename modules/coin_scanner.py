@@ -7,8 +7,19 @@ import os as _os
 import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
-from modules.trend_signals import detect_buy_signal, detect_strong_reversal_sell
+from modules.trend_signals import detect_buy_signal, detect_strong_reversal_sell, debounce
+from core.rate_limit import WeightBudget, default_budget, KLINES_WEIGHT
+from modules.indicator_engine import rsi_series, ema_series, series_key
+from core.bars import Bars, CandleView
+
+try:
+    import numpy as np
+    from modules import indicators_batch as _batch
+except Exception:  # numpy yoksa sembol bazlı skor
+    np = None
+    _batch = None
 
 COIN_LIST_PATH = 'config/coin_list.json'
 
@@ -21,6 +32,15 @@ MIN_VOL_1M = float(_os.getenv("MIN_VOL_1M", "0.00005"))
 MIN_VOL_5M = float(_os.getenv("MIN_VOL_5M", "0.0008"))
 MIN_VOL_USDT_5M = float(_os.getenv("MIN_VOL_USDT_5M", "30000"))
 
+# --- Paralel tarama ---
+# SCANNER_PARALLEL=true: mumlar thread havuzunda eşzamanlı çekilir; sabit sleep yerine
+# paylaşılan istek ağırlığı bütçesi (core/rate_limit.py) hız sınırını belirler.
+SCANNER_PARALLEL = _os.getenv("SCANNER_PARALLEL", "False").lower() in ("1", "true", "yes", "on")
+SCANNER_MAX_WORKERS = int(_os.getenv("SCANNER_MAX_WORKERS", "8"))
+# SCANNER_BATCH=true: tüm evren (semboller × barlar) matrisinde tek geçişte skorlanır
+# (score_universe); aynı uzunlukta veri gelmeyen semboller score_symbol ile.
+SCANNER_BATCH = _os.getenv("SCANNER_BATCH", "True").lower() in ("1", "true", "yes", "on")
+
 # Teşhis: Eşikler gerçekten ne olarak okunuyor?
 print(f"[scanner] thresholds: MIN_VOL_1M={MIN_VOL_1M}, MIN_VOL_5M={MIN_VOL_5M}, MIN_VOL_USDT_5M={MIN_VOL_USDT_5M}")
 
@@ -30,54 +50,38 @@ def load_coin_list() -> List[str]:
         return json.load(f)
 
 
-def fetch_candles_and_volumes(client, symbol: str, interval: str = '1m', limit: int = 30):
+def fetch_candles_and_volumes(client, symbol: str, interval: str = '1m', limit: int = 30,
+                              indicators: bool = True):
     """
     Binance API'den mum, hacim, kapanış fiyatı, RSI ve EMA dizileri çeker.
+    indicators=False: RSI / EMA None döner (toplu skorlama kendisi hesaplar).
     """
     try:
         klines = client.get_klines(symbol=symbol, interval=interval, limit=limit)
-        closes = [float(k[4]) for k in klines]
-        candles = [{'open': float(k[1]), 'close': float(k[4])} for k in klines]
-        volumes = [float(k[5]) for k in klines]  # base volume
-        rsi_series = calculate_rsi_series(closes, period=14)
-        ema_series = calculate_ema_series(closes, period=14)
-        return candles, volumes, closes, rsi_series, ema_series
+        # Tek ayrıştırma; mumlar Bars üzerinde görünüm, kapanış / hacim düz listeler
+        bars = Bars.from_klines(klines)
+        closes = bars.close.tolist()
+        candles = bars.candles
+        volumes = bars.volume.tolist()  # base volume
+        if not indicators:
+            return candles, volumes, closes, None, None
+        key = series_key(symbol, interval, klines)
+        rsi = calculate_rsi_series(closes, period=14, key=key)
+        ema = calculate_ema_series(closes, period=14, key=key)
+        return candles, volumes, closes, rsi, ema
     except Exception as e:
         logging.error(f"API veri çekim hatası: {symbol} - {e}")
         return None, None, None, None, None
 
 
-def calculate_rsi_series(closes: List[float], period: int = 14) -> List[Optional[float]]:
-    """RSI serisi döndürür."""
-    if len(closes) < period + 1:
-        return [None] * len(closes)
-    rsi_list = [None] * period
-    for i in range(period, len(closes)):
-        gains = [max(0, closes[j] - closes[j-1]) for j in range(i-period+1, i+1)]
-        losses = [max(0, closes[j-1] - closes[j]) for j in range(i-period+1, i+1)]
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-        if avg_loss == 0:
-            rsi = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        rsi_list.append(rsi)
-    return rsi_list
-
-
-def calculate_ema_series(closes: List[float], period: int = 14) -> List[Optional[float]]:
+def calculate_rsi_series(closes: List[float], period: int = 14, key=None) -> List[Optional[float]]:
+    """RSI serisi (son `period` değişimin basit ortalaması; kayıp yoksa 100)."""
+    return rsi_series(closes, period, method="sma", key=key)
+
+
+def calculate_ema_series(closes: List[float], period: int = 14, key=None) -> List[Optional[float]]:
     """EMA serisi döndürür."""
-    if len(closes) < period:
-        return [None] * len(closes)
-    ema_list = [None] * (period-1)
-    ema = sum(closes[:period]) / period
-    ema_list.append(ema)
-    multiplier = 2 / (period + 1)
-    for price in closes[period:]:
-        ema = (price - ema) * multiplier + ema
-        ema_list.append(ema)
-    return ema_list
+    return ema_series(closes, period, key=key)
 
 
 def load_scoring_params(path: str = 'config/coin_scanner_params.json') -> dict:
@@ -101,120 +105,339 @@ def load_scoring_params(path: str = 'config/coin_scanner_params.json') -> dict:
         }
 
 
-def select_best_coin(client, sleep_time: float = 0.2, verbose: bool = False, scoring_params: dict = None) -> Optional[str]:
+def _sync_budget_from_headers(client, budget: WeightBudget) -> None:
+    """python-binance son yanıt başlığından kullanılan ağırlığı bütçeye yansıt."""
+    try:
+        used = client.response.headers.get("x-mbx-used-weight-1m")
+        if used is not None:
+            budget.sync_used_weight(float(used))
+    except Exception:
+        pass
+
+
+def fetch_all_parallel(client, symbols: List[str], interval: str = '1m', limit: int = 30,
+                       max_workers: int = SCANNER_MAX_WORKERS, budget: Optional[WeightBudget] = None,
+                       indicators: bool = True) -> Dict[str, tuple]:
     """
-    Çoklu coin taraması yapar, gelişmiş skor sistemiyle en iyi coini seçer.
+    Sembollerin mumlarını sınırlı bir thread havuzunda çeker.
+    Her istek öncesi bütçeden KLINES_WEIGHT kadar ağırlık alınır.
     """
-    coin_list = load_coin_list()
-    if scoring_params is None:
-        scoring_params = load_scoring_params()
-    best_score = float('-inf')
-    best_coin = None
+    budget = budget or default_budget()
 
-    for symbol in coin_list:
-        candles, volumes, closes, rsi_series, ema_series = fetch_candles_and_volumes(client, symbol, '1m', 30)
-        if candles is None or volumes is None or closes is None:
-            continue
+    def _task(symbol: str) -> tuple:
+        budget.acquire(KLINES_WEIGHT)
+        data = fetch_candles_and_volumes(client, symbol, interval, limit, indicators=indicators)
+        _sync_budget_from_headers(client, budget)
+        return data
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="scanner") as pool:
+        futures = {symbol: pool.submit(_task, symbol) for symbol in symbols}
+        return {symbol: fut.result() for symbol, fut in futures.items()}
+
+
+def score_symbol(symbol: str, data: tuple, scoring_params: dict, verbose: bool = False) -> Optional[float]:
+    """
+    Çekilmiş mum verisinden skor hesaplar; veri yoksa veya filtreye takılırsa None.
+    """
+    candles, volumes, closes, rsi_series, ema_series = data
+    if candles is None or volumes is None or closes is None:
+        return None
+    if rsi_series is None:
+        rsi_series = calculate_rsi_series(closes, period=14)
+    if ema_series is None:
+        ema_series = calculate_ema_series(closes, period=14)
+
+    # Hacim artışı yüzdesi (son 2 bar)
+    if len(volumes) >= 4:
+        vol_change = ((volumes[-1] - volumes[-4]) / (volumes[-4] + 1e-8)) * 100  # %
+    else:
+        vol_change = 0.0
+
+    # Volatilite (son 10 barın stdev'i)
+    if len(closes) >= 10:
+        mean = sum(closes[-10:]) / 10
+        variance = sum((x - mean) ** 2 for x in closes[-10:]) / 10
+        volatility = variance ** 0.5  # mutlak fiyat biriminde
+    else:
+        volatility = 0.0
+
+    # Volatiliteyi orana çevir (fiyata göre normalize)
+    if closes and closes[-1] > 0:
+        volatility_pct_1m = volatility / closes[-1]  # ~1m volatilite oranı
+    else:
+        volatility_pct_1m = 0.0
+
+    # 5 dakikalık fiyat aralığı (range) oranı
+    if len(closes) >= 5 and closes[-1] > 0:
+        last5 = closes[-5:]
+        range_pct_5m = (max(last5) - min(last5)) / closes[-1]
+    else:
+        range_pct_5m = 0.0
+
+    # 1 dakikalık ve 5 dakikalık yaklaşık USDT hacimleri
+    # (Binance klines'taki k[5] base volume; USDT'ye çevirmek için ~ closes[-1] ile çarpıyoruz)
+    last_price = closes[-1] if closes else 0.0
+    vol_usdt_1m = (volumes[-1] * last_price) if (volumes and last_price) else 0.0
+    vol_usdt_5m = (sum(volumes[-5:]) * last_price) if (len(volumes) >= 5 and last_price) else 0.0
+
+    # --- Filtre: Piyasa sakin/likidite düşükse ele
+    # Daha "gevşek" olsun diye üç şartın da düşük olması halinde eleme yapıyoruz.
+    # Böylece en az bir metrik yeterince iyiyse aday kalır.
+    if (volatility_pct_1m < MIN_VOL_1M) and (range_pct_5m < MIN_VOL_5M) and (vol_usdt_5m < MIN_VOL_USDT_5M):
+        if verbose:
+            print(
+                f"[scanner] {symbol}: Volatilite/hacim düşük, işlem yok. "
+                f"(1mV: {volatility_pct_1m:.4f}, 5mV: {range_pct_5m:.4f}, "
+                f"1mH: {int(vol_usdt_1m)}, 5mH: {int(vol_usdt_5m)})"
+            )
+        return None
+
+    # RSI/EMA uyumu (son 3 bar ortalaması)
+    rsi_score = 0
+    ema_score = 0
+    rsi_last = [r for r in rsi_series[-3:] if r is not None]
+    ema_last = [e for e in ema_series[-3:] if e is not None]
+    rsi_val = sum(rsi_last) / len(rsi_last) if rsi_last else None
+    ema_val = sum(ema_last) / len(ema_last) if ema_last else None
+    if rsi_val is not None:
+        if 30 < rsi_val < 70:
+            rsi_score = scoring_params["rsi_mid"]
+        elif rsi_val <= 30:
+            rsi_score = scoring_params["rsi_oversold"]
+        elif rsi_val >= 70:
+            rsi_score = scoring_params["rsi_overbought"]
+    if ema_val is not None and closes[-1] > ema_val:
+        ema_score = scoring_params["ema_above"]
+    elif ema_val is not None:
+        ema_score = scoring_params["ema_below"]
+
+    # Trend sinyalleri (son 5 bar üzerinden)
+    # Agresif BUY sinyali (EMA7>EMA14 + RSI>52 + mini breakout) en az 14 kapanış ister
+    buy_window = 20 if len(candles) >= 20 else len(candles)
+    buy_signal = detect_buy_signal(candles[-buy_window:], volumes[-buy_window:])
+    # detect_strong_reversal_sell(candles, rsi, ema9, ema21): seriler None içermemeli
+    rsi_tail = [r for r in (rsi_series or [])[-5:] if r is not None]
+    ema9_tail = [e for e in calculate_ema_series(closes, period=9)[-5:] if e is not None]
+    ema21_tail = [e for e in calculate_ema_series(closes, period=21)[-5:] if e is not None]
+    reversal_signal = detect_strong_reversal_sell(candles[-5:], rsi_tail, ema9_tail, ema21_tail)
+
+    # Skor hesaplama
+    score = 0.0
+    score += scoring_params["buy_signal_weight"] if buy_signal else 0.0
+    score += scoring_params["no_reversal_bonus"] if not reversal_signal else scoring_params["reversal_penalty"]
+    score += min(max(vol_change / scoring_params["vol_change_scale"], -scoring_params["vol_change_clip"]), scoring_params["vol_change_clip"])
+    score += min(max(volatility, 0.0), scoring_params["volatility_clip"])
+    score += rsi_score
+    score += ema_score
+
+    # Momentum: son 3 bar kapanış değişimi
+    if len(closes) >= 4:
+        momentum = closes[-1] - closes[-4]
+        score += min(max(momentum, -2), 2)
+
+    if verbose:
+        print(
+            f"[scanner] {symbol}: score={score:.2f} vol%={vol_change:.1f} "
+            f"volat={volatility:.4f} rsi={rsi_val} ema={ema_val} "
+            f"buy={buy_signal} rev={reversal_signal}"
+        )
 
-        # Hacim artışı yüzdesi (son 2 bar)
-        if len(volumes) >= 4:
-            vol_change = ((volumes[-1] - volumes[-4]) / (volumes[-4] + 1e-8)) * 100  # %
-        else:
-            vol_change = 0.0
-
-        # Volatilite (son 10 barın stdev'i)
-        if len(closes) >= 10:
-            mean = sum(closes[-10:]) / 10
-            variance = sum((x - mean) ** 2 for x in closes[-10:]) / 10
-            volatility = variance ** 0.5  # mutlak fiyat biriminde
-        else:
-            volatility = 0.0
-
-        # Volatiliteyi orana çevir (fiyata göre normalize)
-        if closes and closes[-1] > 0:
-            volatility_pct_1m = volatility / closes[-1]  # ~1m volatilite oranı
-        else:
-            volatility_pct_1m = 0.0
-
-        # 5 dakikalık fiyat aralığı (range) oranı
-        if len(closes) >= 5 and closes[-1] > 0:
-            last5 = closes[-5:]
-            range_pct_5m = (max(last5) - min(last5)) / closes[-1]
-        else:
-            range_pct_5m = 0.0
-
-        # 1 dakikalık ve 5 dakikalık yaklaşık USDT hacimleri
-        # (Binance klines'taki k[5] base volume; USDT'ye çevirmek için ~ closes[-1] ile çarpıyoruz)
-        last_price = closes[-1] if closes else 0.0
-        vol_usdt_1m = (volumes[-1] * last_price) if (volumes and last_price) else 0.0
-        vol_usdt_5m = (sum(volumes[-5:]) * last_price) if (len(volumes) >= 5 and last_price) else 0.0
-
-        # --- Filtre: Piyasa sakin/likidite düşükse ele
-        # Daha "gevşek" olsun diye üç şartın da düşük olması halinde eleme yapıyoruz.
-        # Böylece en az bir metrik yeterince iyiyse aday kalır.
-        if (volatility_pct_1m < MIN_VOL_1M) and (range_pct_5m < MIN_VOL_5M) and (vol_usdt_5m < MIN_VOL_USDT_5M):
+    return score
+
+
+def _batch_buy_signal(close: "np.ndarray") -> "np.ndarray":
+    """detect_buy_signal(candles[-20:]) matris sürümü: EMA7 > EMA14, RSI14 > 52, mini breakout."""
+    s, b = close.shape
+    w = min(20, b)
+    if w < 15:
+        return np.zeros(s, dtype=bool)
+    win = close[:, b - w:]
+    ema7 = _batch.ema(win, 7, delta_form=True)[:, -1]
+    ema14 = _batch.ema(win, 14, delta_form=True)[:, -1]
+    d = np.diff(win[:, -15:], axis=1)
+    avg_gain = _batch.seq_sum(np.maximum(d, 0.0)) / 14
+    avg_loss = _batch.seq_sum(np.maximum(-d, 0.0)) / 14
+    rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + (avg_gain / (avg_loss + 1e-9)))))
+    breakout = win[:, -1] > win[:, -11:-1].max(axis=1) * 1.001
+    return (ema7 > ema14) & (rsi > 52) & breakout
+
+
+def _batch_reversal_raw(open_: "np.ndarray", close: "np.ndarray", rsi: "np.ndarray",
+                        ema9: "np.ndarray", ema21: "np.ndarray") -> "np.ndarray":
+    """detect_strong_reversal_sell koşulu, debounce hariç (o sembol sırasıyla uygulanır)."""
+    s, b = close.shape
+    if b < 4:
+        return np.zeros(s, dtype=bool)
+    green = close > open_
+    candles_ok = green[:, -4] & green[:, -3] & (close[:, -1] < open_[:, -1])
+    # Isınma NaN'ları baştadır: son 3 RSI / son 2 EMA doluysa kuyruklar yeterli uzunlukta
+    tails_ok = ~np.isnan(rsi[:, -3]) & ~np.isnan(ema9[:, -2]) & ~np.isnan(ema21[:, -2])
+    falling = (rsi[:, -1] < rsi[:, -2]) & (rsi[:, -2] < rsi[:, -3])
+    cross = (ema9[:, -2] > ema21[:, -2]) & (ema9[:, -1] < ema21[:, -1])
+    return candles_ok & tails_ok & (falling | cross)
+
+
+def _opens(candles) -> list:
+    if isinstance(candles, CandleView):
+        return candles.column('open')
+    return [c['open'] for c in candles]
+
+
+def _tail_mean(m: "np.ndarray", n: int) -> "np.ndarray":
+    """Son n sütunun NaN olmayanlarının ortalaması; hepsi NaN ise NaN."""
+    tail = m[:, -n:]
+    valid = ~np.isnan(tail)
+    cnt = valid.sum(axis=1)
+    total = _batch.seq_sum(np.where(valid, tail, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(cnt > 0, total / np.maximum(cnt, 1), np.nan)
+
+
+def score_universe(symbols: List[str], fetched: Dict[str, tuple], scoring_params: dict,
+                   verbose: bool = False) -> Dict[str, Optional[float]]:
+    """
+    Tüm evreni tek geçişte skorlar; sonuçlar score_symbol ile aynıdır (kayan nokta toleransında).
+    En uzun ortak boyda (>= 20 bar) veri gelen semboller (S × B) matrislerinde vektörel hesaplanır;
+    diğerleri score_symbol'e düşer. Dönüş reversal debounce'u nedeniyle sembol sırasına bağlıdır.
+    """
+    def _ok(data):
+        return data is not None and data[0] is not None and data[1] is not None and data[2] is not None
+
+    lengths = [len(fetched[s][2]) for s in symbols if _ok(fetched.get(s))]
+    bars = max(lengths) if lengths else 0
+    rows = [
+        s for s in symbols
+        if _ok(fetched.get(s)) and len(fetched[s][0]) == len(fetched[s][1]) == len(fetched[s][2]) == bars
+    ] if _batch is not None and bars >= 20 else []
+    if not rows:
+        return {s: score_symbol(s, fetched[s], scoring_params, verbose) if _ok(fetched.get(s)) else None
+                for s in symbols}
+
+    close = np.array([fetched[s][2] for s in rows], dtype=np.float64)
+    open_ = np.array([_opens(fetched[s][0]) for s in rows], dtype=np.float64)
+    vol = np.array([fetched[s][1] for s in rows], dtype=np.float64)
+    last = close[:, -1]
+    p = scoring_params
+
+    # Hacim değişimi, volatilite, 5 bar range ve USDT hacmi (score_symbol ile aynı sıra)
+    vol_change = ((vol[:, -1] - vol[:, -4]) / (vol[:, -4] + 1e-8)) * 100
+    mean = _batch.seq_sum(close[:, -10:]) / 10
+    volatility = (_batch.seq_sum((close[:, -10:] - mean[:, None]) ** 2) / 10) ** 0.5
+    pos = last > 0
+    safe_last = np.where(pos, last, 1.0)
+    volatility_pct = np.where(pos, volatility / safe_last, 0.0)
+    range_pct = np.where(pos, _batch.price_range(close, 5)[:, -1] / safe_last, 0.0)
+    vol_usdt_1m = vol[:, -1] * last
+    vol_usdt_5m = _batch.seq_sum(vol[:, -5:]) * last
+    quiet = (volatility_pct < MIN_VOL_1M) & (range_pct < MIN_VOL_5M) & (vol_usdt_5m < MIN_VOL_USDT_5M)
+
+    rsi14 = _batch.rsi(close, 14, method="sma")
+    ema14 = _batch.ema(close, 14)
+    rsi_val = _tail_mean(rsi14, 3)
+    ema_val = _tail_mean(ema14, 3)
+    has_rsi = ~np.isnan(rsi_val)
+    rsi_score = np.where(~has_rsi, 0, np.where(
+        (rsi_val > 30) & (rsi_val < 70), p["rsi_mid"],
+        np.where(rsi_val <= 30, p["rsi_oversold"], p["rsi_overbought"])))
+    has_ema = ~np.isnan(ema_val)
+    ema_score = np.where(~has_ema, 0, np.where(last > ema_val, p["ema_above"], p["ema_below"]))
+
+    buy = _batch_buy_signal(close)
+    rev_raw = _batch_reversal_raw(open_, close, rsi14, _batch.ema(close, 9), _batch.ema(close, 21))
+
+    # Sembol sırasıyla: yedek yol ve reversal debounce tek sembollü akışla aynı sırada işlenir
+    index = {s: i for i, s in enumerate(rows)}
+    rev = np.zeros(len(rows), dtype=bool)
+    out: Dict[str, Optional[float]] = {}
+    for s in symbols:
+        i = index.get(s)
+        if i is None:
+            out[s] = score_symbol(s, fetched[s], scoring_params, verbose) if _ok(fetched.get(s)) else None
+        elif not quiet[i] and rev_raw[i]:
+            rev[i] = debounce('reversal', True)
+
+    score = np.zeros(len(rows))
+    score += np.where(buy, p["buy_signal_weight"], 0.0)
+    score += np.where(rev, p["reversal_penalty"], p["no_reversal_bonus"])
+    score += np.minimum(np.maximum(vol_change / p["vol_change_scale"], -p["vol_change_clip"]), p["vol_change_clip"])
+    score += np.minimum(np.maximum(volatility, 0.0), p["volatility_clip"])
+    score += rsi_score
+    score += ema_score
+    score += np.minimum(np.maximum(close[:, -1] - close[:, -4], -2), 2)
+
+    for s, i in index.items():
+        if quiet[i]:
             if verbose:
                 print(
-                    f"[scanner] {symbol}: Volatilite/hacim düşük, işlem yok. "
-                    f"(1mV: {volatility_pct_1m:.4f}, 5mV: {range_pct_5m:.4f}, "
-                    f"1mH: {int(vol_usdt_1m)}, 5mH: {int(vol_usdt_5m)})"
+                    f"[scanner] {s}: Volatilite/hacim düşük, işlem yok. "
+                    f"(1mV: {volatility_pct[i]:.4f}, 5mV: {range_pct[i]:.4f}, "
+                    f"1mH: {int(vol_usdt_1m[i])}, 5mH: {int(vol_usdt_5m[i])})"
                 )
-            time.sleep(sleep_time)
+            out[s] = None
             continue
+        out[s] = float(score[i])
+        if verbose:
+            print(
+                f"[scanner] {s}: score={score[i]:.2f} vol%={vol_change[i]:.1f} "
+                f"volat={volatility[i]:.4f} rsi={float(rsi_val[i]) if has_rsi[i] else None} "
+                f"ema={float(ema_val[i]) if has_ema[i] else None} buy={bool(buy[i])} rev={bool(rev[i])}"
+            )
+    return {s: out.get(s) for s in symbols}
 
-        # RSI/EMA uyumu (son 3 bar ortalaması)
-        rsi_score = 0
-        ema_score = 0
-        rsi_last = [r for r in rsi_series[-3:] if r is not None]
-        ema_last = [e for e in ema_series[-3:] if e is not None]
-        rsi_val = sum(rsi_last) / len(rsi_last) if rsi_last else None
-        ema_val = sum(ema_last) / len(ema_last) if ema_last else None
-        if rsi_val is not None:
-            if 30 < rsi_val < 70:
-                rsi_score = scoring_params["rsi_mid"]
-            elif rsi_val <= 30:
-                rsi_score = scoring_params["rsi_oversold"]
-            elif rsi_val >= 70:
-                rsi_score = scoring_params["rsi_overbought"]
-        if ema_val is not None and closes[-1] > ema_val:
-            ema_score = scoring_params["ema_above"]
-        elif ema_val is not None:
-            ema_score = scoring_params["ema_below"]
-
-        # Trend sinyalleri (son 5 bar üzerinden)
-        # Agresif BUY sinyali (EMA7>EMA14 + RSI>52 + mini breakout) en az 14 kapanış ister
-        buy_window = 20 if len(candles) >= 20 else len(candles)
-        buy_signal = detect_buy_signal(candles[-buy_window:], volumes[-buy_window:])
-        reversal_signal = detect_strong_reversal_sell(
-            candles[-5:],
-            closes[-5:],
-            volumes[-5:],
-            rsi_series[-5:] if rsi_series else [None]*5,
-            ema_series[-5:] if ema_series else [None]*5
-        )
 
-        # Skor hesaplama
-        score = 0.0
-        score += scoring_params["buy_signal_weight"] if buy_signal else 0.0
-        score += scoring_params["no_reversal_bonus"] if not reversal_signal else scoring_params["reversal_penalty"]
-        score += min(max(vol_change / scoring_params["vol_change_scale"], -scoring_params["vol_change_clip"]), scoring_params["vol_change_clip"])
-        score += min(max(volatility, 0.0), scoring_params["volatility_clip"])
-        score += rsi_score
-        score += ema_score
+def _best(symbols: List[str], scores: Dict[str, Optional[float]]) -> Optional[str]:
+    best_score = float('-inf')
+    best_coin = None
+    for symbol in symbols:
+        score = scores.get(symbol)
+        if score is not None and score > best_score:
+            best_score = score
+            best_coin = symbol
+    return best_coin
+
 
-        # Momentum: son 3 bar kapanış değişimi
-        if len(closes) >= 4:
-            momentum = closes[-1] - closes[-4]
-            score += min(max(momentum, -2), 2)
+def select_best_coin(client, sleep_time: float = 0.2, verbose: bool = False, scoring_params: dict = None,
+                     coin_list: Optional[List[str]] = None, parallel: Optional[bool] = None,
+                     max_workers: int = SCANNER_MAX_WORKERS, budget: Optional[WeightBudget] = None,
+                     batch: Optional[bool] = None) -> Optional[str]:
+    """
+    Çoklu coin taraması yapar, gelişmiş skor sistemiyle en iyi coini seçer.
+    parallel=True: tüm mumlar önce thread havuzunda çekilir, skorlar veri tamamlanınca hesaplanır.
+    batch=True: skorlar score_universe ile tüm evren için tek geçişte hesaplanır.
+    """
+    if coin_list is None:
+        coin_list = load_coin_list()
+    if scoring_params is None:
+        scoring_params = load_scoring_params()
+    if parallel is None:
+        parallel = SCANNER_PARALLEL
+    if batch is None:
+        batch = SCANNER_BATCH
+    batch = batch and _batch is not None
+    best_score = float('-inf')
+    best_coin = None
 
-        if verbose:
-            print(
-                f"[scanner] {symbol}: score={score:.2f} vol%={vol_change:.1f} "
-                f"volat={volatility:.4f} rsi={rsi_val} ema={ema_val} "
-                f"buy={buy_signal} rev={reversal_signal}"
-            )
+    if parallel:
+        fetched = fetch_all_parallel(client, coin_list, '1m', 30, max_workers=max_workers, budget=budget,
+                                     indicators=not batch)
+        if batch:
+            return _best(coin_list, score_universe(coin_list, fetched, scoring_params, verbose))
+        return _best(coin_list, {s: score_symbol(s, fetched[s], scoring_params, verbose) for s in coin_list})
+
+    if batch:
+        fetched = {}
+        for symbol in coin_list:
+            fetched[symbol] = fetch_candles_and_volumes(client, symbol, '1m', 30, indicators=False)
+            if fetched[symbol][0] is not None:
+                time.sleep(sleep_time)  # API rate limit koruması
+        return _best(coin_list, score_universe(coin_list, fetched, scoring_params, verbose))
 
-        if score > best_score:
+    for symbol in coin_list:
+        data = fetch_candles_and_volumes(client, symbol, '1m', 30)
+        if data[0] is None or data[1] is None or data[2] is None:
+            continue
+        score = score_symbol(symbol, data, scoring_params, verbose)
+        if score is not None and score > best_score:
             best_score = score
             best_coin = symbol
 
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+modules/indicator_engine.py
+RSI / EMA için tek hesaplama noktası + bar bazlı önbellek.
+
+Tüm çağıranlar (signal_utils, technical_analysis, coin_scanner, onchain_alternative,
+playbook, Strategy) seriyi buradan alır; her biri eski çıktı biçimine kendisi uyarlar.
+
+Seri biçimi: girdiyle aynı uzunlukta, ısınma dönemi None ile doldurulmuş liste.
+    rsi_series(closes, 14)               -> Wilder RSI (signal_utils hizası)
+    rsi_series(closes, 14, method="sma") -> son `period` değişimin basit ortalaması (Cutler)
+    ema_series(closes, 9)
+
+Önbellek: çağıran `key=series_key(symbol, interval, klines)` verirse sonuç
+(symbol, interval, son bar açılış zamanı, pencere uzunluğu, son kapanış, indikatör,
+parametreler) anahtarıyla saklanır; aynı turda tarayıcı, ana döngü ve strateji aynı
+seriyi yeniden hesaplamaz. Son kapanış da anahtardadır: açık bar fiyatı değişirse
+yeniden hesaplanır.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from modules import indicators_np as _np_ind
+except Exception:  # numpy yoksa saf Python
+    _np_ind = None
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+USE_NUMPY = _np_ind is not None and _bool_env("TA_NUMPY", True)
+INDICATOR_CACHE_SIZE = _int_env("INDICATOR_CACHE_SIZE", 4096)
+
+SeriesKey = Tuple[str, str, int]
+
+
+def series_key(symbol: Optional[str], interval: Optional[str], rows: Sequence[Sequence[Any]]) -> Optional[SeriesKey]:
+    """Kline / OHLCV satırlarından önbellek anahtarı; bilgi eksikse None (önbelleksiz)."""
+    if not symbol or not interval or not rows:
+        return None
+    try:
+        return (str(symbol), str(interval), int(rows[-1][0]))
+    except Exception:
+        return None
+
+
+# ----------------------
+# Saf Python çekirdekleri (NumPy yoksa / TA_NUMPY=false)
+# ----------------------
+def _rsi_wilder_py(closes: List[float], period: int) -> List[float]:
+    deltas = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+    gains = [d if d > 0 else 0 for d in deltas]
+    losses = [-d if d < 0 else 0 for d in deltas]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    out = []
+    for i in range(period, len(closes)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        rs = avg_gain / avg_loss if avg_loss != 0 else 0
+        out.append(100 - (100 / (1 + rs)))
+    return out
+
+
+def _rsi_sma_py(closes: List[float], period: int) -> List[float]:
+    out = []
+    for i in range(period, len(closes)):
+        gains = [max(0, closes[j] - closes[j - 1]) for j in range(i - period + 1, i + 1)]
+        losses = [max(0, closes[j - 1] - closes[j]) for j in range(i - period + 1, i + 1)]
+        avg_gain = sum(gains) / period
+        avg_loss = sum(losses) / period
+        out.append(100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    return out
+
+
+def _ema_py(closes: List[float], period: int) -> List[float]:
+    k = 2 / (period + 1)
+    out = [sum(closes[:period]) / period]
+    for price in closes[period:]:
+        out.append(price * k + out[-1] * (1 - k))
+    return out
+
+
+def _compute(name: str, closes: Sequence[float], period: int, method: str) -> List[Optional[float]]:
+    n = len(closes)
+    if name == "ema":
+        if period <= 0 or n < period:
+            return [None] * n
+        vals = _np_ind.ema(closes, period).tolist() if USE_NUMPY else _ema_py(list(closes), period)
+        return [None] * (period - 1) + vals
+    if method == "sma":
+        if n < period + 1:
+            return [None] * n
+        vals = _np_ind.rsi_sma(closes, period).tolist() if USE_NUMPY else _rsi_sma_py(list(closes), period)
+        return [None] * period + vals
+    if n < period + 1:
+        return [None] * n
+    vals = _np_ind.rsi_full(closes, period).tolist() if USE_NUMPY else _rsi_wilder_py(list(closes), period)
+    return [None] * period + vals
+
+
+class IndicatorEngine:
+    """Bar anahtarlı LRU önbellek; thread-safe (paralel tarama aynı motoru paylaşır)."""
+
+    def __init__(self, max_entries: int = INDICATOR_CACHE_SIZE):
+        self.max_entries = int(max_entries)
+        self._cache: "OrderedDict[tuple, List[Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "uncached": 0}
+
+    def series(self, name: str, closes: Sequence[float], period: int, method: str = "wilder",
+               key: Optional[SeriesKey] = None) -> List[Optional[float]]:
+        period = int(period)
+        if key is None or not len(closes):
+            with self._lock:
+                self.stats["uncached"] += 1
+            return _compute(name, closes, period, method)
+        full_key = key + (len(closes), float(closes[-1]), name, period, method)
+        with self._lock:
+            hit = self._cache.get(full_key)
+            if hit is not None:
+                self._cache.move_to_end(full_key)
+                self.stats["hits"] += 1
+                return list(hit)
+            self.stats["misses"] += 1
+        out = _compute(name, closes, period, method)
+        with self._lock:
+            self._cache[full_key] = out
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return list(out)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            for k in self.stats:
+                self.stats[k] = 0
+
+    def hit_rate(self) -> float:
+        with self._lock:
+            looked = self.stats["hits"] + self.stats["misses"]
+            return self.stats["hits"] / looked if looked else 0.0
+
+
+# Süreç genelinde paylaşılan motor
+ENGINE = IndicatorEngine()
+
+
+def rsi_series(closes: Sequence[float], period: int = 14, method: str = "wilder",
+               key: Optional[SeriesKey] = None) -> List[Optional[float]]:
+    return ENGINE.series("rsi", closes, period, method, key)
+
+
+def ema_series(closes: Sequence[float], period: int = 9, key: Optional[SeriesKey] = None) -> List[Optional[float]]:
+    return ENGINE.series("ema", closes, period, "ema", key)
+
+
+def stats() -> Dict[str, int]:
+    with ENGINE._lock:
+        return dict(ENGINE.stats)
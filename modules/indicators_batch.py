@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+modules/indicators_batch.py
+Çoklu sembol için indikatörler: (semboller × barlar) matrisleri tek geçişte.
+
+Girdi matrisleri sağa hizalıdır (son sütun son bar). Çıktılar aynı şekildedir,
+ısınma dönemi NaN. Özyinelemeler (EMA, Wilder RSI) bar ekseninde döngüyle, sembol
+ekseninde vektörel hesaplanır; 500 × 200 için döngü 200 adımdır.
+
+Tek sembol sonuçlarıyla aynı tanımlar:
+    ema(close, p)                 -> indicator_engine.ema_series
+    rsi(close, p)                 -> Wilder RSI (signal_utils)
+    rsi(close, p, method="sma")   -> coin_scanner.calculate_rsi_series
+    atr(high, low, close, p)      -> son p true range ortalaması (technical_analysis.calculate_atr)
+    volatility(close, w)          -> son w kapanışın popülasyon std'si (coin_scanner.score_symbol)
+    price_range(close, w)         -> son w kapanışın max - min
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_NAN = np.nan
+
+
+def stack_klines(klines_by_symbol: Dict[str, Sequence[Sequence[Any]]], bars: int) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Kline satırlarını (open_time, o, h, l, c, v, ...) matrislere çevirir.
+    En az `bars` satırı olan semboller alınır (son `bars` satır); diğerleri dışarıda kalır.
+    """
+    symbols = [s for s, rows in klines_by_symbol.items() if rows is not None and len(rows) >= bars]
+    if not symbols:
+        empty = np.empty((0, bars))
+        return [], {k: empty for k in ("open", "high", "low", "close", "volume")}
+    try:
+        # Tüm sütunlar sayısal (Binance satırları) ise dilimlemeden tek dönüşüm daha hızlı
+        arr = np.array([klines_by_symbol[s][-bars:] for s in symbols], dtype=np.float64)[:, :, 1:6]
+    except (TypeError, ValueError):
+        arr = np.array([[r[1:6] for r in klines_by_symbol[s][-bars:]] for s in symbols], dtype=np.float64)
+    # Alan başına bitişik (S, B) matris; adımlı görünümde sütun işlemleri birkaç kat yavaş
+    cols = np.ascontiguousarray(arr.transpose(2, 0, 1))
+    return symbols, dict(zip(("open", "high", "low", "close", "volume"), cols))
+
+
+def seq_sum(m: np.ndarray) -> np.ndarray:
+    """Bar ekseninde soldan sağa sıralı toplam (Python sum() ile bit düzeyinde aynı)."""
+    out = m[:, 0].copy()
+    for j in range(1, m.shape[1]):
+        out += m[:, j]
+    return out
+
+
+def ema(close: np.ndarray, period: int, start: int = 0, delta_form: bool = False) -> np.ndarray:
+    """
+    EMA; `start` sütunundan itibaren ilk `period` barın ortalamasıyla tohumlanır.
+    delta_form=True: e = (p - e) * k + e (trend_signals.detect_buy_signal formu).
+    """
+    s, b = close.shape
+    # Bar ekseninde döngü: (B, S) bitişik düzende her adım tek satır
+    out = np.full((b, s), _NAN)
+    if b - start < period:
+        return out.T
+    x = np.ascontiguousarray(close.T)
+    k = 2 / (period + 1)
+    e = seq_sum(close[:, start:start + period]) / period
+    j0 = start + period - 1
+    out[j0] = e
+    for j in range(j0 + 1, b):
+        p = x[j]
+        e = (p - e) * k + e if delta_form else p * k + e * (1 - k)
+        out[j] = e
+    return out.T
+
+
+def _rs_to_rsi(g: np.ndarray, lo: np.ndarray, zero_loss: float) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - (100 / (1 + g / np.where(lo != 0, lo, 1.0)))
+    return np.where(lo != 0, out, zero_loss)
+
+
+def rsi(close: np.ndarray, period: int = 14, method: str = "wilder") -> np.ndarray:
+    s, b = close.shape
+    out = np.full((s, b), _NAN)
+    if b < period + 1:
+        return out
+    d = np.diff(close, axis=1)
+    gains = np.maximum(d, 0.0)
+    losses = np.maximum(-d, 0.0)
+    if method == "sma":
+        out[:, period:] = _rs_to_rsi(rolling_sum(gains, period) / period, rolling_sum(losses, period) / period, 100.0)
+        return out
+    # Ortalama kazanç / kayıp (B-period, S) düzende biriktirilir, RSI tek seferde
+    gt = np.ascontiguousarray(gains.T)
+    lt = np.ascontiguousarray(losses.T)
+    avg_g = np.empty((b - period, s))
+    avg_l = np.empty((b - period, s))
+    avg_g[0] = seq_sum(gains[:, :period]) / period
+    avg_l[0] = seq_sum(losses[:, :period]) / period
+    for i in range(1, b - period):
+        avg_g[i] = (avg_g[i - 1] * (period - 1) + gt[period + i - 1]) / period
+        avg_l[i] = (avg_l[i - 1] * (period - 1) + lt[period + i - 1]) / period
+    out[:, period:] = _rs_to_rsi(avg_g, avg_l, 0.0).T
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """(S, B-1): her bar için önceki kapanışa göre true range."""
+    h, lo, pc = high[:, 1:], low[:, 1:], close[:, :-1]
+    return np.maximum(h - lo, np.maximum(np.abs(h - pc), np.abs(lo - pc)))
+
+
+def rolling_sum(m: np.ndarray, window: int) -> np.ndarray:
+    """
+    (S, B-window+1): her pencerenin soldan sağa sıralı toplamı. Kaydırılmış dilimlerin
+    toplamıdır (window adet vektörel toplama); 3-B pencere görünümünden hızlı ve sırası
+    Python sum() ile aynı.
+    """
+    n = m.shape[1] - window + 1
+    out = m[:, :n].copy()
+    for k in range(1, window):
+        out += m[:, k:k + n]
+    return out
+
+
+def _rolling_extreme(m: np.ndarray, window: int, fn) -> np.ndarray:
+    n = m.shape[1] - window + 1
+    out = m[:, :n].copy()
+    for k in range(1, window):
+        fn(out, m[:, k:k + n], out=out)
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    s, b = close.shape
+    out = np.full((s, b), _NAN)
+    if b < period + 1:
+        return out
+    out[:, period:] = rolling_sum(true_range(high, low, close), period) / period
+    return out
+
+
+def volatility(close: np.ndarray, window: int = 10) -> np.ndarray:
+    s, b = close.shape
+    out = np.full((s, b), _NAN)
+    if b < window:
+        return out
+    n = b - window + 1
+    mean = rolling_sum(close, window) / window
+    var = (close[:, :n] - mean) ** 2
+    for k in range(1, window):
+        var += (close[:, k:k + n] - mean) ** 2
+    out[:, window - 1:] = np.sqrt(var / window)
+    return out
+
+
+def price_range(close: np.ndarray, window: int = 5) -> np.ndarray:
+    s, b = close.shape
+    out = np.full((s, b), _NAN)
+    if b < window:
+        return out
+    out[:, window - 1:] = _rolling_extreme(close, window, np.maximum) - _rolling_extreme(close, window, np.minimum)
+    return out
+
+
+def indicator_matrices(close: np.ndarray, high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+                       rsi_period: int = 14, ema_periods: Sequence[int] = (9, 14, 21), atr_period: int = 14,
+                       vol_window: int = 10, range_window: int = 5) -> Dict[str, np.ndarray]:
+    """Tarayıcının kullandığı indikatörlerin hepsi; high/low yoksa ATR atlanır."""
+    out: Dict[str, np.ndarray] = {
+        f"rsi{rsi_period}": rsi(close, rsi_period),
+        f"rsi{rsi_period}_sma": rsi(close, rsi_period, method="sma"),
+        f"volatility{vol_window}": volatility(close, vol_window),
+        f"range{range_window}": price_range(close, range_window),
+    }
+    for p in ema_periods:
+        out[f"ema{p}"] = ema(close, p)
+    if high is not None and low is not None:
+        out[f"atr{atr_period}"] = atr(high, low, close, atr_period)
+    return out
+
+
+
+def opportunity_scores(closes: Sequence[Sequence[float]],
+                       quotes: Sequence[Tuple[float, float, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    main._opportunity_score'un matris sürümü. closes: eşit uzunlukta kapanış satırları,
+    quotes: (hacim, bid, ask). Dönüş (volatilite, spread, skor) vektörleri.
+    """
+    close = np.asarray(closes, dtype=np.float64)
+    volume, bid, ask = np.asarray(quotes, dtype=np.float64).T
+    volatility = (close.max(axis=1) - close.min(axis=1)) / close[:, 0]
+    pos = bid > 0
+    spread = np.where(pos, (ask - bid) / np.where(pos, bid, 1.0), 0.0)
+    return volatility, spread, volatility * volume / (spread + 0.0001)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+modules/indicators_np.py
+NumPy tabanlı indikatörler (RSI, EMA, MACD, ATR, momentum, Bollinger, VWAP, ADX).
+
+`modules/technical_analysis` ile aynı girdileri alır, aynı çıktıları (list / float) döner;
+yetersiz veri kontrolleri ve loglama orada kalır. Sonuçlar saf Python sürümüyle kayan
+nokta toleransında aynıdır (bkz. tests/test_indicators_np.py).
+
+EMA / Wilder gibi özyinelemeler y[t] = a * y[t-1] + x[t] biçimindedir; `linear_recurrence`
+bunu blok blok, taşma olmadan vektörel çözer.
+"""
+from __future__ import annotations
+
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Blok içinde a**-j ölçeği bu sınırı aşmasın
+_MAX_SCALE_LOG = 200.0 * math.log(10.0)
+# Bollinger pencere matrisi için satır parçası (bellek sınırı)
+_BB_CHUNK = 1 << 16
+
+
+def as_array(values: Sequence[float]) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def ohlcv_columns(ohlcv) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(high, low, close, volume) sütunları."""
+    arr = np.asarray(ohlcv, dtype=np.float64)
+    return arr[:, 2], arr[:, 3], arr[:, 4], arr[:, 5]
+
+
+def linear_recurrence(x: np.ndarray, a: float, y0: float) -> np.ndarray:
+    """
+    y[t] = a * y[t-1] + x[t],  y[-1] = y0  (0 < a < 1).
+
+    Blok içinde y[i] = a**(i+1) * (y0 + sum_{j<=i} x[j] * a**-(j+1)); ölçek a**-L sınırlı
+    tutulduğundan taşma olmaz ve hata saf döngüyle aynı mertebededir.
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    if a <= 0.0:
+        out[:] = x
+        return out
+    block = max(1, min(n, int(_MAX_SCALE_LOG / -math.log(a)))) if a < 1.0 else n
+    idx = np.arange(1, block + 1, dtype=np.float64)
+    up = a ** idx            # a**(i+1)
+    down = a ** -idx         # a**-(i+1)
+    prev = float(y0)
+    for start in range(0, n, block):
+        seg = x[start:start + block]
+        m = seg.shape[0]
+        acc = np.cumsum(seg * down[:m])
+        acc += prev
+        acc *= up[:m]
+        out[start:start + m] = acc
+        prev = float(acc[-1])
+    return out
+
+
+def ema(prices, period: int) -> np.ndarray:
+    """EMA: ilk değer ilk `period` barın ortalaması (technical_analysis ile aynı hizalama)."""
+    p = as_array(prices)
+    k = 2.0 / (period + 1)
+    seed = p[:period].sum() / period
+    out = np.empty(p.shape[0] - period + 1, dtype=np.float64)
+    out[0] = seed
+    out[1:] = linear_recurrence(p[period:] * k, 1.0 - k, seed)
+    return out
+
+
+def _rs_to_rsi(g: np.ndarray, lo: np.ndarray, zero_loss: float) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - (100.0 / (1.0 + g / np.where(lo != 0, lo, 1.0)))
+    return np.where(lo != 0, out, zero_loss)
+
+
+def rsi_full(prices, period: int = 14) -> np.ndarray:
+    """Wilder RSI, tohum değeri dahil: len(prices) - period eleman (signal_utils hizası)."""
+    p = as_array(prices)
+    d = np.diff(p)
+    gains = np.maximum(d, 0.0)
+    losses = np.abs(np.minimum(d, 0.0))
+    a = (period - 1) / period
+    g0, l0 = gains[:period].sum() / period, losses[:period].sum() / period
+    # (avg * (p-1) + x) / p == a * avg + x / p
+    g = np.concatenate(([g0], linear_recurrence(gains[period:] / period, a, g0)))
+    lo = np.concatenate(([l0], linear_recurrence(losses[period:] / period, a, l0)))
+    # Kayıp 0 iken rs = 0 -> RSI 0 (orijinal davranış)
+    return _rs_to_rsi(g, lo, 0.0)
+
+
+def rsi(prices, period: int = 14) -> np.ndarray:
+    """technical_analysis hizası: tohum değeri olmadan."""
+    return rsi_full(prices, period)[1:]
+
+
+def rsi_sma(prices, period: int = 14) -> np.ndarray:
+    """
+    Basit ortalamalı (Cutler) RSI: her nokta son `period` değişimin ortalamasından.
+    len(prices) - period eleman; kayıp 0 iken 100 (coin_scanner / onchain davranışı).
+    """
+    d = np.diff(as_array(prices))
+    win_g = np.lib.stride_tricks.sliding_window_view(np.maximum(d, 0.0), period)
+    win_l = np.lib.stride_tricks.sliding_window_view(np.maximum(-d, 0.0), period)
+    return _rs_to_rsi(win_g.sum(axis=1) / period, win_l.sum(axis=1) / period, 100.0)
+
+
+def macd(prices, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+    ema_fast = ema(prices, fast_period)
+    ema_slow = ema(prices, slow_period)
+    n = min(ema_fast.shape[0], ema_slow.shape[0])
+    line = ema_fast[-n:] - ema_slow[-n:]
+    if n < signal_period:
+        return line, np.empty(0), np.empty(0)
+    signal = ema(line, signal_period)
+    hist = line[:signal.shape[0]] - signal
+    return line, signal, hist
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = close[:-1]
+    h, lo = high[1:], low[1:]
+    return np.maximum(h - lo, np.maximum(np.abs(h - prev_close), np.abs(lo - prev_close)))
+
+
+def atr(ohlcv, period: int = 14) -> Optional[float]:
+    high, low, close, _ = ohlcv_columns(ohlcv[-(period + 1):])
+    trs = true_range(high, low, close)
+    return float(trs.sum() / period) if trs.shape[0] else None
+
+
+def momentum(prices, period: int = 10) -> np.ndarray:
+    p = as_array(prices)
+    return p[period:] - p[:-period]
+
+
+def bbands(prices, period: int = 20, std_mult: float = 2.0):
+    """SMA ± std*mult; varyans her pencerede iki geçişle (saf sürümle aynı sayısal yol)."""
+    p = as_array(prices)
+    n_out = p.shape[0] - period + 1
+    mids = np.empty(n_out, dtype=np.float64)
+    stds = np.empty(n_out, dtype=np.float64)
+    win = np.lib.stride_tricks.sliding_window_view(p, period)
+    for s in range(0, n_out, _BB_CHUNK):
+        w = win[s:s + _BB_CHUNK]
+        m = w.sum(axis=1) / period
+        dev = w - m[:, None]
+        mids[s:s + w.shape[0]] = m
+        stds[s:s + w.shape[0]] = np.sqrt((dev * dev).sum(axis=1) / period)
+    return mids, mids + std_mult * stds, mids - std_mult * stds
+
+
+def vwap(ohlcv, lookback: int = 50) -> Optional[float]:
+    _, _, close, vol = ohlcv_columns(ohlcv[-lookback:])
+    sum_v = float(vol.sum())
+    if sum_v <= 0:
+        return None
+    return float((close * vol).sum() / sum_v)
+
+
+def wilder_smooth(vals: np.ndarray, p: int) -> np.ndarray:
+    """İlk değer ilk p değerin toplamı, sonra y = y - y/p + v."""
+    if vals.shape[0] < p:
+        return np.empty(0)
+    seed = float(vals[:p].sum())
+    out = np.empty(vals.shape[0] - p + 1, dtype=np.float64)
+    out[0] = seed
+    out[1:] = linear_recurrence(vals[p:], 1.0 - 1.0 / p, seed)
+    return out
+
+
+def adx(ohlcv, period: int = 14) -> Optional[float]:
+    high, low, close, _ = ohlcv_columns(ohlcv)
+    trs = true_range(high, low, close)
+    up = high[1:] - high[:-1]
+    down = low[:-1] - low[1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    trn = wilder_smooth(trs, period)
+    pdm = wilder_smooth(plus_dm, period)
+    mdm = wilder_smooth(minus_dm, period)
+    if not trn.shape[0]:
+        return None
+    safe_t = np.where(trn != 0, trn, 1.0)
+    di_plus = np.where(trn != 0, 100.0 * pdm / safe_t, 0.0)
+    di_minus = np.where(trn != 0, 100.0 * mdm / safe_t, 0.0)
+    s = di_plus + di_minus
+    dx = np.where(s != 0, 100.0 * np.abs(di_plus - di_minus) / np.where(s != 0, s, 1.0), 0.0)
+    adx_series = wilder_smooth(dx, period)
+    if not adx_series.shape[0]:
+        return None
+    return float(adx_series[-1] / period)
@@ -140,6 +140,14 @@ class Optimizer:
     def get_params(self) -> Dict[str, Any]:
         return self.params
 
+    def set_params(self, new_params: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        """Dışarıda seçilen parametreleri (ör. walk-forward) kaydeder ve değişikliği loglar."""
+        old_params = self.params.copy()
+        self.params.update(new_params)
+        self._save_params()
+        self._log_change(reason=reason, old_params=old_params, new_params=self.params)
+        return self.params
+
 # Test fonksiyonu
 def test_optimizer():
     import tempfile
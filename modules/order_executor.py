@@ -17,12 +17,15 @@ Notlar:
 
 from __future__ import annotations
 
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import Optional, Dict, Any, Tuple
 
 from config import settings
 from notifier import send_notification
 
+from core.metrics import observe_precheck_fetch
 from modules import order_filters
 from modules.risk_manager import RiskManager
 
@@ -30,6 +33,29 @@ from modules.risk_manager import RiskManager
 from binance.client import Client
 
 
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+# Ön kontrol okumaları için çağrı başına süre sınırı ve bakiye önbelleği ömrü
+PRECHECK_FETCH_TIMEOUT_SEC = _float_env("PRECHECK_FETCH_TIMEOUT_SEC", 2.0)
+BALANCE_CACHE_TTL_SEC = _float_env("BALANCE_CACHE_TTL_SEC", 5.0)
+# BNB komisyonunu USDT'ye çevirmek için BNBUSDT fiyatının önbellek ömrü
+BNB_MARK_TTL_SEC = _float_env("BNB_MARK_TTL_SEC", 60.0)
+# Hesap komisyonu BNB ile ödüyorsa BNBUSDT fiyatı ilk fill'den önce ısıtılır
+BNB_FEE_PAYMENT = _bool_env("BNB_FEE_PAYMENT", False)
+
+
 class OrderExecutor:
     def __init__(
         self,
@@ -38,6 +64,9 @@ class OrderExecutor:
         notifier_enabled: Optional[bool] = None,
         order_book_depth: int = 20,
         taker_fee_cache_ttl_sec: int = 600,
+        fetch_timeout_sec: Optional[float] = None,
+        balance_cache_ttl_sec: Optional[float] = None,
+        bnb_fee_payment: Optional[bool] = None,
     ):
         self.client = client
         self.risk: Optional[RiskManager] = risk_manager
@@ -50,6 +79,19 @@ class OrderExecutor:
         self._last_taker_fee_fetch_ts: float = 0.0
         self._taker_fee_rate_cached: Optional[float] = None
 
+        # ön kontrol: paralel okuma havuzu (ilk kullanımda kurulur) ve bakiye önbelleği
+        self.fetch_timeout = float(PRECHECK_FETCH_TIMEOUT_SEC if fetch_timeout_sec is None else fetch_timeout_sec)
+        self.balance_cache_ttl = float(BALANCE_CACHE_TTL_SEC if balance_cache_ttl_sec is None else balance_cache_ttl_sec)
+        self._usdt_free_cached: Optional[float] = None
+        self._last_balance_fetch_ts: float = 0.0
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        # komisyon çevirimi: son fiyatlar (USDT) ve BNBUSDT önbelleği
+        self._last_price_usdt: Dict[str, Tuple[float, float]] = {}
+        self.bnb_fee_payment = BNB_FEE_PAYMENT if bnb_fee_payment is None else bool(bnb_fee_payment)
+        self._bnb_fee_seen = False
+        self._mark_pending: set = set()
+
     # ----------------------
     # Yardımcılar
     # ----------------------
@@ -59,12 +101,22 @@ class OrderExecutor:
     def _get_order_book(self, symbol: str) -> Dict[str, Any]:
         return self.client.get_order_book(symbol=symbol, limit=self.order_book_depth)
 
+    def _fee_is_fresh(self) -> bool:
+        return (self._taker_fee_rate_cached is not None
+                and (time.time() - self._last_taker_fee_fetch_ts) < self.taker_fee_cache_ttl)
+
+    def _balance_is_fresh(self) -> bool:
+        return (self._usdt_free_cached is not None
+                and (time.time() - self._last_balance_fetch_ts) < self.balance_cache_ttl)
+
     def _get_taker_fee_rate(self) -> float:
         """Hesaptan takerCommission (bps) çekip 0.xx oranına çevirir, 10 dk cache eder."""
-        now = time.time()
-        if self._taker_fee_rate_cached is not None and (now - self._last_taker_fee_fetch_ts) < self.taker_fee_cache_ttl:
+        if self._fee_is_fresh():
             return self._taker_fee_rate_cached
+        return self._fetch_taker_fee_rate()
 
+    def _fetch_taker_fee_rate(self) -> float:
+        now = time.time()
         try:
             account = self.client.get_account()
             rate = order_filters.get_taker_fee_rate_from_account(account)
@@ -86,13 +138,121 @@ class OrderExecutor:
         Basit equity approx: USDT free + açık maruziyet (USDT).
         Not: Tam equity için tüm varlıkların USDT karşılığı gerekir (daha ağır).
         """
+        usdt_free = self._usdt_free_cached if self._balance_is_fresh() else self._fetch_usdt_free()
+        return self._equity_from(usdt_free)
+
+    def _equity_from(self, usdt_free: float) -> float:
+        open_exposure = sum(max(v, 0.0) for v in self._exposure_usdt_per_symbol.values())
+        return float(usdt_free) + float(open_exposure)
+
+    def _fetch_usdt_free(self) -> float:
+        """USDT free bakiyesini çeker; başarılıysa önbelleğe yazar."""
         try:
             bal = self.client.get_asset_balance(asset="USDT") or {}
             usdt_free = float(bal.get("free", 0.0))
         except Exception:
-            usdt_free = 0.0
-        open_exposure = sum(max(v, 0.0) for v in self._exposure_usdt_per_symbol.values())
-        return float(usdt_free) + float(open_exposure)
+            return 0.0
+        self._usdt_free_cached = usdt_free
+        self._last_balance_fetch_ts = time.time()
+        return usdt_free
+
+    def invalidate_balance(self) -> None:
+        """Emir sonrası bakiye değişti; bir sonraki ön kontrol yeniden çeksin."""
+        self._last_balance_fetch_ts = 0.0
+
+    def warm_caches(self) -> None:
+        """
+        Taker fee, bakiye ve (BNB ile komisyon ödeniyorsa) BNBUSDT fiyatını arka planda
+        tazeler (karar anından önce çağrılabilir).
+        """
+        pool = self._fetch_pool()
+        if not self._fee_is_fresh():
+            pool.submit(self._timed, "taker_fee", self._fetch_taker_fee_rate)
+        if self.risk is not None and not self._balance_is_fresh():
+            pool.submit(self._timed, "balance", self._fetch_usdt_free)
+        if (self.bnb_fee_payment or self._bnb_fee_seen) and self._mark_age("BNB") >= BNB_MARK_TTL_SEC:
+            self._refresh_mark("BNB")
+
+    def _remember_price(self, asset: str, price: float) -> None:
+        if price > 0:
+            self._last_price_usdt[asset] = (float(price), time.time())
+
+    def _mark_age(self, asset: str) -> float:
+        hit = self._last_price_usdt.get(asset)
+        return time.time() - hit[1] if hit else float("inf")
+
+    def _fetch_mark(self, asset: str) -> Optional[float]:
+        try:
+            price = float(self.client.get_symbol_ticker(symbol=f"{asset}USDT")["price"])
+        except Exception:
+            return None
+        finally:
+            self._mark_pending.discard(asset)
+        self._remember_price(asset, price)
+        return price
+
+    def _refresh_mark(self, asset: str) -> None:
+        """<ASSET>USDT fiyatını arka planda çeker (aynı varlık için tek istek uçuşta)."""
+        if asset in self._mark_pending:
+            return
+        self._mark_pending.add(asset)
+        name = "bnb_mark" if asset == "BNB" else "fee_mark"
+        self._fetch_pool().submit(self._timed, name, self._fetch_mark, asset)
+
+    def _mark_usdt(self, asset: str) -> Optional[float]:
+        """
+        Varlığın USDT fiyatı: önbellekteki son değer (bayatsa arka planda tazelenir).
+        Önbellek boşsa emir yolunda istek yapılmaz: None döner, fiyat arka planda çekilir.
+        """
+        hit = self._last_price_usdt.get(asset)
+        if hit is None or time.time() - hit[1] >= BNB_MARK_TTL_SEC:
+            self._refresh_mark(asset)
+        return hit[0] if hit else None
+
+    def _fetch_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="precheck")
+        return self._pool
+
+    @staticmethod
+    def _timed(name: str, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            observe_precheck_fetch(name, time.perf_counter() - t0)
+
+    def _prefetch(self, symbol: str) -> Dict[str, Any]:
+        """
+        Ön kontrol girdilerini tek tur gecikmesiyle toplar: taze önbellek varsa kullanılır,
+        yoksa order book / taker fee / bakiye aynı anda istenir ve ortak süre sınırıyla beklenir.
+        Süre dolarsa: fee -> varsayılan, bakiye -> eski önbellek (yoksa 0); book zorunludur.
+        """
+        pool = self._fetch_pool()
+        futures = {"order_book": pool.submit(self._timed, "order_book", self._get_order_book, symbol)}
+        out: Dict[str, Any] = {}
+        if self._fee_is_fresh():
+            out["taker_fee"] = self._taker_fee_rate_cached
+        else:
+            futures["taker_fee"] = pool.submit(self._timed, "taker_fee", self._fetch_taker_fee_rate)
+        if self.risk is not None:
+            if self._balance_is_fresh():
+                out["balance"] = self._usdt_free_cached
+            else:
+                futures["balance"] = pool.submit(self._timed, "balance", self._fetch_usdt_free)
+
+        deadline = time.monotonic() + self.fetch_timeout
+        for name, fut in futures.items():
+            try:
+                out[name] = fut.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                fut.cancel()
+                out[name] = None
+        if out.get("taker_fee") is None:
+            out["taker_fee"] = self._taker_fee_rate_cached or order_filters.DEFAULT_TAKER_FEE
+        if "balance" in out and out["balance"] is None:
+            out["balance"] = self._usdt_free_cached or 0.0
+        return out
 
     def _update_exposure(self, symbol: str, side: str, filled_quote_usdt: float) -> None:
         cur = float(self._exposure_usdt_per_symbol.get(symbol, 0.0))
@@ -122,9 +282,14 @@ class OrderExecutor:
         """
         side = side.upper()
         order_type = order_type.upper()
-
-        # 1) order book al
-        book = self._get_order_book(symbol)
+        t0 = time.perf_counter()
+
+        # 1) order book + taker fee + bakiye (paralel, süre sınırlı)
+        fetched = self._prefetch(symbol)
+        observe_precheck_fetch("total", time.perf_counter() - t0)
+        book = fetched["order_book"]
+        if book is None:
+            return False, "Order book zaman aşımı.", {"reason": "order_book_timeout"}
         ref_price = self._get_ref_price(side, book)
         if not ref_price or ref_price <= 0:
             return False, "Referans fiyat alınamadı.", {"reason": "no_ref_price"}
@@ -133,7 +298,7 @@ class OrderExecutor:
         size_usdt = float(quantity) * float(ref_price)
 
         # 3) taker ücreti (oran)
-        taker_fee_rate = self._get_taker_fee_rate()
+        taker_fee_rate = fetched["taker_fee"]
 
         # 4) piyasa metrikleri (spread, vwap, slippage, all-in cost)
         mkt = order_filters.estimate_effective_price_and_costs(
@@ -154,7 +319,7 @@ class OrderExecutor:
 
         # 5) RiskManager (opsiyonel)
         if self.risk is not None:
-            equity_usdt = self._get_equity_approx()
+            equity_usdt = self._equity_from(fetched["balance"])
             total_exp = sum(max(v, 0.0) for v in self._exposure_usdt_per_symbol.values())
             sym_exp = float(self._exposure_usdt_per_symbol.get(symbol, 0.0))
 
@@ -264,6 +429,7 @@ class OrderExecutor:
             return {"ok": False, "reason": f"API error: {e}", "info": {}}
 
         # Fill bilgilerini toparla
+        self.invalidate_balance()
         result = self._parse_fills(symbol, resp)
 
         # Maruziyeti güncelle (yalnızca gerçekleşen kısım için)
@@ -310,7 +476,9 @@ class OrderExecutor:
     def _parse_fills(self, symbol: str, resp: Dict[str, Any]) -> Dict[str, Any]:
         """
         Binance spot yanıtından doldurma metriklerini çıkarır.
-        Commission USDT değilse (örn. BNB), yaklaşık USDT'e çevirme denemesi yapılır.
+        Commission USDT değilse: base varlık için fill fiyatı, BNB için önbellekteki
+        BNBUSDT fiyatı kullanılır (ek order book / ticker isteği yok). Önbellekte fiyat
+        yoksa komisyon `fee_unconverted` alanına yazılır.
         """
         status = str(resp.get("status", "NEW"))
         fills = resp.get("fills", []) or []
@@ -318,14 +486,7 @@ class OrderExecutor:
         sum_qty = 0.0
         sum_quote = 0.0
         fee_usdt = 0.0
-
-        # Referans fiyat (şimdiki an) ile komisyon çevirimi için
-        ref_price = None
-        try:
-            book = self._get_order_book(symbol)
-            ref_price = self._get_ref_price("BUY", book) or self._get_ref_price("SELL", book)
-        except Exception:
-            pass
+        fee_unconverted: Dict[str, float] = {}
 
         base_asset = symbol[:-4] if symbol.endswith("USDT") else None  # kaba çıkarım
 
@@ -343,15 +504,22 @@ class OrderExecutor:
                 if commission > 0:
                     if commission_asset == "USDT":
                         fee_usdt += commission
-                    elif commission_asset == base_asset and ref_price:
-                        fee_usdt += commission * ref_price
+                    elif commission_asset == base_asset and price > 0:
+                        fee_usdt += commission * price
                     else:
-                        # bilinmiyorsa ihmal et (istersen burada extra fiyat sorgusu ile genişlet)
-                        pass
+                        if commission_asset == "BNB":
+                            self._bnb_fee_seen = True
+                        mark = self._mark_usdt(commission_asset) if commission_asset else None
+                        if mark:
+                            fee_usdt += commission * mark
+                        else:
+                            fee_unconverted[commission_asset] = fee_unconverted.get(commission_asset, 0.0) + commission
             except Exception:
                 continue
 
         avg_price = (sum_quote / sum_qty) if sum_qty > 1e-12 else None
+        if base_asset and avg_price:
+            self._remember_price(base_asset, avg_price)
 
         return {
             "orderId": resp.get("orderId"),
@@ -362,4 +530,5 @@ class OrderExecutor:
             "filled_quote": float(sum_quote),
             "avg_fill_price": avg_price,
             "fee_usdt": float(fee_usdt),
+            "fee_unconverted": fee_unconverted,
         }
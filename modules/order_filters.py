@@ -360,8 +360,8 @@ def adjust_qty_for_filters(symbol: str, qty: float) -> float:
 # ==========================
 from core.types import OrderPlan, RiskCheckResult
 from core.exchange_rules import load_rules_for_symbol
-from core.num import quantize_to_step, round_to_tick, safe_mul, ceil_to_step
-from core.cooldown import REGISTRY
+from core.num import quantizer_for
+from core.cooldown import REGISTRY, CooldownRegistry
 from core.logger import logger
 
 
@@ -389,18 +389,21 @@ def _ensure_qty_base(plan: OrderPlan, entry_price: Optional[float]) -> Optional[
 
 def validate_order_plan(plan: OrderPlan,
                         market_state: Optional[Dict[str, Any]] = None,
-                        account_state: Optional[Dict[str, Any]] = None) -> RiskCheckResult:
+                        account_state: Optional[Dict[str, Any]] = None,
+                        now: Optional[float] = None,
+                        cooldown: Optional[CooldownRegistry] = None) -> RiskCheckResult:
     """
     Tek doğrulama noktası:
     - entry_price yoksa market_state.last_price ile doldur
     - qty_base yoksa qty_quote/price ile hesapla
     - tickSize/stepSize uyumu
     - minNotional
-    - cooldown & overtrade guard
+    - cooldown & overtrade guard (now / cooldown: backtest için simülasyon saati ve ayrı kayıt)
     """
     reasons: List[str] = []
     symbol = plan.symbol
     rules = load_rules_for_symbol(symbol)
+    qz = quantizer_for(rules.tick_size, rules.step_size)
 
     # 1) Fiyatı kesinleştir
     entry = _ensure_entry_price(plan, market_state)
@@ -415,8 +418,8 @@ def validate_order_plan(plan: OrderPlan,
         return RiskCheckResult(ok=False, reasons=reasons)
 
     # 3) Tick/step yuvarlamaları
-    adj_entry = round_to_tick(entry, rules.tick_size)
-    adj_qty = quantize_to_step(qty, rules.step_size)
+    adj_entry = qz.round_price(entry)
+    adj_qty = qz.floor_qty(qty)
     if adj_qty <= 0:
         reasons.append("qty_after_step_zero")
         return RiskCheckResult(ok=False, reasons=reasons)
@@ -436,7 +439,7 @@ def validate_order_plan(plan: OrderPlan,
             pass
 
     # 5) Min notional
-    notional = safe_mul(adj_qty, adj_entry)
+    notional = qz.notional(adj_qty, adj_entry)
     if notional is None or notional + 1e-9 < rules.min_notional_usdt:
         # Opsiyonel autoscale (sadece BUY ve yeterli quote varsa)
         allow_auto = _bool_env("ALLOW_MIN_NOTIONAL_AUTOSCALE", False)
@@ -448,16 +451,16 @@ def validate_order_plan(plan: OrderPlan,
             # Min notional için gerekli miktar
             if adj_entry and adj_entry > 0.0:
                 needed_qty = float(rules.min_notional_usdt) / float(adj_entry)
-                auto_qty = ceil_to_step(needed_qty, rules.step_size)
+                auto_qty = qz.ceil_qty(needed_qty)
                 # Yeterli bakiye var mı?
                 needed_quote = auto_qty * float(adj_entry)
                 if quote_free + 1e-9 >= needed_quote:
-                    adj_qty = quantize_to_step(auto_qty, rules.step_size)
-                    notional2 = safe_mul(adj_qty, adj_entry) or 0.0
+                    adj_qty = qz.floor_qty(auto_qty)
+                    notional2 = qz.notional(adj_qty, adj_entry) or 0.0
                     if notional2 + 1e-9 < rules.min_notional_usdt:
                         # bir adım daha artırmayı dene
-                        adj_qty = quantize_to_step(auto_qty + rules.step_size, rules.step_size)
-                        notional2 = safe_mul(adj_qty, adj_entry) or 0.0
+                        adj_qty = qz.floor_qty(auto_qty + rules.step_size)
+                        notional2 = qz.notional(adj_qty, adj_entry) or 0.0
                     if notional2 + 1e-9 >= rules.min_notional_usdt:
                         pass  # autoscale başarılı, devam et
                     else:
@@ -476,8 +479,9 @@ def validate_order_plan(plan: OrderPlan,
     # 6) Cooldown / overtrade guard (TEST_SKIP_COOLDOWN=true ise atla)
     if not _bool_env("TEST_SKIP_COOLDOWN", False):
         import time
-        now = time.time()
-        allowed, why = REGISTRY.can_trade(symbol, now)
+        if now is None:
+            now = time.time()
+        allowed, why = (cooldown or REGISTRY).can_trade(symbol, now)
         if not allowed:
             reasons.append(why)
             return RiskCheckResult(ok=False, reasons=reasons, adjusted_qty=adj_qty, adjusted_entry=adj_entry)
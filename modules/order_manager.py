@@ -23,9 +23,8 @@ class OrderManager:
     def _get_symbol_filters(self):
         """Binance exchangeInfo'dan min qty, tick size, step vs. çeker."""
         try:
-            info = self.client.get_symbol_info(self.symbol)
-            filters = {f['filterType']: f for f in info['filters']}
-            return filters
+            from core.exchange_rules import symbol_filters
+            return symbol_filters(self.symbol, self.client)
         except Exception as e:
             logging.error(f"Symbol info error: {e}")
             return {}
@@ -2,59 +2,158 @@
 Performance Optimization Module
 Strateji parametrelerini grid, random veya bayesian search ile optimize eder.
 Stealth mod ve insanvari davranış için uygundur.
+
+Offline mod (PERF_OPT_OFFLINE=true veya offline=True): denemeler arası gecikme yoktur,
+eval_func core.sweep süreç havuzunda koşar ve erken durdurma (patience / target_score)
+desteklenir. eval_func picklable değilse (lambda, closure) aynı süreçte sırayla koşar.
+
+Sonuç önbelleği (cache=ResultCache|True ya da RESULT_CACHE_ENABLED): anahtar eval_func'ın kod
+sürümü + adı + cache_data_files içeriği + parametreler; önbellekteki denemeler yeniden
+değerlendirilmez (online modda gecikme de atlanır), isabet oranı arama sonunda loglanır.
 """
 
+import os
+import pickle
 import random
 import time
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Optional
 from core.logger import BotLogger
+from core.result_cache import default_cache, func_namespace, stable_hash
+from core.sweep import EarlyStop, TrialResult, grid, run_sweep
 
 logger = BotLogger()
 
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+PERF_OPT_OFFLINE = _bool_env("PERF_OPT_OFFLINE", False)
+PERF_OPT_PATIENCE = _int_env("PERF_OPT_PATIENCE", 0)   # 0 = erken durdurma yok
+
+
+def _call_eval(params: Dict[str, Any], data, eval_func: Callable[[Dict[str, Any]], float]) -> float:
+    # core.sweep deneme imzası -> eval_func(params)
+    return eval_func(params)
+
+
 class PerformanceOptimization:
-    def __init__(self):
+    def __init__(self, offline: Optional[bool] = None, max_workers: Optional[int] = None,
+                 patience: Optional[int] = None, min_delta: float = 0.0,
+                 target_score: Optional[float] = None, cache=None, cache_data_files=()):
         self.best_params = []
         self.best_score = float('-inf')
+        self.offline = PERF_OPT_OFFLINE if offline is None else bool(offline)
+        self.max_workers = max_workers
+        self.patience = patience if patience is not None else (PERF_OPT_PATIENCE or None)
+        self.min_delta = min_delta
+        self.target_score = target_score
+        self.last_run = None  # son offline çalışmanın SweepResults tablosu
+        self.cache = default_cache(cache)
+        self.cache_data_files = tuple(cache_data_files)
+
+    def _cache_key(self, eval_func):
+        if self.cache is None:
+            return None
+        namespace = func_namespace(eval_func, self.cache_data_files)
+        return lambda params: stable_hash(namespace, params)
+
+    def _legacy_eval(self, name, params, eval_func, cache_key):
+        """Online mod tek deneme: önbellekte varsa gecikme ve değerlendirme atlanır."""
+        key = cache_key(params) if cache_key else None
+        score = self.cache.get(key) if key else None
+        try:
+            if score is None:
+                # Stealth: Rastgele gecikme
+                time.sleep(random.uniform(0.1, 0.5))
+                score = eval_func(params)
+                if key and score is not None:
+                    self.cache.put(key, score)
+            logger.info(f"{name}: Params={params}, Score={score:.4f}")
+            self._update_best(params, score)
+        except Exception as e:
+            logger.error(f"{name} error: {e}")
 
     def grid_search(self, param_grid: Dict[str, List[Any]], eval_func: Callable[[Dict[str, Any]], float], max_trials: int = 50):
         """
         Grid search ile parametre optimizasyonu.
         """
+        if self.offline:
+            return self._offline_search("GridSearch", grid(param_grid)[:max_trials], eval_func)
         from itertools import product
         keys = list(param_grid.keys())
         values = list(param_grid.values())
+        cache_key = self._cache_key(eval_func)
+        before = self.cache.stats() if self.cache else None
         trials = 0
         for combination in product(*values):
             if trials >= max_trials:
                 break
             params = dict(zip(keys, combination))
-            # Stealth: Rastgele gecikme
-            time.sleep(random.uniform(0.1, 0.5))
-            try:
-                score = eval_func(params)
-                logger.info(f"GridSearch: Params={params}, Score={score:.4f}")
-                self._update_best(params, score)
-            except Exception as e:
-                logger.error(f"GridSearch error: {e}")
+            self._legacy_eval("GridSearch", params, eval_func, cache_key)
             trials += 1
+        if self.cache:
+            self.cache.report("GridSearch", since=before)
 
     def random_search(self, param_space: Dict[str, List[Any]], eval_func: Callable[[Dict[str, Any]], float], max_trials: int = 50):
         """
         Random search ile parametre optimizasyonu.
         """
+        if self.offline:
+            # Örnekler baştan çekilir (aynı RNG sırası), değerlendirme havuzda
+            samples = [{k: random.choice(v) for k, v in param_space.items()} for _ in range(max_trials)]
+            return self._offline_search("RandomSearch", samples, eval_func)
         keys = list(param_space.keys())
+        cache_key = self._cache_key(eval_func)
+        before = self.cache.stats() if self.cache else None
         trials = 0
         while trials < max_trials:
             params = {k: random.choice(v) for k, v in param_space.items()}
-            # Stealth: Rastgele gecikme
-            time.sleep(random.uniform(0.1, 0.5))
-            try:
-                score = eval_func(params)
-                logger.info(f"RandomSearch: Params={params}, Score={score:.4f}")
-                self._update_best(params, score)
-            except Exception as e:
-                logger.error(f"RandomSearch error: {e}")
+            self._legacy_eval("RandomSearch", params, eval_func, cache_key)
             trials += 1
+        if self.cache:
+            self.cache.report("RandomSearch", since=before)
+
+    def _offline_search(self, name: str, param_sets: List[Dict[str, Any]], eval_func: Callable[[Dict[str, Any]], float]):
+        """
+        Gecikmesiz değerlendirme: süreç havuzu + erken durdurma; sonuçlar bittikçe _update_best.
+        """
+        workers = self.max_workers
+        try:
+            pickle.dumps(eval_func)
+        except Exception:
+            workers = 1
+
+        def _collect(row: TrialResult):
+            if row.error or row.score is None:
+                logger.error(f"{name} error: {row.error or 'score=None'}")
+                return
+            logger.info(f"{name}: Params={row.params}, Score={row.score:.4f}")
+            self._update_best(row.params, row.score)
+
+        stop = None
+        if self.patience or self.target_score is not None:
+            stop = EarlyStop(patience=self.patience, min_delta=self.min_delta, target=self.target_score)
+        before = self.cache.stats() if self.cache else None
+        self.last_run = run_sweep(_call_eval, param_sets, context=eval_func, max_workers=workers,
+                                  on_result=_collect, stop=stop, cache=self.cache,
+                                  cache_key=self._cache_key(eval_func))
+        logger.info(f"{name}: {len(self.last_run.rows)}/{len(param_sets)} deneme, "
+                    f"{self.last_run.trials_per_sec:.1f} deneme/sn"
+                    + (" (erken durduruldu)" if self.last_run.stopped_early else ""))
+        if self.cache:
+            self.cache.report(name, since=before)
+        return self.last_run
 
     def _update_best(self, params: Dict[str, Any], score: float):
         """
@@ -73,25 +172,37 @@ class PerformanceOptimization:
 
 optimizer = PerformanceOptimization()
 
-def eval_func(params):
-    # Burada params ile Strategy örneğini oluşturup simülasyon sonucu döndürmelisin
-    strategy = Strategy()
-    for k, v in params.items():
-        setattr(strategy, k, v)
-    sim_result = strategy.simulate_portfolio(
-        initial_balance=1000,
-        price_data=price_data,
-        days=24,
-        symbols=['BTCUSDT', 'ETHUSDT'],
-        order_split=3
-    )
-    return sim_result[-1]['portfolio_value'] if sim_result else 0
-
-param_grid = {
-    'cooldown_period': [10, 12, 15],
-    'max_position_pct': [0.2, 0.25],
-    'stop_loss_pct': [0.03, 0.05, 0.07],
-    'take_profit_pct': [0.08, 0.10, 0.12]
-}
-optimizer.grid_search(param_grid, eval_func)
-print("En iyi parametreler:", optimizer.get_best_params())
\ No newline at end of file
+
+if __name__ == "__main__":
+    # Örnek: minimal_strategy simülasyonu üzerinde offline grid search
+    import math
+    from minimal_strategy import Strategy
+
+    price_data = {
+        'BTCUSDT': [100 * (1 + 0.08 * math.sin(d / 3)) for d in range(24)],
+        'ETHUSDT': [50 * (1 + 0.12 * math.cos(d / 4)) for d in range(24)],
+    }
+
+    def eval_func(params):
+        strategy = Strategy()
+        strategy.trade_logging = False
+        for k, v in params.items():
+            setattr(strategy, k, v)
+        sim_result = strategy.simulate_portfolio(
+            initial_balance=1000,
+            price_data=price_data,
+            days=24,
+            symbols=['BTCUSDT', 'ETHUSDT'],
+            order_split=3
+        )
+        return sim_result[-1]['portfolio_value'] if sim_result else 0
+
+    param_grid = {
+        'cooldown_period': [10, 12, 15],
+        'max_position_pct': [0.2, 0.25],
+        'stop_loss_pct': [0.03, 0.05, 0.07],
+        'take_profit_pct': [0.08, 0.10, 0.12]
+    }
+    demo = PerformanceOptimization(offline=True)
+    demo.grid_search(param_grid, eval_func)
+    print("En iyi parametreler:", demo.get_best_params())
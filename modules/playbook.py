@@ -5,18 +5,25 @@ modules/playbook.py
 """
 from __future__ import annotations
 
+import heapq
 import os as _os
+
+import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
 
 from modules.technical_analysis import calculate_ema, calculate_atr, calculate_bbands, calculate_vwap, calculate_adx
+from modules.indicator_engine import series_key
+from core.bars import Bars, CLOSE, column
 
 
-def regime_on(ohlcv_15m: List[Tuple[float, float, float, float, float, float]], adx_min: float = None) -> bool:
-    """EMA20>EMA50 ve ADX14>threshold -> trend ON."""
+def regime_on(ohlcv_15m: List[Tuple[float, float, float, float, float, float]], adx_min: float = None,
+              symbol: Optional[str] = None) -> bool:
+    """EMA20>EMA50 ve ADX14>threshold -> trend ON. symbol verilirse EMA'lar önbellekten."""
     adx_thr = float(_os.getenv("TREND_ADX_MIN", "18")) if adx_min is None else float(adx_min)
-    closes = [c[4] for c in ohlcv_15m]
-    ema20 = calculate_ema(closes, 20) or []
-    ema50 = calculate_ema(closes, 50) or []
+    closes = column(ohlcv_15m, CLOSE)
+    key = series_key(symbol, "15m", ohlcv_15m)
+    ema20 = calculate_ema(closes, 20, key=key) or []
+    ema50 = calculate_ema(closes, 50, key=key) or []
     if not ema20 or not ema50:
         return False
     on = (ema20[-1] > ema50[-1])
@@ -26,9 +33,18 @@ def regime_on(ohlcv_15m: List[Tuple[float, float, float, float, float, float]],
     return bool(on and (adx >= adx_thr))
 
 
+def regime_on_snapshot(snap: Dict[str, Any], adx_min: float = None) -> bool:
+    """regime_on'un artımlı sürümü: core.indicator_state anlık görüntüsünden (ema20, ema50, adx14)."""
+    adx_thr = float(_os.getenv("TREND_ADX_MIN", "18")) if adx_min is None else float(adx_min)
+    ema20, ema50, adx = snap.get("ema20"), snap.get("ema50"), snap.get("adx14")
+    if ema20 is None or ema50 is None or adx is None:
+        return False
+    return bool(ema20 > ema50 and adx >= adx_thr)
+
+
 def bb_squeeze_breakout_signal(ohlcv_1m: List[Tuple[float, float, float, float, float, float]], vol_mult: float = 2.0) -> bool:
     """BB daralma (bant genişliği düşüklüğü) sonrası üst bant kırılımı ve fiyat VWAP üstünde ise True."""
-    closes = [c[4] for c in ohlcv_1m]
+    closes = column(ohlcv_1m, CLOSE)
     mids, uppers, lowers = calculate_bbands(closes, period=20, std_mult=vol_mult)
     if not uppers:
         return False
@@ -40,7 +56,9 @@ def bb_squeeze_breakout_signal(ohlcv_1m: List[Tuple[float, float, float, float,
             widths.append((uppers[i] - lowers[i]) / mids[i])
     if not widths:
         return False
-    thresh = sorted(widths)[max(0, int(len(widths) * 0.2) - 1)]
+    # sorted(widths)[k] ile aynı; tam sıralama yerine k+1 en küçük
+    k = max(0, int(len(widths) * 0.2) - 1)
+    thresh = heapq.nsmallest(k + 1, widths)[-1]
     # Breakout: son close üst bandın hafif üstünde
     breakout = closes[-1] > uppers[-1] * 1.0005
     vwap = calculate_vwap(ohlcv_1m, lookback=50) or 0
@@ -48,16 +66,32 @@ def bb_squeeze_breakout_signal(ohlcv_1m: List[Tuple[float, float, float, float,
     return bool(bw <= thresh and breakout and above_vwap)
 
 
-def pullback_signal(ohlcv_1m: List[Tuple[float, float, float, float, float, float]]) -> bool:
-    """EMA20 pullback + RSI(2)<=10 ve geri dönüş mumu."""
-    closes = [c[4] for c in ohlcv_1m]
-    ema20 = calculate_ema(closes, 20)
+def bb_squeeze_breakout_snapshot(snap: Dict[str, Any]) -> bool:
+    """
+    bb_squeeze_breakout_signal'in artımlı sürümü: genişlik eşiği core.indicator_state'in
+    kayan yüzdeliğinden (bb_squeeze_thr, bar başına O(log n)) okunur.
+    """
+    close, upper = snap.get("close"), snap.get("bb_upper")
+    bw, thresh = snap.get("bb_width"), snap.get("bb_squeeze_thr")
+    if close is None or upper is None or bw is None or thresh is None:
+        return False
+    breakout = close > upper * 1.0005
+    above_vwap = close >= (snap.get("vwap50") or 0)
+    return bool(bw <= thresh and breakout and above_vwap)
+
+
+def pullback_signal(ohlcv_1m: List[Tuple[float, float, float, float, float, float]],
+                    symbol: Optional[str] = None) -> bool:
+    """EMA20 pullback + RSI(2)<=10 ve geri dönüş mumu. symbol verilirse seriler önbellekten."""
+    closes = column(ohlcv_1m, CLOSE)
+    key = series_key(symbol, "1m", ohlcv_1m)
+    ema20 = calculate_ema(closes, 20, key=key)
     if not ema20:
         return False
     try:
         # RSI(2)
         from utils.signal_utils import calculate_rsi
-        rsi2_list = calculate_rsi(closes, period=2)
+        rsi2_list = calculate_rsi(closes, period=2, key=key)
         rsi2 = rsi2_list[-1] if rsi2_list else 50
     except Exception:
         rsi2 = 50
@@ -96,6 +130,11 @@ def _calc_atr14(ohlcv, period=14) -> float | None:
     try:
         if not ohlcv or len(ohlcv) < period + 1:
             return None
+        if isinstance(ohlcv, Bars):
+            # Sütun görünümlerinden; toplam sırası aşağıdaki döngüyle aynı
+            h, lo, c0 = ohlcv.high[-period:], ohlcv.low[-period:], ohlcv.close[-period - 1:-1]
+            trs = np.maximum(h - lo, np.maximum(np.abs(h - c0), np.abs(lo - c0)))
+            return sum(trs.tolist()) / period
         trs = []
         for i in range(1, len(ohlcv)):
             h1, l1, c0 = float(ohlcv[i][2]), float(ohlcv[i][3]), float(ohlcv[i-1][4])
@@ -4,18 +4,56 @@ Strateji parametrelerini geçmiş veriye göre optimize eder.
 Stealth mod, loglama ve hata toleransı içerir.
 """
 
+import inspect
+import os
 import random
 from core.logger import BotLogger
+from core.result_cache import default_cache, func_namespace, stable_hash
 
 logger = BotLogger()
 
-def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_type="random", max_trials=20, update_settings=False):
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+# 'tpe' araması: en kısa geçmiş oranı ve basamak çarpanı (successive halving)
+OPT_MIN_BUDGET = _float_env("OPT_MIN_BUDGET", 1.0 / 9)
+OPT_ETA = _int_env("OPT_ETA", 3)
+
+
+def _accepts_budget(func) -> bool:
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "budget" or p.kind is inspect.Parameter.VAR_KEYWORD for p in params)
+
+
+def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_type="random", max_trials=20, update_settings=False, seed=None, cache=None, cache_data_files=()):
     """
     Strateji parametrelerini optimize eder.
     backtest_func: parametreleri alıp skor döndüren fonksiyon (zorunlu!).
     param_grid: {'STOP_LOSS_RATIO': [0.003, 0.005, 0.007], ...}
-    search_type: 'random' veya 'grid'
+    search_type: 'random', 'grid' veya 'tpe'
     update_settings: True ise en iyi parametreler settings'e yazılır.
+    'tpe': TPE önerileri + successive halving (modules/tpe_search.py); max_trials tam geçmiş
+    eşdeğeri bütçedir. backtest_func `budget` (geçmiş oranı, 0-1) argümanı alıyorsa adaylar önce
+    kısa geçmişte denenir, yalnızca umut verenler tam geçmişte koşar; almıyorsa yalnız TPE.
+    cache: ResultCache | True | None (RESULT_CACHE_ENABLED). Anahtar: backtest_func kod sürümü +
+    adı (+ cache_token()) + cache_data_files içeriği + parametreler (+ budget); tüm arama
+    türleri aynı tam geçmiş kayıtlarını paylaşır. Kod sürümü yalnız backtest_func'ın kendi
+    modülüdür: çağırdığı modüller ve bellekteki veri için cache_token() gerekir (func_namespace).
     """
     if backtest_func is None:
         logger.warning("optimize_strategy_parameters: backtest_func belirtilmedi, gerçek optimizasyon yapılmayacak!")
@@ -33,8 +71,9 @@ def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_typ
     }
     if not param_grid:
         param_grid = default_grid
-    else:
-        # Eksik anahtarlar için varsayılanları ekle
+    elif search_type != "tpe":
+        # Eksik anahtarlar için varsayılanları ekle (tpe: yalnız verilen uzay; skor fonksiyonunun
+        # okumadığı anahtarlar uzayı ve başlangıç denemelerini büyütüp aynı yapılandırmayı tekrarlatır)
         for k, v in default_grid.items():
             if k not in param_grid:
                 param_grid[k] = v
@@ -49,7 +88,35 @@ def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_typ
     def params_to_tuple(params):
         return tuple(params[k] for k in keys)
 
-    if search_type == "grid":
+    cache = default_cache(cache)
+    namespace = func_namespace(backtest_func, tuple(cache_data_files)) if cache is not None else ""
+    before = cache.stats() if cache is not None else None
+
+    def evaluate(params):
+        if cache is None:
+            return backtest_func(params)
+        key = stable_hash(namespace, params, 1.0)
+        score = cache.get(key)
+        if score is None:
+            score = backtest_func(params)
+            if score is not None:
+                cache.put(key, score)
+        return score
+
+    if search_type == "tpe":
+        from modules.tpe_search import TPEHalvingSearch
+        min_budget = OPT_MIN_BUDGET if _accepts_budget(backtest_func) else 1.0
+        search = TPEHalvingSearch(param_grid, min_budget=min_budget, eta=OPT_ETA, seed=seed,
+                                  cache=cache, cache_namespace=namespace)
+        res = search.run(backtest_func, total_budget=max_trials)
+        for ev in res.history:
+            if ev.score is not None:
+                logger.info(f"TPESearch: Params={ev.params}, budget={ev.budget:.3f}, Score={ev.score:.4f}")
+        trials = len(res.history)
+        if res.best_params:
+            best_params, best_score = res.best_params, res.best_score
+        logger.info(f"TPESearch: {trials} değerlendirme, {res.budget_used:.2f} tam geçmiş eşdeğeri bütçe")
+    elif search_type == "grid":
         from itertools import product
         for combination in product(*values):
             params = dict(zip(keys, combination))
@@ -58,7 +125,7 @@ def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_typ
                 continue
             tried_combinations.add(params_tuple)
             try:
-                score = backtest_func(params)
+                score = evaluate(params)
                 logger.info(f"GridSearch: Params={params}, Score={score:.4f}")
                 if score > best_score:
                     best_score = score
@@ -76,7 +143,7 @@ def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_typ
                 continue
             tried_combinations.add(params_tuple)
             try:
-                score = backtest_func(params)
+                score = evaluate(params)
                 logger.info(f"RandomSearch: Params={params}, Score={score:.4f}")
                 if score > best_score:
                     best_score = score
@@ -86,6 +153,8 @@ def optimize_strategy_parameters(backtest_func=None, param_grid=None, search_typ
             trials += 1
 
     logger.info(f"Best params: {best_params}, Best score: {best_score:.4f}")
+    if cache is not None:
+        cache.report("optimize_strategy_parameters", since=before)
 
     # İstenirse settings'e yaz
     if update_settings and best_params:
@@ -2,16 +2,38 @@
 Module: technical_analysis.py
 Provides functions to fetch market data (OHLCV) and compute technical indicators: RSI, MACD, ATR, momentum.
 Includes robust error handling and logging.
+
+NumPy varsa hesaplar `modules/indicators_np` ile yapılır (aynı imza ve çıktı);
+`TA_NUMPY=false` ile aşağıdaki saf Python döngülerine dönülür. RSI / EMA ortak
+`modules/indicator_engine` üzerinden (önbellekli) hesaplanır. VWAP yalnızca son
+`lookback` barı okuduğundan saf Python'da kalır.
 """
+import os
 import requests
 import random
 import time
 from typing import List, Tuple, Optional
 
 from core.logger import BotLogger
+from modules.indicator_engine import rsi_series, ema_series
+
+try:
+    from modules import indicators_np as _np_ind
+except Exception:  # numpy yoksa saf Python
+    _np_ind = None
 
 logger = BotLogger()
 
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+USE_NUMPY = _np_ind is not None and _bool_env("TA_NUMPY", True)
+
 def fetch_ohlcv_from_binance(
     symbol: str = "BTCUSDT",
     interval: str = "1h",
@@ -48,40 +70,24 @@ def fetch_ohlcv_from_binance(
         logger.error(f"fetch_ohlcv_from_binance error: {e}")
         return []
 
-def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
+def calculate_rsi(prices: List[float], period: int = 14, key=None) -> List[float]:
     """
     RSI hesaplar. Hatalara karşı güvenli, minimum veri kontrolü içerir.
+    Tohum değeri olmadan döner (ilk değer period+1. değişimden sonra).
     """
     if len(prices) < period + 1:
         logger.warning("RSI: Yetersiz veri.")
         return []
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    gains = [max(delta, 0) for delta in deltas]
-    losses = [abs(min(delta, 0)) for delta in deltas]
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
-    rsi: List[float] = []
-    for i in range(period, len(prices)-1):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        rs = avg_gain / avg_loss if avg_loss != 0 else 0
-        rsi.append(100 - (100 / (1 + rs)))
-    # Warmup döneminde eksik değerler için None bırakmayı tercih edebiliriz;
-    # burada basitçe hesaplananları döndürüyoruz, signals tarafı None filtreleyecek.
-    return rsi
-
-def calculate_ema(prices: List[float], period: int) -> List[float]:
+    return rsi_series(prices, period, key=key)[period + 1:]
+
+def calculate_ema(prices: List[float], period: int, key=None) -> List[float]:
     """
     EMA hesaplar. Hatalara karşı güvenli.
     """
-    if not prices or period <= 0 or len(prices) < period:
+    if len(prices) == 0 or period <= 0 or len(prices) < period:
         logger.warning("EMA: Yetersiz veri veya yanlış parametre.")
         return []
-    ema = [sum(prices[:period]) / period]
-    k = 2 / (period + 1)
-    for price in prices[period:]:
-        ema.append(price * k + ema[-1] * (1 - k))
-    return ema
+    return ema_series(prices, period, key=key)[period - 1:]
 
 def calculate_macd(
     prices: List[float],
@@ -95,6 +101,9 @@ def calculate_macd(
     if len(prices) < slow_period + signal_period:
         logger.warning("MACD: Yetersiz veri.")
         return [], [], []
+    if USE_NUMPY:
+        line, signal, hist = _np_ind.macd(prices, fast_period, slow_period, signal_period)
+        return line.tolist(), signal.tolist(), hist.tolist()
     ema_fast = calculate_ema(prices, fast_period)
     ema_slow = calculate_ema(prices, slow_period)
     min_len = min(len(ema_fast), len(ema_slow))
@@ -114,6 +123,8 @@ def calculate_atr(
     if len(ohlcv) < period + 1:
         logger.warning("ATR: Yetersiz veri.")
         return None
+    if USE_NUMPY:
+        return _np_ind.atr(ohlcv, period)
     trs = []
     for i in range(1, len(ohlcv)):
         high = ohlcv[i][2]
@@ -134,6 +145,8 @@ def calculate_momentum(prices: List[float], period: int = 10) -> List[float]:
     if len(prices) < period + 1:
         logger.warning("Momentum: Yetersiz veri.")
         return []
+    if USE_NUMPY:
+        return _np_ind.momentum(prices, period).tolist()
     return [prices[i] - prices[i - period] for i in range(period, len(prices))]
 
 def calculate_bbands(prices: List[float], period: int = 20, std_mult: float = 2.0) -> Tuple[List[float], List[float], List[float]]:
@@ -141,6 +154,9 @@ def calculate_bbands(prices: List[float], period: int = 20, std_mult: float = 2.
     if len(prices) < period:
         logger.warning("BBANDS: Yetersiz veri.")
         return [], [], []
+    if USE_NUMPY:
+        mids, uppers, lowers = _np_ind.bbands(prices, period, std_mult)
+        return mids.tolist(), uppers.tolist(), lowers.tolist()
     mids, uppers, lowers = [], [], []
     for i in range(period - 1, len(prices)):
         window = prices[i - period + 1:i + 1]
@@ -173,6 +189,8 @@ def calculate_adx(ohlcv: List[Tuple[float, float, float, float, float, float]],
     if len(ohlcv) < period + 1:
         logger.warning("ADX: Yetersiz veri.")
         return None
+    if USE_NUMPY:
+        return _np_ind.adx(ohlcv, period)
     highs = [x[2] for x in ohlcv]
     lows = [x[3] for x in ohlcv]
     closes = [x[4] for x in ohlcv]
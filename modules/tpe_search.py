@@ -0,0 +1,227 @@
+"""TPE örnekleyici + successive halving (BOHB benzeri), saf Python/NumPy.
+
+Arama uzayı strategy_optimizer ile aynı biçimdedir: {'PARAM': [değer1, değer2, ...]}.
+Sayısal listeler sıralı kabul edilir (komşu değerler benzer), diğerleri kategoriktir.
+
+Bütçe (budget) geçmişin kullanılan oranıdır (0 < b <= 1). Her turda `eta^(rung-1)` yapılandırma
+en düşük bütçede (kısa geçmiş) denenir, her basamakta en iyi 1/eta'sı bir üst bütçeye
+terfi eder; yalnızca umut verenler tam geçmişte koşar. Yeni yapılandırmalar, yeterli gözlem
+olan en yüksek bütçedeki sonuçlardan TPE ile önerilir: iyi (ilk gamma) ve kötü gözlemlerin
+boyut başına Parzen yoğunlukları l(x) / g(x) oranı en yüksek aday seçilir.
+
+Kullanım:
+    search = TPEHalvingSearch(space, min_budget=1/9, seed=1)
+    res = search.run(lambda p, budget: backtest(p, budget), total_budget=20)
+    res.best_params, res.best_score
+"""
+from __future__ import annotations
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.result_cache import ResultCache, stable_hash
+from core.sweep import run_sweep
+
+log = logging.getLogger("silent_core")
+
+Space = Dict[str, Sequence[Any]]
+
+
+def _is_numeric(values: Sequence[Any]) -> bool:
+    return all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+
+
+class TPESampler:
+    """Ayrık uzayda TPE; gözlemler (params, score) çiftleri, büyük skor iyidir."""
+
+    def __init__(self, space: Space, gamma: float = 0.25, n_candidates: int = 24,
+                 n_startup: Optional[int] = None, prior_weight: float = 1.0,
+                 rng: Optional[np.random.Generator] = None):
+        self.keys = list(space.keys())
+        self.values = [list(space[k]) for k in self.keys]
+        self.sizes = np.array([len(v) for v in self.values])
+        # Sayısal boyutlarda çekirdek sıra (rank) uzayında: komşu değerler benzer
+        self.rank = [np.argsort(np.argsort(v)) if _is_numeric(v) else None for v in self.values]
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.n_startup = n_startup if n_startup is not None else len(self.keys) + 2
+        self.prior_weight = prior_weight
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def encode(self, params: Dict[str, Any]) -> Tuple[int, ...]:
+        return tuple(self.values[d].index(params[k]) for d, k in enumerate(self.keys))
+
+    def decode(self, idx: Sequence[int]) -> Dict[str, Any]:
+        return {k: self.values[d][int(i)] for d, (k, i) in enumerate(zip(self.keys, idx))}
+
+    def _random(self) -> Tuple[int, ...]:
+        return tuple(int(self.rng.integers(0, n)) for n in self.sizes)
+
+    def _kernel(self, d: int, centers: np.ndarray) -> np.ndarray:
+        """Boyut d için merkezlerin (indeks) ayrık yoğunluğu: (len(centers), K) satır normalize."""
+        k = int(self.sizes[d])
+        if self.rank[d] is None or k <= 2:
+            dens = np.zeros((centers.shape[0], k))
+            dens[np.arange(centers.shape[0]), centers] = 1.0
+            return dens
+        r = self.rank[d]
+        bw = max(1.0, k / (1.0 + centers.shape[0]) ** 0.5) * 0.5
+        dens = np.exp(-0.5 * ((r[None, :] - r[centers][:, None]) / bw) ** 2)
+        return dens / dens.sum(axis=1, keepdims=True)
+
+    def _density(self, d: int, centers: np.ndarray) -> np.ndarray:
+        k = int(self.sizes[d])
+        mix = self._kernel(d, centers).sum(axis=0) + self.prior_weight / k
+        return mix / mix.sum()
+
+    def suggest(self, observations: List[Tuple[Tuple[int, ...], float]], n: int = 1,
+                exclude: Optional[set] = None) -> List[Tuple[int, ...]]:
+        """n öneri (indeks demetleri); `exclude` içindekiler ve birbirinin tekrarı atlanır."""
+        exclude = set(exclude or ())
+        total = int(np.prod(self.sizes, dtype=np.float64)) if self.sizes.size else 0
+        out: List[Tuple[int, ...]] = []
+        for _ in range(n):
+            if len(exclude) >= total:
+                break
+            pick = self._suggest_one(observations, exclude)
+            out.append(pick)
+            exclude.add(pick)
+        return out
+
+    def _suggest_one(self, observations, exclude: set) -> Tuple[int, ...]:
+        if len(observations) < self.n_startup:
+            return self._unique_random(exclude)
+        xs = np.array([o[0] for o in observations], dtype=np.int64)
+        ys = np.array([o[1] for o in observations], dtype=np.float64)
+        order = np.argsort(-ys, kind="stable")
+        n_good = max(1, int(math.ceil(self.gamma * len(order))))
+        good, bad = xs[order[:n_good]], xs[order[n_good:]]
+        score = np.zeros((self.n_candidates,))
+        cand = np.empty((self.n_candidates, len(self.keys)), dtype=np.int64)
+        for d in range(len(self.keys)):
+            l_dens = self._density(d, good[:, d])
+            g_dens = self._density(d, bad[:, d]) if bad.shape[0] else np.full(l_dens.shape, 1.0 / l_dens.shape[0])
+            cand[:, d] = self.rng.choice(l_dens.shape[0], size=self.n_candidates, p=l_dens)
+            score += np.log(l_dens[cand[:, d]]) - np.log(g_dens[cand[:, d]])
+        for j in np.argsort(-score, kind="stable"):
+            pick = tuple(int(v) for v in cand[j])
+            if pick not in exclude:
+                return pick
+        return self._unique_random(exclude)
+
+    def _unique_random(self, exclude: set) -> Tuple[int, ...]:
+        for _ in range(1000):
+            pick = self._random()
+            if pick not in exclude:
+                return pick
+        # Uzay neredeyse dolu: ilk boş noktayı tara
+        for flat in range(int(np.prod(self.sizes))):
+            pick = tuple(int(v) for v in np.unravel_index(flat, tuple(self.sizes)))
+            if pick not in exclude:
+                return pick
+        return self._random()
+
+
+@dataclass
+class Evaluation:
+    params: Dict[str, Any]
+    budget: float
+    score: Optional[float]
+
+
+@dataclass
+class SearchResult:
+    best_params: Dict[str, Any]
+    best_score: float
+    history: List[Evaluation] = field(default_factory=list)
+    budget_used: float = 0.0
+
+
+def _evaluate_at(params: Dict[str, Any], data, ctx) -> float:
+    # core.sweep deneme imzası -> tam geçmişte func(params), kısada func(params, budget=b)
+    func, budget = ctx
+    return func(params) if budget >= 1.0 else func(params, budget=budget)
+
+
+class TPEHalvingSearch:
+    """TPE önerileri + successive halving; `total_budget` tam geçmiş eşdeğeri değerlendirme sayısıdır."""
+
+    def __init__(self, space: Space, min_budget: float = 1.0 / 9, eta: int = 3,
+                 gamma: float = 0.25, n_candidates: int = 24, seed: Optional[int] = None,
+                 max_workers: Optional[int] = 1, cache: Optional[ResultCache] = None,
+                 cache_namespace: str = ""):
+        """cache: değerlendirmeler (cache_namespace, params, budget) anahtarıyla saklanır."""
+        self.eta = max(2, int(eta))
+        self.min_budget = min(1.0, max(1e-6, float(min_budget)))
+        # Basamak bütçeleri: min_budget * eta^r, son basamak tam geçmiş (1.0)
+        n_rungs = 1 + max(0, int(round(math.log(1.0 / self.min_budget, self.eta))))
+        self.budgets = [float(self.eta) ** (r - n_rungs + 1) for r in range(n_rungs)]
+        self.sampler = TPESampler(space, gamma=gamma, n_candidates=n_candidates,
+                                  rng=np.random.default_rng(seed))
+        self.max_workers = max_workers
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+        self.obs: Dict[float, Dict[Tuple[int, ...], float]] = {b: {} for b in self.budgets}
+
+    def _model_obs(self) -> List[Tuple[Tuple[int, ...], float]]:
+        # Yeterli gözlem olan en yüksek bütçe (BOHB kuralı)
+        for b in reversed(self.budgets):
+            if len(self.obs[b]) >= self.sampler.n_startup:
+                return list(self.obs[b].items())
+        return list(self.obs[self.budgets[0]].items())
+
+    def _evaluate(self, func, idxs: List[Tuple[int, ...]], budget: float, result: SearchResult) -> None:
+        params = [self.sampler.decode(i) for i in idxs]
+        key = (lambda p: stable_hash(self.cache_namespace, p, budget)) if self.cache is not None else None
+        rows = run_sweep(_evaluate_at, params, context=(func, budget), max_workers=self.max_workers,
+                         cache=self.cache, cache_key=key).rows
+        for row in sorted(rows, key=lambda r: r.index):
+            if row.error:
+                log.error(f"TPEHalvingSearch: Params={row.params}, budget={budget:.3f}, hata: {row.error}")
+            score = row.score if row.score is not None and math.isfinite(row.score) else -math.inf
+            self.obs[budget][idxs[row.index]] = score
+            result.history.append(Evaluation(row.params, budget, row.score))
+            result.budget_used += budget
+
+    def run(self, func: Callable[..., float], total_budget: float) -> SearchResult:
+        """Skor büyük = iyi. Kısa geçmişte func(params, budget=b), tam geçmişte func(params);
+        min_budget=1.0 ise basamak yoktur (yalnız TPE) ve budget hiç geçirilmez."""
+        budgets = self.budgets
+        result = SearchResult(best_params={}, best_score=-math.inf)
+        while result.budget_used < total_budget - 1e-9:
+            used = result.budget_used
+            left = total_budget - result.budget_used
+            # Kalan bütçeye sığan en büyük turu kur: n_r = n0 / eta^r
+            n0 = self.eta ** (len(budgets) - 1)
+            while n0 > 1 and sum(max(1, n0 // self.eta ** r) * b for r, b in enumerate(budgets)) > left + 1e-9:
+                n0 //= self.eta
+            seen = set(self.obs[budgets[0]])
+            idxs = self.sampler.suggest(self._model_obs(), n=n0, exclude=seen)
+            if not idxs:
+                break   # uzay tükendi
+            for r, b in enumerate(budgets):
+                if r > 0:
+                    keep = max(1, len(idxs) // self.eta)
+                    ranked = sorted(idxs, key=lambda i: self.obs[budgets[r - 1]][i], reverse=True)
+                    idxs = [i for i in ranked[:keep] if i not in self.obs[b]]
+                if not idxs or result.budget_used + b * len(idxs) > total_budget + 1e-9:
+                    break
+                self._evaluate(func, idxs, b, result)
+            if result.budget_used == used:
+                break   # kalan bütçe en küçük basamağa bile yetmiyor
+        top = budgets[-1]
+        for b in reversed(budgets):
+            scored = {i: s for i, s in self.obs[b].items() if s > -math.inf}
+            if scored:
+                best = max(scored, key=scored.get)
+                result.best_params, result.best_score = self.sampler.decode(best), scored[best]
+                if b < top:
+                    log.warning(f"TPEHalvingSearch: tam geçmişte değerlendirme yok, en iyi sonuç budget={b:.3f}")
+                break
+        return result
+
+
+__all__ = ["TPESampler", "TPEHalvingSearch", "SearchResult", "Evaluation"]
@@ -75,6 +75,15 @@ def detect_sell_signal(candles: List[dict], volumes: List[float],
         return True
     return False
 
+def debounce(kind: str, fired: bool) -> bool:
+    """Dışarıda (ör. toplu tarama) hesaplanmış ham sinyale detect_* ile aynı debounce kuralı."""
+    now = time.time()
+    if now - _last_signal_time[kind] < _DEBOUNCE_SEC:
+        return False
+    if fired:
+        _last_signal_time[kind] = now
+    return bool(fired)
+
 def detect_strong_reversal_sell(candles: List[dict], rsi: List[float], ema9: List[float], ema21: List[float],
                                 period: int = 1, position_open: bool = False) -> bool:
     now = time.time()
@@ -32,6 +32,8 @@ import numpy as np
 from binance import ThreadedWebsocketManager
 from binance.client import Client
 
+from modules.indicator_engine import rsi_series
+
 # --- Ayarlar ---
 BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
 BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
@@ -201,19 +203,10 @@ class SimpleTrendPredictor:
 
 # --- RSI hesaplama fonksiyonu ---
 def calculate_rsi(prices, period=14):
-    """Basit RSI hesaplama fonksiyonu"""
+    """Basit RSI hesaplama fonksiyonu (son `period` değişimin ortalaması)"""
     if len(prices) < period + 1:
         return 50  # Nötr RSI
-    deltas = np.diff(prices)
-    ups = deltas.clip(min=0)
-    downs = -deltas.clip(max=0)
-    avg_gain = np.mean(ups[-period:])
-    avg_loss = np.mean(downs[-period:])
-    if avg_loss == 0:
-        return 100
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return rsi_series(prices, period, method="sma")[-1]
 
 # --- Ana analiz fonksiyonu ---
 def run_onchain_alternative(symbol="BTCUSDT", coin_id="bitcoin"):
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Ana döngü kline ayrıştırması: eski liste / dict / tuple kopyaları vs core.bars.Bars.
+
+Bir tur, ana döngünün teknik veri hazırlığını taklit eder: 1m (10 ve 200 bar), 3m (3 bar)
+ve 15m (100 bar) yanıtları ayrıştırılır, ardından detect_buy_signal, playbook.pullback_signal,
+compute_stop_and_size ve VWAP / volatilite hesapları çalışır. Bars yolunda 1m tek pencere
+olarak ayrıştırılır (KlineCache.get_bars 10 barlık isteği 200 barlık pencerenin dilimi olarak
+döner). Ham yanıtlar Binance biçimindedir (sayılar str). tracemalloc ile tur sonunda canlı
+kalan blok sayısı ve tepe bellek ölçülür.
+Çalıştır:
+  python scripts/bench_bars.py
+"""
+from __future__ import annotations
+import os, sys, random, time, tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.bars import Bars  # noqa: E402
+from modules import playbook  # noqa: E402
+from modules.signals import detect_buy_signal  # noqa: E402
+
+CYCLES = int(os.getenv("BENCH_CYCLES", "200"))
+_MIN = 60_000
+
+
+def _raw(n: int, step: int = _MIN):
+    rnd = random.Random(n)
+    p, rows = 100.0, []
+    for i in range(n):
+        o = p
+        p *= 1 + rnd.gauss(0, 0.002)
+        rows.append([i * step, f"{o:.8f}", f"{max(o, p) * 1.001:.8f}", f"{min(o, p) * 0.999:.8f}", f"{p:.8f}",
+                     f"{rnd.uniform(1, 50):.8f}", i * step + step - 1, "0", 10, "0", "0", "0"])
+    return rows
+
+
+RAW = {("1m", 10): _raw(200)[-10:], ("1m", 200): _raw(200), ("3m", 3): _raw(3, 3 * _MIN),
+       ("15m", 100): _raw(100, 15 * _MIN)}
+
+
+def old_cycle():
+    klines_1m = RAW[("1m", 10)]
+    closes_1m = [float(k[4]) for k in klines_1m]
+    volumes_1m = [float(k[5]) for k in klines_1m]
+    candles_1m = [{'open': float(k[1]), 'close': float(k[4])} for k in klines_1m]
+    candles_3m = [{'open': float(k[1]), 'close': float(k[4])} for k in RAW[("3m", 3)]]
+    ohlcv_15m = [tuple(float(v) for v in x[:6]) for x in RAW[("15m", 100)]]
+    ohlcv_1m = [(float(x[0]), float(x[1]), float(x[2]), float(x[3]), float(x[4]), float(x[5])) for x in RAW[("1m", 200)]]
+    vwap = [(float(x[1]) + float(x[4])) / 2.0 for x in ohlcv_1m][-3:]
+    vol = abs((ohlcv_1m[-1][4] - ohlcv_1m[-2][4]) / ohlcv_1m[-2][4])
+    out = (detect_buy_signal(candles_1m, candles_3m, volumes_1m), playbook.pullback_signal(ohlcv_1m),
+           playbook.compute_stop_and_size(ohlcv_1m[-1][4], ohlcv_1m, 1000.0), vwap, vol)
+    return out, (closes_1m, volumes_1m, candles_1m, candles_3m, ohlcv_15m, ohlcv_1m)
+
+
+def new_cycle():
+    ohlcv_1m = Bars.from_klines(RAW[("1m", 200)])
+    bars_1m = ohlcv_1m[-10:]
+    candles_3m = Bars.from_klines(RAW[("3m", 3)]).candles
+    bars_15m = Bars.from_klines(RAW[("15m", 100)])
+    vwap = ((ohlcv_1m.open[-3:] + ohlcv_1m.close[-3:]) / 2.0).tolist()
+    c = ohlcv_1m.close
+    vol = abs((c[-1] - c[-2]) / c[-2])
+    out = (detect_buy_signal(bars_1m.candles, candles_3m, bars_1m.volume), playbook.pullback_signal(ohlcv_1m),
+           playbook.compute_stop_and_size(ohlcv_1m[-1][4], ohlcv_1m, 1000.0), vwap, vol)
+    return out, (bars_1m, candles_3m, bars_15m, ohlcv_1m)
+
+
+def _measure(fn):
+    fn()  # ısınma (import / önbellek)
+    t0 = time.perf_counter()
+    for _ in range(CYCLES):
+        fn()
+    per_cycle = (time.perf_counter() - t0) / CYCLES
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    kept = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    size = sum(s.size_diff for s in stats if s.size_diff > 0)
+    del kept
+    return per_cycle, blocks, size, peak
+
+
+def main() -> None:
+    a, b = old_cycle()[0], new_cycle()[0]
+    assert a[:3] == b[:3] and all(abs(x - y) < 1e-12 for x, y in zip(a[3], b[3]))
+    print(f"{'path':<10} {'µs/cycle':>10} {'live blocks':>12} {'live KB':>9} {'peak KB':>9}")
+    for name, fn in (("lists", old_cycle), ("bars", new_cycle)):
+        t, blocks, size, peak = _measure(fn)
+        print(f"{name:<10} {t * 1e6:>10.1f} {blocks:>12} {size / 1024:>9.1f} {peak / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
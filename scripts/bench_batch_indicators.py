@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Evren skorlama: sembol bazlı yol vs (semboller × barlar) toplu yol.
+
+Tohumlu rastgele yürüyüş klineları (varsayılan 500 sembol × 200 bar) bellekte hazırlanır;
+API gecikmesi ölçüme girmez. İki seviye ölçülür:
+  indicators: RSI14 / EMA9,14,21 / ATR14 / volatilite / range — sembol başına
+              indicator_engine + Python döngüsü vs indicators_batch.indicator_matrices
+  score:      çekilmiş veriden score_symbol döngüsü vs score_universe
+  scan:       uçtan uca (kline ayrıştırma dahil) fetch + score_symbol vs indicators=False + score_universe
+Çalıştır:
+  python scripts/bench_batch_indicators.py
+  BENCH_SYMBOLS=1000 BENCH_BARS=30 python scripts/bench_batch_indicators.py
+"""
+from __future__ import annotations
+import os, sys, random, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from modules import coin_scanner  # noqa: E402
+from modules import indicators_batch as batch  # noqa: E402
+from modules import trend_signals  # noqa: E402
+from modules.indicator_engine import ENGINE, ema_series, rsi_series  # noqa: E402
+
+SYMBOLS = int(os.getenv("BENCH_SYMBOLS", "500"))
+BARS = int(os.getenv("BENCH_BARS", "200"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "3"))
+
+
+def _klines(symbol: str, n: int):
+    rnd = random.Random(symbol)
+    p, rows = rnd.uniform(1, 100), []
+    for i in range(n):
+        o = p
+        p = max(0.01, p * (1 + rnd.gauss(0, 0.004)))
+        rows.append([i, o, max(o, p) * 1.001, min(o, p) * 0.999, p, rnd.uniform(500, 5000), 0, 0, 0, 0, 0, 0])
+    return rows
+
+
+class _MemClient:
+    def __init__(self, data):
+        self.data = data
+
+    def get_klines(self, symbol, interval, limit):
+        return self.data[symbol][-limit:]
+
+
+def _columns(data):
+    """Sembol başına (high, low, close) listeleri; dönüşüm ölçüme girmez."""
+    return {s: ([r[2] for r in rows], [r[3] for r in rows], [r[4] for r in rows]) for s, rows in data.items()}
+
+
+def _per_symbol_indicators(cols):
+    out = {}
+    for s, (highs, lows, closes) in cols.items():
+        trs = [max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+               for i in range(len(closes) - 14, len(closes))]
+        last10 = closes[-10:]
+        m = sum(last10) / 10
+        out[s] = (
+            rsi_series(closes, 14), rsi_series(closes, 14, method="sma"),
+            ema_series(closes, 9), ema_series(closes, 14), ema_series(closes, 21),
+            sum(trs) / 14, (sum((x - m) ** 2 for x in last10) / 10) ** 0.5,
+            max(closes[-5:]) - min(closes[-5:]),
+        )
+    return out
+
+
+def _batch_indicators(m):
+    return batch.indicator_matrices(m["close"], m["high"], m["low"])
+
+
+def _reset():
+    ENGINE.clear()
+    for k in trend_signals._last_signal_time:
+        trend_signals._last_signal_time[k] = 0
+
+
+def _best(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        _reset()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    coins = [f"C{i}USDT" for i in range(SYMBOLS)]
+    data = {s: _klines(s, BARS) for s in coins}
+    client = _MemClient(data)
+    params = coin_scanner.load_scoring_params(path="__missing__.json")
+
+    def per_symbol_scan():
+        scores = {}
+        for s in coins:
+            scores[s] = coin_scanner.score_symbol(
+                s, coin_scanner.fetch_candles_and_volumes(client, s, '1m', BARS), params)
+        return scores
+
+    def batch_scan():
+        fetched = {s: coin_scanner.fetch_candles_and_volumes(client, s, '1m', BARS, indicators=False) for s in coins}
+        return coin_scanner.score_universe(coins, fetched, params)
+
+    _reset()
+    ref = per_symbol_scan()
+    _reset()
+    got = batch_scan()
+    assert coin_scanner._best(coins, ref) == coin_scanner._best(coins, got)
+
+    cols = _columns(data)
+    _, mats = batch.stack_klines(data, BARS)
+    fetched = {s: coin_scanner.fetch_candles_and_volumes(client, s, '1m', BARS) for s in coins}
+
+    print(f"{SYMBOLS} sembol × {BARS} bar")
+    print(f"{'case':<12} {'per-symbol':>12} {'batch':>10} {'speedup':>8}")
+    for name, a, b in (
+        ("indicators", lambda: _per_symbol_indicators(cols), lambda: _batch_indicators(mats)),
+        ("score", lambda: [coin_scanner.score_symbol(s, fetched[s], params) for s in coins],
+         lambda: coin_scanner.score_universe(coins, fetched, params)),
+        ("scan", per_symbol_scan, batch_scan),
+    ):
+        t_a, t_b = _best(a), _best(b)
+        print(f"{name:<12} {t_a * 1e3:>10.1f}ms {t_b * 1e3:>8.1f}ms {t_a / t_b:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""modules/technical_analysis indikatörleri: saf Python döngüsü vs NumPy (indicators_np).
+
+Tohumlu rastgele yürüyüş OHLCV üzerinde 200 / 10k / 1M bar ölçülür. Saf Python
+BBANDS O(n*period) olduğundan 1M barda uzun sürer; BENCH_SKIP_PY_1M=true ile atlanır.
+Çalıştır:
+  python scripts/bench_indicators.py
+"""
+from __future__ import annotations
+import os, sys, random, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from modules import indicator_engine as engine  # noqa: E402
+from modules import technical_analysis as ta  # noqa: E402
+
+SIZES = [int(x) for x in os.getenv("BENCH_SIZES", "200,10000,1000000").split(",")]
+SKIP_PY_1M = os.getenv("BENCH_SKIP_PY_1M", "false").lower() in ("1", "true", "yes", "on")
+
+
+def _series(n: int):
+    rnd = random.Random(42)
+    p, rows = 100.0, []
+    for i in range(n):
+        o = p
+        p = max(0.01, p * (1 + rnd.gauss(0, 0.01)))
+        rows.append((float(i), o, max(o, p) * 1.001, min(o, p) * 0.999, p, rnd.uniform(1, 50)))
+    return rows
+
+
+def _backend(use_numpy: bool) -> None:
+    ta.USE_NUMPY = engine.USE_NUMPY = use_numpy
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    print(f"{'bars':>8} {'indicator':<10} {'python':>10} {'numpy':>10} {'speedup':>8}")
+    for n in SIZES:
+        rows = _series(n)
+        closes = [r[4] for r in rows]
+        cases = [
+            ("rsi", lambda: ta.calculate_rsi(closes, 14)),
+            ("ema", lambda: ta.calculate_ema(closes, 20)),
+            ("macd", lambda: ta.calculate_macd(closes)),
+            ("atr", lambda: ta.calculate_atr(rows, 14)),
+            ("bbands", lambda: ta.calculate_bbands(closes, 20, 2.0)),
+            ("vwap", lambda: ta.calculate_vwap(rows, 50)),
+            ("adx", lambda: ta.calculate_adx(rows, 14)),
+        ]
+        repeat = 5 if n <= 10_000 else 1
+        for name, fn in cases:
+            _backend(True)
+            t_np = _best(fn, repeat)
+            if SKIP_PY_1M and n >= 1_000_000:
+                print(f"{n:>8} {name:<10} {'-':>10} {t_np * 1e3:>8.2f}ms {'-':>8}")
+                continue
+            _backend(False)
+            t_py = _best(fn, repeat)
+            print(f"{n:>8} {name:<10} {t_py * 1e3:>8.2f}ms {t_np * 1e3:>8.2f}ms {t_py / t_np:>7.1f}x")
+    _backend(True)
+
+
+if __name__ == "__main__":
+    main()
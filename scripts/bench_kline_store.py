@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Kline deposu: yıllarca 1m veriden aralık okuma, tam yükleme (CSV) ile karşılaştırma.
+
+BENCH_YEARS yıllık sentetik 1m seri geçici bir depoya ve aynı içerikte CSV'ye yazılır.
+Ölçülenler: depo açılışı + 1 günlük rastgele aralık dilimi (ikili arama, kopyasız), 30 günlük
+Bars matrisi, tüm geçmişten günlük kapanışlar (price_data) ve CSV'nin load_klines ile tamamen
+yüklenmesi. Bellek, ölçümden önce / sonra anlık RSS farkıdır (/proc/self/statm).
+Çalıştır:
+  python scripts/bench_kline_store.py
+"""
+from __future__ import annotations
+import csv, os, resource, sys, tempfile, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+from backtest import load_klines  # noqa: E402
+from core.bars import Bars  # noqa: E402
+from core.kline_store import KlineStore  # noqa: E402
+
+YEARS = float(os.getenv("BENCH_YEARS", "2"))
+MIN = 60_000
+DAY = 86_400_000
+
+
+def _rss_mb() -> float:
+    # Anlık RSS (Linux); yoksa tepe RSS
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _synthetic(n: int) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0015, n)))
+    a = np.empty((n, 6))
+    a[:, 0] = 1_600_000_000_000 // DAY * DAY + np.arange(n) * MIN
+    a[:, 1] = np.concatenate(([100.0], close[:-1]))
+    a[:, 2] = np.maximum(a[:, 1], close) * 1.0005
+    a[:, 3] = np.minimum(a[:, 1], close) * 0.9995
+    a[:, 4] = close
+    a[:, 5] = rng.uniform(10, 500, n)
+    return a
+
+
+def main() -> None:
+    n = int(YEARS * 365 * 1440)
+    with tempfile.TemporaryDirectory() as tmp:
+        a = _synthetic(n)
+        csv_path = os.path.join(tmp, "BENCHUSDT_1m.csv")
+        with open(csv_path, "w", newline="") as f:
+            csv.writer(f).writerows([int(r[0]), *r[1:6], int(r[0]) + MIN - 1] for r in a.tolist())
+        t0 = time.perf_counter()
+        KlineStore(tmp).append("BENCHUSDT", Bars(a))
+        print(f"{n} bars | append {time.perf_counter() - t0:.2f}s, "
+              f"{os.path.getsize(csv_path) / 1e6:.0f} MB csv")
+        del a
+
+        rss0 = _rss_mb()
+        t0 = time.perf_counter()
+        store = KlineStore(tmp)
+        rng = np.random.default_rng(2)
+        start = 1_600_000_000_000 // DAY * DAY
+        for _ in range(100):
+            lo = start + int(rng.integers(0, n - 1440)) * MIN
+            cols = store.columns("BENCHUSDT", lo, lo + DAY)
+            float(cols["close"][-1])
+        print(f"1-day slice (store): {(time.perf_counter() - t0) / 100 * 1e6:.0f} us")
+        t0 = time.perf_counter()
+        bars = store.bars("BENCHUSDT", start + DAY, start + 31 * DAY)
+        print(f"30-day Bars (store): {(time.perf_counter() - t0) * 1e3:.1f} ms, {len(bars)} bars")
+        t0 = time.perf_counter()
+        daily = store.price_data(["BENCHUSDT"])["BENCHUSDT"]
+        print(f"daily closes over {YEARS:g}y (store): {(time.perf_counter() - t0) * 1e3:.1f} ms, {len(daily)} days")
+        print(f"RSS growth (store): {_rss_mb() - rss0:.0f} MB")
+
+        rss0 = _rss_mb()
+        t0 = time.perf_counter()
+        rows = load_klines(csv_path)
+        print(f"full load (csv): {time.perf_counter() - t0:.2f}s, {len(rows)} rows, "
+              f"RSS growth {_rss_mb() - rss0:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""core/num yuvarlama fonksiyonları için çağrı başı maliyet ölçümü.
+
+Decimal referans sürümü ile tamsayı ölçekli yol (genel API + sembol başı Quantizer)
+karşılaştırılır. Girdiler tohumlu rastgele fiyat / miktar değerleridir.
+Çalıştır:
+  python scripts/bench_num.py
+"""
+from __future__ import annotations
+import os, sys, random, timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import num  # noqa: E402
+
+N = int(os.getenv("BENCH_N", "20000"))
+TICK, STEP = 0.01, 0.001
+
+
+def _per_call_ns(fn, args) -> float:
+    def run():
+        for a in args:
+            fn(*a)
+    best = min(timeit.repeat(run, number=1, repeat=5))
+    return best / len(args) * 1e9
+
+
+def main() -> None:
+    rnd = random.Random(42)
+    prices = [round(rnd.uniform(0.5, 50000), rnd.randint(2, 8)) for _ in range(N)]
+    qtys = [rnd.uniform(0.0001, 500) for _ in range(N)]
+    qz = num.quantizer_for(TICK, STEP)
+    q_adj = [qz.floor_qty(q) for q in qtys]
+    p_adj = [qz.round_price(p) for p in prices]
+    cases = [
+        ("round_to_tick", num._round_to_tick_dec, num.round_to_tick, qz.round_price,
+         [(p, TICK) for p in prices], [(p,) for p in prices]),
+        ("quantize_to_step", num._quantize_to_step_dec, num.quantize_to_step, qz.floor_qty,
+         [(q, STEP) for q in qtys], [(q,) for q in qtys]),
+        ("ceil_to_step", num._ceil_to_step_dec, num.ceil_to_step, qz.ceil_qty,
+         [(q, STEP) for q in qtys], [(q,) for q in qtys]),
+        # validate_order_plan notional'ı yuvarlanmış miktar * fiyat üzerinden hesaplar
+        ("safe_mul", num._safe_mul_dec, num.safe_mul, qz.notional,
+         list(zip(q_adj, p_adj)), list(zip(q_adj, p_adj))),
+    ]
+    print(f"N={N} tick={TICK} step={STEP}  (ns/call, en iyi 5 tekrar)")
+    print(f"{'function':<18} {'decimal':>9} {'api':>9} {'quantizer':>10} {'speedup':>8}")
+    for name, ref, api, method, args2, args1 in cases:
+        t_ref = _per_call_ns(ref, args2)
+        t_api = _per_call_ns(api, args2)
+        t_q = _per_call_ns(method, args1)
+        print(f"{name:<18} {t_ref:>9.0f} {t_api:>9.0f} {t_q:>10.0f} {t_ref / t_q:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""PerformanceOptimization: eski (gecikmeli, sıralı) ve offline (havuz, gecikmesiz) mod.
+
+eval_func minimal_strategy portföy simülasyonudur (90 gün, 2 sembol). Eski mod
+denemeler arası 0.1-0.5 sn uyur; bu yüzden yalnızca BENCH_LEGACY_TRIALS denemeyle ölçülür
+ve BENCH_TRIALS için süre tahmin edilir. Offline mod tüm denemeleri ve erken durdurmalı
+(patience) çeşidini koşar.
+Çalıştır:
+  python scripts/bench_perf_optimization.py
+  BENCH_TRIALS=5000 SWEEP_MAX_WORKERS=8 python scripts/bench_perf_optimization.py
+"""
+from __future__ import annotations
+import copy, logging, math, os, random, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from minimal_strategy import Strategy  # noqa: E402
+from modules.performance_optimization import PerformanceOptimization  # noqa: E402
+
+TRIALS = int(os.getenv("BENCH_TRIALS", "1000"))
+LEGACY_TRIALS = int(os.getenv("BENCH_LEGACY_TRIALS", "10"))
+DAYS = 90
+
+PRICES = {
+    "BTCUSDT": [100 * (1 + 0.08 * math.sin(d / 3)) for d in range(DAYS)],
+    "ETHUSDT": [50 * (1 + 0.12 * math.cos(d / 4)) for d in range(DAYS)],
+}
+SPACE = {
+    "cooldown_period": list(range(1, 21)),
+    "max_position_pct": [0.1, 0.15, 0.2, 0.25, 0.3],
+    "stop_loss_pct": [0.02, 0.03, 0.04, 0.05, 0.07],
+    "take_profit_pct": [0.04, 0.06, 0.08, 0.10, 0.12],
+}
+_TEMPLATE = Strategy()
+_TEMPLATE.trade_logging = False
+
+
+def eval_func(params):
+    s = copy.deepcopy(_TEMPLATE)
+    for k, v in params.items():
+        setattr(s, k, v)
+    res = s.simulate_portfolio(1000, PRICES, DAYS, order_split=3)
+    return res[-1]["portfolio_value"] if res else 0.0
+
+
+def _run(opt: PerformanceOptimization, trials: int) -> tuple[float, int]:
+    random.seed(1)
+    t0 = time.perf_counter()
+    opt.random_search(SPACE, eval_func, max_trials=trials)
+    done = len(opt.last_run.rows) if opt.last_run is not None else trials
+    return time.perf_counter() - t0, done
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+    logging.getLogger("silent_core").disabled = True
+    print(f"{'mode':<22} {'trials':>7} {'seconds':>9} {'trials/s':>9} best")
+    legacy = PerformanceOptimization(offline=False)
+    sec, n = _run(legacy, LEGACY_TRIALS)
+    print(f"{'legacy (sleep)':<22} {n:>7} {sec:>9.2f} {n / sec:>9.1f} {legacy.best_score:.2f}")
+    print(f"{'  -> est. ' + str(TRIALS):<22} {TRIALS:>7} {TRIALS * sec / n:>9.1f}")
+    for label, kw in (("offline", {}), ("offline patience=200", {"patience": 200})):
+        opt = PerformanceOptimization(offline=True, **kw)
+        sec, n = _run(opt, TRIALS)
+        print(f"{label:<22} {n:>7} {sec:>9.2f} {n / sec:>9.1f} {opt.best_score:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""coin_scanner seri / paralel tarama benchmark'ı.
+
+Sahte client her get_klines çağrısında sabit gecikme uygular (ağ RTT benzetimi).
+Seri mod mevcut davranıştır (sleep_time=0 ile, yalnızca ağ beklemesi); paralel mod
+thread havuzu + paylaşılan ağırlık bütçesiyle çalışır.
+Çalıştır:
+  python scripts/bench_scanner.py
+  BENCH_LATENCY_MS=50 BENCH_WORKERS=16 python scripts/bench_scanner.py
+"""
+from __future__ import annotations
+import os, sys, time, random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from modules import coin_scanner, trend_signals  # noqa: E402
+from core.rate_limit import WeightBudget  # noqa: E402
+
+LATENCY_S = float(os.getenv("BENCH_LATENCY_MS", "30")) / 1000.0
+WORKERS = int(os.getenv("BENCH_WORKERS", "16"))
+SIZES = [int(x) for x in os.getenv("BENCH_SIZES", "12,100,400").split(",") if x]
+
+
+class LatencyClient:
+    """Deterministik mum üretir, her isteği LATENCY_S kadar bekletir."""
+    def get_klines(self, symbol, interval, limit):
+        time.sleep(LATENCY_S)
+        rnd = random.Random(symbol)
+        price = rnd.uniform(1, 100)
+        rows = []
+        for i in range(limit):
+            price *= 1 + rnd.uniform(-0.004, 0.004)
+            rows.append([i * 60_000, price, price, price, price, rnd.uniform(500, 5000), 0, 0, 0, 0, 0, 0])
+        return rows
+
+
+def _reset_debounce() -> None:
+    # Sinyal debounce'u duvar saatine bağlı; iki koşu aynı başlangıç durumunu görsün
+    for k in trend_signals._last_signal_time:
+        trend_signals._last_signal_time[k] = 0
+
+
+def main() -> None:
+    client = LatencyClient()
+    params = coin_scanner.load_scoring_params(path="__bench_defaults__.json")
+    print(f"latency={LATENCY_S * 1000:.0f}ms workers={WORKERS}")
+    print(f"{'symbols':>8} {'serial_s':>9} {'parallel_s':>11} {'speedup':>8} same_pick")
+    for n in SIZES:
+        coins = [f"C{i:04d}USDT" for i in range(n)]
+        _reset_debounce()
+        t0 = time.perf_counter()
+        serial = coin_scanner.select_best_coin(client, sleep_time=0, scoring_params=params, coin_list=coins, parallel=False)
+        t_serial = time.perf_counter() - t0
+        # Bütçe gerçek spot limitine göre: 6000 ağırlık/dk * 0.8
+        budget = WeightBudget(per_minute=4800)
+        _reset_debounce()
+        t0 = time.perf_counter()
+        par = coin_scanner.select_best_coin(client, scoring_params=params, coin_list=coins, parallel=True,
+                                            max_workers=WORKERS, budget=budget)
+        t_par = time.perf_counter() - t0
+        print(f"{n:>8} {t_serial:>9.2f} {t_par:>11.2f} {t_serial / t_par:>7.1f}x {serial == par}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""strategy_optimizer: random vs 'tpe' (TPE + successive halving), aynı bütçe.
+
+Skor fonksiyonu vector_backtest.BacktestObjective (getiri oranı); 'tpe' adayları önce geçmişin
+son 1/9'unda, sonra 1/3'ünde dener, yalnız terfi edenler tam geçmişte koşar. Bütçe
+(max_trials) tam geçmiş eşdeğeri backtest sayısıdır.
+Çalıştır:
+  python scripts/bench_tpe_search.py
+  BENCH_DAYS=365 BENCH_BUDGET=60 python scripts/bench_tpe_search.py
+"""
+from __future__ import annotations
+import logging, os, random, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backtest import synthetic_klines  # noqa: E402
+from modules.strategy_optimizer import optimize_strategy_parameters  # noqa: E402
+from vector_backtest import BacktestObjective, VectorBacktester  # noqa: E402
+
+DAYS = int(os.getenv("BENCH_DAYS", "90"))
+BUDGET = int(os.getenv("BENCH_BUDGET", "30"))
+SEEDS = int(os.getenv("BENCH_SEEDS", "3"))
+
+SPACE = {
+    "hard_stop_pct": [0.002, 0.003, 0.004, 0.006, 0.008, 0.01],
+    "take_profit_pct": [0.002, 0.003, 0.004, 0.006, 0.008, 0.01],
+    "adx_min": [10.0, 14.0, 18.0, 22.0, 26.0, 30.0],
+    "max_hold_sec": [300, 600, 900, 1800, 3600],
+    "risk_pct": [0.002, 0.005, 0.01],
+    "entry_cooldown_sec": [0, 60, 300, 900],
+    "scalp_mode": [True, False],
+}
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+    logging.getLogger("silent_core").disabled = True
+    engine = VectorBacktester("BENCHUSDT", synthetic_klines(DAYS * 1440, seed=2))
+    obj = BacktestObjective(engine)
+    size = 1
+    for v in SPACE.values():
+        size *= len(v)
+    print(f"{DAYS} days 1m | space {size} configs | budget {BUDGET} full-history runs")
+    print(f"{'search':<8} {'seed':>4} {'seconds':>8} {'evals':>6} {'best return':>12}")
+    for search in ("random", "tpe"):
+        for seed in range(SEEDS):
+            random.seed(seed)
+            evals = []
+
+            def counted(params, budget=1.0):
+                evals.append(budget)
+                return obj(params, budget=budget)
+
+            func = counted if search == "tpe" else (lambda p: counted(p))
+            t0 = time.perf_counter()
+            best = optimize_strategy_parameters(func, dict(SPACE), search_type=search, max_trials=BUDGET, seed=seed)
+            sec = time.perf_counter() - t0
+            print(f"{search:<8} {seed:>4} {sec:>8.2f} {len(evals):>6} {obj(best):>12.4%}")
+
+
+if __name__ == "__main__":
+    main()
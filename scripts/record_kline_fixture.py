@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Bar toplama testi için kayıtlı REST fikstürü: aynı aralığın 1m ve 15m kline yanıtları.
+
+Son kapanmış N adet 15m barı ve bunları oluşturan 15*N adet 1m barı herkese açık
+/api/v3/klines uç noktasından (anahtarsız) ham haliyle çeker ve
+tests/fixtures/klines_{SYMBOL}_{ilk open_time}.json dosyasına yazar.
+tests/test_bar_aggregator.py, `aggregate`ın bu 15m satırlarını birebir ürettiğini doğrular.
+Çalıştır:
+  python scripts/record_kline_fixture.py SOLUSDT 4
+  BINANCE_KLINES_BASE=https://api.binance.com python scripts/record_kline_fixture.py BTCUSDT
+"""
+from __future__ import annotations
+import os, sys, json, time
+import urllib.parse
+import urllib.request
+
+BASE = os.getenv("BINANCE_KLINES_BASE", "https://data-api.binance.vision")
+OUT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures"))
+_MIN = 60_000
+
+
+def _klines(symbol: str, interval: str, **params) -> list:
+    query = urllib.parse.urlencode({"symbol": symbol, "interval": interval, **params})
+    with urllib.request.urlopen(f"{BASE}/api/v3/klines?{query}", timeout=10) as resp:  # nosec - sabit uç nokta
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def record(symbol: str, bars_15m: int = 4) -> str:
+    now_ms = int(time.time() * 1000)
+    # Son satır açık bar olabilir: yalnızca kapanmış 15m barlar
+    rows_15m = [r for r in _klines(symbol, "15m", limit=bars_15m + 1) if int(r[6]) < now_ms][-bars_15m:]
+    start = int(rows_15m[0][0])
+    rows_1m = _klines(symbol, "1m", startTime=start, limit=15 * len(rows_15m))
+    if len(rows_1m) != 15 * len(rows_15m) or int(rows_1m[-1][6]) != int(rows_15m[-1][6]):
+        raise RuntimeError(f"1m yanıtı 15m aralığını kapsamıyor ({len(rows_1m)} bar)")
+    os.makedirs(OUT_DIR, exist_ok=True)
+    path = os.path.join(OUT_DIR, f"klines_{symbol}_{start}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"symbol": symbol, "source": BASE, "recorded_at": now_ms,
+                   "1m": rows_1m, "15m": rows_15m}, f, indent=1)
+    return path
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sym = (args[0] if args else "SOLUSDT").upper()
+    n = int(args[1]) if len(args) > 1 else 4
+    print(record(sym, n))
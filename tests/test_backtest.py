@@ -1,6 +1,10 @@
 # tests/test_backtest.py
 
-from backtest import run_backtest
+import json
+
+from backtest import run_backtest, Backtester, BacktestConfig, load_klines, synthetic_klines
+from modules import playbook
+
 
 def test_backtest_runs_and_outputs_value(capsys):
     # Hata vermeden float değer dönmeli
@@ -10,3 +14,45 @@ def test_backtest_runs_and_outputs_value(capsys):
     # Konsolda çıktıyı doğrula
     out = capsys.readouterr().out
     assert "Final portfolio value:" in out
+
+
+def test_accounting_and_equity_curve():
+    res = Backtester("TESTUSDT", synthetic_klines(1500, seed=3)).run(1000.0)
+    assert res.trades and res.bars == len(res.equity_curve) == 1500 - 199
+    # Son değer = başlangıç + işlem P&L'leri (ücret ve slippage dahil)
+    assert abs(res.final_value - (1000.0 + sum(t.pnl for t in res.trades))) < 1e-6
+    assert all(t.fees > 0 and t.exit_reason in ("stop", "take_profit", "max_hold", "end") for t in res.trades)
+    assert res.bars_per_sec > 0 and res.equity_curve[-1][1] == res.final_value
+
+
+def test_entries_fill_next_open_with_sim_time_cooldown(monkeypatch):
+    # Sinyaller sürekli açık: giriş sıklığını simülasyon saatindeki cooldown belirler
+    monkeypatch.setattr(playbook, "regime_on", lambda *a, **k: True)
+    monkeypatch.setattr(playbook, "bb_squeeze_breakout_signal", lambda *a, **k: True)
+    rows = synthetic_klines(1200, seed=5)
+    cfg = BacktestConfig(slippage_bps=10.0, entry_cooldown_sec=0, max_hold_sec=60, scalp_mode=False)
+    res = Backtester("TESTUSDT", rows, config=cfg).run(1000.0)
+    opens = {r[0]: float(r[1]) for r in rows}
+    assert len(res.trades) > 10 and all(t.setup == "LONG" for t in res.trades)
+    for t in res.trades:
+        assert abs(t.entry_price - opens[t.entry_ts] * 1.001) < 1e-9
+    gaps = [b.entry_ts - a.entry_ts for a, b in zip(res.trades, res.trades[1:])]
+    assert min(gaps) >= 45_000    # MIN_TRADE_SPACING_SEC, duvar saati değil bar saati
+
+
+def test_files_and_book_slippage(tmp_path, capsys, monkeypatch):
+    rows = synthetic_klines(1500, seed=9)
+    (tmp_path / "ABCUSDT_1m.csv").write_text("\n".join(",".join(str(v) for v in r) for r in rows))
+    # İnce order book: 1 USDT'den fazlası ikinci seviyeye taşar
+    books = [{"ts": r[0], "bids": [[r[4], "0.01"], [float(r[4]) * 0.99, "3000"]],
+              "asks": [[r[4], "0.01"], [float(r[4]) * 1.01, "1000"]]} for r in rows[::30]]
+    (tmp_path / "ABCUSDT_book.jsonl").write_text("\n".join(json.dumps(b) for b in books))
+    monkeypatch.setattr(playbook, "regime_on", lambda *a, **k: True)
+    monkeypatch.setattr(playbook, "bb_squeeze_breakout_signal", lambda *a, **k: True)
+
+    assert load_klines(str(tmp_path / "ABCUSDT_1m.csv"))[0][0] == rows[0][0]
+    val = run_backtest("ABCUSDT", start_str="5 hours ago UTC", initial_balance=1000.0, data_dir=str(tmp_path))
+    out = capsys.readouterr().out
+    assert "ABCUSDT_1m.csv" in out and "300 bars" in out and "Final portfolio value:" in out
+    # Kitaptan okunan slippage sabit baz puandan büyük: kayıp ücretten fazla
+    assert val < 1000.0
@@ -0,0 +1,129 @@
+import glob
+import json
+import os
+import random
+from decimal import Decimal
+
+import pytest
+
+from core.bar_aggregator import BarAggregator, aggregate
+from core.kline_cache import KlineCache
+
+MIN = 60_000
+# Borsadan kaydedilmiş 1m + 15m yanıtları (scripts/record_kline_fixture.py)
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "klines_*.json")))
+
+
+def _minutes(n, seed=7):
+    # Kayıtlı 1m yanıtı biçiminde: sayılar str, 12 alan
+    rnd = random.Random(seed)
+    p, rows = 100.0, []
+    for i in range(n):
+        o = p
+        p *= 1 + rnd.gauss(0, 0.002)
+        rows.append([i * MIN, f"{o:.8f}", f"{max(o, p) * 1.001:.8f}", f"{min(o, p) * 0.999:.8f}", f"{p:.8f}",
+                     f"{rnd.uniform(0, 50):.8f}", i * MIN + MIN - 1, f"{rnd.uniform(0, 5000):.8f}",
+                     rnd.randint(0, 90), f"{rnd.uniform(0, 20):.8f}", f"{rnd.uniform(0, 2000):.8f}", "0"])
+    return rows
+
+
+def _server(minutes, step):
+    # Sunucu tarafı toplama, bağımsız referans: kova başı epoch hizalı
+    out, buckets = [], {}
+    for r in minutes:
+        buckets.setdefault(r[0] // step * step, []).append(r)
+    for start in sorted(buckets):
+        rs = buckets[start]
+
+        def tot(j):
+            return format(sum((Decimal(r[j]) for r in rs), Decimal(0)), "f")
+
+        out.append([start, rs[0][1], max((r[2] for r in rs), key=Decimal), min((r[3] for r in rs), key=Decimal),
+                    rs[-1][4], tot(5), start + step - 1, tot(7), sum(r[8] for r in rs), tot(9), tot(10), "0"])
+    return out
+
+
+class Exchange:
+    """Saati ilerletilebilen sahte REST: `now` dakikaya kadar barlar görünür."""
+
+    def __init__(self, minutes):
+        self.minutes = minutes
+        self.now = 0
+        self.calls = []
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None):
+        self.calls.append(interval)
+        visible = self.minutes[:self.now]
+        rows = visible if interval == "1m" else _server(visible, {"3m": 3, "15m": 15}[interval] * MIN)
+        return [list(r) for r in rows[-limit:]]
+
+
+def test_aggregate_matches_server_rows():
+    minutes = _minutes(45)
+    assert aggregate(minutes[15:30], 15 * MIN, 15 * MIN) == _server(minutes, 15 * MIN)[1]
+    # Sıfır hacim "0E-8" değil REST'teki gibi yazılır
+    zero = [r[:5] + ["0.00000000"] + r[6:] for r in minutes[:3]]
+    assert aggregate(zero, 0, 3 * MIN)[5] == "0.00000000"
+
+
+@pytest.mark.parametrize("path", FIXTURES or [None], ids=lambda p: os.path.basename(p) if p else "none")
+def test_aggregate_reproduces_recorded_server_rows(path):
+    # Gerçek REST yanıtları: yerel toplama borsanın 15m satırlarıyla birebir aynı olmalı
+    if path is None:
+        pytest.skip("kayıtlı fikstür yok: python scripts/record_kline_fixture.py SOLUSDT")
+    with open(path, encoding="utf-8") as f:
+        rec = json.load(f)
+    step = 15 * MIN
+    buckets = {}
+    for r in rec["1m"]:
+        buckets.setdefault(r[0] // step * step, []).append(r)
+    assert sorted(buckets) == [r[0] for r in rec["15m"]]
+    for row in rec["15m"]:
+        assert aggregate(buckets[row[0]], row[0], step) == row
+
+
+def test_local_bars_equal_server_bars_without_extra_requests():
+    minutes = _minutes(3000)
+    ex = Exchange(minutes)
+    ex.now = 1507    # 15m kovasının ortası
+    agg = BarAggregator(ex, targets={"3m": 3, "15m": 100}, base_limit=200)
+    for now in range(1507, 2300, 7):
+        ex.now = now
+        ex.calls.clear()
+        for interval, limit in (("3m", 3), ("15m", 100)):
+            assert agg.get_klines(symbol="SOLUSDT", interval=interval, limit=limit) == \
+                _server(minutes[:now], {"3m": 3, "15m": 15}[interval] * MIN)[-limit:]
+        if now > 1507:
+            assert ex.calls == ["1m", "1m"]    # 3m / 15m için REST yok
+    assert agg.stats["rest_seeds"] == 2
+    assert agg.get_bars("SOLUSDT", "15m", 100).close[-1] == float(minutes[ex.now - 1][4])
+
+
+def test_gap_in_base_window_reseeds():
+    minutes = _minutes(1000)
+    ex = Exchange(minutes)
+    ex.now = 400
+    agg = BarAggregator(ex, targets={"15m": 100}, base_limit=30)
+    agg.get_klines(symbol="SOLUSDT", interval="15m", limit=100)
+    # 1m penceresi son kapanmış 15m barından sonrasını kapsamıyor
+    ex.now = 700
+    got = agg.get_klines(symbol="SOLUSDT", interval="15m", limit=100)
+    assert got == _server(minutes[:700], 15 * MIN)[-100:]
+    assert agg.stats["rest_seeds"] == 2
+
+
+def test_through_kline_cache_one_base_request_per_cycle():
+    minutes = _minutes(2000)
+    ex = Exchange(minutes)
+    ex.now = 1600
+    cache = KlineCache(ex, windows={"1m": 200, "3m": 3, "15m": 100}, clock=lambda: (ex.now - 0.5) * MIN / 1000)
+    agg = BarAggregator(cache, targets={"3m": 3, "15m": 100})
+    for now in range(1600, 1700, 5):
+        ex.now = now
+        agg.new_cycle()
+        ex.calls.clear()
+        agg.get_klines(symbol="SOLUSDT", interval="1m", limit=10)
+        agg.get_klines(symbol="SOLUSDT", interval="3m", limit=3)
+        agg.get_klines(symbol="SOLUSDT", interval="15m", limit=100)
+        if now > 1600:
+            assert ex.calls == ["1m"]
@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+
+from core.bars import Bars, fetch_bars
+from core.indicator_state import IndicatorState
+from core.kline_cache import KlineCache
+from modules import playbook
+from modules.signals import detect_buy_signal, detect_trend_reversal_sell
+
+MIN = 60_000
+
+
+def _raw(n, seed=1):
+    # Binance biçimi: sayılar str, 12 alan
+    rnd = random.Random(seed)
+    p, rows = 100.0, []
+    for i in range(n):
+        o = p
+        p *= 1 + rnd.gauss(0, 0.003)
+        rows.append([i * MIN, f"{o:.6f}", f"{max(o, p) * 1.001:.6f}", f"{min(o, p) * 0.999:.6f}", f"{p:.6f}",
+                     f"{rnd.uniform(1, 50):.4f}", i * MIN + MIN - 1, "0", 10, "0", "0", "0"])
+    return rows
+
+
+def _tuples(raw):
+    return [tuple(float(v) for v in k[:6]) for k in raw]
+
+
+def test_views_are_zero_copy_and_match_tuples():
+    raw = _raw(50)
+    bars = Bars.from_klines(raw)
+    ref = _tuples(raw)
+    assert len(bars) == 50 and bars.tolist() == ref
+    assert bars[-1] == ref[-1] and bars[3][4] == ref[3][4] and len(bars[0]) == 6
+    assert bars.candles[-2]['open'] == ref[-2][1] and bars.candles[-2]['close'] == ref[-2][4]
+    tail = bars[-10:]
+    assert isinstance(tail, Bars) and np.shares_memory(tail.close, bars.values)
+    assert np.shares_memory(np.asarray(bars), bars.values)
+    assert list(tail.candles[-3:])[0]['close'] == ref[-3][4]
+    assert not Bars.empty() and Bars.from_klines([]).values.shape == (0, 6)
+
+
+def test_consumers_give_same_results_for_bars_and_lists():
+    for seed in range(20):
+        raw = _raw(200, seed)
+        bars, ref = Bars.from_klines(raw), _tuples(raw)
+        candles = [{'open': r[1], 'close': r[4]} for r in ref[-10:]]
+        vols = [r[5] for r in ref[-10:]]
+        tail = bars[-10:]
+        assert detect_buy_signal(tail.candles, [], tail.volume) == detect_buy_signal(candles, [], vols)
+        assert (detect_trend_reversal_sell(tail.candles, [50, 40, 30], [1.0], [2.0])
+                == detect_trend_reversal_sell(candles, [50, 40, 30], [1.0], [2.0]))
+        assert playbook.pullback_signal(bars) == playbook.pullback_signal(ref)
+        assert playbook.regime_on(bars[-100:]) == playbook.regime_on(ref[-100:])
+        assert playbook.bb_squeeze_breakout_signal(bars) == playbook.bb_squeeze_breakout_signal(ref)
+        assert playbook.compute_stop_and_size(ref[-1][4], bars, 1000.0) == \
+            playbook.compute_stop_and_size(ref[-1][4], ref, 1000.0)
+        assert IndicatorState("1m").feed(bars) == IndicatorState("1m").feed(ref)
+
+
+def test_kline_cache_parses_window_once():
+    class Fake:
+        def __init__(self):
+            self.calls = 0
+
+        def get_klines(self, symbol, interval, limit=500, startTime=None):
+            self.calls += 1
+            return _raw(200)[-limit:]
+
+    fake = Fake()
+    cache = KlineCache(fake, windows={"1m": 200}, clock=lambda: 199 * MIN / 1000 + 30)
+    big = fetch_bars(cache, "SOLUSDT", "1m", 200)
+    small = fetch_bars(cache, "SOLUSDT", "1m", 10)
+    assert fake.calls == 1 and len(big) == 200 and len(small) == 10
+    assert np.shares_memory(small.values, big.values)
+    assert small.tolist() == _tuples(_raw(200))[-10:]
+    # KlineCache olmayan client: yanıt doğrudan ayrıştırılır
+    assert fetch_bars(Fake(), "SOLUSDT", "1m", 5).tolist() == _tuples(_raw(200))[-5:]
@@ -0,0 +1,68 @@
+import json
+
+import main
+
+MIN = 60_000
+
+
+class FakeClient:
+    """Toplu ve sembol bazlı uçları aynı veriden besler; çağrıları sayar."""
+    def __init__(self, n=30):
+        self.symbols = [f"C{i}USDT" for i in range(n)]
+        self.calls = []
+
+    def _closes(self, s):
+        i = self.symbols.index(s)
+        return [100.0, 100.0 + i % 7, 99.0, 101.0 + i % 3, 100.5]
+
+    def _vol(self, s):
+        return 1000.0 * (1 + self.symbols.index(s))
+
+    def _bidask(self, s):
+        i = self.symbols.index(s)
+        return 100.0, 100.0 + 0.01 * (1 + i % 5)
+
+    def get_klines(self, symbol, interval, limit=500):
+        self.calls.append("klines")
+        return [[t * MIN, "0", "0", "0", str(c), "1"] for t, c in enumerate(self._closes(symbol))][-limit:]
+
+    def get_ticker(self, symbol=None, symbols=None):
+        self.calls.append("ticker")
+        if symbol:
+            return {"symbol": symbol, "quoteVolume": str(self._vol(symbol))}
+        return [{"symbol": s, "quoteVolume": str(self._vol(s))} for s in json.loads(symbols)]
+
+    def get_order_book(self, symbol, limit=100):
+        self.calls.append("order_book")
+        bid, ask = self._bidask(symbol)
+        return {"bids": [[str(bid), "1"]], "asks": [[str(ask), "1"]]}
+
+    def get_orderbook_tickers(self, symbols=None):
+        self.calls.append("book_tickers")
+        return [{"symbol": s, "bidPrice": str(self._bidask(s)[0]), "askPrice": str(self._bidask(s)[1])}
+                for s in json.loads(symbols)]
+
+
+def test_batched_scan_matches_per_symbol_scores(monkeypatch):
+    client = FakeClient(n=9)
+    monkeypatch.setattr(main, "SCAN_MODE", "per_symbol")
+    ref_scores, ref_details = main.scan_opportunities(client, client.symbols)
+    assert len(client.calls) == 27
+
+    client.calls.clear()
+    monkeypatch.setattr(main, "SCAN_MODE", "batched")
+    monkeypatch.setattr(main, "SCAN_TOP_N", 9)
+    scores, details = main.scan_opportunities(client, client.symbols)
+    assert client.calls.count("ticker") == 1 and client.calls.count("book_tickers") == 1
+    assert scores == ref_scores and details == ref_details
+
+
+def test_batched_scan_fetches_klines_only_for_survivors(monkeypatch):
+    client = FakeClient(n=300)
+    monkeypatch.setattr(main, "SCAN_MODE", "batched")
+    monkeypatch.setattr(main, "SCAN_TOP_N", 5)
+    monkeypatch.setattr(main, "SCAN_MIN_QUOTE_VOLUME", 2000.0)
+    scores, _ = main.scan_opportunities(client, client.symbols)
+    assert len(client.calls) == 2 + 5
+    assert scores["C0USDT"] == 0.0  # hacim eşiğinin altında
+    assert sum(1 for v in scores.values() if v > 0) == 5
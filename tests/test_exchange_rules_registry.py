@@ -0,0 +1,151 @@
+import threading
+import time
+
+import core.exchange_rules as er
+
+
+def _info(*symbols):
+    return {"symbols": [{
+        "symbol": s, "quoteAsset": "USDT",
+        "filters": [
+            {"filterType": "PRICE_FILTER", "tickSize": "0.01"},
+            {"filterType": "LOT_SIZE", "stepSize": "0.001"},
+            {"filterType": "NOTIONAL", "minNotional": "5.0"},
+        ]} for s in symbols]}
+
+
+class Fetcher:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.done = threading.Event()
+
+    def __call__(self, symbols=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.done.set()
+        return _info("SOLUSDT", "ADAUSDT")
+
+
+def test_bulk_preload_serves_all_symbols_from_memory(tmp_path):
+    fetch = Fetcher()
+    reg = er.RulesRegistry(snapshot_path=str(tmp_path / "rules.json"), fetcher=fetch)
+    assert reg.preload()
+    for _ in range(100):
+        r = reg.get("SOLUSDT")
+    assert fetch.calls == 1
+    assert r.tick_size == 0.01 and r.step_size == 0.001 and r.min_notional_usdt == 5.0
+    assert reg.get_filters("ADAUSDT")["LOT_SIZE"]["stepSize"] == "0.001"
+
+
+def test_snapshot_warm_restart_without_network(tmp_path):
+    path = str(tmp_path / "rules.json")
+    er.RulesRegistry(snapshot_path=path, fetcher=Fetcher()).preload()
+
+    fetch = Fetcher()
+    reg = er.RulesRegistry(snapshot_path=path, fetcher=fetch)
+    assert reg.warm_start()
+    assert fetch.calls == 0
+    assert reg.get("ADAUSDT").tick_size == 0.01
+
+
+def test_expired_rules_refresh_in_background(tmp_path):
+    now = {"t": 1000.0}
+    fetch = Fetcher()
+    reg = er.RulesRegistry(ttl_sec=60, snapshot_path=str(tmp_path / "r.json"), fetcher=fetch, clock=lambda: now["t"])
+    reg.preload()
+    fetch.done.clear()
+    now["t"] += 61
+    assert reg.get("SOLUSDT") is not None  # bayat kural hemen döner
+    assert fetch.done.wait(2.0) and fetch.calls == 2
+
+
+def test_warm_registry_never_hits_network(monkeypatch, tmp_path):
+    fetch = Fetcher()
+    reg = er.RulesRegistry(snapshot_path=None, fetcher=fetch)
+    reg.preload()
+    monkeypatch.setattr(er, "USE_EXCHANGE_INFO", True)
+    monkeypatch.setattr(er, "RULES", reg)
+    for _ in range(50):
+        r = er.load_rules_for_symbol("SOLUSDT")
+    assert fetch.calls == 1 and r.tick_size == 0.01
+
+
+class SymbolFetcher:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, symbols=None):
+        self.calls.append(symbols)
+        if self.fail:
+            raise OSError("timeout")
+        return _info(*symbols)
+
+
+def test_cold_registry_loads_symbol_once(monkeypatch):
+    # Kayıt boş: ENV varsayılanı yerine sembolün gerçek filtreleri tek istekle yüklenir
+    fetch = SymbolFetcher()
+    monkeypatch.setattr(er, "USE_EXCHANGE_INFO", True)
+    monkeypatch.setattr(er, "RULES", er.RulesRegistry(snapshot_path=None, fetcher=fetch))
+    monkeypatch.setenv("DEFAULT_TICK_SIZE", "0.5")
+    for _ in range(20):
+        r = er.load_rules_for_symbol("SOLUSDT")
+    assert fetch.calls == [["SOLUSDT"]]
+    assert r.tick_size == 0.01 and r.step_size == 0.001 and r.min_notional_usdt == 5.0
+
+
+def test_cold_registry_failed_fetch_falls_back_without_retry_storm(monkeypatch):
+    now = {"t": 0.0}
+    fetch = SymbolFetcher(fail=True)
+    reg = er.RulesRegistry(snapshot_path=None, fetcher=fetch, clock=lambda: now["t"])
+    reg.refresh_async = lambda: None
+    monkeypatch.setattr(er, "USE_EXCHANGE_INFO", True)
+    monkeypatch.setattr(er, "RULES", reg)
+    monkeypatch.setenv("DEFAULT_TICK_SIZE", "0.5")
+    for _ in range(5):
+        assert er.load_rules_for_symbol("SOLUSDT").tick_size == 0.5
+    assert len(fetch.calls) == 1
+    now["t"] += reg.retry_sec
+    er.load_rules_for_symbol("SOLUSDT")
+    assert len(fetch.calls) == 2
+
+class _Client:
+    def __init__(self, api_url, testnet=False):
+        self.API_URL = api_url
+        self.testnet = testnet
+        self.calls = 0
+
+    def get_exchange_info(self):
+        self.calls += 1
+        return _info("SOLUSDT")
+
+    def get_symbol_info(self, symbol):
+        self.calls += 1
+        return _info(symbol)["symbols"][0]
+
+
+def test_snapshot_from_other_environment_is_rejected(tmp_path):
+    # testnet snapshot'ı TTL içinde olsa da live client'a sunulmamalı
+    path = str(tmp_path / "rules.json")
+    testnet = er.RulesRegistry(snapshot_path=path)
+    testnet.use_client(_Client("https://testnet.binance.vision/api", testnet=True))
+    assert testnet.preload()
+
+    live_client = _Client("https://api.binance.com/api")
+    live = er.RulesRegistry(snapshot_path=path)
+    live.use_client(live_client)
+    assert not live.load_snapshot()
+    assert live.warm_start() and live_client.calls == 1
+
+    again = er.RulesRegistry(snapshot_path=path)
+    again.use_client(_Client("https://api.binance.com/api"))
+    assert again.load_snapshot()
+
+
+def test_cold_registry_uses_client_symbol_info():
+    client = _Client("https://api.binance.com/api")
+    reg = er.RulesRegistry(snapshot_path=None)
+    reg.use_client(client)
+    assert reg.load_symbol("ADAUSDT").tick_size == 0.01
+    assert reg.load_symbol("ADAUSDT") is not None and client.calls == 1
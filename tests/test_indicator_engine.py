@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from modules import indicator_engine as engine
+from modules.coin_scanner import calculate_rsi_series, calculate_ema_series
+from modules import technical_analysis as ta
+from utils import signal_utils
+
+MIN = 60_000
+
+
+def _closes(n, seed=11):
+    rnd = random.Random(seed)
+    p, out = 50.0, []
+    for _ in range(n):
+        p *= 1 + rnd.gauss(0, 0.01)
+        out.append(p)
+    return out
+
+
+def _rsi_sma_reference(closes, period):
+    # Eski coin_scanner.calculate_rsi_series (O(n*period))
+    if len(closes) < period + 1:
+        return [None] * len(closes)
+    out = [None] * period
+    for i in range(period, len(closes)):
+        g = [max(0, closes[j] - closes[j - 1]) for j in range(i - period + 1, i + 1)]
+        lo = [max(0, closes[j - 1] - closes[j]) for j in range(i - period + 1, i + 1)]
+        ag, al = sum(g) / period, sum(lo) / period
+        out.append(100.0 if al == 0 else 100 - (100 / (1 + ag / al)))
+    return out
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_caller_shapes_are_preserved(use_numpy, monkeypatch):
+    monkeypatch.setattr(engine, "USE_NUMPY", use_numpy)
+    closes = _closes(60)
+    wilder = signal_utils.calculate_rsi(closes, 14)
+    assert len(wilder) == 60 and wilder[13] is None and wilder[14] is not None
+    assert ta.calculate_rsi(closes, 14) == pytest.approx(wilder[15:], rel=1e-12)
+    assert ta.calculate_ema(closes, 9) == pytest.approx(signal_utils.calculate_ema(closes, 9)[8:], rel=1e-12)
+    assert calculate_rsi_series(closes, 14) == pytest.approx(_rsi_sma_reference(closes, 14), rel=1e-12)
+    ema = calculate_ema_series(closes, 21)
+    assert ema[:20] == [None] * 20 and ema[20] == pytest.approx(sum(closes[:21]) / 21)
+    # Kısa seri: ısınma None ile doldurulur
+    assert signal_utils.calculate_rsi(closes[:5], 9) == [None] * 5
+    assert calculate_rsi_series(closes[:14], 14) == [None] * 14
+
+
+def test_flat_series_keeps_each_callers_zero_loss_convention():
+    flat = [3.0] * 30
+    assert signal_utils.calculate_rsi(flat, 14)[-1] == 0.0       # Wilder: rs=0 -> 0
+    assert calculate_rsi_series(flat, 14)[-1] == 100.0           # Cutler: kayıp yok -> 100
+
+
+def test_keyed_results_are_memoized_by_bar():
+    eng = engine.IndicatorEngine(max_entries=8)
+    closes = _closes(200)
+    rows = [[i * MIN] for i in range(200)]
+    key = engine.series_key("SOLUSDT", "1m", rows)
+    a = eng.series("rsi", closes, 14, key=key)
+    b = eng.series("rsi", closes, 14, key=key)
+    assert a == b and eng.stats == {"hits": 1, "misses": 1, "uncached": 0}
+    # Açık barın fiyatı değişti: yeni hesap
+    moved = closes[:-1] + [closes[-1] * 1.01]
+    eng.series("rsi", moved, 14, key=key)
+    # Farklı parametre / pencere uzunluğu ayrı girdi
+    eng.series("rsi", closes, 9, key=key)
+    eng.series("rsi", closes[-50:], 14, key=key)
+    assert eng.stats["misses"] == 4 and eng.hit_rate() == pytest.approx(1 / 5)
+    # Dönen liste değiştirilse de önbellek bozulmaz
+    a[-1] = None
+    assert eng.series("rsi", closes, 14, key=key)[-1] is not None
+    eng.series("ema", closes, 9)
+    assert eng.stats["uncached"] == 1
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from core.indicator_state import IndicatorState, IndicatorRegistry
+from modules import technical_analysis as ta
+from utils import signal_utils
+
+MIN = 60_000
+
+
+def _rows(n, seed=5, start=60_000.0):
+    rnd = random.Random(seed)
+    p, rows = start, []
+    for i in range(n):
+        o = p
+        p = p * (1 + rnd.gauss(0, 0.004))
+        h = max(o, p) * (1 + abs(rnd.gauss(0, 0.001)))
+        lo = min(o, p) * (1 - abs(rnd.gauss(0, 0.001)))
+        rows.append([i * MIN, o, h, lo, p, rnd.uniform(1, 30), i * MIN + MIN - 1])
+    return rows
+
+
+def _approx(a, b):
+    assert a is not None and b is not None
+    assert a == pytest.approx(b, rel=1e-9, abs=1e-9)
+
+
+def test_incremental_matches_batch_each_step():
+    rows = _rows(400)
+    st = IndicatorState("1m")
+    # Her tur: pencere bir bar kayar, son satır açık bar
+    for t in range(60, len(rows) + 1, 7):
+        snap = st.feed(rows[max(0, t - 100):t])
+        hist = rows[:t]
+        closes = [r[4] for r in hist]
+        ohlcv = [tuple(r[:6]) for r in hist]
+        _approx(snap["ema21"], ta.calculate_ema(closes, 21)[-1])
+        _approx(snap["ema9"], signal_utils.calculate_ema(closes, 9)[-1])
+        _approx(snap["rsi14"], ta.calculate_rsi(closes, 14)[-1])
+        _approx(snap["rsi9"], signal_utils.calculate_rsi(closes, 9)[-1])
+        assert snap["rsi9_series"][-3:] == pytest.approx(signal_utils.calculate_rsi(closes, 9)[-3:], rel=1e-9)
+        _approx(snap["atr14"], ta.calculate_atr(ohlcv, 14))
+        _approx(snap["adx14"], ta.calculate_adx(ohlcv, 14))
+        _approx(snap["vwap50"], ta.calculate_vwap(ohlcv, 50))
+        mids, ups, lows = ta.calculate_bbands(closes, 20, 2.0)
+        _approx(snap["bb_mid"], mids[-1])
+        # Kayan varyans: 60k fiyatta iki geçişli sürüme göre ~1e-7 göreli
+        assert snap["bb_upper"] == pytest.approx(ups[-1], rel=1e-9)
+        assert snap["bb_width"] == pytest.approx((ups[-1] - lows[-1]) / mids[-1], rel=1e-6)
+
+
+def test_open_bar_update_is_not_committed():
+    rows = _rows(80)
+    st = IndicatorState("1m")
+    st.feed(rows)
+    bars = st.bars
+    changed = list(rows[-1])
+    changed[4] = changed[4] * 1.01
+    a = st.feed(rows[:-1] + [changed])
+    assert st.bars == bars
+    closes = [r[4] for r in rows[:-1]] + [changed[4]]
+    _approx(a["ema20"], ta.calculate_ema(closes, 20)[-1])
+
+
+def test_gap_resets_and_registry_is_keyed():
+    rows = _rows(120)
+    reg = IndicatorRegistry()
+    reg.feed("SOLUSDT", "1m", rows[:60])
+    # 30 bar atlandı: bağlanmayan pencere -> durum baştan kurulur
+    snap = reg.feed("SOLUSDT", "1m", rows[90:])
+    closes = [r[4] for r in rows[90:]]
+    _approx(snap["ema20"], ta.calculate_ema(closes, 20)[-1])
+    assert reg.get("SOLUSDT", "15m") is not reg.get("SOLUSDT", "1m")
+    assert reg.feed("ADAUSDT", "1m", rows[:5])["ema20"] is None
+
+
+def test_regime_snapshot_agrees_with_batch_regime():
+    from modules import playbook
+    for seed in range(6):
+        rows = _rows(100, seed=seed)
+        snap = IndicatorState("15m").feed(rows)
+        ohlcv = [tuple(r[:6]) for r in rows]
+        for thr in (5.0, 18.0, 30.0):
+            assert playbook.regime_on_snapshot(snap, adx_min=thr) == playbook.regime_on(ohlcv, adx_min=thr)
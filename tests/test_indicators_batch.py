@@ -0,0 +1,94 @@
+import math
+import random
+
+import numpy as np
+
+from modules import coin_scanner, indicators_batch as batch, trend_signals
+from modules.indicator_engine import ema_series, rsi_series
+from modules import technical_analysis as ta
+
+
+def _klines(symbol, n):
+    # Açılış != kapanış: reversal mum koşulu da devreye girer
+    rnd = random.Random(symbol)
+    p, rows = rnd.uniform(1, 100), []
+    for i in range(n):
+        o = p
+        p *= 1 + rnd.uniform(-0.01, 0.012)
+        rows.append([i, o, max(o, p) * 1.001, min(o, p) * 0.999, p, rnd.uniform(500, 5000), 0, 0, 0, 0, 0, 0])
+    return rows
+
+
+class MemClient:
+    def __init__(self, lengths):
+        self.data = {s: _klines(s, n) for s, n in lengths.items()}
+
+    def get_klines(self, symbol, interval, limit):
+        if symbol not in self.data:
+            raise Exception("API Fail")
+        return self.data[symbol][-limit:]
+
+
+def _close(a, b):
+    return (a is None and (b is None or math.isnan(b))) or (a is not None and abs(a - b) <= 1e-9 * max(1.0, abs(a)))
+
+
+def _reset():
+    for k in trend_signals._last_signal_time:
+        trend_signals._last_signal_time[k] = 0
+
+
+def test_matrices_match_per_symbol_series():
+    data = {f"S{i}": _klines(f"S{i}", 60) for i in range(12)}
+    symbols, m = batch.stack_klines(data, 60)
+    out = batch.indicator_matrices(m["close"], m["high"], m["low"])
+    for i, s in enumerate(symbols):
+        closes = [r[4] for r in data[s]]
+        for key, ref in (("rsi14", rsi_series(closes, 14)), ("rsi14_sma", rsi_series(closes, 14, method="sma")),
+                         ("ema9", ema_series(closes, 9)), ("ema21", ema_series(closes, 21))):
+            assert all(_close(a, b) for a, b in zip(ref, out[key][i])), (s, key)
+        assert _close(ta.calculate_atr([tuple(r[:6]) for r in data[s]], 14), out["atr14"][i, -1])
+        last10 = closes[-10:]
+        mean = sum(last10) / 10
+        assert _close((sum((x - mean) ** 2 for x in last10) / 10) ** 0.5, out["volatility10"][i, -1])
+        assert _close(max(closes[-5:]) - min(closes[-5:]), out["range5"][i, -1])
+
+
+def test_stack_klines_skips_short_symbols():
+    symbols, m = batch.stack_klines({"A": _klines("A", 30), "B": _klines("B", 10)}, 20)
+    assert symbols == ["A"] and m["close"].shape == (1, 20)
+    assert m["close"][0, -1] == _klines("A", 30)[-1][4]
+
+
+def test_score_universe_matches_score_symbol():
+    # Kısa veri gelen ve hata veren semboller score_symbol yoluna düşer
+    lengths = {f"C{i}USDT": 30 for i in range(200)}
+    lengths.update({"SHORTUSDT": 12, "MIDUSDT": 25})
+    client = MemClient(lengths)
+    coins = list(lengths) + ["FAILUSDT"]
+    params = coin_scanner.load_scoring_params(path="__missing__.json")
+
+    _reset()
+    ref = {s: coin_scanner.score_symbol(s, coin_scanner.fetch_candles_and_volumes(client, s), params)
+           if s in client.data else None for s in coins}
+    _reset()
+    fetched = {s: coin_scanner.fetch_candles_and_volumes(client, s, indicators=False) for s in coins}
+    got = coin_scanner.score_universe(coins, fetched, params)
+
+    assert sum(v is None for v in ref.values()) >= 1
+    assert all(_close(ref[s], got[s]) for s in coins)
+    assert coin_scanner._best(coins, ref) == coin_scanner._best(coins, got)
+
+
+def test_batch_signals_fire_like_single_symbol():
+    client = MemClient({f"C{i}USDT": 30 for i in range(300)})
+    rows = list(client.data.values())
+    close = np.array([[r[4] for r in k] for k in rows])
+    open_ = np.array([[r[1] for r in k] for k in rows])
+    buy = coin_scanner._batch_buy_signal(close)
+    rev = coin_scanner._batch_reversal_raw(open_, close, batch.rsi(close, 14, method="sma"),
+                                           batch.ema(close, 9), batch.ema(close, 21))
+    assert buy.any() and rev.any()
+    for i, k in enumerate(rows):
+        candles = [{"open": r[1], "close": r[4]} for r in k]
+        assert bool(buy[i]) == trend_signals.detect_buy_signal(candles[-20:], [r[5] for r in k][-20:])
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from modules import indicator_engine as engine
+from modules import technical_analysis as ta
+
+
+def _series(n, seed=7, start=100.0):
+    rnd = random.Random(seed)
+    p, rows = start, []
+    for i in range(n):
+        o = p
+        p = max(0.01, p * (1 + rnd.gauss(0, 0.01)))
+        h = max(o, p) * (1 + abs(rnd.gauss(0, 0.003)))
+        lo = min(o, p) * (1 - abs(rnd.gauss(0, 0.003)))
+        rows.append((float(i), o, h, lo, p, rnd.uniform(1, 50)))
+    return rows
+
+
+def _both(fn, *args, monkeypatch):
+    monkeypatch.setattr(ta, "USE_NUMPY", False)
+    monkeypatch.setattr(engine, "USE_NUMPY", False)
+    ref = fn(*args)
+    monkeypatch.setattr(ta, "USE_NUMPY", True)
+    monkeypatch.setattr(engine, "USE_NUMPY", True)
+    return ref, fn(*args)
+
+
+def _close(a, b):
+    if isinstance(a, tuple):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            _close(x, y)
+    elif isinstance(a, list):
+        assert isinstance(b, list) and len(a) == len(b)
+        assert a == pytest.approx(b, rel=1e-9, abs=1e-9)
+    elif a is None:
+        assert b is None
+    else:
+        assert isinstance(b, float) and a == pytest.approx(b, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("n", [16, 60, 200, 3000])
+def test_numpy_matches_python_reference(n, monkeypatch):
+    rows = _series(n)
+    closes = [r[4] for r in rows]
+    cases = [
+        (ta.calculate_rsi, closes, 14),
+        (ta.calculate_ema, closes, 12),
+        (ta.calculate_ema, closes, 50),
+        (ta.calculate_macd, closes),
+        (ta.calculate_atr, rows, 14),
+        (ta.calculate_momentum, closes, 10),
+        (ta.calculate_bbands, closes, 20, 2.0),
+        (ta.calculate_vwap, rows, 50),
+        (ta.calculate_adx, rows, 14),
+    ]
+    for fn, *args in cases:
+        ref, fast = _both(fn, *args, monkeypatch=monkeypatch)
+        _close(ref, fast)
+
+
+def test_flat_and_monotonic_edge_cases(monkeypatch):
+    # Sabit fiyat: kayıp 0 -> RSI 0 (orijinal davranış), std 0, ADX 0
+    flat = [(float(i), 5.0, 5.0, 5.0, 5.0, 1.0) for i in range(80)]
+    up = [(float(i), i + 1.0, i + 1.5, i + 0.5, i + 1.0, 2.0) for i in range(80)]
+    for rows in (flat, up):
+        closes = [r[4] for r in rows]
+        for fn, *args in [(ta.calculate_rsi, closes, 14), (ta.calculate_bbands, closes, 20, 2.0),
+                          (ta.calculate_adx, rows, 14), (ta.calculate_macd, closes)]:
+            ref, fast = _both(fn, *args, monkeypatch=monkeypatch)
+            _close(ref, fast)
+
+
+def test_long_series_recurrence_stays_stable(monkeypatch):
+    # Blok sınırlarını geçen uzun seri (EMA 200: blok ~46k bar)
+    closes = [r[4] for r in _series(120_000, seed=3, start=60_000.0)]
+    ref, fast = _both(ta.calculate_ema, closes, 200, monkeypatch=monkeypatch)
+    assert fast[-1] == pytest.approx(ref[-1], rel=1e-9)
+    ref, fast = _both(ta.calculate_rsi, closes, 14, monkeypatch=monkeypatch)
+    assert max(abs(a - b) for a, b in zip(ref[-1000:], fast[-1000:])) < 1e-7
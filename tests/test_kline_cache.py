@@ -0,0 +1,74 @@
+from core.kline_cache import KlineCache
+
+MIN = 60_000
+
+
+class FakeClient:
+    """Sabit 1m bar serisi; her get_klines çağrısını kaydeder."""
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.calls = []
+
+    def _bar(self, open_ms):
+        c = 100.0 + open_ms / MIN
+        return [open_ms, c, c + 1, c - 1, c, 10.0, open_ms + MIN - 1]
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None):
+        self.calls.append({"limit": limit, "startTime": startTime})
+        last_open = (self.now_ms // MIN) * MIN
+        first = startTime if startTime is not None else last_open - (limit - 1) * MIN
+        rows = [self._bar(t) for t in range(first, last_open + 1, MIN)]
+        return rows[:limit]
+
+    def get_ticker(self, symbol):
+        return {"quoteVolume": "123"}
+
+
+def _make(now_ms=1_000 * MIN + 30_000):
+    fake = FakeClient(now_ms)
+    cache = KlineCache(fake, windows={"1m": 200}, clock=lambda: fake.now_ms / 1000)
+    return fake, cache
+
+
+def test_same_cycle_serves_smaller_views_from_one_request():
+    fake, cache = _make()
+    a = cache.get_klines(symbol="SOLUSDT", interval="1m", limit=5)
+    b = cache.get_klines(symbol="SOLUSDT", interval="1m", limit=10)
+    c = cache.get_klines(symbol="SOLUSDT", interval="1m", limit=200)
+    assert len(fake.calls) == 1 and fake.calls[0]["limit"] == 200
+    assert len(a) == 5 and len(b) == 10 and len(c) == 200
+    assert a == c[-5:]
+    assert cache.stats["hits"] == 2
+
+
+def test_new_cycle_refreshes_incrementally_with_start_time():
+    fake, cache = _make()
+    cache.get_klines(symbol="SOLUSDT", interval="1m", limit=200)
+    # 3 bar sonra
+    fake.now_ms += 3 * MIN
+    cache.new_cycle()
+    rows = cache.get_klines(symbol="SOLUSDT", interval="1m", limit=200)
+    assert len(fake.calls) == 2
+    inc = fake.calls[1]
+    assert inc["startTime"] is not None and inc["limit"] <= 5
+    # Pencere kaydı: son bar güncel, sıralı ve tekrarsız
+    opens = [r[0] for r in rows]
+    assert len(rows) == 200
+    assert opens == sorted(set(opens))
+    assert opens[-1] == (fake.now_ms // MIN) * MIN
+
+
+def test_bar_close_invalidates_within_same_cycle():
+    fake, cache = _make()
+    cache.get_klines(symbol="SOLUSDT", interval="1m", limit=5)
+    fake.now_ms += MIN  # bar kapandı, tur aynı
+    cache.get_klines(symbol="SOLUSDT", interval="1m", limit=5)
+    assert len(fake.calls) == 2 and fake.calls[1]["startTime"] is not None
+
+
+def test_passthrough_for_other_calls_and_custom_queries():
+    fake, cache = _make()
+    assert cache.get_ticker(symbol="SOLUSDT")["quoteVolume"] == "123"
+    cache.get_klines(symbol="SOLUSDT", interval="1m", limit=5, startTime=0)
+    cache.get_klines(symbol="SOLUSDT", interval="1m", limit=5, startTime=0)
+    assert len(fake.calls) == 2
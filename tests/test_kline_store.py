@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from backtest import BacktestConfig, run_backtest, synthetic_klines
+from core.bars import Bars
+from core.kline_store import KlineStore
+from core.rate_limit import WeightBudget
+from vector_backtest import VectorBacktester
+
+MIN = 60_000
+DAY = 86_400_000
+
+
+class FakeClient:
+    """now_ms'e kadar 1m barlar; her get_klines çağrısını kaydeder (son bar açık)."""
+    def __init__(self, start_ms, now_ms):
+        self.start_ms, self.now_ms = start_ms, now_ms
+        self.calls = []
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None):
+        self.calls.append(startTime)
+        first = max(startTime, self.start_ms)
+        return [[t, 1.0, 2.0, 0.5, t / MIN, 3.0, t + MIN - 1]
+                for t in range(first, self.now_ms + 1, MIN)][:limit]
+
+
+def test_append_is_incremental_and_slices_are_memmap_views(tmp_path):
+    store = KlineStore(str(tmp_path))
+    rows = synthetic_klines(500, seed=2)
+    assert store.append("SOLUSDT", rows[:300]) == 300
+    # Tekrar eden ve eski barlar atlanır, yalnız yeniler eklenir
+    assert store.append("SOLUSDT", rows[250:400] + rows[390:400]) == 100
+    assert store.length("SOLUSDT") == 400 and store.last_open_time("SOLUSDT") == rows[399][0]
+
+    t0 = rows[100][0]
+    cols = store.columns("SOLUSDT", t0 + 30 * MIN - 1, t0 + 60 * MIN)
+    assert isinstance(cols["close"], np.memmap) and not cols["close"].flags.writeable
+    assert cols["open_time"].tolist() == [r[0] for r in rows[130:160]]
+    assert store.index_range("SOLUSDT", end_ms=rows[0][0]) == (0, 0)
+    expected = Bars.from_klines(rows[:400]).values
+    assert np.array_equal(store.bars("SOLUSDT").values, expected)
+    assert np.array_equal(store.bars("SOLUSDT", end_ms=rows[200][0], last=50).values, expected[150:200])
+
+
+def test_interrupted_append_is_repaired(tmp_path):
+    store = KlineStore(str(tmp_path))
+    rows = synthetic_klines(50, seed=3)
+    store.append("SOLUSDT", rows[:20])
+    # Yarıda kalan ekleme: close sütunu yazılmış, open_time yazılmamış
+    with open(store._path("SOLUSDT", "close"), "ab") as f:
+        f.write(np.zeros(5).tobytes())
+    assert store.length("SOLUSDT") == 20
+    assert store.append("SOLUSDT", rows[20:]) == 30
+    assert np.array_equal(store.bars("SOLUSDT").values, Bars.from_klines(rows).values)
+
+
+def test_update_pages_closed_bars_from_last_stored(tmp_path):
+    store = KlineStore(str(tmp_path))
+    start = 1_700_000_000_000 // MIN * MIN
+    client = FakeClient(start, start + 2500 * MIN + 30_000)
+    budget = WeightBudget(per_minute=1e9)
+    assert store.update(client, "SOLUSDT", start_ms=start, now_ms=client.now_ms, budget=budget) == 2500
+    assert client.calls == [start, start + 1000 * MIN, start + 2000 * MIN]
+    # Açık bar eklenmez; sonraki güncelleme yalnız yeni kapanan barları ister
+    client.now_ms += 3 * MIN
+    assert store.update(client, "SOLUSDT", now_ms=client.now_ms, budget=budget) == 3
+    assert client.calls[-1] == start + 2500 * MIN
+    assert np.array_equal(np.diff(store.columns("SOLUSDT")["open_time"]), np.full(2502, MIN))
+
+
+def test_price_data_daily_closes(tmp_path):
+    store = KlineStore(str(tmp_path))
+    start = 1_700_006_400_000     # UTC gün başı
+    store.append("BTCUSDT", FakeClient(start, start + 3 * DAY - MIN).get_klines("BTCUSDT", "1m", limit=10_000,
+                                                                                   startTime=start))
+    closes = store.price_data(["BTCUSDT", "ETHUSDT"])
+    assert closes["BTCUSDT"].tolist() == [(start + k * DAY - MIN) / MIN for k in (1, 2, 3)]
+    assert closes["ETHUSDT"].shape == (0,)
+
+
+def test_run_backtest_reads_bounded_range_from_store(tmp_path):
+    store = KlineStore(str(tmp_path / "klines"))
+    rows = synthetic_klines(3000, seed=4)
+    store.append("SOLUSDT", rows)
+    value = run_backtest("SOLUSDT", start_str="1000 minutes ago UTC", initial_balance=1000.0,
+                         data_dir=str(tmp_path / "none"), mode="vector", store=store)
+    warmup = (BacktestConfig().window_15m + 1) * 15
+    expected = VectorBacktester("SOLUSDT", rows[-(1000 + warmup):]).run(1000.0, start_index=warmup)
+    assert value == expected.final_value
+    # Aralıksız istek tüm geçmişi RAM'e kopyalamaz: reddedilir
+    with pytest.raises(ValueError):
+        run_backtest("SOLUSDT", start_str="all", data_dir=str(tmp_path / "none"), store=store)
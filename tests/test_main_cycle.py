@@ -0,0 +1,229 @@
+import functools
+import time
+
+import pytest
+
+import main
+from core.indicator_state import INDICATORS
+from modules import humanizer, order_filters
+
+MIN = 60_000
+SYMBOL = "SOLUSDT"
+
+
+class _Stop(BaseException):
+    """main döngüsünü (except Exception'a yakalanmadan) durdurur."""
+
+
+class FakeExchange:
+    """Saate hizalı yükselen 1m seri; 3m / 15m aynı seriden. Kline çağrılarını kaydeder.
+
+    Saat (now_ms) kurulumda sabitlenir; testler ileri alarak boşluk oluşturabilir.
+    """
+    def __init__(self):
+        self.calls = []
+        self.now_ms = int(time.time() * 1000)
+
+    def _rows(self, interval, limit, startTime=None):
+        step = {"1m": MIN, "3m": 3 * MIN, "15m": 15 * MIN}[interval]
+        last_open = self.now_ms // step * step
+        first = startTime if startTime is not None else last_open - (limit - 1) * step
+        rows = []
+        for t in range(first, last_open + 1, step):
+            k = t // MIN
+            c = self.close_at(k)
+            o = self.open_at(k, c)
+            rows.append([t, str(o), str(max(o, c) + 0.2), str(min(o, c) - 0.2), str(c), "50.0", t + step - 1])
+        return rows[:limit]
+
+    def close_at(self, k):
+        return 100.0 + 0.01 * (k % 500) + 0.3 * ((k // 7) % 2)
+
+    def open_at(self, k, c):
+        return c - 0.05
+
+    def clock(self):
+        return self.now_ms / 1000.0
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None, **kwargs):
+        self.calls.append((symbol, interval, limit))
+        return self._rows(interval, limit, startTime)
+
+    def get_symbol_ticker(self, symbol):
+        return {"symbol": symbol, "price": self._rows("1m", 1)[-1][4]}
+
+    def get_order_book(self, symbol, limit=20):
+        return {"bids": [["100.0", "50"]], "asks": [["100.01", "10"]]}
+
+
+class RecordingExecutor:
+    """OrderExecutor yerine: gönderilen her emri kaydeder (main ve pipeline aynı örneği kullanır)."""
+    orders = []
+
+    def __init__(self, client, risk_manager=None):
+        self.client = client
+
+    def warm_caches(self):
+        pass
+
+    def execute_order(self, symbol, side, qty, price=None, **kwargs):
+        RecordingExecutor.orders.append((symbol, side, qty, price))
+        return {"status": "FILLED"}
+
+
+def run_main_cycles(monkeypatch, tmp_path, exchange, cycles=1, scores=None, on_cycle=None):
+    """main.main()'i sahte borsa ile `cycles` tur koştur; executor'a giden emirleri döner.
+
+    `scores` bir liste ise i. tur onun i. elemanını kullanır; `on_cycle(i)` tur başında çağrılır.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(time, "sleep", lambda s: None)
+    monkeypatch.setattr(humanizer, "humanized_order_wrapper",
+                        functools.partial(humanizer.humanized_order_wrapper, sleep_func=lambda s: None))
+    monkeypatch.setattr(main, "initialize_client", lambda *a, **k: exchange)
+    monkeypatch.setattr(main, "_BinanceClient", None)
+    monkeypatch.setattr(main, "MARKET_STREAM_ENABLED", False)
+    monkeypatch.setattr(main, "BAR_AGGREGATION_ENABLED", False)
+    monkeypatch.setattr(main.RULES, "use_client", lambda client: None)
+    monkeypatch.setattr(main.RULES, "warm_start", lambda *a, **k: True)
+    monkeypatch.setattr(main, "optimize_strategy_parameters", lambda *a, **k: None)
+    monkeypatch.setattr(main, "OrderExecutor", RecordingExecutor)
+    done = []
+
+    def scan(client, symbols):
+        sc = scores[len(done) - 1] if isinstance(scores, list) else (scores or {SYMBOL: 1e12})
+        return sc, {s: {"spread": 0.0} for s in sc}
+
+    monkeypatch.setattr(main, "scan_opportunities", scan)
+    monkeypatch.setattr(main, "get_volatility_and_volume", lambda client, symbol: (0.01, 0.01, 1e6, 1e6))
+    monkeypatch.setattr(main, "safe_get_trade_signal", lambda symbol, coin_id: {})
+    monkeypatch.setattr(order_filters, "ensure_min_qty", lambda symbol, price, qty, min_notional: qty)
+    monkeypatch.setattr(order_filters, "adjust_qty_for_filters", lambda symbol, qty: qty)
+    main.reset_pos()
+    main._last_fallback_buy_ts.clear()
+    INDICATORS.clear()
+    RecordingExecutor.orders = []
+    real_new_cycle = main.KlineCache.new_cycle
+
+    def new_cycle(self):
+        if len(done) >= cycles:
+            raise _Stop()
+        if on_cycle is not None:
+            on_cycle(len(done))
+        done.append(None)
+        self._clock = exchange.clock      # önbellek tazeliği sahte borsanın saatiyle
+        real_new_cycle(self)
+
+    monkeypatch.setattr(main.KlineCache, "new_cycle", new_cycle)
+    try:
+        with pytest.raises(_Stop):
+            main.main()
+    finally:
+        main.reset_pos()
+        main.set_executor(None)
+    return RecordingExecutor.orders
+
+
+@pytest.mark.parametrize("trigger", ["scalp", "fallback"])
+def test_entry_cycle_sends_exactly_one_order(monkeypatch, tmp_path, trigger):
+    # Giriş micro-entry (scalp) ya da fallback skoruyla; pipeline yolları ek emir göndermemeli
+    monkeypatch.setenv("ORDER_PIPELINE_ENABLED", "true")
+    scores = None
+    if trigger == "scalp":
+        monkeypatch.setattr(main.playbook, "regime_on_snapshot", lambda snap: False)
+        monkeypatch.setattr(main, "micro_entry_signal", lambda **kw: True)
+        scores = {SYMBOL: 10.0}
+    orders = run_main_cycles(monkeypatch, tmp_path, FakeExchange(), scores=scores)
+    assert len(orders) == 1
+    symbol, side, qty, price = orders[0]
+    assert (symbol, side, price) == (SYMBOL, "BUY", None) and qty > 0
+    assert main.pos.in_pos is False     # harness turdan sonra sıfırlar
+
+
+def _gapped_coin_switches(monkeypatch, tmp_path):
+    """SOL -> ADA -> SOL (300 dk boşluk) -> SOL; her turun 1m penceresini (200 bar) kaydeder."""
+    exchange = FakeExchange()
+    windows = []
+
+    def on_cycle(i):
+        if i == 2:
+            exchange.now_ms += 300 * MIN
+        windows.append(exchange._rows("1m", 200))
+
+    scores = [{SYMBOL: 10.0}, {"ADAUSDT": 10.0}, {SYMBOL: 10.0}, {SYMBOL: 10.0}]
+    return exchange, windows, scores, on_cycle
+
+
+def test_main_seeds_1m_indicators_from_full_window(monkeypatch, tmp_path):
+    # main'in besleme sırası: RSI / EMA her turda 200 barlık pencereyle aynı olmalı
+    # (sembol değişimi ve boşluk sonrası 10 barla yeniden tohumlanmamalı)
+    from modules import technical_analysis as ta
+    from utils import signal_utils
+
+    exchange, windows, scores, on_cycle = _gapped_coin_switches(monkeypatch, tmp_path)
+    seen = []
+
+    def record(candles_1m, rsi_values, ema_9, ema_21):
+        seen.append((rsi_values, ema_9, ema_21))
+        return False
+
+    monkeypatch.setattr(main, "detect_trend_reversal_sell", record)
+    monkeypatch.setattr(main, "WARM_REVERSAL_SIGNALS", True)
+    run_main_cycles(monkeypatch, tmp_path, exchange, cycles=len(scores), scores=scores, on_cycle=on_cycle)
+    assert len(seen) == len(scores)
+    for (rsi_values, ema_9, ema_21), window in zip(seen, windows):
+        closes = [float(r[4]) for r in window]
+        assert ema_21 == pytest.approx(ta.calculate_ema(closes, 21)[-1], rel=1e-9)
+        assert ema_9 == pytest.approx(signal_utils.calculate_ema(closes, 9)[-1], rel=1e-9)
+        assert rsi_values[-1] == pytest.approx(ta.calculate_rsi(closes, 9)[-1], rel=1e-9)
+        assert len(rsi_values) >= 5 and None not in rsi_values
+
+
+def test_main_squeeze_snapshot_is_warm_in_live_order(monkeypatch, tmp_path):
+    # main'in besleme sırasında squeeze snapshot'ı hiçbir turda boş kalmamalı ve toplu sinyalle eşleşmeli
+    exchange, windows, scores, on_cycle = _gapped_coin_switches(monkeypatch, tmp_path)
+    seen = []
+    real = main.playbook.bb_squeeze_breakout_snapshot
+
+    def record(snap):
+        seen.append(dict(snap))
+        return real(snap)
+
+    monkeypatch.setattr(main.playbook, "bb_squeeze_breakout_snapshot", record)
+    run_main_cycles(monkeypatch, tmp_path, exchange, cycles=len(scores), scores=scores, on_cycle=on_cycle)
+    assert len(seen) == len(scores)
+    for snap, window in zip(seen, windows):
+        assert snap["bars"] >= 200
+        for key in ("bb_width", "bb_squeeze_thr", "ema21"):
+            assert snap[key] is not None, key
+        rows = [tuple(float(x) for x in r[:6]) for r in window]
+        assert real(snap) == main.playbook.bb_squeeze_breakout_signal(rows)
+
+
+class ReversalExchange(FakeExchange):
+    """Zikzaklı düşüş; son 4 barda iki yeşil mum, ardından kapanışları düşen kırmızı açık bar."""
+
+    def close_at(self, k):
+        i = self.now_ms // MIN - k     # 0 = açık bar
+        if i < 3:
+            return self.close_at(k - (3 - i)) - 0.1 * (3 - i)
+        return 100.0 + 0.02 * i + 0.15 * (i % 2)
+
+    def open_at(self, k, c):
+        return c + 0.05 if k == self.now_ms // MIN else c - 0.05
+
+
+@pytest.mark.parametrize("warm", [False, True])
+def test_reversal_signal_only_with_warm_flag(monkeypatch, tmp_path, warm):
+    # Varsayılan: eski 10 kapanışlık girdiler, strong_reversal tetiklenmez; bayrakla ısınmış girdilerle tetiklenir
+    seen = []
+    real = main.decide_action
+
+    def record(symbol, analysis, tech, has_position):
+        seen.append(tech["strong_reversal"])
+        return real(symbol, analysis, tech, has_position)
+
+    monkeypatch.setattr(main, "decide_action", record)
+    monkeypatch.setattr(main, "WARM_REVERSAL_SIGNALS", warm)
+    run_main_cycles(monkeypatch, tmp_path, ReversalExchange(), scores={SYMBOL: 10.0})
+    assert seen == [warm]
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+
+from websockets.sync.server import serve
+
+from core.market_stream import MarketStream
+
+MIN = 60_000
+NOW_MS = 1_000 * MIN + 30_000
+
+
+class FakeRest:
+    """REST fallback: çağrıları sayar, sabit veri döner."""
+    def __init__(self):
+        self.calls = []
+
+    def get_klines(self, symbol, interval, limit=500, **kw):
+        self.calls.append("get_klines")
+        last_open = (NOW_MS // MIN) * MIN
+        return [[t, "1", "1", "1", "1", "1", t + MIN - 1] for t in range(last_open - (limit - 1) * MIN, last_open + 1, MIN)]
+
+    def get_symbol_ticker(self, symbol):
+        self.calls.append("get_symbol_ticker")
+        return {"symbol": symbol, "price": "0.5"}
+
+    def get_order_book(self, symbol, limit=100):
+        self.calls.append("get_order_book")
+        return {"bids": [["1", "1"]], "asks": [["2", "1"]]}
+
+
+def _events(sym="SOLUSDT"):
+    s = sym.lower()
+    last_open = (NOW_MS // MIN) * MIN
+    k = {"s": sym, "i": "1m", "t": last_open, "T": last_open + MIN - 1,
+         "o": "10", "h": "12", "l": "9", "c": "11.5", "v": "7", "x": False}
+    return [
+        {"stream": f"{s}@kline_1m", "data": {"e": "kline", "s": sym, "k": k}},
+        {"stream": f"{s}@bookTicker", "data": {"s": sym, "b": "11.4", "B": "3", "a": "11.6", "A": "4"}},
+        {"stream": f"{s}@depth20@100ms", "data": {"lastUpdateId": 7, "bids": [["11.4", "3"], ["11.3", "5"]], "asks": [["11.6", "4"]]}},
+        {"stream": f"{s}@miniTicker", "data": {"s": sym, "c": "11.5", "o": "10", "h": "12", "l": "9", "v": "100", "q": "1150"}},
+    ]
+
+
+class FakeStreamServer:
+    """Yerel combined-stream sunucusu: bağlanana olayları gönderir, path'i kaydeder."""
+    def __init__(self, events):
+        self.events = events
+        self.paths = []
+        self.server = serve(self._handler, "127.0.0.1", 0)
+        self.port = self.server.socket.getsockname()[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _handler(self, ws):
+        self.paths.append(ws.request.path)
+        for ev in self.events:
+            ws.send(json.dumps(ev))
+        try:
+            ws.recv()
+        except Exception:
+            pass
+
+    def close(self):
+        self.server.shutdown()
+
+
+def _wait(cond, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _run(events):
+    server = FakeStreamServer(events)
+    rest = FakeRest()
+    clock = {"t": NOW_MS / 1000}
+    stream = MarketStream(["SOLUSDT"], fallback=rest, intervals=("1m",),
+                          url=f"ws://127.0.0.1:{server.port}", clock=lambda: clock["t"])
+    assert stream.start()
+    assert _wait(lambda: stream.stats["messages"] >= len(events))
+    return server, rest, stream, clock
+
+
+def test_stream_serves_prices_book_and_ticker_without_rest():
+    server, rest, stream, _ = _run(_events())
+    try:
+        assert "solusdt@kline_1m" in server.paths[0] and "solusdt@bookTicker" in server.paths[0]
+        assert stream.get_symbol_ticker(symbol="SOLUSDT")["price"] == "11.5"
+        assert stream.get_ticker(symbol="SOLUSDT")["quoteVolume"] == "1150"
+        ob = stream.get_order_book(symbol="SOLUSDT", limit=1)
+        assert ob["bids"] == [["11.4", "3"]] and ob["asks"] == [["11.6", "4"]]
+        assert stream.get_orderbook_ticker(symbol="SOLUSDT")["askPrice"] == "11.6"
+        assert rest.calls == []
+    finally:
+        stream.stop()
+        server.close()
+
+
+def test_klines_seed_from_rest_once_then_read_from_buffer():
+    server, rest, stream, _ = _run(_events())
+    try:
+        rows = stream.get_klines(symbol="SOLUSDT", interval="1m", limit=50)
+        assert rest.calls == ["get_klines"]
+        # Açık bar akıştan gelen sürümle birleşti
+        assert len(rows) == 50 and rows[-1][4] == "11.5"
+        again = stream.get_klines(symbol="SOLUSDT", interval="1m", limit=20)
+        assert rest.calls == ["get_klines"] and again == rows[-20:]
+    finally:
+        stream.stop()
+        server.close()
+
+
+def test_stale_stream_falls_back_to_rest():
+    server, rest, stream, clock = _run(_events())
+    try:
+        clock["t"] += stream.stale_sec + 1
+        assert stream.get_symbol_ticker(symbol="SOLUSDT")["price"] == "0.5"
+        stream.get_order_book(symbol="SOLUSDT", limit=5)
+        assert rest.calls == ["get_symbol_ticker", "get_order_book"]
+    finally:
+        stream.stop()
+        server.close()
+
+
+def test_batched_ticker_queries_served_when_all_symbols_fresh():
+    rest = FakeRest()
+    stream = MarketStream(["SOLUSDT", "ADAUSDT"], fallback=rest, intervals=("1m",), clock=lambda: NOW_MS / 1000)
+    for ev in _events("SOLUSDT") + _events("ADAUSDT"):
+        stream.handle_message(json.dumps(ev))
+    both = json.dumps(["SOLUSDT", "ADAUSDT"])
+    assert [t["symbol"] for t in stream.get_ticker(symbols=both)] == ["SOLUSDT", "ADAUSDT"]
+    assert stream.get_orderbook_tickers(symbols=both)[1]["bidPrice"] == "11.4"
+    assert rest.calls == []
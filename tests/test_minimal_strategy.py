@@ -5,3 +5,29 @@ from minimal_strategy import Strategy
 def test_strategy_always_hold():
     s = Strategy()
     assert s.get_action({}) == "HOLD"
+
+
+def _price_data(days=30):
+    import math
+    return {
+        "BTCUSDT": [100 * (1 + 0.08 * math.sin(d / 3)) for d in range(days)],
+        "ETHUSDT": [50 * (1 + 0.12 * math.cos(d / 4)) for d in range(days)],
+    }
+
+
+def test_optimize_parameters_pool_matches_serial(tmp_path, caplog):
+    grid = {"cooldown_period": [1, 3], "stop_loss_pct": [0.03, 0.05], "take_profit_pct": [0.05, 0.1]}
+    s = Strategy()
+    before = (s.cooldown_period, s.stop_loss_pct, dict(s.last_action))
+    caplog.set_level("INFO", logger="StrategyLogger")
+    serial = s.optimize_parameters(_price_data(), 30, ["BTCUSDT", "ETHUSDT"], grid, max_workers=1, seed=7)
+    # Deneme logları kapalı: sadece deneme özeti + en iyi sonuç satırları
+    assert not any("split" in r.getMessage() or "tetiklendi" in r.getMessage() for r in caplog.records)
+    path = tmp_path / "sweep.csv"
+    pooled = s.optimize_parameters(_price_data(), 30, ["BTCUSDT", "ETHUSDT"], grid, max_workers=2, seed=7,
+                                   results_path=str(path))
+    assert serial == pooled and serial[0] is not None
+    # Her deneme stratejinin kopyasıyla koşar
+    assert (s.cooldown_period, s.stop_loss_pct, dict(s.last_action)) == before
+    rows = path.read_text().splitlines()
+    assert rows[0].startswith("index,cooldown_period") and len(rows) == 1 + 8
@@ -0,0 +1,57 @@
+import math
+import random
+
+import pytest
+
+from core import num
+
+STEPS = [1e-8, 1e-6, 1e-5, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, 0.00025, 0.005, 0.05, 0.5, 0.2, 0.03]
+
+
+def _value(rnd, inc):
+    """Zor durumlar ağırlıklı: ızgarada, tam yarımda, negatif, kısa ondalık, uç değer."""
+    r = rnd.random()
+    if r < 0.3:
+        return rnd.uniform(0, 1e5) * rnd.choice([1e-6, 1e-3, 1, 1e3])
+    if r < 0.55:
+        return rnd.randint(0, 10**7) * inc
+    if r < 0.75:
+        return (rnd.randint(0, 10**7) + 0.5) * inc
+    if r < 0.85:
+        return -rnd.uniform(0, 1e4)
+    if r < 0.95:
+        return float(f"{rnd.uniform(0, 1e4):.{rnd.randint(0, 9)}f}")
+    return rnd.choice([0.0, 1e-12, 1e12, 123456789.123456789, 5e-324, 1e300, math.inf])
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_integer_path_matches_decimal_reference(seed):
+    rnd = random.Random(seed)
+    for _ in range(20000):
+        inc = rnd.choice(STEPS)
+        x = _value(rnd, inc)
+        assert num.quantize_to_step(x, inc) == num._quantize_to_step_dec(x, inc), (x, inc)
+        assert num.ceil_to_step(x, inc) == num._ceil_to_step_dec(x, inc), (x, inc)
+        assert num.round_to_tick(x, inc) == num._round_to_tick_dec(x, inc), (x, inc)
+
+
+def test_symbol_quantizer_matches_module_functions():
+    rnd = random.Random(11)
+    for _ in range(20000):
+        tick, step = rnd.choice(STEPS), rnd.choice(STEPS)
+        qz = num.quantizer_for(tick, step)
+        price, qty = _value(rnd, tick), _value(rnd, step)
+        if math.isinf(price) or math.isinf(qty):
+            continue
+        p, q = qz.round_price(price), qz.floor_qty(qty)
+        assert p == num._round_to_tick_dec(price, tick)
+        assert q == num._quantize_to_step_dec(qty, step)
+        assert qz.ceil_qty(qty) == num._ceil_to_step_dec(qty, step)
+        assert qz.notional(q, p) == num._safe_mul_dec(q, p)
+        assert qz.notional(qty, price) == num._safe_mul_dec(qty, price)
+
+
+def test_non_positive_increment_is_identity():
+    qz = num.quantizer_for(0.0, 0.0)
+    assert qz.round_price(1.23456) == 1.23456 and qz.floor_qty(7.7) == 7.7
+    assert num.quantize_to_step(3.3, 0) == 3.3 and num.safe_mul(None, 2.0) is None
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from modules.order_executor import OrderExecutor
+
+
+class FakeClient:
+    """Order book çağrısı hata verir; ticker çağrılarını sayar."""
+    def __init__(self):
+        self.calls = []
+
+    def get_order_book(self, symbol, limit=20):
+        raise AssertionError("fill sonrası order book istenmemeli")
+
+    def get_symbol_ticker(self, symbol):
+        self.calls.append(symbol)
+        return {"symbol": symbol, "price": "600"}
+
+
+def _resp(asset, commission):
+    return {"orderId": 1, "symbol": "SOLUSDT", "side": "BUY", "status": "FILLED",
+            "fills": [{"price": "150", "qty": "2", "commission": commission, "commissionAsset": asset}]}
+
+
+def test_base_commission_uses_fill_price_without_book():
+    ex = OrderExecutor(FakeClient(), notifier_enabled=False)
+    res = ex._parse_fills("SOLUSDT", _resp("SOL", "0.002"))
+    assert abs(res["fee_usdt"] - 0.3) < 1e-12 and res["fee_unconverted"] == {}
+
+
+def _drain(ex):
+    ex._fetch_pool().shutdown(wait=True)
+    ex._pool = None
+
+
+def test_bnb_commission_uses_mark_warmed_before_fill():
+    client = FakeClient()
+    ex = OrderExecutor(client, notifier_enabled=False, bnb_fee_payment=True)
+    # BNB ile ödeme açıkken BNBUSDT, hiç BNB fill'i görülmeden ısıtılır
+    ex.warm_caches()
+    _drain(ex)
+    assert client.calls == ["BNBUSDT"]
+    first = ex._parse_fills("SOLUSDT", _resp("BNB", "0.0005"))
+    second = ex._parse_fills("SOLUSDT", _resp("BNB", "0.0005"))
+    assert abs(first["fee_usdt"] - 0.3) < 1e-12 and second["fee_usdt"] == first["fee_usdt"]
+    # fill ayrıştırma ek ticker isteği yapmadı
+    assert client.calls == ["BNBUSDT"]
+
+
+def test_cold_bnb_mark_does_not_block_fill_parsing():
+    release = threading.Event()
+
+    class SlowTicker(FakeClient):
+        def get_symbol_ticker(self, symbol):
+            release.wait(5)
+            return super().get_symbol_ticker(symbol)
+
+    client = SlowTicker()
+    ex = OrderExecutor(client, notifier_enabled=False)
+    t0 = time.perf_counter()
+    res = ex._parse_fills("SOLUSDT", _resp("BNB", "0.0005"))
+    assert time.perf_counter() - t0 < 1.0
+    assert res["fee_usdt"] == 0.0 and res["fee_unconverted"] == {"BNB": 0.0005}
+    # fiyat arka planda çekilir; sonraki fill çevrilir
+    release.set()
+    _drain(ex)
+    res = ex._parse_fills("SOLUSDT", _resp("BNB", "0.0005"))
+    assert abs(res["fee_usdt"] - 0.3) < 1e-12 and client.calls == ["BNBUSDT"]
+
+
+def test_unknown_commission_is_reported_not_dropped():
+    class NoTicker(FakeClient):
+        def get_symbol_ticker(self, symbol):
+            raise RuntimeError("yok")
+
+    ex = OrderExecutor(NoTicker(), notifier_enabled=False)
+    res = ex._parse_fills("SOLUSDT", _resp("XYZ", "1.5"))
+    _drain(ex)
+    assert res["fee_usdt"] == 0.0 and res["fee_unconverted"] == {"XYZ": 1.5}
@@ -0,0 +1,35 @@
+import time
+
+from core.sweep import EarlyStop, TrialResult
+from modules.performance_optimization import PerformanceOptimization
+
+
+def _score(params):
+    # Modül seviyesinde: süreç havuzuna gönderilebilir
+    return -(params["x"] - 7) ** 2 + params["y"]
+
+
+def test_offline_grid_has_no_sleep_and_keeps_top5(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda s: (_ for _ in ()).throw(AssertionError("sleep")))
+    opt = PerformanceOptimization(offline=True, max_workers=2)
+    opt.grid_search({"x": list(range(10)), "y": [0, 1]}, _score, max_trials=100)
+    assert len(opt.last_run.rows) == 20 and opt.best_score == 1
+    best = opt.get_best_params()
+    # Eşit skorların sırası bitiş sırasına bağlı: skorları karşılaştır
+    assert len(best) == 5 and best[0] == {"x": 7, "y": 1} and [_score(p) for p in best[1:]] == [0, 0, 0, -1]
+
+
+def test_offline_random_early_stop_and_lambda_fallback():
+    # Lambda picklable değil: aynı süreçte sırayla; patience dolunca durur
+    calls = []
+    opt = PerformanceOptimization(offline=True, patience=5)
+    opt.random_search({"x": [1, 2, 3]}, lambda p: calls.append(p) or 1.0, max_trials=200)
+    assert opt.last_run.stopped_early and len(calls) == 6
+    assert opt.get_best_params() == [calls[0]] + calls[1:5]
+
+
+def test_early_stop_rule():
+    stop = EarlyStop(patience=2, min_delta=0.5, target=10.0)
+    rows = [TrialResult(i, {}, s, 0.0) for i, s in enumerate([1.0, 1.2, 2.0, None, 1.0])]
+    assert [stop(r) for r in rows] == [False, False, False, False, True]
+    assert EarlyStop(target=10.0)(TrialResult(0, {}, 11.0, 0.0))
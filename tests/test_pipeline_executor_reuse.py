@@ -0,0 +1,84 @@
+import core.pipeline as p
+from core.types import OrderPlan
+
+
+class CountingExec:
+    """Kurulum sayısını ve fee cache benzeri durumu tutan stub."""
+    instances = 0
+
+    def __init__(self, client=None, risk_manager=None):
+        CountingExec.instances += 1
+        self.client = client
+        self.risk = risk_manager
+        self.fee_lookups = 0
+        self._fee = None
+
+    def place_order(self, plan):
+        if self._fee is None:
+            self.fee_lookups += 1
+            self._fee = 0.001
+        return {"ok": True}
+
+
+def _plan(sym="AAAUSDT"):
+    return OrderPlan(symbol=sym, side="BUY", qty_base=1.0, entry_price=10.0)
+
+
+def test_executor_built_once_and_bound_to_client(monkeypatch):
+    CountingExec.instances = 0
+    monkeypatch.setattr(p, "_safe_import_executor", lambda: ("executor", CountingExec))
+    client, rm = object(), object()
+    p.init_pipeline(client, rm)
+    try:
+        for i in range(5):
+            assert p.execute_order_plan(_plan(f"S{i}USDT")).success
+        kind, inst = p.get_executor()
+        assert CountingExec.instances == 1
+        assert inst.client is client and inst.risk is rm
+        assert inst.fee_lookups == 1  # cache emirler arasında korunur
+    finally:
+        p.bind_executor(None, None)
+
+
+def test_injected_executor_wins_and_imports_resolve_once(monkeypatch):
+    calls = {"n": 0}
+
+    def counting_filters():
+        calls["n"] += 1
+        return None
+
+    monkeypatch.setattr(p, "_safe_import_filters", counting_filters)
+    stub = CountingExec()
+    p.set_executor(stub)
+    try:
+        for _ in range(3):
+            p.validate_order_plan(_plan())
+            assert p.execute_order_plan(_plan()).success
+        assert p.get_executor() == ("injected", stub)
+        assert calls["n"] == 1
+    finally:
+        p.set_executor(None)
+
+
+class OrderExecutorLike:
+    def __init__(self):
+        self.calls = []
+
+    def execute_order(self, **kw):
+        self.calls.append(kw)
+        if kw["quantity"] > 5:
+            return {"ok": False, "reason": "spread too wide"}
+        return {"ok": True, "orderId": 7, "filled_qty": kw["quantity"], "avg_fill_price": 10.0}
+
+
+def test_order_executor_interface_is_supported():
+    ex = OrderExecutorLike()
+    p.set_executor(ex)
+    try:
+        ok = p.execute_order_plan(OrderPlan(symbol="BBBUSDT", side="BUY", qty_quote=20.0, entry_price=10.0))
+        bad = p.execute_order_plan(OrderPlan(symbol="CCCUSDT", side="SELL", qty_base=9.0, entry_price=10.0))
+    finally:
+        p.set_executor(None)
+    assert ok.success and ok.filled_qty == 2.0 and ok.order_id == "7"
+    assert not bad.success and bad.error == "spread too wide"
+    assert ex.calls[0]["quantity"] == 2.0 and ex.calls[0]["order_type"] == "MARKET"
@@ -0,0 +1,76 @@
+import time
+
+from core import metrics
+from modules.order_executor import OrderExecutor
+
+
+class SlowClient:
+    """Her okuma sabit gecikmeli; çağrıları sayar."""
+    def __init__(self, delay=0.15, book_delay=None):
+        self.delay = delay
+        self.book_delay = delay if book_delay is None else book_delay
+        self.calls = []
+
+    def get_order_book(self, symbol, limit=20):
+        self.calls.append("get_order_book")
+        time.sleep(self.book_delay)
+        return {"bids": [["100", "50"]], "asks": [["100.01", "50"]]}
+
+    def get_account(self):
+        self.calls.append("get_account")
+        time.sleep(self.delay)
+        return {"takerCommission": 10}
+
+    def get_asset_balance(self, asset):
+        self.calls.append("get_asset_balance")
+        time.sleep(self.delay)
+        return {"free": "1000"}
+
+
+class FakeRisk:
+    def __init__(self):
+        self.equity = None
+
+    def allow_trade(self, equity_usdt, **kw):
+        self.equity = equity_usdt
+        return True, "ok", {}
+
+
+def test_fetches_run_concurrently_within_one_round_trip():
+    metrics._reset_for_tests()
+    client = SlowClient(delay=0.15)
+    risk = FakeRisk()
+    ex = OrderExecutor(client, risk_manager=risk, notifier_enabled=False)
+    t0 = time.perf_counter()
+    ok, _, info = ex.precheck("SOLUSDT", "BUY", 0.1)
+    elapsed = time.perf_counter() - t0
+    assert ok and risk.equity == 1000.0
+    # Sıralı olsaydı ~0.45 sn
+    assert elapsed < 0.35
+    text = metrics._generate_latest_text()
+    for name in ("order_book", "taker_fee", "balance", "total"):
+        assert f'precheck_fetch_seconds_count{{fetch="{name}"}} 1.0' in text
+
+
+def test_fresh_caches_skip_account_and_balance_calls():
+    client = SlowClient(delay=0.0)
+    ex = OrderExecutor(client, risk_manager=FakeRisk(), notifier_enabled=False)
+    ex.precheck("SOLUSDT", "BUY", 0.1)
+    client.calls.clear()
+    ex.precheck("SOLUSDT", "BUY", 0.1)
+    assert client.calls == ["get_order_book"]
+    ex.invalidate_balance()
+    ex.precheck("SOLUSDT", "BUY", 0.1)
+    assert sorted(client.calls) == ["get_asset_balance", "get_order_book", "get_order_book"]
+
+
+def test_deadline_falls_back_to_defaults_or_rejects():
+    client = SlowClient(delay=0.5, book_delay=0.0)
+    risk = FakeRisk()
+    ex = OrderExecutor(client, risk_manager=risk, notifier_enabled=False, fetch_timeout_sec=0.05)
+    ok, _, info = ex.precheck("SOLUSDT", "BUY", 0.1)
+    assert ok and risk.equity == 0.0 and info["taker_fee_rate"] > 0
+
+    slow_book = OrderExecutor(SlowClient(delay=0.0, book_delay=0.5), notifier_enabled=False, fetch_timeout_sec=0.05)
+    ok, reason, info = slow_book.precheck("SOLUSDT", "BUY", 0.1)
+    assert not ok and info["reason"] == "order_book_timeout"
@@ -0,0 +1,92 @@
+import os
+import time
+
+import numpy as np
+
+from core.result_cache import ResultCache, array_fingerprint, file_fingerprint, func_namespace, stable_hash
+from minimal_strategy import Strategy
+from modules.performance_optimization import PerformanceOptimization
+from modules.strategy_optimizer import optimize_strategy_parameters
+
+
+def _score(params):
+    return -(params["x"] - 3) ** 2
+
+
+def test_stable_hash_ignores_dict_order_and_fingerprints_arrays():
+    assert stable_hash({"a": 1, "b": 2}) == stable_hash({"b": 2, "a": 1})
+    a = np.arange(6, dtype=np.float64)
+    assert stable_hash(a) == stable_hash(a.copy()) == stable_hash(array_fingerprint(a))
+    assert array_fingerprint(a) != array_fingerprint(a.reshape(2, 3))
+
+
+def test_lru_eviction_keeps_recently_read(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=3 * 120)
+    for i in range(3):
+        cache.put(f"k{i:02d}", "x" * 100)
+        past = time.time() - 100 + i
+        os.utime(cache._path(f"k{i:02d}"), (past, past))
+    assert cache.get("k00") == "x" * 100     # okuma mtime'ı tazeler
+    cache.put("k03", "x" * 100)
+    assert cache.evictions == 1 and cache.get("k01") is None
+    assert cache.get("k00") is not None and cache.size_bytes <= cache.max_bytes
+    s = cache.stats()
+    assert (s["hits"], s["misses"]) == (2, 1)
+
+
+def test_file_fingerprint_follows_content(tmp_path):
+    path = tmp_path / "klines.csv"
+    path.write_text("1,2,3\n")
+    fp = file_fingerprint(str(path))
+    assert file_fingerprint(str(path)) == fp
+    path.write_text("1,2,4\n")
+    assert file_fingerprint(str(path)) != fp
+    # Veri dosyası değişince skor fonksiyonunun ad alanı da değişir
+    assert func_namespace(_score, (str(path),)) != func_namespace(_score, ())
+
+
+def test_minimal_optimize_parameters_second_run_is_cached(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    data = {"BTCUSDT": [100 + (d % 5) for d in range(20)]}
+    grid = {"cooldown_period": [1, 3], "stop_loss_pct": [0.03, 0.05]}
+    s = Strategy()
+    first = s.optimize_parameters(data, 20, ["BTCUSDT"], grid, max_workers=1, seed=3, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 4)
+    again = s.optimize_parameters(data, 20, ["BTCUSDT"], grid, max_workers=1, seed=3, cache=cache)
+    assert again == first and cache.hits == 4
+    # seed yoksa önbellek kullanılmaz
+    s.optimize_parameters(data, 20, ["BTCUSDT"], grid, max_workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (4, 4)
+
+
+def test_online_search_skips_delay_on_cache_hits(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    PerformanceOptimization(offline=False, cache=cache).grid_search({"x": [1, 2, 3]}, _score)
+    assert len(sleeps) == 3
+    opt = PerformanceOptimization(offline=False, cache=cache)
+    opt.grid_search({"x": [1, 2, 3]}, _score)
+    assert len(sleeps) == 3 and cache.hits == 3 and opt.best_score == 0
+    # Offline mod aynı kayıtları paylaşır
+    offline = PerformanceOptimization(offline=True, max_workers=1, cache=cache)
+    offline.grid_search({"x": [1, 2, 3, 4]}, _score)
+    assert offline.last_run.cache_hits == 3 and offline.last_run.cache_misses == 1
+    assert sum(r.cached for r in offline.last_run.rows) == 3
+
+
+def test_strategy_optimizer_grid_and_tpe_share_full_history_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    calls = []
+
+    def backtest(params):
+        calls.append(params)
+        return -abs(params["STOP_LOSS_RATIO"] - 0.005)
+
+    grid = {"STOP_LOSS_RATIO": [0.003, 0.005], "TAKE_PROFIT_RATIO": [0.01], "EMA_PERIOD": [9],
+            "RSI_PERIOD": [14]}
+    best = optimize_strategy_parameters(backtest, dict(grid), search_type="grid", cache=cache)
+    assert len(calls) == 2 and best["STOP_LOSS_RATIO"] == 0.005
+    best = optimize_strategy_parameters(backtest, dict(grid), search_type="tpe", max_trials=2, seed=1,
+                                        cache=cache)
+    assert len(calls) == 2 and best["STOP_LOSS_RATIO"] == 0.005
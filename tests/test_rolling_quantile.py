@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from core.indicator_state import IndicatorState, RollingQuantile
+from modules import playbook
+from modules.technical_analysis import calculate_bbands
+
+MIN = 60_000
+
+
+def _ref(window_vals, q):
+    return sorted(window_vals)[max(0, int(len(window_vals) * q) - 1)]
+
+
+@pytest.mark.parametrize("window,q", [(1, 0.2), (5, 0.5), (181, 0.2), (50, 0.95)])
+def test_rolling_quantile_matches_sorted_window(window, q):
+    rnd = random.Random(window)
+    rq = RollingQuantile(window, q)
+    vals = []
+    for _ in range(600):
+        # Tekrarlı değerler de olsun
+        x = round(rnd.random(), 2)
+        cand = (vals + [x])[-window:]
+        assert rq.peek(x) == _ref(cand, q)
+        vals.append(x)
+        assert rq.update(x) == _ref(vals[-window:], q)
+        assert len(rq) == min(len(vals), window)
+
+
+def _rows(n, seed):
+    rnd = random.Random(seed)
+    p, rows = 100.0, []
+    for i in range(n):
+        o = p
+        # Sakin dönemler ve ani kırılımlar karışık
+        vol = 0.0005 if (i // 40) % 2 else 0.004
+        p = p * (1 + rnd.gauss(0.0003, vol))
+        rows.append((float(i * MIN), o, max(o, p) * 1.0005, min(o, p) * 0.9995, p, rnd.uniform(1, 20)))
+    return rows
+
+
+def test_snapshot_squeeze_matches_batch_signal_each_bar():
+    fired = 0
+    for seed in range(3):
+        rows = _rows(900, seed)
+        st = IndicatorState("1m")
+        for t in range(200, len(rows) + 1):
+            window = rows[t - 200:t]
+            snap = st.feed(window)
+            batch = playbook.bb_squeeze_breakout_signal(window)
+            mids, ups, lows = calculate_bbands([r[4] for r in window], 20, 2.0)
+            widths = [(u - lo) / m for m, u, lo in zip(mids, ups, lows)]
+            assert snap["bb_squeeze_thr"] == pytest.approx(_ref(widths, 0.2), rel=1e-9)
+            assert playbook.bb_squeeze_breakout_snapshot(snap) == batch
+            fired += batch
+    assert fired > 0
@@ -0,0 +1,29 @@
+import numpy as np
+
+from core.sweep import SharedSeries, grid, run_sweep
+
+
+def _trial(params, data, context):
+    # İşçide paylaşılan seri salt okunur memmap görünümü
+    assert not data["x"].flags.writeable
+    if params["k"] == 3:
+        raise ValueError("bozuk")
+    return float(data["x"][params["k"]]) * context
+
+
+def test_pool_streams_results_and_captures_errors():
+    seen = []
+    res = run_sweep(_trial, grid({"k": [0, 1, 2, 3, 4]}), shared={"x": [10.0, 20.0, 30.0, 40.0, 50.0]},
+                    context=2.0, max_workers=2, chunk_size=1, on_result=seen.append)
+    serial = run_sweep(_trial, grid({"k": [4, 2]}), shared={"x": np.arange(5.0) * 10 + 10}, context=2.0, max_workers=1)
+    assert [r.score for r in serial.rows] == [100.0, 60.0]
+    assert len(seen) == len(res.rows) == 5
+    by_k = {r.params["k"]: r for r in res.rows}
+    assert by_k[3].score is None and "ValueError" in by_k[3].error
+    assert [r.params["k"] for r in res.best(2)] == [4, 2] and res.best(1)[0].score == 100.0
+
+
+def test_shared_series_views():
+    with SharedSeries({"a": [1, 2], "b": np.arange(3.0)}) as s:
+        views = SharedSeries.attach(s.handle())
+        assert views["a"].tolist() == [1.0, 2.0] and views["b"].tolist() == [0.0, 1.0, 2.0]
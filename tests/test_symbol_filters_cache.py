@@ -0,0 +1,44 @@
+import core.exchange_rules as er
+import main
+
+
+def _sdef(symbol):
+    return {"symbol": symbol, "quoteAsset": "USDT", "filters": [
+        {"filterType": "PRICE_FILTER", "tickSize": "0.01"},
+        {"filterType": "LOT_SIZE", "stepSize": "0.1"},
+        {"filterType": "NOTIONAL", "minNotional": "5.0"},
+    ]}
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_symbol_info(self, symbol):
+        self.calls += 1
+        return _sdef(symbol)
+
+
+def test_quantize_uses_preloaded_filters_without_rest(monkeypatch):
+    reg = er.RulesRegistry(snapshot_path=None, fetcher=lambda symbols=None: {"symbols": [_sdef("SOLUSDT")]})
+    assert reg.preload()
+    monkeypatch.setattr(er, "RULES", reg)
+    client = CountingClient()
+    for _ in range(50):
+        q, p = main.quantize_qty_price(client, "SOLUSDT", 1.234, 101.239)
+    assert client.calls == 0
+    assert abs(q - 1.2) < 1e-12 and abs(p - 101.23) < 1e-9
+
+
+def test_unknown_symbol_loaded_once_then_shared(monkeypatch):
+    reg = er.RulesRegistry(snapshot_path=None, fetcher=lambda symbols=None: {"symbols": []})
+    monkeypatch.setattr(er, "RULES", reg)
+    client = CountingClient()
+    main.quantize_qty_price(client, "ADAUSDT", 100, 0.5)
+    main.quantize_qty_price(client, "ADAUSDT", 100, 0.5)
+    assert client.calls == 1
+    # Aynı kayıt exchange_rules tarafında da görünür
+    assert reg.get("ADAUSDT").step_size == 0.1
+    # NOTIONAL filtresi min notional için kullanılır: 5 / 0.5 = 10 adet
+    q, _ = main.quantize_qty_price(client, "ADAUSDT", 1, 0.5)
+    assert q >= 10
@@ -0,0 +1,71 @@
+import numpy as np
+
+from backtest import BacktestConfig, synthetic_klines
+from modules.strategy_optimizer import optimize_strategy_parameters
+from modules.tpe_search import TPEHalvingSearch
+from vector_backtest import BacktestObjective, VectorBacktester
+
+SPACE = {f"p{i}": list(range(10)) for i in range(4)}
+OPT = (2, 7, 4, 5)
+
+
+def _score(params, budget=1.0):
+    # Kısa geçmiş gürültülü ama tam geçmişle aynı tepe noktası
+    base = -sum((params[f"p{i}"] - OPT[i]) ** 2 for i in range(4))
+    noise = np.random.default_rng([params[f"p{i}"] for i in range(4)]).normal(0, 3.0 * (1 - budget))
+    return base + noise
+
+
+def test_halving_spends_budget_on_short_history_first():
+    res = TPEHalvingSearch(SPACE, min_budget=1 / 9, eta=3, seed=0).run(_score, total_budget=30)
+    by_budget = {}
+    for ev in res.history:
+        by_budget[round(ev.budget, 3)] = by_budget.get(round(ev.budget, 3), 0) + 1
+    assert res.budget_used <= 30 + 1e-9
+    # Her turda 9 -> 3 -> 1: tam geçmişe yalnızca terfi edenler çıkar
+    assert by_budget[0.111] > by_budget[0.333] > by_budget[1.0] > 0
+    assert len(res.history) > 60 and res.best_score >= -4
+    again = TPEHalvingSearch(SPACE, min_budget=1 / 9, eta=3, seed=0).run(_score, total_budget=30)
+    assert again.best_params == res.best_params
+
+
+def test_entry_point_passes_budget_only_when_supported():
+    calls = []
+
+    def plain(params):
+        calls.append(params)
+        return _score(params)
+
+    best = optimize_strategy_parameters(plain, dict(SPACE), search_type="tpe", max_trials=25, seed=3)
+    assert len(calls) == 25 and len({tuple(sorted(c.items())) for c in calls}) == 25
+    assert set(best) == set(SPACE)     # tpe: varsayılan ızgara eklenmez
+    budgets = []
+    optimize_strategy_parameters(lambda p, budget=1.0: budgets.append(budget) or _score(p, budget),
+                                 dict(SPACE), search_type="tpe", max_trials=10, seed=3)
+    assert min(budgets) < 0.2 and 1.0 in budgets
+
+
+def test_backtest_objective_runs_on_history_tail():
+    rows = synthetic_klines(3000, seed=4)
+    engine = VectorBacktester("TESTUSDT", rows)
+    obj = BacktestObjective(engine)
+    params = {"take_profit_pct": 0.004, "STOP_LOSS_RATIO": 0.005}
+    cfg = BacktestConfig(take_profit_pct=0.004)
+    ref = VectorBacktester("TESTUSDT", rows, config=cfg).run(1000.0, start_index=199 + 1400)
+    assert obj(params, budget=0.5) == ref.final_value / 1000.0 - 1.0
+    assert obj(params) == VectorBacktester("TESTUSDT", rows, config=cfg).run(1000.0).final_value / 1000.0 - 1.0
+
+
+def test_tpe_searches_only_given_keys():
+    # Varsayılan ızgara eklenmez: her değerlendirme farklı (a, b, budget) yapılandırması
+    seen = []
+
+    def score(p, budget=1.0):
+        seen.append((tuple(sorted(p)), p["a"], p["b"], round(budget, 6)))
+        return -abs(p["a"] - 3) - abs(p["b"] - 2)
+
+    space = {"a": [1, 2, 3, 4], "b": [1, 2, 3, 4]}
+    best = optimize_strategy_parameters(score, dict(space), search_type="tpe", max_trials=10, seed=0)
+    assert set(best) == {"a", "b"}
+    assert all(keys == ("a", "b") for keys, *_ in seen)
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,79 @@
+import numpy as np
+
+from backtest import Backtester, BacktestConfig, resample_closed, synthetic_klines
+from core.bars import Bars
+from core.indicator_state import IndicatorState
+from modules import playbook
+from modules.signals import micro_entry_signal
+from vector_backtest import VectorBacktester, prepare, rolling_kth, signal_codes
+
+MIN = 60_000
+SPEC_1M = {"ema": (20,), "rsi": (2,), "bb": (20, 2.0), "vwap": 50, "squeeze": (181, 0.2)}
+SPEC_15M = {"ema": (20, 50), "adx": 14}
+
+
+def _loop_codes(rows, cfg, start):
+    # Bar bar referans: ana döngünün artımlı durumu (IndicatorState) + snapshot kuralları
+    rows_15m = resample_closed(rows)
+    st1, st15 = IndicatorState("1m", SPEC_1M), IndicatorState("15m", SPEC_15M)
+    codes, prev_ema, j = [], None, 0
+    for i in range(len(rows)):
+        snap = st1.feed(rows[:i + 1])          # son satır (i. bar) peek: kapanmış gibi
+        t_close = rows[i][0] + MIN
+        while j < len(rows_15m) and rows_15m[j][0] + 15 * MIN <= t_close:
+            j += 1
+        regime = j > 0 and playbook.regime_on_snapshot(st15.feed(rows_15m[:j]), adx_min=cfg.adx_min)
+        c, o = float(rows[i][4]), float(rows[i][1])
+        ema, rsi2 = snap["ema20"], snap["rsi2"]
+        pullback = (ema is not None and prev_ema is not None and rsi2 is not None and c > o and rsi2 <= 10
+                    and c >= ema * 0.998 and float(rows[i - 1][4]) <= prev_ema * 1.002)
+        prev_ema = ema
+        code = 0
+        if i >= start:
+            if regime and (playbook.bb_squeeze_breakout_snapshot(snap) or pullback):
+                code = 1
+            elif not regime:
+                w = Bars.from_klines(rows[i - 2:i + 1])
+                cl = w.close
+                vol = abs((cl[-1] - cl[-2]) / cl[-2])
+                if micro_entry_signal(ohlcv_1m=w, vwap=((w.open + w.close) / 2.0).tolist(), volatility=vol):
+                    code = 2
+        codes.append(code)
+    return codes
+
+
+def test_signal_arrays_match_bar_by_bar_loop():
+    rows = synthetic_klines(1600, seed=11)
+    cfg = BacktestConfig()
+    bars = Bars.from_klines(rows)
+    codes = signal_codes(prepare(bars, Bars.from_klines(resample_closed(rows))), cfg)
+    ref = _loop_codes(rows, cfg, start=cfg.window_1m - 1)
+    got = codes.tolist()
+    got[:cfg.window_1m - 1] = [0] * (cfg.window_1m - 1)
+    assert got == ref and 1 in ref and 2 in ref
+
+
+def test_trades_match_event_engine_with_same_signals():
+    rows = synthetic_klines(3000, seed=4)
+    for cfg in (BacktestConfig(), BacktestConfig(take_profit_pct=0.0, max_hold_sec=600, slippage_bps=5.0)):
+        engine = VectorBacktester("TESTUSDT", rows, config=cfg)
+        vec = engine.run(1000.0)
+        # Aynı sinyal dizisi bar bar motordan: boyut, doğrulama, dolum ve çıkışlar aynı olmalı
+        ref = Backtester("TESTUSDT", rows, config=cfg, signals=engine.signals).run(1000.0)
+        assert len(vec.trades) == len(ref.trades) > 5
+        for a, b in zip(vec.trades, ref.trades):
+            assert (a.entry_ts, a.exit_ts, a.exit_reason, a.qty, a.setup) == (b.entry_ts, b.exit_ts, b.exit_reason, b.qty, b.setup)
+            assert a.pnl == b.pnl and a.exit_price == b.exit_price
+        assert vec.equity_curve == ref.equity_curve and vec.final_value == ref.final_value
+
+
+def test_rolling_kth_matches_sorted_rule():
+    rnd = np.random.default_rng(1)
+    x = rnd.random(400)
+    x[:19] = np.nan
+    got = rolling_kth(x, 181, 0.2)
+    vals = x[19:]
+    for i in range(vals.shape[0]):
+        w = sorted(vals[max(0, i - 180):i + 1])
+        assert got[19 + i] == w[max(0, int(len(w) * 0.2) - 1)]
+    assert np.isnan(got[:19]).all()
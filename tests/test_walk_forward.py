@@ -0,0 +1,110 @@
+import json
+
+from backtest import synthetic_klines
+from core.result_cache import ResultCache
+from modules.optimizer import Optimizer
+from walk_forward import WalkForward, split_windows
+
+DAY = 1440
+SPACE = {"take_profit_pct": [0.003, 0.006], "adx_min": [14.0, 22.0], "max_hold_sec": [600, 1800]}
+
+
+def _wf(rows, cache, **kw):
+    return WalkForward("TESTUSDT", rows, space=SPACE, train_days=2, test_days=1, warmup_bars=300,
+                       max_trials=4, seed=1, cache=cache, **kw)
+
+
+def test_split_windows_roll_forward():
+    assert split_windows(10, 4, 2, warmup=1) == [(1, 5, 7), (3, 7, 9)]
+    assert split_windows(10, 4, 2, step_bars=1, warmup=0)[-1] == (4, 8, 10)
+
+
+def test_oos_curve_chains_windows_and_extra_window_reuses_cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    opt = Optimizer(param_file=str(tmp_path / "params.json"), perf_log_file=str(tmp_path / "perf.json"),
+                    change_log_file=str(tmp_path / "changes.json"))
+    rows = synthetic_klines(300 + 5 * DAY, seed=6)
+    first = _wf(rows, cache, optimizer=opt).run(1000.0)
+    assert len(first.windows) == 3 and first.cache_misses > 0
+    for a, b in zip(first.windows, first.windows[1:]):
+        assert b.start_value == a.final_value and b.test[0] == a.test[1]
+    assert first.equity_curve[0][0] > first.windows[0].test[0] and first.equity_curve[-1][1] == first.final_value
+    # Seçilen parametreler yalnızca BacktestConfig alanları; son pencereninki kalıcı yazılır
+    saved = json.loads((tmp_path / "params.json").read_text())
+    assert {k: saved[k] for k in SPACE} == first.windows[-1].params
+    assert "Walk-forward TESTUSDT window 2" in (tmp_path / "changes.json").read_text()
+
+    # Geçmişe bir gün eklenince yalnız yeni pencere hesaplanır
+    longer = _wf(synthetic_klines(300 + 6 * DAY, seed=6), cache).run(1000.0)
+    assert len(longer.windows) == 4
+    assert [w.params for w in longer.windows[:3]] == [w.params for w in first.windows]
+    assert longer.equity_curve[:len(first.equity_curve)] == first.equity_curve
+    new_misses = longer.cache_misses
+    again = _wf(synthetic_klines(300 + 6 * DAY, seed=6), cache).run(1000.0)
+    assert again.cache_misses == 0 and again.final_value == longer.final_value
+    # Eski pencerelerin seçim + test kayıtları önbellekten; ıskalar yalnız yeni pencerenin
+    assert longer.cache_hits >= 3 * 2 and 0 < new_misses < first.cache_misses
+
+
+def test_env_knobs_and_rules_invalidate_cached_windows(tmp_path, monkeypatch):
+    # Sonucu etkileyen ENV / kural değişince önbellekteki skorlar yeniden kullanılmamalı
+    cache = ResultCache(str(tmp_path / "cache"))
+    rows = synthetic_klines(300 + 3 * DAY, seed=2)
+    first = _wf(rows, cache).run(1000.0)
+    assert _wf(rows, cache).run(1000.0).cache_misses == 0
+    monkeypatch.setenv("MICRO_ENTRY_MIN_VOLATILITY", "0.002")
+    assert _wf(rows, cache).run(1000.0).cache_misses == first.cache_misses
+    monkeypatch.setenv("DEFAULT_MIN_NOTIONAL_USDT", "7")
+    assert _wf(rows, cache).run(1000.0).cache_misses == first.cache_misses
+
+
+def test_engine_code_version_covers_result_modules(monkeypatch):
+    import core.result_cache as rc
+    import vector_backtest
+    seen = []
+    monkeypatch.setattr(rc, "code_fingerprint", lambda *objs: seen.extend(o.__name__ for o in objs) or "x")
+    vector_backtest.engine_code_version()
+    for name in ("core.indicator_state", "core.cooldown", "core.bars", "core.bar_aggregator",
+                 "modules.playbook", "modules.order_filters", "backtest"):
+        assert name in seen
+
+
+def test_synthetic_fallback_does_not_persist_params(tmp_path, monkeypatch):
+    # Veri dosyası ve depo yokken sentetik veriyle seçilen parametreler parametre dosyasına yazılmaz
+    import walk_forward
+    from core.kline_store import KlineStore
+
+    monkeypatch.setattr(walk_forward, "synthetic_klines", lambda n: synthetic_klines(300 + 3 * DAY, seed=2))
+    opt = Optimizer(param_file=str(tmp_path / "params.json"), perf_log_file=str(tmp_path / "perf.json"),
+                    change_log_file=str(tmp_path / "changes.json"))
+    res = walk_forward.run_walk_forward("TESTUSDT", data_dir=str(tmp_path / "none"),
+                                        store=KlineStore(str(tmp_path / "klines")), optimizer=opt,
+                                        space=SPACE, train_days=2, test_days=1, warmup_bars=300,
+                                        max_trials=4, cache=ResultCache(str(tmp_path / "cache")))
+    assert res.windows
+    assert not (tmp_path / "changes.json").exists()
+    assert not (tmp_path / "params.json").exists() or "take_profit_pct" not in (tmp_path / "params.json").read_text()
+
+
+def test_store_backed_windows_match_in_memory(tmp_path):
+    # Depodan pencere pencere okuma: sonuç bellekteki geçmişle aynı, hiçbir okuma tüm geçmişi kopyalamaz
+    from core.kline_store import KlineStore
+
+    rows = synthetic_klines(300 + 4 * DAY, seed=8)
+    store = KlineStore(str(tmp_path / "klines"))
+    store.append("TESTUSDT", rows)
+    reads = []
+    real_bars = store.bars
+
+    def bars(symbol, start_ms=None, end_ms=None, last=None):
+        out = real_bars(symbol, start_ms, end_ms, last)
+        reads.append((start_ms, end_ms, len(out)))
+        return out
+
+    store.bars = bars
+    mem = _wf(rows, ResultCache(str(tmp_path / "c1"))).run(1000.0)
+    disk = _wf(None, ResultCache(str(tmp_path / "c2")), store=store).run(1000.0)
+    assert [w.params for w in disk.windows] == [w.params for w in mem.windows]
+    assert disk.final_value == mem.final_value and disk.equity_curve == mem.equity_curve
+    assert reads and all(s is not None and e is not None for s, e, _ in reads)
+    assert max(n for *_, n in reads) <= 300 + 3 * DAY < len(rows)
@@ -0,0 +1,407 @@
+"""
+Vektörel backtest: playbook giriş kuralları tüm geçmiş için boolean dizi olarak hesaplanır,
+girişler / çıkışlar dizi işlemleriyle simüle edilir. Parametre setlerini olay güdümlü
+(backtest.Backtester) tekrardan önce hızlıca elemek için.
+
+İki aşama:
+    frame = prepare(bars_1m, bars_15m, books)      parametreden bağımsız indikatör dizileri (bir kez)
+    VectorBacktester(..., frame=frame).run(...)    sinyal kodları + işlem simülasyonu (parametre seti başına)
+
+Sinyaller ana döngünün artımlı anlamıyla hesaplanır (core.indicator_state: EMA / RSI / ADX
+serinin başından, Bollinger genişlik eşiği son 181 genişliğin %20 yüzdeliği):
+    rejim    = EMA20 > EMA50 ve ADX14 >= adx_min (kapanmış 15m barları; regime_on_snapshot)
+    kırılım  = genişlik <= eşik, close > üst bant * 1.0005, close >= VWAP50 (bb_squeeze_breakout_snapshot)
+    pullback = yeşil mum, RSI(2) <= 10, EMA20'ye temas (pullback_signal)
+    micro    = close ve (open+close)/2 yükseliyor, |Δclose| >= MICRO_ENTRY_MIN_VOLATILITY (micro_entry_signal)
+Olay güdümlü motor 200 / 100 barlık pencerelerle hesapladığından tohumlama farkı olabilir;
+aynı sinyal dizisiyle (Backtester(signals=...)) işlem listesi birebir aynıdır
+(bkz. tests/test_vector_backtest.py). Boyutlandırma, doğrulama, ücret / slippage ve çıkış
+seviyeleri Backtester'ınkilerdir; yalnızca çıkış barı araması dizi üzerinde yapılır.
+
+Çalıştır:
+    python scripts/bench_vector_backtest.py
+"""
+from __future__ import annotations
+import copy
+import dataclasses
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backtest import Backtester, BacktestConfig, BacktestResult, Trade, SETUPS, _MIN, _M15
+from core.bars import Bars
+from core.cooldown import CooldownRegistry
+from core.exchange_rules import load_rules_for_symbol
+from core.indicator_state import DEFAULT_SPEC
+from modules import indicators_np as _np_ind
+from modules import playbook
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return str(v).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+# Pencere matrisleri için satır parçası (bellek sınırı)
+_CHUNK = 1 << 16
+
+
+def _pad(values: np.ndarray, n: int) -> np.ndarray:
+    """Sona hizalı diziyi başı NaN olan n uzunluğa genişlet."""
+    out = np.full(n, np.nan)
+    m = min(values.shape[0], n)
+    if m:
+        out[n - m:] = values[-m:]
+    return out
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Pencere toplamı (ilk window-1 konum NaN)."""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    win = np.lib.stride_tricks.sliding_window_view(x, window)
+    for s in range(0, win.shape[0], _CHUNK):
+        w = win[s:s + _CHUNK]
+        out[window - 1 + s:window - 1 + s + w.shape[0]] = w.sum(axis=1)
+    return out
+
+
+def rolling_kth(x: np.ndarray, window: int, q: float) -> np.ndarray:
+    """
+    Kayan q-yüzdelik, RollingQuantile sıra kuralıyla: sorted(w)[max(0, int(len(w) * q) - 1)].
+    Baştaki kısmi pencereler de hesaplanır (NaN değerler pencereye girmez).
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if not valid.shape[0]:
+        return out
+    v = x[valid]
+    m = v.shape[0]
+    head = min(window - 1, m)
+    for i in range(head):
+        w = np.sort(v[:i + 1])
+        out[valid[i]] = w[max(0, int((i + 1) * q) - 1)]
+    if m >= window:
+        k = max(0, int(window * q) - 1)
+        win = np.lib.stride_tricks.sliding_window_view(v, window)
+        for s in range(0, win.shape[0], _CHUNK):
+            w = np.partition(win[s:s + _CHUNK], k, axis=1)[:, k]
+            out[valid[window - 1 + s:window - 1 + s + w.shape[0]]] = w
+    return out
+
+
+def adx_series(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Her bardaki Wilder ADX (calculate_adx ölçeği), başı NaN."""
+    n = close.shape[0]
+    if n < 2 * period:
+        return np.full(n, np.nan)
+    trs = _np_ind.true_range(high, low, close)
+    up = high[1:] - high[:-1]
+    down = low[:-1] - low[1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    trn = _np_ind.wilder_smooth(trs, period)
+    pdm = _np_ind.wilder_smooth(plus_dm, period)
+    mdm = _np_ind.wilder_smooth(minus_dm, period)
+    safe_t = np.where(trn != 0, trn, 1.0)
+    di_plus = np.where(trn != 0, 100.0 * pdm / safe_t, 0.0)
+    di_minus = np.where(trn != 0, 100.0 * mdm / safe_t, 0.0)
+    s = di_plus + di_minus
+    dx = np.where(s != 0, 100.0 * np.abs(di_plus - di_minus) / np.where(s != 0, s, 1.0), 0.0)
+    return _pad(_np_ind.wilder_smooth(dx, period) / period, n)
+
+
+def _ema(x: np.ndarray, period: int) -> np.ndarray:
+    return _pad(_np_ind.ema(x, period), x.shape[0]) if x.shape[0] >= period else np.full(x.shape[0], np.nan)
+
+
+@dataclass
+class SignalFrame:
+    """Parametreden bağımsız diziler (1m bar ekseninde)."""
+    open: np.ndarray
+    close: np.ndarray
+    ema20: np.ndarray
+    rsi2: np.ndarray
+    bb_upper: np.ndarray
+    bb_width: np.ndarray
+    squeeze_thr: np.ndarray
+    vwap50: np.ndarray               # hacim 0 ise 0 (snapshot'taki `or 0`)
+    trend_up: np.ndarray             # EMA20 > EMA50 (15m, kapanmış barlardan)
+    adx15: np.ndarray
+    book_idx: Optional[np.ndarray]   # bar kapanışında geçerli order book görüntüsü (-1: yok)
+    seconds: float = 0.0
+
+
+def prepare(bars_1m: Bars, bars_15m: Bars, books: Optional[List[Dict[str, Any]]] = None) -> SignalFrame:
+    t0 = time.perf_counter()
+    o, h, lo, c, v = (np.ascontiguousarray(a) for a in (bars_1m.open, bars_1m.high, bars_1m.low,
+                                                         bars_1m.close, bars_1m.volume))
+    n = c.shape[0]
+    bb_period, bb_mult = DEFAULT_SPEC["bb"]
+    sq_window, sq_q = DEFAULT_SPEC["squeeze"]
+    vwap_lb = DEFAULT_SPEC["vwap"]
+
+    upper = np.full(n, np.nan)
+    width = np.full(n, np.nan)
+    if n >= bb_period:
+        mids, uppers, lowers = _np_ind.bbands(c, bb_period, bb_mult)
+        upper[bb_period - 1:] = uppers
+        with np.errstate(divide="ignore", invalid="ignore"):
+            width[bb_period - 1:] = np.where(mids != 0, (uppers - lowers) / mids, np.nan)
+
+    pv, vs = rolling_sum(c * v, vwap_lb), rolling_sum(v, vwap_lb)
+    # Pencere dolmadan (ilk barlar) kısmi toplam: RollingVwap gibi
+    head = min(vwap_lb - 1, n)
+    pv[:head], vs[:head] = np.cumsum(c[:head] * v[:head]), np.cumsum(v[:head])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(vs > 0, pv / np.where(vs > 0, vs, 1.0), 0.0)
+
+    rsi2 = _pad(_np_ind.rsi_full(c, 2), n) if n > 2 else np.full(n, np.nan)
+
+    # 15m rejimi: i. 1m barın kapanışına kadar kapanmış son 15m barı
+    c15 = np.ascontiguousarray(bars_15m.close)
+    ema20_15, ema50_15 = _ema(c15, 20), _ema(c15, 50)
+    adx15 = adx_series(np.ascontiguousarray(bars_15m.high), np.ascontiguousarray(bars_15m.low), c15, 14)
+    idx15 = np.searchsorted(bars_15m.open_time + _M15, bars_1m.open_time + _MIN, side="right") - 1
+    has15 = idx15 >= 0
+    pick = np.where(has15, idx15, 0)
+    with np.errstate(invalid="ignore"):
+        trend_up = has15 & (ema20_15[pick] > ema50_15[pick]) if c15.shape[0] else np.zeros(n, dtype=bool)
+    adx_1m = np.where(has15, adx15[pick], np.nan) if c15.shape[0] else np.full(n, np.nan)
+
+    book_idx = None
+    if books:
+        ts = np.array([int(b["ts"]) for b in books], dtype=np.float64)
+        book_idx = np.searchsorted(ts, bars_1m.open_time + _MIN, side="right") - 1
+
+    frame = SignalFrame(open=o, close=c, ema20=_ema(c, 20), rsi2=rsi2, bb_upper=upper, bb_width=width,
+                        squeeze_thr=rolling_kth(width, sq_window, sq_q), vwap50=vwap,
+                        trend_up=trend_up, adx15=adx_1m, book_idx=book_idx)
+    frame.seconds = time.perf_counter() - t0
+    return frame
+
+
+def signal_codes(frame: SignalFrame, cfg: BacktestConfig,
+                 books: Optional[List[Dict[str, Any]]] = None) -> np.ndarray:
+    """Bar başına giriş kodu (backtest.SETUPS): 0 yok, 1 LONG, 2 SCALP."""
+    o, c = frame.open, frame.close
+    c_prev = np.concatenate(([np.nan], c[:-1]))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        regime = frame.trend_up & (frame.adx15 >= cfg.adx_min)
+        breakout = ((frame.bb_width <= frame.squeeze_thr) & (c > frame.bb_upper * 1.0005)
+                    & (c >= frame.vwap50))
+        ema_prev = np.concatenate(([np.nan], frame.ema20[:-1]))
+        pullback = ((c > o) & (frame.rsi2 <= 10) & (c >= frame.ema20 * 0.998)
+                    & (c_prev <= ema_prev * 1.002))
+        vw = (o + c) / 2.0
+        vw_prev = np.concatenate(([np.nan], vw[:-1]))
+        vol = np.where(c_prev != 0, np.abs((c - c_prev) / c_prev), 0.0)
+        micro = (c > c_prev) & (vw > vw_prev) & (vol >= float(os.getenv("MICRO_ENTRY_MIN_VOLATILITY", "0.0009")))
+
+    book_ok = np.ones(c.shape[0], dtype=bool)
+    if frame.book_idx is not None and books:
+        ok = np.array([playbook.orderbook_imbalance_ok(b, min_ratio=cfg.orderbook_min_ratio) for b in books])
+        has = frame.book_idx >= 0
+        book_ok = np.where(has, ok[np.where(has, frame.book_idx, 0)], True)
+
+    codes = np.zeros(c.shape[0], dtype=np.int8)
+    codes[regime & book_ok & (breakout | pullback)] = 1
+    if cfg.scalp_mode and cfg.micro_entry:
+        codes[~regime & micro] = 2
+    return codes
+
+
+class VectorBacktester(Backtester):
+    """Backtester ile aynı işlem kuralları; sinyaller diziden, çıkış barı dizi taramasıyla."""
+
+    def __init__(self, symbol: str, klines_1m: Sequence[Sequence[Any]],
+                 klines_15m: Optional[Sequence[Sequence[Any]]] = None,
+                 books: Optional[List[Dict[str, Any]]] = None,
+                 config: Optional[BacktestConfig] = None,
+                 frame: Optional[SignalFrame] = None):
+        super().__init__(symbol, klines_1m, klines_15m, books, config)
+        self.frame = frame if frame is not None else prepare(self.bars_1m, self.bars_15m, self.books)
+
+    def with_config(self, config: BacktestConfig) -> "VectorBacktester":
+        """Aynı ayrıştırılmış bar ve SignalFrame ile yeni parametre seti (yeniden ayrıştırma yok)."""
+        clone = copy.copy(self)
+        clone.cfg = config
+        clone.cooldown = CooldownRegistry()
+        clone.signals = None
+        return clone
+
+    def _scan_exit(self, e: int, pos: Trade) -> Optional[Tuple[int, float, str]]:
+        """e. bardan itibaren ilk çıkış (bar, fiyat, neden); Backtester._exit ile aynı öncelik."""
+        cfg = self.cfg
+        a = self.bars_1m.values
+        stop, target = self._levels(pos)
+        n = a.shape[0]
+        size = max(16, int(cfg.max_hold_sec // 60) + 2)
+        start = e
+        while start < n:
+            seg = a[start:min(n, start + size)]
+            hit_stop = seg[:, 3] <= stop if stop else np.zeros(seg.shape[0], dtype=bool)
+            hit_tp = seg[:, 2] >= target if target else np.zeros(seg.shape[0], dtype=bool)
+            hit_hold = (seg[:, 0] + _MIN - pos.entry_ts) / 1000.0 >= cfg.max_hold_sec
+            hit = hit_stop | hit_tp | hit_hold
+            if hit.any():
+                k = int(hit.argmax())
+                o, c = float(seg[k, 1]), float(seg[k, 4])
+                if hit_stop[k]:
+                    return start + k, min(o, stop), "stop"
+                if hit_tp[k]:
+                    return start + k, max(o, target), "take_profit"
+                return start + k, c, "max_hold"
+            start += seg.shape[0]
+            size *= 2
+        return None
+
+    def run(self, initial_balance: float = 1000.0, start_index: Optional[int] = None) -> BacktestResult:
+        cfg = self.cfg
+        result = BacktestResult(symbol=self.symbol, initial_balance=float(initial_balance),
+                                final_value=float(initial_balance))
+        n = len(self.bars_1m)
+        first = max(cfg.window_1m - 1, int(start_index or 0))
+        t0 = time.perf_counter()
+        codes = signal_codes(self.frame, cfg, self.books)
+        self.signals = codes
+        cand = np.flatnonzero(codes[:max(0, n - 1)])
+        t_close = self.bars_1m.open_time + _MIN
+        close = self.bars_1m.close
+        equity = np.empty(max(0, n - first))
+        skip_cooldown = _bool_env("TEST_SKIP_COOLDOWN", False)
+        # Nakitle alınabilecek en büyük notional minNotional'ın altına inince hiçbir plan doğrulamadan
+        # geçemez: qty nakitle (ücret + en az sabit slippage) sınırlı, fiyat en çok yarım tick yukarı
+        # yuvarlanır. Autoscale açıkken yalnız quote_free >= minNotional koşulu kalır.
+        rules = load_rules_for_symbol(self.symbol)
+        if _bool_env("ALLOW_MIN_NOTIONAL_AUTOSCALE", False) or n == 0:
+            reach = 1.0
+        else:
+            slip_floor = 0.0 if self.books else cfg.slippage_bps / 10_000.0
+            reach = (1 + rules.tick_size / (2 * float(close.min()))) / ((1 + cfg.fee_rate + slip_floor) * 1.001)
+        min_notional = rules.min_notional_usdt - 1e-9
+
+        cash = float(initial_balance)
+        last_entry_ms = -10 ** 15
+        i_min, flat_from = first, first
+        while cash * reach >= min_notional:
+            k = int(np.searchsorted(cand, i_min))
+            if k >= cand.shape[0]:
+                break
+            i = int(cand[k])
+            tc = int(t_close[i])
+            if (tc - last_entry_ms) / 1000.0 < cfg.entry_cooldown_sec:
+                i_min = i + 1
+                continue
+            if not skip_cooldown:
+                allowed, why = self.cooldown.can_trade(self.symbol, tc / 1000.0)
+                if why == "daily-trade-limit":
+                    # Günün kalan adayları zaten reddedilir: ertesi güne atla
+                    day_end = (int(tc / 1000.0 // 86400) + 1) * 86_400_000
+                    i_min = max(i + 1, int(np.searchsorted(t_close, day_end, side="left")))
+                    continue
+            stop_price, qty = self._size(i, cash)
+            if qty <= 0:
+                i_min = i + 1
+                continue
+            e = i + 1
+            pos, cash_in = self._fill(e, SETUPS[int(codes[i])], stop_price, qty, cash)
+            if pos is None:
+                i_min = e
+                continue
+            equity[flat_from - first:e - first] = cash
+            cash = cash_in
+            last_entry_ms = pos.entry_ts
+            hit = self._scan_exit(e, pos)
+            j, price, reason = hit if hit is not None else (n - 1, float(close[-1]), "end")
+            equity[e - first:j - first] = cash + pos.qty * close[e:j]
+            cash += self._close(pos, j, price, reason)
+            result.trades.append(pos)
+            if hit is None:
+                flat_from = n
+                equity[j - first] = cash
+                break
+            i_min = flat_from = j
+        equity[flat_from - first:] = cash
+
+        result.equity_curve = list(zip(t_close[first:].astype(np.int64).tolist(), equity.tolist()))
+        result.seconds = time.perf_counter() - t0
+        result.bars = max(0, n - first)
+        result.final_value = cash
+        return result
+
+
+def engine_code_version() -> str:
+    """Backtest sonucunu belirleyen modüllerin kaynak özeti (önbellek anahtarlarında kod sürümü)."""
+    import backtest
+    from core import bar_aggregator, bars, cooldown, exchange_rules, indicator_state, num
+    from modules import order_filters, signals
+    from core.result_cache import code_fingerprint
+    return code_fingerprint(backtest, sys.modules[__name__], playbook, order_filters, signals,
+                            _np_ind, exchange_rules, num, indicator_state, cooldown, bars, bar_aggregator)
+
+
+def engine_settings(symbol: str) -> Dict[str, Any]:
+    """Sonucu belirleyen kod dışı girdiler: çalışma anında okunan ENV bayrakları, cooldown
+    ayarı ve sembolün çözülmüş kuralı (önbellek anahtarlarında engine_code_version ile birlikte)."""
+    from core import cooldown
+    return {
+        "MICRO_ENTRY_MIN_VOLATILITY": float(os.getenv("MICRO_ENTRY_MIN_VOLATILITY", "0.0009")),
+        "ALLOW_MIN_NOTIONAL_AUTOSCALE": _bool_env("ALLOW_MIN_NOTIONAL_AUTOSCALE", False),
+        "TEST_SKIP_COOLDOWN": _bool_env("TEST_SKIP_COOLDOWN", False),
+        "MAX_SLIPPAGE_PCT": _float_env("MAX_SLIPPAGE_PCT", 0.0),
+        "guard": dataclasses.asdict(cooldown.CFG),
+        "rules": dataclasses.asdict(load_rules_for_symbol(symbol)),
+    }
+
+
+class BacktestObjective:
+    """strategy_optimizer skor fonksiyonu: params -> BacktestConfig alanları, skor = getiri oranı.
+
+    budget (0-1] geçmişin son oranıdır: kısa geçmiş denemeleri aynı hazır SignalFrame'in
+    kuyruğunda koşar; start_index öncesi yalnız ısınmadır. BacktestConfig alanı olmayan
+    anahtarlar (optimizer'ın varsayılan ızgarası gibi) yok sayılır.
+    """
+
+    def __init__(self, engine: VectorBacktester, initial_balance: float = 1000.0, start_index: int = 0):
+        self.engine = engine
+        self.initial_balance = float(initial_balance)
+        self.start_index = int(start_index)
+        self._fields = {f.name for f in dataclasses.fields(BacktestConfig)}
+
+    def cache_token(self) -> str:
+        """Sonuç önbelleği için: motor kod sürümü + ENV / kural ayarları + bar verisi + temel ayarlar."""
+        from core.result_cache import array_fingerprint, stable_hash
+        return stable_hash(engine_code_version(), engine_settings(self.engine.symbol),
+                           array_fingerprint(self.engine.bars_1m.values),
+                           array_fingerprint(self.engine.bars_15m.values), self.engine.books,
+                           dataclasses.asdict(self.engine.cfg), self.initial_balance, self.start_index)
+
+    def __call__(self, params: Dict[str, Any], budget: float = 1.0) -> float:
+        cfg = dataclasses.replace(self.engine.cfg, **{k: v for k, v in params.items() if k in self._fields})
+        n = len(self.engine.bars_1m)
+        first = max(cfg.window_1m - 1, self.start_index)
+        start = first + int(max(0, n - first) * (1.0 - min(1.0, max(0.0, float(budget)))))
+        res = self.engine.with_config(cfg).run(self.initial_balance, start_index=start)
+        return res.final_value / self.initial_balance - 1.0
+
+
+__all__ = ["SignalFrame", "prepare", "signal_codes", "VectorBacktester", "BacktestObjective", "engine_code_version",
+           "engine_settings",
+           "rolling_kth", "adx_series"]
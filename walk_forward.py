@@ -0,0 +1,264 @@
+"""
+Walk-forward optimizasyon: geçmiş kayan train / test pencerelerine bölünür; her train
+penceresinde strategy_optimizer (varsayılan 'tpe') BacktestConfig parametrelerini seçer,
+seçilen parametreler hemen sonraki test penceresinde vektörel motorla koşar. Test
+pencereleri zincirlenir (her biri bir öncekinin son değeriyle başlar): örneklem dışı
+(out-of-sample) özsermaye eğrisi.
+
+Önbellek (core.result_cache): anahtarlar (parametre özeti, veri penceresi parmak izi,
+motor kod sürümü, çalışma anı ENV bayrakları + sembol kuralı: vector_backtest.engine_settings).
+    wf-eval    tek train değerlendirmesi (BacktestConfig, pencere, budget) -> skor
+    wf-select  pencerenin arama sonucu (arama ayarları, uzay, pencere) -> seçilen parametreler
+    wf-test    test koşusu (BacktestConfig, pencere, başlangıç bakiyesi) -> eğri + işlemler
+Geçmişe bir pencere eklenip yeniden koşulunca eski pencereler önbellekten gelir, yalnız
+yeni pencere hesaplanır. Son pencerede seçilen parametreler modules.optimizer.Optimizer ile
+kalıcı yazılır (parametre dosyası + değişiklik logu).
+
+Pencere, ısınma (WF_WARMUP_BARS) dahil motorun gördüğü barlardır; ısınma barları
+değerlendirilmez.
+
+Çalıştır:
+    python walk_forward.py SOLUSDT 1000
+"""
+from __future__ import annotations
+import dataclasses
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backtest import (BACKTEST_DATA_DIR, BacktestConfig, BacktestResult, Trade, _find, load_klines,
+                      synthetic_klines)
+from core.bars import Bars
+from core.kline_store import KlineStore, default_store
+from core.result_cache import ResultCache, array_fingerprint, stable_hash
+from modules.optimizer import Optimizer
+from modules.strategy_optimizer import optimize_strategy_parameters
+from vector_backtest import BacktestObjective, VectorBacktester, engine_code_version, engine_settings
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except Exception:
+        return default
+
+
+WF_TRAIN_DAYS = _int_env("WF_TRAIN_DAYS", 30)
+WF_TEST_DAYS = _int_env("WF_TEST_DAYS", 7)
+WF_MAX_TRIALS = _int_env("WF_MAX_TRIALS", 20)
+WF_WARMUP_BARS = _int_env("WF_WARMUP_BARS", 1500)    # 100 x 15m: rejim göstergeleri için
+
+_DAY = 1440
+
+# Varsayılan arama uzayı (BacktestConfig alanları)
+DEFAULT_SPACE: Dict[str, List[Any]] = {
+    "hard_stop_pct": [0.003, 0.005, 0.008, 0.012],
+    "take_profit_pct": [0.003, 0.005, 0.008, 0.012],
+    "adx_min": [14.0, 18.0, 22.0, 26.0],
+    "max_hold_sec": [600, 1800, 3600],
+}
+
+_FIELDS = {f.name for f in dataclasses.fields(BacktestConfig)}
+
+
+@dataclass
+class WindowResult:
+    index: int
+    train: Tuple[int, int]          # (ilk bar açılış ms, son bar kapanış ms), ısınma hariç
+    test: Tuple[int, int]
+    params: Dict[str, Any]
+    start_value: float
+    final_value: float
+    trades: int
+
+    @property
+    def test_return(self) -> float:
+        return self.final_value / self.start_value - 1.0 if self.start_value else 0.0
+
+
+@dataclass
+class WalkForwardResult(BacktestResult):
+    windows: List[WindowResult] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+def split_windows(n_bars: int, train_bars: int, test_bars: int, step_bars: Optional[int] = None,
+                  warmup: int = 0) -> List[Tuple[int, int, int]]:
+    """(train_start, test_start, test_end) bar indeksleri; ilk train ısınmadan sonra başlar."""
+    step = step_bars or test_bars
+    out, s = [], warmup
+    while s + train_bars + test_bars <= n_bars:
+        out.append((s, s + train_bars, s + train_bars + test_bars))
+        s += step
+    return out
+
+
+class _WindowObjective:
+    """Tek train penceresinde önbellekli BacktestObjective; motor ilk ıskada kurulur."""
+
+    def __init__(self, wf: "WalkForward", lo: int, start: int, hi: int):
+        self.wf, self.lo, self.start, self.hi = wf, lo, start, hi
+        self.bars = wf.window(lo, hi)
+        self.fp = array_fingerprint(self.bars.values)
+        self._objective: Optional[BacktestObjective] = None
+
+    def __call__(self, params: Dict[str, Any], budget: float = 1.0) -> float:
+        cfg = self.wf.config_for(params)
+        key = stable_hash("wf-eval", self.wf.code_version, self.wf.settings, dataclasses.asdict(cfg), self.fp,
+                          self.start - self.lo, round(float(budget), 6), self.wf.initial_balance)
+        hit = self.wf.cache.get(key)
+        if hit is not None:
+            return float(hit)
+        if self._objective is None:
+            engine = VectorBacktester(self.wf.symbol, self.bars, config=self.wf.base)
+            self._objective = BacktestObjective(engine, self.wf.initial_balance, start_index=self.start - self.lo)
+        return self.wf.cache.put(key, float(self._objective(params, budget=budget)))
+
+
+class WalkForward:
+    """
+    Geçmiş `klines_1m` (bellekte) ya da `store` (core.kline_store, [start_ms, end_ms) aralığı)
+    olarak verilir. Depodan yalnız open_time sütunu (memmap) pencere sınırları için okunur; her
+    pencerenin barları (train / test + ısınma) ihtiyaç anında `store.bars(...)` ile kopyalanır.
+    """
+
+    def __init__(self, symbol: str, klines_1m: Optional[Sequence[Sequence[Any]]] = None,
+                 space: Optional[Dict[str, List[Any]]] = None,
+                 base_config: Optional[BacktestConfig] = None,
+                 train_days: int = WF_TRAIN_DAYS, test_days: int = WF_TEST_DAYS,
+                 step_days: Optional[int] = None, warmup_bars: int = WF_WARMUP_BARS,
+                 search_type: str = "tpe", max_trials: int = WF_MAX_TRIALS, seed: int = 0,
+                 cache: Optional[ResultCache] = None, optimizer: Optional[Optimizer] = None,
+                 store: Optional[KlineStore] = None, start_ms: Optional[int] = None,
+                 end_ms: Optional[int] = None):
+        self.symbol = symbol
+        self.store = store
+        if store is not None:
+            self.bars = None
+            self.open_time = store.columns(symbol, start_ms, end_ms, fields=("open_time",))["open_time"]
+        else:
+            if klines_1m is None:
+                raise ValueError("WalkForward: klines_1m ya da store gerekli")
+            self.bars = Bars.from_klines(klines_1m if isinstance(klines_1m, Bars) else list(klines_1m))
+            self.open_time = self.bars.open_time
+        self.space = dict(space or DEFAULT_SPACE)
+        self.base = base_config or BacktestConfig()
+        self.windows = split_windows(int(self.open_time.shape[0]), train_days * _DAY, test_days * _DAY,
+                                     (step_days or test_days) * _DAY, warmup_bars)
+        self.warmup = warmup_bars
+        self.search_type = search_type
+        self.max_trials = max_trials
+        self.seed = seed
+        self.cache = cache if cache is not None else ResultCache()
+        self.optimizer = optimizer
+        self.initial_balance = 1000.0
+        self.code_version = engine_code_version()
+        self.settings = engine_settings(symbol)
+
+    def window(self, lo: int, hi: int) -> Bars:
+        """[lo, hi) bar indeksleri; depodan yalnız bu aralık okunur."""
+        if self.store is None:
+            return self.bars[lo:hi]
+        return self.store.bars(self.symbol, int(self.open_time[lo]), int(self.open_time[hi - 1]) + 1)
+
+    def config_for(self, params: Dict[str, Any]) -> BacktestConfig:
+        return dataclasses.replace(self.base, **{k: v for k, v in params.items() if k in _FIELDS})
+
+    def _span(self, a: int, b: int) -> Tuple[int, int]:
+        return int(self.open_time[a]), int(self.open_time[b - 1]) + 60_000
+
+    def _select(self, ts: int, te: int) -> Dict[str, Any]:
+        lo = max(0, ts - self.warmup)
+        objective = _WindowObjective(self, lo, ts, te)
+        key = stable_hash("wf-select", self.code_version, self.settings, self.space, dataclasses.asdict(self.base),
+                          objective.fp, ts - lo, self.search_type, self.max_trials, self.seed,
+                          self.initial_balance)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        best = optimize_strategy_parameters(objective, dict(self.space), search_type=self.search_type,
+                                            max_trials=self.max_trials, seed=self.seed)
+        # grid / random aramada optimizer varsayılan ızgarasından gelen (BacktestConfig dışı) anahtarlar atılır
+        return self.cache.put(key, {k: v for k, v in best.items() if k in _FIELDS})
+
+    def _test(self, params: Dict[str, Any], ts: int, te: int, balance: float) -> Dict[str, Any]:
+        lo = max(0, ts - self.warmup)
+        cfg = self.config_for(params)
+        bars = self.window(lo, te)
+        key = stable_hash("wf-test", self.code_version, self.settings, dataclasses.asdict(cfg),
+                          array_fingerprint(bars.values), ts - lo, balance)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        res = VectorBacktester(self.symbol, bars, config=cfg).run(balance, start_index=ts - lo)
+        return self.cache.put(key, {"final_value": res.final_value, "equity_curve": res.equity_curve,
+                                    "trades": [dataclasses.asdict(t) for t in res.trades]})
+
+    def run(self, initial_balance: float = 1000.0) -> WalkForwardResult:
+        self.initial_balance = float(initial_balance)
+        self.settings = engine_settings(self.symbol)
+        hits0, misses0, evictions0 = self.cache.hits, self.cache.misses, self.cache.evictions
+        t0 = time.perf_counter()
+        out = WalkForwardResult(symbol=self.symbol, initial_balance=self.initial_balance,
+                                final_value=self.initial_balance)
+        balance = self.initial_balance
+        for k, (ts, vs, ve) in enumerate(self.windows):
+            params = self._select(ts, vs)
+            test = self._test(params, vs, ve, balance)
+            out.windows.append(WindowResult(k, self._span(ts, vs), self._span(vs, ve), params,
+                                            balance, float(test["final_value"]), len(test["trades"])))
+            out.trades.extend(Trade(**t) for t in test["trades"])
+            out.equity_curve.extend((int(ms), float(eq)) for ms, eq in test["equity_curve"])
+            out.bars += ve - vs
+            balance = float(test["final_value"])
+        out.final_value = balance
+        out.seconds = time.perf_counter() - t0
+        out.cache_hits = self.cache.hits - hits0
+        out.cache_misses = self.cache.misses - misses0
+        self.cache.report(f"Walk-forward {self.symbol}", since={"hits": hits0, "misses": misses0,
+                                                                 "evictions": evictions0})
+        if self.optimizer is not None and out.windows:
+            last = out.windows[-1]
+            self.optimizer.set_params(last.params, reason=f"Walk-forward {self.symbol} window {last.index} "
+                                                          f"(test return {last.test_return:.4%})")
+        return out
+
+
+def run_walk_forward(symbol: str = "BTCUSDT", initial_balance: float = 1000.0,
+                     data_dir: Optional[str] = None, **kwargs: Any) -> WalkForwardResult:
+    """Yerel 1m verisiyle (dosya, yoksa kline deposu, yoksa sentetik 90 gün) walk-forward; özet yazdırır.
+
+    Sentetik veride seçilen parametreler kalıcı yazılmaz (optimizer verilse de).
+    """
+    path = _find(data_dir or BACKTEST_DATA_DIR, symbol, "1m")
+    store = kwargs.pop("store", None) or default_store()
+    optimizer = kwargs.pop("optimizer", None)
+    rows = None
+    if path:
+        rows = load_klines(path)
+    elif store.length(symbol):
+        # Depo pencere pencere okunur (tüm geçmiş belleğe alınmaz)
+        kwargs["store"], path = store, f"kline store {store.root}"
+    else:
+        rows = synthetic_klines(90 * _DAY + WF_WARMUP_BARS)
+    if path:
+        optimizer = optimizer or Optimizer()
+    elif optimizer is not None:
+        print("Walk-forward: sentetik veri, seçilen parametreler kalıcı yazılmayacak")
+        optimizer = None
+    res = WalkForward(symbol, rows, optimizer=optimizer, **kwargs).run(initial_balance)
+    for w in res.windows:
+        print(f"window {w.index}: params {w.params} -> test {w.test_return:+.2%} ({w.trades} trades)")
+    print(f"Walk-forward {symbol} ({path or 'synthetic'}): {len(res.windows)} windows, OOS max DD "
+          f"{res.max_drawdown * 100:.2f}%, cache {res.cache_hits} hits / {res.cache_misses} misses, {res.seconds:.1f}s")
+    print(f"Final portfolio value: {res.final_value:.2f} USDT")
+    return res
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run_walk_forward(symbol=args[0] if args else "BTCUSDT",
+                     initial_balance=float(args[1]) if len(args) > 1 else 1000.0)